@@ -13,20 +13,26 @@ const logger = require('../utils/logger');                 // Logger centralizad
  */
 exports.generateReport = async (req, res) => {
   try {
-    const { formato, syncBeforeRun = false } = req.body;
+    const { formato, syncBeforeRun = false, filtros = {} } = req.body;
 
     // Normaliza xlsx para xls (sistema trata ambos como o mesmo tipo)
     const formatoNormalizado = formato === 'xlsx' ? 'xls' : formato;
 
     // ValidaÃ§Ã£o de formato permitido
-    if (!formatoNormalizado || !['csv', 'xls', 'txt'].includes(formatoNormalizado)) {
+    if (!formatoNormalizado || !['csv', 'xls', 'txt', 'parquet', 'feather'].includes(formatoNormalizado)) {
       return res.status(400).json({
-        error: 'Formato invalido. Use: csv, xls/xlsx ou txt'
+        error: 'Formato invalido. Use: csv, xls/xlsx, txt, parquet ou feather'
       });
     }
 
     // Cria job assÃ­ncrono de geraÃ§Ã£o
-    const job = jobManager.createJob(formatoNormalizado, { syncBeforeRun });
+    // Filtros opcionais (empresa, centroCusto, vencimentoDe/Ate, baixaDe/Ate, status)
+    // sao repassados ao generate_report.py e aplicados no WHERE
+    if (filtros === null || typeof filtros !== 'object' || Array.isArray(filtros)) {
+      return res.status(400).json({ error: 'filtros deve ser um objeto' });
+    }
+
+    const job = jobManager.createJob(formatoNormalizado, { syncBeforeRun, filtros });
 
     // Log para auditoria e debug futuro
     logger.info(`Relatorio solicitado: ${job.jobId} - Formato: ${formatoNormalizado}`);
@@ -14,6 +14,15 @@ const historyManager = require('./historyManager');      // Persiste histÃ³ric
 const logger = require('../utils/logger');               // Logger central
 const siengeSyncService = require('./siengeSyncService'); // Sincroniza dados do Sienge (opcional antes do job)
 
+// Faixa de progresso (%) de cada etapa. Dentro da inserção o avanço é real:
+// proporcional aos bytes dos SI_*.json já carregados (métricas do Python).
+const STEP_PROGRESS = {
+  sync: [0, 10],
+  insert: [10, 70],
+  query: [70, 85],
+  report: [85, 100],
+};
+
 class JobManager extends EventEmitter {
   constructor() {
     super();
@@ -42,11 +51,27 @@ class JobManager extends EventEmitter {
       syncBeforeRun: Boolean(options.syncBeforeRun),
       syncBeforeRun: options.syncBeforeRun || false,
 
+      // Filtros do relatorio (aplicados no WHERE pelo generate_report.py)
+      filtros: options.filtros || {},
+
       status: 'processing', // processing | completed | failed
       currentStep: { number: 1, total: 5, description: 'Inicializando...' },
 
-      // Progresso Ã© â€œestimadoâ€ e atualizado manualmente em cada etapa
-      progress: { percentage: 0, recordsProcessed: 0, totalRecords: 19000 },
+      // Progresso: faixas por etapa (STEP_PROGRESS); na inserção avança pelos bytes
+      // carregados. totalRecords só é conhecido ao gerar o relatório.
+      progress: {
+        percentage: 0,
+        recordsProcessed: 0,
+        totalRecords: null,
+        bytesProcessed: 0,
+        totalBytes: 0,
+        filesProcessed: 0,
+        totalFiles: 0,
+        currentStage: null,
+      },
+
+      // Métricas por arquivo/etapa da inserção (tempo, linhas, RSS)
+      metrics: { files: [] },
 
       // Controle de tempo (usado para mostrar duraÃ§Ã£o ao usuÃ¡rio e histÃ³rico)
       timing: {
@@ -95,39 +120,40 @@ class JobManager extends EventEmitter {
       if (job.syncBeforeRun) {
         await this.runStep(jobId, 0, 'Sincronizando dados do Sienge...', async () => {
           await siengeSyncService.syncAll();
-          job.progress.percentage = 10;
+          this.setProgress(job, STEP_PROGRESS.sync[1]);
         });
       }
 
       // Etapa 1: popular banco com dados base
       await this.runStep(jobId, 1, 'Lendo JSON e inserindo no banco...', async () => {
-        await pythonRunner.runBackendInsert();
-        job.progress.percentage = 25;
+        await pythonRunner.runBackendInsert((metric) => this.handleInsertMetric(job, metric));
+        this.setProgress(job, STEP_PROGRESS.insert[1]);
       });
 
       // Etapa 2: executar query consolidada (normalmente gera tabela/visÃ£o final para exportaÃ§Ã£o)
       await this.runStep(jobId, 2, 'Processando query consolidada...', async () => {
         await pythonRunner.runQuery();
-        job.progress.percentage = 50;
+        this.setProgress(job, STEP_PROGRESS.query[1]);
       });
 
       // Etapa 3: gerar o arquivo final para download
       await this.runStep(jobId, 3, 'Gerando arquivo de relatorio...', async () => {
-        const result = await pythonRunner.runReportGeneration(job.formato);
+        const result = await pythonRunner.runReportGeneration(job.formato, job.filtros);
 
         // Copia metadados retornados pelo Python para o job (usado na UI e histÃ³rico)
         job.result.fileName = result.fileName;
         job.result.fileSize = result.fileSize;
         job.result.recordCount = result.recordCount;
+        job.progress.totalRecords = result.recordCount;
 
         // URL esperada pelo endpoint /downloads/:filename
         job.result.downloadUrl = `/downloads/${result.fileName}`;
-        job.progress.percentage = 75;
+        this.setProgress(job, STEP_PROGRESS.report[1]);
       });
 
       // Etapa 4: finalizaÃ§Ã£o
       await this.runStep(jobId, 4, 'Finalizando...', async () => {
-        job.progress.percentage = 100;
+        this.setProgress(job, 100);
       });
 
       // Marca como concluÃ­do e calcula tempo total
@@ -171,6 +197,53 @@ class JobManager extends EventEmitter {
     await asyncFn();
   }
 
+  /**
+   * Atualiza o percentual (inteiro, nunca regride).
+   */
+  setProgress(job, percentage) {
+    job.progress.percentage = Math.max(job.progress.percentage, Math.round(percentage));
+  }
+
+  /**
+   * Trata um evento de métricas da inserção (JSON-lines do stderr do Python).
+   * - run_start: total de arquivos/bytes
+   * - stage: etapa atual (parse, split, dataframe, insert) e linhas gravadas
+   * - file_done: avança o progresso pelos bytes do arquivo e guarda as métricas
+   */
+  handleInsertMetric(job, metric) {
+    const { progress } = job;
+
+    switch (metric.event) {
+      case 'run_start':
+        progress.totalFiles = metric.files.length;
+        progress.totalBytes = metric.total_bytes;
+        break;
+
+      case 'stage':
+        progress.currentStage = `${metric.table}: ${metric.stage}`;
+        if (metric.stage === 'insert') {
+          progress.recordsProcessed += metric.rows;
+        }
+        break;
+
+      case 'file_done': {
+        progress.filesProcessed += 1;
+        progress.bytesProcessed += metric.bytes;
+        job.metrics.files.push(metric);
+
+        const [start, end] = STEP_PROGRESS.insert;
+        const fraction = progress.totalBytes
+          ? progress.bytesProcessed / progress.totalBytes
+          : progress.filesProcessed / Math.max(progress.totalFiles, 1);
+        this.setProgress(job, start + (end - start) * Math.min(fraction, 1));
+        break;
+      }
+
+      default:
+        break;
+    }
+  }
+
   /**
    * Retorna o job pelo ID (usado pelo controller para status).
    */
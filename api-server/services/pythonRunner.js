@@ -13,6 +13,7 @@
 // - DATA_FOLDER (obrigatÃ³rio)
 // - DOWNLOADS_FOLDER (obrigatÃ³rio)
 // - JOB_TIMEOUT_MINUTES (opcional, default 30)
+// - PYTHON_PROFILE (opcional: cpu ou mem; perfila os 3 scripts em backend/logs/profiles)
 
 const { spawn } = require('child_process');
 const fs = require('fs');
@@ -95,27 +96,77 @@ class PythonRunner {
   /**
    * Executa o script Python que lÃª JSON e insere no banco.
    * ParÃ¢metros e comportamento sÃ£o controlados via args fixos aqui.
+   * onMetric (opcional) recebe os eventos de métricas por etapa emitidos
+   * pelo Python (--metrics): run_start, file_start, stage, file_done, run_done.
    */
-  async runBackendInsert() {
+  async runBackendInsert(onMetric = null) {
     const scriptPath = this.resolveEnvPath('BACKEND_INSERT_SCRIPT');
     const dataFolder = this.resolveEnvPath('DATA_FOLDER');
     const pattern = process.env.BACKEND_INSERT_PATTERN || 'SI_*.json';
     const chunkSize = process.env.BACKEND_INSERT_CHUNK_SIZE || '15000';
+    const insertMethod = process.env.BACKEND_INSERT_METHOD || 'to_sql';
+    const ifExists = process.env.BACKEND_INSERT_IF_EXISTS || 'truncate';
+    const insertMode = this.getInsertMode();
 
     // Args do script (contrato esperado do Python)
     const args = [
       scriptPath,
       '--dir', dataFolder,
       '--pattern', pattern,
-      '--mode', 'quick',
+      '--mode', insertMode,
       '--chunk-size', chunkSize,
-      '--if-exists', 'replace'
+      '--insert-method', insertMethod,
+      '--if-exists', ifExists
     ];
 
+    // Pula arquivos SI_* idênticos aos da última carga (BACKEND_INSERT_SKIP_UNCHANGED=0 desliga)
+    if (process.env.BACKEND_INSERT_SKIP_UNCHANGED !== '0') {
+      args.push('--skip-unchanged');
+    }
+
+    // Commit por lote; um job que falhou continua do último lote confirmado
+    if (process.env.BACKEND_INSERT_RESUME === '1') {
+      args.push('--resume');
+    }
+
+    // Perfil de sessão para carga em massa + ANALYZE TABLE no fim
+    if (process.env.BACKEND_INSERT_BULK_SESSION === '1') {
+      args.push('--bulk-session');
+      if (process.env.BACKEND_INSERT_SKIP_BINLOG === '1') {
+        args.push('--no-binlog');
+      }
+    }
+
+    if (onMetric) {
+      args.push('--metrics');
+    }
+
+    args.push(...this.getProfileArgs());
+
     const pythonPath = this.getPythonPath();
     logger.info(`Executando backend insert: ${pythonPath} ${args.join(' ')}`);
 
-    return this.runPythonScript(pythonPath, args, 'Backend Insert');
+    return this.runPythonScript(pythonPath, args, 'Backend Insert', onMetric);
+  }
+
+  /**
+   * Modo de carga do backend: quick (recarga completa) ou upsert (só linhas alteradas).
+   */
+  getInsertMode() {
+    return process.env.BACKEND_INSERT_MODE || 'quick';
+  }
+
+  /**
+   * Args de profiling (--profile cpu|mem) quando PYTHON_PROFILE estiver definido.
+   */
+  getProfileArgs() {
+    const mode = process.env.PYTHON_PROFILE;
+    if (!mode) return [];
+    if (!['cpu', 'mem'].includes(mode)) {
+      logger.warn(`PYTHON_PROFILE invalido: ${mode} (use cpu ou mem); profiling desligado`);
+      return [];
+    }
+    return ['--profile', mode];
   }
 
   /**
@@ -126,6 +177,13 @@ class PythonRunner {
     const scriptPath = this.resolveEnvPath('QUERY_SCRIPT');
     const args = [scriptPath];
 
+    // Com upsert, reconsolida só os títulos alterados na carga
+    if (this.getInsertMode() === 'upsert') {
+      args.push('--incremental');
+    }
+
+    args.push(...this.getProfileArgs());
+
     const pythonPath = this.getPythonPath();
     logger.info(`Executando query: ${pythonPath} ${args.join(' ')}`);
 
@@ -138,14 +196,16 @@ class PythonRunner {
    * Exemplo esperado:
    * { fileName, fileSize, recordCount }
    */
-  async runReportGeneration(formato) {
+  async runReportGeneration(formato, filtros = {}) {
     const scriptPath = this.resolveEnvPath('REPORT_SCRIPT');
     const downloadFolder = this.resolveEnvPath('DOWNLOADS_FOLDER');
 
     const args = [
       scriptPath,
       '--formato', formato,
-      '--output-dir', downloadFolder
+      '--output-dir', downloadFolder,
+      ...this.getFilterArgs(filtros),
+      ...this.getProfileArgs()
     ];
 
     const pythonPath = this.getPythonPath();
@@ -162,14 +222,65 @@ class PythonRunner {
     }
   }
 
+  /**
+   * Converte os filtros do relatorio em argumentos do generate_report.py.
+   * empresa, centroCusto e status aceitam valor unico ou lista (flag repetida).
+   */
+  getFilterArgs(filtros = {}) {
+    const flags = {
+      empresa: '--empresa',
+      centroCusto: '--centro-custo',
+      vencimentoDe: '--vencimento-de',
+      vencimentoAte: '--vencimento-ate',
+      baixaDe: '--baixa-de',
+      baixaAte: '--baixa-ate',
+      status: '--status',
+    };
+
+    const args = [];
+    for (const [key, flag] of Object.entries(flags)) {
+      const value = filtros[key];
+      const values = Array.isArray(value) ? value : [value];
+      for (const item of values) {
+        if (item === undefined || item === null || item === '') continue;
+        args.push(flag, String(item));
+      }
+    }
+    return args;
+  }
+
+  /**
+   * Repassa uma linha do stderr para onMetric se for um evento de métricas.
+   * Linhas de log comuns são ignoradas; erro no callback não derruba o script.
+   */
+  dispatchMetric(line, onMetric, stepName) {
+    const trimmed = line.trim();
+    if (!trimmed.startsWith('{')) return;
+
+    let metric;
+    try {
+      metric = JSON.parse(trimmed);
+    } catch (e) {
+      return;
+    }
+    if (!metric || typeof metric.event !== 'string') return;
+
+    try {
+      onMetric(metric);
+    } catch (e) {
+      logger.warn(`[${stepName}] falha ao processar metrica ${metric.event}: ${e.message}`);
+    }
+  }
+
   /**
    * Executor genÃ©rico de scripts Python.
    * - spawn com cwd = PROJECT_ROOT (scripts podem depender de paths relativos)
    * - captura stdout/stderr
    * - timeout global por job/etapa
    * - resolve stdout quando exit code = 0
+   * - onMetric (opcional): chamado para cada linha JSON {"event": ...} do stderr
    */
-  async runPythonScript(pythonPath, args, stepName) {
+  async runPythonScript(pythonPath, args, stepName, onMetric = null) {
     return new Promise((resolve, reject) => {
       const BACKEND_DIR = path.join(PROJECT_ROOT, 'backend');
 
@@ -185,6 +296,7 @@ class PythonRunner {
 
       let stdout = '';
       let stderr = '';
+      let stderrLine = ''; // linha incompleta do stderr (chunks não respeitam \n)
 
       // Timeout: evita jobs travados indefinidamente
       const timeoutId = setTimeout(() => {
@@ -204,12 +316,22 @@ class PythonRunner {
         const text = data.toString();
         stderr += text;
         logger.debug(`[${stepName}] stderr: ${text.trim()}`);
+
+        if (onMetric) {
+          const lines = (stderrLine + text).split('\n');
+          stderrLine = lines.pop();
+          lines.forEach((line) => this.dispatchMetric(line, onMetric, stepName));
+        }
       });
 
       // Processo terminou (exit code)
       child.on('close', (code) => {
         clearTimeout(timeoutId);
 
+        if (onMetric && stderrLine) {
+          this.dispatchMetric(stderrLine, onMetric, stepName);
+        }
+
         // Sucesso: devolve stdout como string
         if (code === 0) {
           resolve(stdout);
@@ -7,10 +7,14 @@ Este é o ponto de entrada para operações de carregamento.
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field
+from datetime import datetime
 
-from app.core import get_logger, DatabaseManager
-from app.loaders import QuickLoader, LoadResult
-from app.utils import JSONParser, SchemaInferencer
+from app.core import get_logger, DatabaseManager, emit_metric
+from app.loaders import QuickLoader, UpsertLoader, LoadResult
+from app.utils import JSONParser, SchemaInferencer, SchemaStats
+from app.utils.competence_categories import refresh_categories
+from app.utils.receipts_match import refresh_receipts_match
+from app.utils.upload_tracker import UploadTracker
 from config import config, get_config
 
 logger = get_logger(__name__)
@@ -23,8 +27,11 @@ class ApplicationConfig:
     debug: bool = False
     loader_mode: str = "quick"  # quick, load, upsert
     chunk_size: int = 5000
+    insert_method: str = "to_sql"  # to_sql, executemany
     validate_before_insert: bool = True
     normalize_nested: bool = False
+    bulk_session: bool = False  # perfil de carga em massa + ANALYZE TABLE (QuickLoader)
+    bulk_skip_binlog: bool = False  # sql_log_bin=0 no perfil (exige privilégio)
     
     def __post_init__(self):
         """Carrega configuração do arquivo."""
@@ -50,6 +57,7 @@ class JSONMySQLApplication:
             self.cfg.database.url,
             pool_size=self.cfg.database.pool_size,
             max_overflow=self.cfg.database.max_overflow,
+            stats_log_interval=self.cfg.database.stats_log_interval,
             echo=self.cfg.debug,
         )
         
@@ -63,6 +71,7 @@ class JSONMySQLApplication:
         self,
         file_path: Path,
         table_name: str,
+        skip_unchanged: bool = False,
         **kwargs,
     ) -> LoadResult:
         """
@@ -71,6 +80,8 @@ class JSONMySQLApplication:
         Args:
             file_path: Caminho do arquivo JSON
             table_name: Nome da tabela
+            skip_unchanged: Se True, consulta o UploadTracker e pula o arquivo
+                quando a última carga bem-sucedida da tabela veio do mesmo conteúdo
             **kwargs: Argumentos adicionais (lines, if_exists, etc)
         
         Returns:
@@ -89,9 +100,39 @@ class JSONMySQLApplication:
         file_path = Path(file_path)
         
         logger.info(f"Iniciando carregamento: {file_path} → {table_name}")
+        file_bytes = file_path.stat().st_size if file_path.exists() else 0
+        emit_metric("file_start", table=table_name, file=file_path.name, bytes=file_bytes)
         
-        # Usa QuickLoader (implementar outros depois)
-        loader = QuickLoader(self.app_config.__dict__)
+        tracker = None
+        if skip_unchanged:
+            tracker = UploadTracker(DatabaseManager.get_engine())
+            previous = tracker.is_current(file_path, table_name)
+            if previous and DatabaseManager.table_exists(table_name):
+                logger.info(
+                    f"↷ {file_path.name} inalterado desde {previous['upload_date']} "
+                    f"(hash {previous['file_hash'][:12]}): mantendo {table_name}"
+                )
+                refresh_receipts_match(DatabaseManager.get_engine(), table_name, changed=False)
+                refresh_categories(DatabaseManager.get_engine(), table_name, changed=False)
+                now = datetime.now()
+                result = LoadResult(
+                    success=True,
+                    table=table_name,
+                    rows_inserted=0,
+                    rows_failed=0,
+                    execution_time=0.0,
+                    errors=[],
+                    started_at=now,
+                    finished_at=now,
+                    skipped=True,
+                )
+                emit_metric("file_done", bytes=file_bytes, **result.metrics())
+                return result
+        
+        # upsert aplica só as linhas alteradas; demais modos usam QuickLoader
+        loader_class = UpsertLoader if self.app_config.loader_mode == "upsert" else QuickLoader
+        loader = loader_class(self.app_config.__dict__)
+        kwargs.setdefault('insert_method', self.app_config.insert_method)
         
         try:
             result = loader.load(
@@ -103,9 +144,23 @@ class JSONMySQLApplication:
             
             if result.success:
                 logger.info(f"✓ {result}")
+                # Antes do registro no tracker: se falhar, a próxima execução recarrega
+                refresh_receipts_match(DatabaseManager.get_engine(), table_name)
+                refresh_categories(DatabaseManager.get_engine(), table_name)
             else:
                 logger.error(f"✗ {result}")
             
+            if tracker is not None:
+                tracker.register_upload(
+                    file_path,
+                    table_name,
+                    result.rows_inserted,
+                    result.execution_time,
+                    status='success' if result.success else 'error',
+                    error_message='; '.join(result.errors) or None,
+                )
+            
+            emit_metric("file_done", bytes=file_bytes, **result.metrics())
             return result
         
         except Exception as e:
@@ -139,13 +194,23 @@ class JSONMySQLApplication:
         
         return results
     
-    def infer_schema(self, file_path: Path, sample_size: int = 100) -> str:
+    def infer_schema(
+        self,
+        file_path: Path,
+        sample_size: Optional[int] = None,
+        lines: bool = False,
+    ) -> str:
         """
         Infere schema SQL a partir de arquivo JSON.
         
+        Por padrão percorre o arquivo inteiro em streaming, acumulando
+        estatísticas por coluna (SchemaStats). Assim strings longas ou ids
+        grandes no fim do arquivo já entram no DDL, sem montar DataFrame.
+        
         Args:
             file_path: Caminho do arquivo
-            sample_size: Número de registros para amostrar
+            sample_size: Se definido, considera apenas os N primeiros registros
+            lines: Se True, trata como NDJSON
         
         Returns:
             str: Comando CREATE TABLE
@@ -154,22 +219,30 @@ class JSONMySQLApplication:
         
         logger.info(f"Inferindo schema: {file_path}")
         
-        # Parse JSON (amostra)
-        data = JSONParser.parse_file(file_path, sample_size=sample_size)
-        
-        # Converter para DataFrame
-        import pandas as pd
-        df = pd.DataFrame(data)
+        stats = SchemaStats()
+        for chunk in JSONParser.iterate_file(
+            file_path,
+            lines=lines,
+            chunk_size=self.app_config.chunk_size,
+        ):
+            if sample_size:
+                chunk = chunk[:sample_size - stats.row_count]
+            stats.update(chunk)
+            if sample_size and stats.row_count >= sample_size:
+                break
         
         # Gerar DDL
         table_name = file_path.stem
-        ddl = SchemaInferencer.generate_create_table(
+        ddl = SchemaInferencer.generate_create_table_from_stats(
             table_name,
-            df,
+            stats,
             indexes=['created_at', 'updated_at'],
         )
         
-        logger.info(f"✓ Schema inferido para {table_name}")
+        logger.info(
+            f"✓ Schema inferido para {table_name} "
+            f"({stats.row_count} registros, {len(stats.columns)} colunas)"
+        )
         return ddl
     
     def create_table(self, table_name: str, ddl: str) -> bool:
@@ -4,8 +4,13 @@ Init do módulo core.
 Exporta componentes principais.
 """
 
-from app.core.logger import setup_logger, get_logger
+from app.core.logger import setup_logger, get_logger, shutdown_logging
 from app.core.database import DatabaseManager, get_engine
+from app.core.pool_metrics import PoolMetrics
+from app.core.bulk_session import BulkSessionProfile
+from app.core.stage_metrics import StageMetrics, StageRecorder, emit_metric, enable_metrics_stream
+from app.core.profiling import Profiler, PROFILE_MODES
+from app.core.dialect import SQLDialect, MySQLDialect, SQLiteDialect, get_dialect
 from app.core.venv_validator import require_venv, is_inside_venv, print_venv_status
 from app.core.exceptions import (
     JSONMySQLException,
@@ -20,8 +25,21 @@ from app.core.exceptions import (
 __all__ = [
     'setup_logger',
     'get_logger',
+    'shutdown_logging',
     'DatabaseManager',
     'get_engine',
+    'PoolMetrics',
+    'BulkSessionProfile',
+    'StageMetrics',
+    'StageRecorder',
+    'emit_metric',
+    'enable_metrics_stream',
+    'Profiler',
+    'PROFILE_MODES',
+    'SQLDialect',
+    'MySQLDialect',
+    'SQLiteDialect',
+    'get_dialect',
     'require_venv',
     'is_inside_venv',
     'print_venv_status',
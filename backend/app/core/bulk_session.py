@@ -0,0 +1,109 @@
+"""
+Perfil de sessão para carga em massa.
+
+Dentro de DatabaseManager.bulk_session(), toda conexão que a thread tira
+do pool recebe as variáveis de sessão do dialeto (MySQL: unique_checks,
+foreign_key_checks, bulk_insert_buffer_size, sql_log_bin; SQLite:
+synchronous, foreign_keys). O valor anterior de cada variável fica no
+registro da conexão e volta no checkin: nenhuma conexão retorna ao pool
+com o perfil ligado. Se a restauração falhar, a conexão é invalidada.
+
+Variáveis que o usuário não pode alterar (ex: sql_log_bin sem SUPER)
+são puladas com aviso; o resto do perfil continua valendo.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Engine, event
+
+from app.core.dialect import SQLDialect
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Chave em connection_record.info com os valores a restaurar
+_INFO_KEY = "bulk_session"
+
+
+class BulkSessionProfile:
+    """Aplica/restaura o perfil de carga em massa nas conexões do pool."""
+
+    def __init__(self, dialect: SQLDialect):
+        self.dialect = dialect
+        self._local = threading.local()
+        self._denied = set()
+
+    def attach(self, engine: Engine) -> None:
+        """Registra os listeners de checkout/checkin no engine."""
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+
+    @property
+    def active(self) -> Optional[Dict[str, Any]]:
+        """Variáveis do perfil ativo nesta thread (None fora de activate)."""
+        return getattr(self._local, "settings", None)
+
+    @contextmanager
+    def activate(self, skip_unique_checks: bool = False, skip_binlog: bool = False):
+        """Liga o perfil para as conexões tiradas do pool por esta thread."""
+        previous = self.active
+        self._local.settings = self.dialect.bulk_session_settings(
+            skip_unique_checks, skip_binlog
+        )
+        try:
+            yield self._local.settings
+        finally:
+            self._local.settings = previous
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        settings = self.active
+        if not settings or _INFO_KEY in connection_record.info:
+            return
+        connection_record.info[_INFO_KEY] = self.apply(dbapi_connection, settings)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        previous = connection_record.info.pop(_INFO_KEY, None)
+        if not previous or dbapi_connection is None:
+            return
+        try:
+            self.restore(dbapi_connection, previous)
+        except Exception as e:
+            logger.warning(f"⚠ Perfil de carga não restaurado, conexão descartada: {e}")
+            connection_record.invalidate(e)
+
+    def apply(self, dbapi_connection, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Aplica as variáveis na conexão DBAPI.
+
+        Returns:
+            dict: Valores anteriores das variáveis efetivamente alteradas
+        """
+        previous = {}
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in settings.items():
+                if name in self._denied:
+                    continue
+                try:
+                    current = self.dialect.read_session_setting(cursor, name)
+                    self.dialect.write_session_setting(cursor, name, value)
+                except Exception as e:
+                    # Sem privilégio: avisa uma vez e não tenta de novo
+                    self._denied.add(name)
+                    logger.warning(f"⚠ {name} não alterado no perfil de carga: {e}")
+                    continue
+                previous[name] = current
+        finally:
+            cursor.close()
+        return previous
+
+    def restore(self, dbapi_connection, previous: Dict[str, Any]) -> None:
+        """Devolve as variáveis aos valores anteriores (ordem inversa)."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in reversed(list(previous.items())):
+                self.dialect.write_session_setting(cursor, name, value)
+        finally:
+            cursor.close()
@@ -2,13 +2,19 @@
 Camada de banco de dados com Pool e engine SQLAlchemy.
 
 Implementa padrão Singleton para gerenciamento de conexões.
+Suporta MySQL e SQLite; diferenças de SQL ficam em app.core.dialect.
+O pool é instrumentado (PoolMetrics): veja DatabaseManager.stats().
+Loaders podem ligar o perfil de carga em massa (bulk_session) e atualizar
+as estatísticas do otimizador no fim (analyze_tables).
 """
 
-from typing import Optional, Generator
-from sqlalchemy import create_engine, text, inspect, Engine
-from sqlalchemy.pool import QueuePool, NullPool
+from typing import Optional, Generator, Dict, Any, Iterable
+from sqlalchemy import create_engine, event, text, inspect, Engine, Inspector
 from contextlib import contextmanager
 from app.core.logger import get_logger
+from app.core.pool_metrics import InstrumentedQueuePool, PoolMetrics, PoolStatsReporter
+from app.core.bulk_session import BulkSessionProfile
+from app.core.dialect import SQLDialect, get_dialect
 
 logger = get_logger(__name__)
 
@@ -18,6 +24,9 @@ class DatabaseManager:
     
     _instance: Optional['DatabaseManager'] = None
     _engine: Optional[Engine] = None
+    _metrics: Optional[PoolMetrics] = None
+    _reporter: Optional[PoolStatsReporter] = None
+    _bulk: Optional[BulkSessionProfile] = None
     
     def __new__(cls):
         """Implementa padrão Singleton."""
@@ -33,6 +42,7 @@ class DatabaseManager:
         Args:
             database_url: URL SQLAlchemy do banco
             **kwargs: Argumentos adicionais para create_engine
+                (stats_log_interval: segundos entre logs do pool, 0 desliga)
         """
         instance = cls()
         
@@ -41,9 +51,10 @@ class DatabaseManager:
             return
         
         try:
+            metrics = PoolMetrics()
             instance._engine = create_engine(
                 database_url,
-                poolclass=QueuePool,
+                poolclass=InstrumentedQueuePool,
                 pool_size=kwargs.get('pool_size', 10),
                 max_overflow=kwargs.get('max_overflow', 20),
                 pool_timeout=kwargs.get('pool_timeout', 30),
@@ -53,6 +64,19 @@ class DatabaseManager:
                 echo=kwargs.get('echo', False),
                 future=True,
             )
+            instance._engine.pool.metrics = metrics
+            event.listen(
+                instance._engine, 'connect', get_dialect(instance._engine).on_connect
+            )
+            metrics.attach(instance._engine)
+            instance._metrics = metrics
+            instance._bulk = BulkSessionProfile(get_dialect(instance._engine))
+            instance._bulk.attach(instance._engine)
+            
+            instance._reporter = PoolStatsReporter(
+                metrics, logger, kwargs.get('stats_log_interval', 60)
+            )
+            instance._reporter.start()
             logger.info("Engine SQLAlchemy inicializado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao inicializar engine: {e}")
@@ -76,6 +100,16 @@ class DatabaseManager:
             )
         return instance._engine
     
+    @classmethod
+    def dialect(cls) -> SQLDialect:
+        """
+        Retorna o dialeto SQL do engine (MySQL ou SQLite).
+        
+        Returns:
+            SQLDialect: Diferenças de DDL/upsert/executemany do banco
+        """
+        return get_dialect(cls.get_engine())
+    
     @classmethod
     @contextmanager
     def connection(cls):
@@ -118,6 +152,48 @@ class DatabaseManager:
         finally:
             session.close()
     
+    @classmethod
+    @contextmanager
+    def bulk_session(cls, skip_unique_checks: bool = False, skip_binlog: bool = False):
+        """
+        Perfil de carga em massa nas conexões usadas pela thread no bloco.
+
+        Cada conexão tirada do pool recebe as variáveis do perfil e as
+        devolve ao valor anterior no checkin, mesmo com erro no bloco.
+
+        Args:
+            skip_unique_checks: unique_checks=0 (só com tabelas vazias e
+                linhas já deduplicadas: o UNIQUE secundário não é checado)
+            skip_binlog: sql_log_bin=0 (a carga não vai para réplicas)
+
+        Exemplo:
+            >>> with DatabaseManager.bulk_session(skip_unique_checks=True):
+            ...     loader.load(...)
+            >>> DatabaseManager.analyze_tables(["SI_DATAPAGTO"])
+        """
+        cls.get_engine()
+        instance = cls()
+        with instance._bulk.activate(skip_unique_checks, skip_binlog) as settings:
+            logger.info(
+                "Perfil de carga em massa: "
+                + ", ".join(f"{name}={value}" for name, value in settings.items())
+            )
+            yield settings
+
+    @classmethod
+    def analyze_tables(cls, tables: Iterable[str]) -> None:
+        """
+        Atualiza as estatísticas do otimizador (ANALYZE TABLE) das tabelas.
+
+        Rodar uma vez depois da carga, antes da consolidação.
+        """
+        engine = cls.get_engine()
+        dialect = get_dialect(engine)
+        with engine.begin() as conn:
+            for table in tables:
+                dialect.analyze_table(conn, table)
+                logger.info(f"✓ Estatísticas atualizadas: {table}")
+    
     @classmethod
     def execute(cls, query: str) -> list:
         """
@@ -151,7 +227,7 @@ class DatabaseManager:
             return False
     
     @classmethod
-    def get_inspector(cls) -> inspect.Inspector:
+    def get_inspector(cls) -> Inspector:
         """
         Retorna inspector para inspecionar estrutura do banco.
         
@@ -188,13 +264,56 @@ class DatabaseManager:
         inspector = cls.get_inspector()
         return [col['name'] for col in inspector.get_columns(table_name)]
     
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """
+        Retorna snapshot das métricas do pool.
+        
+        Inclui estado atual (em uso, overflow), histograma de espera no
+        checkout, pico de checkouts simultâneos, falhas de pre-ping,
+        invalidações e disposes.
+        
+        Returns:
+            Dict: Métricas (vazio se engine não inicializado)
+        """
+        instance = cls()
+        if instance._metrics is None:
+            return {}
+        return instance._metrics.snapshot()
+    
+    @classmethod
+    def dispose_pool(cls, reason: str = "manual") -> None:
+        """
+        Descarta as conexões do pool mantendo o engine.
+        
+        Usado após erros de inserção para não reaproveitar conexões
+        inválidas; o motivo entra nas métricas para medir churn.
+        
+        Args:
+            reason: Motivo do dispose (aparece em stats()['dispose_reasons'])
+        """
+        instance = cls()
+        if instance._engine is None:
+            return
+        if instance._metrics is not None:
+            instance._metrics.record_dispose(reason)
+        instance._engine.dispose()
+        logger.warning(f"Pool de conexões descartado ({reason})")
+    
     @classmethod
     def dispose(cls) -> None:
         """Fecha todas as conexões."""
         instance = cls()
+        if instance._reporter is not None:
+            instance._reporter.stop()
+            instance._reporter = None
         if instance._engine:
+            if instance._metrics is not None:
+                logger.info(instance._metrics.summary())
             instance._engine.dispose()
             instance._engine = None
+            instance._metrics = None
+            instance._bulk = None
             logger.info("Engine disposed")
 
 
@@ -0,0 +1,444 @@
+"""
+Diferenças de SQL entre os bancos suportados (MySQL e SQLite).
+
+O pipeline foi escrito para MySQL; o SQLite (arquivo local) permite rodar
+carga e consolidação sem servidor, em CI e nos benchmarks. Tudo que é
+específico de um banco fica aqui: opções de tabela (ENGINE=InnoDB),
+índices com prefixo, upsert (ON DUPLICATE KEY x ON CONFLICT), placeholder
+do cursor DBAPI, tamanho de statement do executemany, funções JSON
+(JSON_LENGTH x json_array_length) e ajustes de conexão.
+
+Identificadores continuam entre crases: o SQLite aceita `nome` por
+compatibilidade com o MySQL.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import inspect, text
+
+from app.core.exceptions import ConfigurationError
+
+# Teto do INSERT multi-row do PyMySQL (max_stmt_length) no caminho executemany
+EXECUTEMANY_MAX_STMT_LENGTH = 16 * 1024 * 1024
+
+# bulk_insert_buffer_size da sessão de carga em massa (padrão do MySQL: 8 MB)
+BULK_INSERT_BUFFER_SIZE = 256 * 1024 * 1024
+
+
+class SQLDialect(ABC):
+    """Base: comportamento comum aos bancos suportados."""
+
+    name = "generic"
+    # Sufixo de CREATE TABLE (ex: ENGINE=InnoDB)
+    table_options = ""
+    # Placeholder do cursor DBAPI (paramstyle)
+    placeholder = "?"
+    # Coluna inteira auto-incremento usada como PK
+    auto_increment_pk = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    def create_table_suffix(self, clustered: bool = False) -> str:
+        """
+        Texto após o ')' final do CREATE TABLE.
+
+        Com clustered=True as linhas ficam guardadas na ordem da chave
+        primária (InnoDB já faz isso; no SQLite é WITHOUT ROWID).
+        """
+        return f" {self.table_options}" if self.table_options else ""
+
+    def cast_integer(self, expr: str) -> str:
+        """Converte uma expressão para inteiro de 64 bits."""
+        return f"CAST({expr} AS INTEGER)"
+
+    def index_column(self, column: str, prefix_length: Optional[int] = None) -> str:
+        """Coluna em CREATE INDEX (prefixo só onde o banco exige)."""
+        return f"`{column}`"
+
+    @abstractmethod
+    def upsert_clause(
+        self,
+        conflict_columns: Sequence[str],
+        update_columns: Iterable[str] = (),
+        touch_columns: Iterable[str] = (),
+    ) -> str:
+        """
+        Cláusula para INSERT ... que atualiza a linha em conflito de chave.
+
+        Args:
+            conflict_columns: Colunas da chave única/primária
+            update_columns: Colunas que recebem o valor novo
+            touch_columns: Colunas que recebem CURRENT_TIMESTAMP
+        """
+
+    @abstractmethod
+    def ignore_duplicates_clause(self, conflict_columns: Sequence[str]) -> str:
+        """
+        Cláusula para INSERT ... que descarta a linha em conflito de chave.
+
+        Diferente de INSERT IGNORE, só o conflito na chave é ignorado: erros
+        de tipo/tamanho continuam falhando no modo estrito do MySQL.
+        """
+
+    def max_statement_length(self, conn) -> Optional[int]:
+        """Tamanho máximo do INSERT multi-row do executemany (None = sem limite)."""
+        return None
+
+    def prepare_cursor(self, cursor, conn) -> None:
+        """Ajusta o cursor DBAPI do executemany."""
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        """Ajustes em cada conexão nova (evento 'connect' do pool)."""
+
+    def bulk_session_settings(
+        self,
+        skip_unique_checks: bool = False,
+        skip_binlog: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Variáveis de sessão do perfil de carga em massa, na ordem de aplicação.
+
+        Args:
+            skip_unique_checks: Desliga a checagem de UNIQUE secundário (só
+                com tabela vazia e linhas já deduplicadas)
+            skip_binlog: Não grava a carga no binlog (exige privilégio)
+        """
+        return {}
+
+    @abstractmethod
+    def read_session_setting(self, cursor, name: str) -> Any:
+        """Valor atual de uma variável de sessão (cursor DBAPI)."""
+
+    @abstractmethod
+    def write_session_setting(self, cursor, name: str, value: Any) -> None:
+        """Altera uma variável de sessão (cursor DBAPI)."""
+
+    def analyze_table(self, conn, table_name: str) -> None:
+        """Atualiza as estatísticas do otimizador da tabela."""
+        conn.execute(text(f"ANALYZE `{table_name}`"))
+
+    @staticmethod
+    def json_path(key: str) -> str:
+        """Literal SQL do caminho JSON de uma chave de objeto (ex: '$."id"')."""
+        escaped = key.replace("\\", "\\\\").replace('"', '\\"').replace("'", "''")
+        return f"'$.\"{escaped}\"'"
+
+    def json_type(self, expr: str) -> str:
+        """
+        Tipo JSON em maiúsculas (OBJECT, ARRAY, ...) ou NULL se não for JSON válido.
+
+        O JSON_VALID antes evita erro do MySQL em colunas texto com lixo.
+        """
+        return f"CASE WHEN JSON_VALID({expr}) THEN UPPER(JSON_TYPE({expr})) END"
+
+    @abstractmethod
+    def json_length(self, expr: str) -> str:
+        """Número de elementos de um array JSON (NULL se não for JSON válido)."""
+
+    @abstractmethod
+    def json_extract_text(self, expr: str, key: str) -> str:
+        """Valor da chave `key` como texto (strings sem aspas, JSON null vira NULL)."""
+
+    @abstractmethod
+    def json_array_items(self, expr: str, alias: str) -> Tuple[str, str, str]:
+        """
+        Tabela (para o FROM) com uma linha por item do array JSON em `expr`.
+
+        Valores que não são array não geram linhas.
+
+        Returns:
+            (fragmento do FROM, índice do item base 0, item como JSON)
+        """
+
+    @abstractmethod
+    def json_object_keys(
+        self, conn, table_name: str, column: str, array_items: bool = False
+    ) -> Set[str]:
+        """
+        Todas as chaves dos objetos JSON de uma coluna (uma única leitura).
+
+        Com array_items=True, as chaves dos objetos dentro dos arrays.
+        """
+
+    def _json_keys_source(self, table_name: str, column: str, array_items: bool):
+        """FROM e expressão dos objetos cujas chaves serão listadas."""
+        source, value = f"`{table_name}` AS t", f"t.`{column}`"
+        if array_items:
+            items, _, value = self.json_array_items(value, "a")
+            source += f", {items}"
+        return source, value
+
+    def truncate_sql(self, table_name: str) -> str:
+        """Statement que esvazia a tabela mantendo definição e índices."""
+        # O SQLite otimiza DELETE sem WHERE (truncate optimization)
+        return f"DELETE FROM `{table_name}`"
+
+    def drop_index(self, conn, table_name: str, index_name: str) -> None:
+        """Remove um índice da tabela."""
+        conn.execute(text(f"DROP INDEX `{index_name}`"))
+
+    def deferrable_indexes(self, conn, table_name: str) -> List[Dict[str, Any]]:
+        """
+        Índices secundários que podem sair durante uma carga e voltar depois.
+
+        Ficam de fora PRIMARY/UNIQUE (garantem unicidade durante a carga)
+        e índices de expressão. Cada item tem name, columns e prefix_length
+        ({coluna: tamanho}), no formato de create_index.
+        """
+        indexes = []
+        for idx in inspect(conn).get_indexes(table_name):
+            columns = idx.get("column_names") or []
+            if idx.get("unique") or not columns or None in columns:
+                continue
+            lengths = (idx.get("dialect_options") or {}).get("mysql_length") or {}
+            if isinstance(lengths, int):
+                lengths = {columns[0]: lengths}
+            indexes.append({
+                "name": idx["name"],
+                "columns": list(columns),
+                "prefix_length": dict(lengths),
+            })
+        return indexes
+
+    def create_index(
+        self,
+        conn,
+        table_name: str,
+        index_name: str,
+        columns: Sequence[str],
+        prefix_length: Union[int, Dict[str, int], None] = None,
+        unique: bool = False,
+    ) -> None:
+        """
+        CREATE [UNIQUE] INDEX.
+
+        prefix_length vale para todas as colunas (int) ou por coluna (dict).
+        """
+        if isinstance(prefix_length, dict):
+            cols = ", ".join(self.index_column(col, prefix_length.get(col)) for col in columns)
+        else:
+            cols = ", ".join(self.index_column(col, prefix_length) for col in columns)
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        conn.execute(text(f"CREATE {kind} `{index_name}` ON `{table_name}` ({cols})"))
+
+    def index_exists(self, conn, table_name: str, index_name: str) -> bool:
+        """Verifica índice via Inspector (funciona nos dois bancos)."""
+        return any(
+            idx["name"] == index_name for idx in inspect(conn).get_indexes(table_name)
+        )
+
+    def ensure_index(
+        self,
+        conn,
+        table_name: str,
+        index_name: str,
+        columns: Sequence[str],
+        prefix_length: Optional[int] = None,
+        unique: bool = False,
+    ) -> bool:
+        """
+        Cria índice (UNIQUE com unique=True) se ainda não existir.
+
+        Returns:
+            bool: True se o índice foi criado
+        """
+        if self.index_exists(conn, table_name, index_name):
+            return False
+        self.create_index(conn, table_name, index_name, columns, prefix_length, unique)
+        return True
+
+
+class MySQLDialect(SQLDialect):
+    """MySQL/MariaDB via PyMySQL."""
+
+    name = "mysql"
+    table_options = "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+    placeholder = "%s"
+    auto_increment_pk = "INT AUTO_INCREMENT PRIMARY KEY"
+
+    def cast_integer(self, expr: str) -> str:
+        return f"CAST({expr} AS SIGNED)"
+
+    def truncate_sql(self, table_name: str) -> str:
+        # TRUNCATE recria o tablespace vazio (DDL: commit implícito)
+        return f"TRUNCATE TABLE `{table_name}`"
+
+    def drop_index(self, conn, table_name: str, index_name: str) -> None:
+        conn.execute(text(f"DROP INDEX `{index_name}` ON `{table_name}`"))
+
+    def index_column(self, column: str, prefix_length: Optional[int] = None) -> str:
+        # TEXT/BLOB só podem ser indexados com prefixo
+        if prefix_length:
+            return f"`{column}`({prefix_length})"
+        return f"`{column}`"
+
+    def upsert_clause(self, conflict_columns, update_columns=(), touch_columns=()) -> str:
+        sets = [f"{col} = VALUES({col})" for col in update_columns]
+        sets += [f"{col} = CURRENT_TIMESTAMP" for col in touch_columns]
+        return "ON DUPLICATE KEY UPDATE " + ", ".join(sets)
+
+    def ignore_duplicates_clause(self, conflict_columns) -> str:
+        # Atribuição sem efeito: a linha existente fica como está
+        col = conflict_columns[0]
+        return f"ON DUPLICATE KEY UPDATE {col} = {col}"
+
+    def json_length(self, expr: str) -> str:
+        return f"CASE WHEN JSON_VALID({expr}) THEN JSON_LENGTH({expr}) END"
+
+    def json_extract_text(self, expr: str, key: str) -> str:
+        value = f"JSON_EXTRACT({expr}, {self.json_path(key)})"
+        # CASE aninhado: o MySQL não garante curto-circuito no AND
+        return (
+            f"CASE WHEN JSON_VALID({expr}) THEN "
+            f"CASE WHEN JSON_TYPE({value}) <> 'NULL' THEN JSON_UNQUOTE({value}) END END"
+        )
+
+    def json_array_items(self, expr: str, alias: str) -> Tuple[str, str, str]:
+        # JSON_TABLE (MySQL 8.0.4+); FOR ORDINALITY começa em 1
+        table = (
+            f"JSON_TABLE(CASE WHEN {self.json_type(expr)} = 'ARRAY' THEN {expr} END, "
+            f"'$[*]' COLUMNS (`_ord` FOR ORDINALITY, `_item` JSON PATH '$')) AS {alias}"
+        )
+        return table, f"({alias}.`_ord` - 1)", f"{alias}.`_item`"
+
+    def json_object_keys(self, conn, table_name, column, array_items=False) -> Set[str]:
+        # Poucos conjuntos distintos de chaves: o DISTINCT roda no servidor
+        source, value = self._json_keys_source(table_name, column, array_items)
+        rows = conn.execute(text(
+            f"SELECT DISTINCT JSON_KEYS({value}) FROM {source} "
+            f"WHERE {self.json_type(value)} = 'OBJECT'"
+        ))
+        keys: Set[str] = set()
+        for (value,) in rows:
+            keys.update(json.loads(value) if isinstance(value, str) else value or ())
+        return keys
+
+    def max_statement_length(self, conn) -> Optional[int]:
+        """
+        Tamanho máximo do INSERT multi-row, limitado por max_allowed_packet.
+
+        Usa 90% do pacote para deixar folga ao protocolo.
+        """
+        try:
+            max_packet = conn.exec_driver_sql("SELECT @@max_allowed_packet").scalar()
+        except Exception:
+            max_packet = None
+        if not max_packet:
+            return 1024 * 1024
+        return max(64 * 1024, min(int(max_packet * 0.9), EXECUTEMANY_MAX_STMT_LENGTH))
+
+    def prepare_cursor(self, cursor, conn) -> None:
+        # PyMySQL reescreve executemany em INSERTs multi-row até este tamanho
+        cursor.max_stmt_length = self.max_statement_length(conn)
+
+    def bulk_session_settings(self, skip_unique_checks=False, skip_binlog=False) -> Dict[str, Any]:
+        # bulk_insert_buffer_size só vale para MyISAM; fica para tabelas legadas
+        settings: Dict[str, Any] = {
+            "foreign_key_checks": 0,
+            "bulk_insert_buffer_size": BULK_INSERT_BUFFER_SIZE,
+        }
+        if skip_unique_checks:
+            settings["unique_checks"] = 0
+        if skip_binlog:
+            settings["sql_log_bin"] = 0
+        return settings
+
+    def read_session_setting(self, cursor, name: str) -> Any:
+        cursor.execute(f"SELECT @@SESSION.{name}")
+        return cursor.fetchone()[0]
+
+    def write_session_setting(self, cursor, name: str, value: Any) -> None:
+        cursor.execute(f"SET SESSION {name} = %s", (value,))
+
+    def analyze_table(self, conn, table_name: str) -> None:
+        # ANALYZE TABLE devolve uma linha de status por tabela
+        conn.execute(text(f"ANALYZE TABLE `{table_name}`")).fetchall()
+
+
+class SQLiteDialect(SQLDialect):
+    """SQLite em arquivo (sqlite3 da biblioteca padrão)."""
+
+    name = "sqlite"
+
+    # PRAGMAs de carga: WAL permite leitura durante a carga e synchronous=NORMAL
+    # evita fsync por transação (seguro com WAL)
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+    )
+
+    def create_table_suffix(self, clustered: bool = False) -> str:
+        return " WITHOUT ROWID" if clustered else ""
+
+    def upsert_clause(self, conflict_columns, update_columns=(), touch_columns=()) -> str:
+        sets = [f"{col} = excluded.{col}" for col in update_columns]
+        sets += [f"{col} = CURRENT_TIMESTAMP" for col in touch_columns]
+        return f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET " + ", ".join(sets)
+
+    def ignore_duplicates_clause(self, conflict_columns) -> str:
+        return f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+
+    def json_length(self, expr: str) -> str:
+        return f"CASE WHEN json_valid({expr}) THEN json_array_length({expr}) END"
+
+    def json_extract_text(self, expr: str, key: str) -> str:
+        # json_extract já devolve strings sem aspas e JSON null como NULL
+        return f"CASE WHEN json_valid({expr}) THEN json_extract({expr}, {self.json_path(key)}) END"
+
+    def json_array_items(self, expr: str, alias: str) -> Tuple[str, str, str]:
+        # json_each falha com texto inválido: só recebe arrays válidos
+        table = f"json_each(CASE WHEN {self.json_type(expr)} = 'ARRAY' THEN {expr} END) AS {alias}"
+        return table, f"{alias}.key", f"{alias}.value"
+
+    def json_object_keys(self, conn, table_name, column, array_items=False) -> Set[str]:
+        source, value = self._json_keys_source(table_name, column, array_items)
+        rows = conn.execute(text(
+            f"SELECT DISTINCT j.key FROM {source}, "
+            f"json_each(CASE WHEN {self.json_type(value)} = 'OBJECT' THEN {value} END) AS j"
+        ))
+        return {key for (key,) in rows}
+
+    def bulk_session_settings(self, skip_unique_checks=False, skip_binlog=False) -> Dict[str, Any]:
+        # Sem fsync durante a carga: com WAL uma queda perde só as últimas
+        # transações, sem corromper o arquivo (a carga pode ser refeita)
+        return {"synchronous": 0, "foreign_keys": 0}
+
+    def read_session_setting(self, cursor, name: str) -> Any:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+    def write_session_setting(self, cursor, name: str, value: Any) -> None:
+        # PRAGMA não aceita parâmetro; valores vêm de bulk_session_settings
+        cursor.execute(f"PRAGMA {name} = {int(value)}")
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in self.PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+_DIALECTS = {
+    "mysql": MySQLDialect(),
+    "sqlite": SQLiteDialect(),
+}
+
+
+def get_dialect(bind) -> SQLDialect:
+    """
+    Retorna o dialeto de um Engine/Connection (ou do nome, ex: 'sqlite').
+
+    Raises:
+        ConfigurationError: Banco não suportado
+    """
+    name = bind if isinstance(bind, str) else bind.dialect.name
+    try:
+        return _DIALECTS[name.lower()]
+    except KeyError:
+        raise ConfigurationError(
+            f"Banco não suportado: {name} (use {', '.join(_DIALECTS)})"
+        )
@@ -2,14 +2,28 @@
 Camada de logging centralizada.
 
 Fornece logging estruturado com suporte a múltiplos handlers.
+
+Modo fila (LOG_QUEUE=1): o logger recebe só um QueueHandler e um
+QueueListener em thread própria formata e grava no console/arquivo, então
+logger.info no loop de carga não espera I/O. Com LOG_RATE_LIMIT=N, cada
+ponto de chamada (arquivo:linha) passa no máximo N registros por segundo;
+WARNING e acima nunca são descartados.
 """
 
+import atexit
+import copy
 import logging
 import logging.handlers
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from config.settings import LoggerConfig
 
+# QueueListener ativo por logger (modo fila)
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
 
 class ColoredFormatter(logging.Formatter):
     """Formatter com cores para console."""
@@ -33,6 +47,77 @@ class ColoredFormatter(logging.Formatter):
         return super().format(record)
 
 
+class RateLimitFilter(logging.Filter):
+    """
+    Limita registros por ponto de chamada (pathname:lineno).
+
+    Passam no máximo `rate` registros por janela de `per` segundos; o
+    primeiro registro da janela seguinte informa quantos foram suprimidos.
+    WARNING e acima sempre passam.
+    """
+
+    def __init__(self, rate: int, per: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self._lock = threading.Lock()
+        # (pathname, lineno) -> [início da janela, registros na janela, suprimidos]
+        self._windows: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.per:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.rate:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+
+        if suppressed:
+            record.msg = f"{record.msg} [+{suppressed} mensagens suprimidas]"
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata na thread de quem loga.
+
+    O QueueHandler padrão chama format() em prepare(); aqui só a mensagem
+    (msg % args) é resolvida, para não depender de objetos mutáveis depois,
+    e Formatter/cores/traceback ficam com o QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_listener(name: str) -> None:
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def shutdown_logging() -> None:
+    """Esvazia as filas e para os QueueListeners (chamado também no atexit)."""
+    for name in list(_listeners):
+        _stop_listener(name)
+
+
+atexit.register(shutdown_logging)
+
+
 def setup_logger(
     name: str,
     config: Optional[LoggerConfig] = None,
@@ -67,6 +152,7 @@ def setup_logger(
     
     # Remove handlers existentes para evitar duplicatas
     logger.handlers.clear()
+    _stop_listener(name)
     
     # Formatter
     formatter = logging.Formatter(config.format)
@@ -75,7 +161,6 @@ def setup_logger(
     console_handler = logging.StreamHandler()
     console_handler.setLevel(getattr(logging, level.upper()))
     console_handler.setFormatter(ColoredFormatter(config.format))
-    logger.addHandler(console_handler)
     
     # Handler: Arquivo
     log_file = config.log_dir / f"{name.split('.')[0]}.log"
@@ -88,7 +173,26 @@ def setup_logger(
     )
     file_handler.setLevel(getattr(logging, level.upper()))
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    handlers = [console_handler, file_handler]
+    if config.use_queue:
+        # Formatação e I/O na thread do listener
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        listener.start()
+        _listeners[name] = listener
+        handlers = [_DeferredQueueHandler(log_queue)]
+    
+    for handler in handlers:
+        logger.addHandler(handler)
+    
+    # Filtro no logger: conta cada registro uma vez, antes de qualquer handler
+    for old_filter in [f for f in logger.filters if isinstance(f, RateLimitFilter)]:
+        logger.removeFilter(old_filter)
+    if config.rate_limit_per_second:
+        logger.addFilter(RateLimitFilter(config.rate_limit_per_second))
     
     return logger
 
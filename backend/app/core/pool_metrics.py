@@ -0,0 +1,249 @@
+"""
+Instrumentação do pool de conexões.
+
+Coleta, via eventos do SQLAlchemy, latência de checkout (histograma),
+checkouts simultâneos, uso de overflow, falhas de pre-ping, invalidações
+e disposes. Usado por DatabaseManager.stats() e pelo log periódico.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, Engine
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Contadores thread-safe do pool de conexões."""
+
+    # Limites superiores (ms) dos buckets do histograma de espera no checkout
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Zera todos os contadores."""
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checkout_wait_total = 0.0
+            self.checkout_wait_max = 0.0
+            self.histogram = [0] * (len(self.BUCKETS_MS) + 1)
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.peak_overflow = 0
+            self.connects = 0
+            self.pre_ping_failures = 0
+            self.invalidations = 0
+            self.soft_invalidations = 0
+            self.disposes = 0
+            self.dispose_reasons: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def record_checkout_wait(self, seconds: float) -> None:
+        """Registra o tempo gasto em pool.connect()."""
+        ms = seconds * 1000
+        bucket = len(self.BUCKETS_MS)
+        for i, limit in enumerate(self.BUCKETS_MS):
+            if ms <= limit:
+                bucket = i
+                break
+        with self._lock:
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+            self.histogram[bucket] += 1
+
+    def record_checkout_failure(self) -> None:
+        """Registra checkout que falhou (timeout do pool, banco fora, etc)."""
+        with self._lock:
+            self.checkout_failures += 1
+
+    def record_dispose(self, reason: str) -> None:
+        """Registra dispose do pool (ex: fallback do QuickLoader após erro)."""
+        with self._lock:
+            self.disposes += 1
+            self.dispose_reasons[reason] = self.dispose_reasons.get(reason, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Eventos do SQLAlchemy
+    # ------------------------------------------------------------------
+    def attach(self, engine: Engine) -> None:
+        """
+        Registra listeners no engine.
+
+        Eventos de pool registrados no Engine sobrevivem a engine.dispose(),
+        pois o pool recriado herda o dispatch.
+        """
+        self._engine = engine
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+        event.listen(engine, 'soft_invalidate', self._on_soft_invalidate)
+        event.listen(engine, 'handle_error', self._on_handle_error)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        overflow = self._current_overflow()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.soft_invalidations += 1
+
+    def _on_handle_error(self, context) -> None:
+        if getattr(context, 'is_pre_ping', False):
+            with self._lock:
+                self.pre_ping_failures += 1
+
+    def _current_overflow(self) -> int:
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            return max(0, pool.overflow())
+        return 0
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retorna cópia dos contadores e do estado atual do pool.
+
+        Returns:
+            Dict com contadores, histograma (ms) e estado do pool
+        """
+        pool_state: Dict[str, Any] = {}
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            pool_state = {
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': max(0, pool.overflow()),
+                'max_overflow': pool._max_overflow,
+            }
+
+        with self._lock:
+            waits = sum(self.histogram)
+            labels = [f"<={limit}ms" for limit in self.BUCKETS_MS]
+            labels.append(f">{self.BUCKETS_MS[-1]}ms")
+            return {
+                'pool': pool_state,
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'checkout_wait_avg_ms': (
+                    self.checkout_wait_total / waits * 1000 if waits else 0.0
+                ),
+                'checkout_wait_max_ms': self.checkout_wait_max * 1000,
+                'checkout_wait_histogram': dict(zip(labels, self.histogram)),
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'peak_overflow': self.peak_overflow,
+                'connects': self.connects,
+                'pre_ping_failures': self.pre_ping_failures,
+                'invalidations': self.invalidations,
+                'soft_invalidations': self.soft_invalidations,
+                'disposes': self.disposes,
+                'dispose_reasons': dict(self.dispose_reasons),
+            }
+
+    def summary(self) -> str:
+        """Linha única para log periódico."""
+        snap = self.snapshot()
+        pool = snap['pool']
+        pool_txt = (
+            f"pool {pool['checked_out']}/{pool['size']} em uso, "
+            f"overflow {pool['overflow']}/{pool['max_overflow']}"
+            if pool else "pool n/d"
+        )
+        return (
+            f"Pool: {pool_txt} | checkouts={snap['checkouts']} "
+            f"espera média={snap['checkout_wait_avg_ms']:.1f}ms "
+            f"máx={snap['checkout_wait_max_ms']:.1f}ms | "
+            f"pico em uso={snap['peak_in_use']} pico overflow={snap['peak_overflow']} | "
+            f"conexões novas={snap['connects']} falhas pre-ping={snap['pre_ping_failures']} "
+            f"invalidações={snap['invalidations']} disposes={snap['disposes']} "
+            f"falhas checkout={snap['checkout_failures']}"
+        )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede o tempo de espera em connect()."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        """Checkout medido: inclui espera na fila e abertura de conexão nova."""
+        if self.metrics is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except Exception:
+            self.metrics.record_checkout_failure()
+            raise
+        self.metrics.record_checkout_wait(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):
+        """Mantém as métricas no pool recriado por engine.dispose()."""
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class PoolStatsReporter:
+    """Thread daemon que loga PoolMetrics.summary() a cada intervalo."""
+
+    def __init__(self, metrics: PoolMetrics, logger, interval: float):
+        self.metrics = metrics
+        self.logger = logger
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread (no-op se intervalo <= 0)."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name='pool-stats', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self) -> None:
+        last_checkouts = -1
+        while not self._stop.wait(self.interval):
+            # Só loga quando houve atividade desde o último ciclo
+            if self.metrics.checkouts != last_checkouts:
+                last_checkouts = self.metrics.checkouts
+                self.logger.info(self.metrics.summary())
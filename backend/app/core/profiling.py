@@ -0,0 +1,193 @@
+"""
+Profiling por etapa (cProfile / tracemalloc) ligado por --profile cpu|mem.
+
+Usado por scripts/main.py, query/execute_query.py e
+relatorio/generate_report.py. Cada etapa (parse, split, dataframe, insert
+do StageRecorder, ou as etapas dos scripts) gera em backend/logs/profiles/:
+
+- cpu: <script>-<timestamp>-<etapa>.prof (abrir com snakeviz ou pstats)
+- mem: <script>-<timestamp>-<etapa>.mem.txt com o top-N de alocações
+  retidas pela etapa e o pico de memória rastreada
+
+e um resumo curto vai para o stderr ao final.
+
+Só usa a biblioteca padrão: os scripts de query/relatório carregam este
+arquivo direto, sem importar o pacote app (pandas/SQLAlchemy).
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILE_MODES = ("cpu", "mem")
+PROFILE_DIR = Path(__file__).resolve().parents[2] / "logs" / "profiles"
+
+_active: Optional["Profiler"] = None
+
+
+class _StageProfile:
+    """Acumulado de uma etapa (pode rodar várias vezes, ex: insert por tabela)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.cpu: Optional[cProfile.Profile] = None
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+        self.mem_report: List[str] = []
+
+
+class Profiler:
+    """
+    Profiler de uma execução de script.
+
+    Exemplo:
+        >>> profiler = Profiler("cpu", "execute_query").activate()
+        >>> with profiler.stage("consolidacao"):
+        ...     executar_query_e_inserir(cursor)
+        >>> profiler.finish()
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str],
+        script: str,
+        output_dir: Optional[Path] = None,
+        top_n: int = 15,
+    ):
+        if mode and mode not in PROFILE_MODES:
+            raise ValueError(f"--profile invalido: {mode} (use {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.script = script
+        self.output_dir = Path(output_dir or PROFILE_DIR)
+        self.top_n = top_n
+        self.run_id = f"{script}-{datetime.now():%Y%m%d-%H%M%S}"
+        self._stages: Dict[str, _StageProfile] = {}
+        self._depth = 0
+        self.files: List[Path] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    def activate(self) -> "Profiler":
+        """Torna este profiler o usado por profile_stage() (StageRecorder)."""
+        global _active
+        _active = self if self.enabled else None
+        if self.mode == "mem" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Perfila um trecho como etapa `name`.
+
+        Etapas aninhadas não são perfiladas de novo (o cProfile não aceita
+        dois perfis ativos e o pico do tracemalloc é global): contam na externa.
+        """
+        if not self.enabled or self._depth:
+            yield
+            return
+
+        profile = self._stages.setdefault(name, _StageProfile(name))
+        self._depth += 1
+        before = None
+        if self.mode == "cpu":
+            profile.cpu = profile.cpu or cProfile.Profile()
+            profile.cpu.enable()
+        else:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+        # Tempo sem o custo dos snapshots (mas com o overhead do profiler)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.seconds += time.perf_counter() - started
+            if self.mode == "cpu":
+                profile.cpu.disable()
+            else:
+                self._record_memory(profile, before)
+            profile.calls += 1
+            self._depth -= 1
+
+    def _record_memory(self, profile: _StageProfile, before) -> None:
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+        diff = after.compare_to(before, "lineno")
+        retained = sum(stat.size_diff for stat in diff)
+
+        profile.peak_bytes = max(profile.peak_bytes, peak)
+        profile.retained_bytes += retained
+        profile.mem_report.append(
+            f"# {profile.name} #{profile.calls + 1}: pico {peak / 1024 / 1024:.1f} MB, "
+            f"retido {retained / 1024 / 1024:+.1f} MB"
+        )
+        profile.mem_report.extend(str(stat) for stat in diff[:self.top_n])
+        profile.mem_report.append("")
+
+    def finish(self) -> List[Path]:
+        """Grava os arquivos de cada etapa e imprime o resumo no stderr."""
+        global _active
+        if _active is self:
+            _active = None
+        if not self.enabled or not self._stages:
+            return []
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for profile in self._stages.values():
+            base = self.output_dir / f"{self.run_id}-{profile.name}"
+            if self.mode == "cpu":
+                path = base.with_suffix(".prof")
+                profile.cpu.dump_stats(str(path))
+            else:
+                path = base.with_suffix(".mem.txt")
+                path.write_text("\n".join(profile.mem_report), encoding="utf-8")
+            self.files.append(path)
+
+        if self.mode == "mem":
+            tracemalloc.stop()
+        print(self.summary(), file=sys.stderr)
+        return self.files
+
+    def summary(self) -> str:
+        """Uma linha por etapa com tempo e o maior consumidor."""
+        lines = [f"Profile {self.mode} ({self.script}) -> {self.output_dir}"]
+        for profile in self._stages.values():
+            head = f"  {profile.name:<14}{profile.seconds:>8.2f}s  x{profile.calls}"
+            if self.mode == "cpu":
+                lines.append(f"{head}  top: {self._top_function(profile.cpu)}")
+            else:
+                lines.append(
+                    f"{head}  pico {profile.peak_bytes / 1024 / 1024:.1f} MB, "
+                    f"retido {profile.retained_bytes / 1024 / 1024:+.1f} MB"
+                )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _top_function(profile: cProfile.Profile) -> str:
+        """Função com maior tempo próprio (tottime) no perfil."""
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        if not stats.stats:
+            return "-"
+        (filename, line, func), (_, _, tottime, _, _) = max(
+            stats.stats.items(), key=lambda item: item[1][2]
+        )
+        where = "" if filename == "~" else f" ({Path(filename).name}:{line})"
+        return f"{func}{where} {tottime:.2f}s"
+
+
+def profile_stage(name: str):
+    """Contexto da etapa no profiler ativo (no-op sem --profile)."""
+    if _active is None:
+        return nullcontext()
+    return _active.stage(name)
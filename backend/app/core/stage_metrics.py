@@ -0,0 +1,153 @@
+"""
+Métricas por etapa da carga (parse, split, DataFrame, inserção).
+
+StageRecorder mede tempo, linhas e pico de RSS de cada etapa; o resultado
+vai para LoadResult.stages. Com o stream ligado (main.py --metrics), cada
+evento também sai como uma linha JSON no stderr, lida pelo api-server
+(pythonRunner/jobManager) para mostrar o progresso real do job.
+
+Exemplo de linha:
+    {"event": "stage", "table": "SI_DATAPAGTO", "stage": "insert",
+     "seconds": 1.52, "rows": 19000, "rows_per_s": 12500.0, "peak_rss_mb": 212.4}
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.profiling import profile_stage
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_stream_enabled = False
+_stream_lock = threading.Lock()
+
+
+def enable_metrics_stream(enabled: bool = True) -> None:
+    """Liga/desliga a emissão de eventos JSON-lines no stderr."""
+    global _stream_enabled
+    _stream_enabled = enabled
+
+
+def emit_metric(event: str, **fields: Any) -> None:
+    """
+    Escreve um evento JSON em uma linha do stderr (se o stream estiver ligado).
+
+    Args:
+        event: Tipo do evento (stage, file_start, file_done, ...)
+        **fields: Campos do evento (serializáveis em JSON)
+    """
+    if not _stream_enabled:
+        return
+    line = json.dumps({"event": event, **fields}, ensure_ascii=False, default=str)
+    with _stream_lock:
+        sys.stderr.write(line + "\n")
+        sys.stderr.flush()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de RSS do processo em MB (None onde não há getrusage, ex: Windows)."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes, Linux reporta KB
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+@dataclass
+class StageMetrics:
+    """Tempo, linhas e memória de uma etapa."""
+    name: str
+    seconds: float = 0.0
+    rows: int = 0
+    peak_rss_mb: Optional[float] = None
+    tables: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        """Linhas por segundo (0 se a etapa não processou linhas)."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "stage": self.name,
+            "seconds": round(self.seconds, 4),
+            "rows": self.rows,
+            "rows_per_s": round(self.rows_per_second, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1) if self.peak_rss_mb else None,
+        }
+        if self.tables:
+            data["tables"] = dict(self.tables)
+        return data
+
+
+class StageRecorder:
+    """
+    Acumula StageMetrics de uma carga.
+
+    A mesma etapa pode ser medida várias vezes (ex: insert da tabela
+    principal e de cada filha): tempo e linhas somam, e cada tabela entra
+    em StageMetrics.tables.
+
+    Exemplo:
+        >>> stages = StageRecorder("SI_DATAPAGTO")
+        >>> with stages.stage("parse") as stage:
+        ...     data = JSONParser.parse_file(path)
+        ...     stage.rows = len(data)
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self._stages: Dict[str, StageMetrics] = {}
+
+    @contextmanager
+    def stage(self, name: str, table: Optional[str] = None):
+        """
+        Mede um trecho como etapa `name`.
+
+        O bloco recebe um StageMetrics temporário: preencha `rows` com as
+        linhas processadas. Ao sair (mesmo com erro) o trecho é somado à
+        etapa e emitido no stream. Com --profile, a etapa também é perfilada.
+        """
+        current = StageMetrics(name)
+        started = time.perf_counter()
+        try:
+            with profile_stage(name):
+                yield current
+        finally:
+            current.seconds = time.perf_counter() - started
+            current.peak_rss_mb = peak_rss_mb()
+            self._add(current, table)
+
+    def _add(self, current: StageMetrics, table: Optional[str]) -> None:
+        total = self._stages.setdefault(current.name, StageMetrics(current.name))
+        total.seconds += current.seconds
+        total.rows += current.rows
+        total.peak_rss_mb = current.peak_rss_mb
+        if table:
+            total.tables[table] = total.tables.get(table, 0) + current.rows
+        emit_metric(
+            "stage",
+            table=table or self.table,
+            load=self.table,
+            **current.to_dict(),
+        )
+
+    @property
+    def stages(self) -> List[StageMetrics]:
+        """Etapas na ordem em que começaram."""
+        return list(self._stages.values())
+
+    def summary(self) -> str:
+        """Resumo de uma linha para o log (ex: parse 1.20s | insert 3.40s)."""
+        return " | ".join(
+            f"{s.name} {s.seconds:.2f}s ({s.rows} linhas)" for s in self._stages.values()
+        )
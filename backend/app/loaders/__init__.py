@@ -4,9 +4,11 @@ Init do módulo loaders.
 
 from app.loaders.base import BaseLoader, LoadResult
 from app.loaders.quick_loader import QuickLoader
+from app.loaders.upsert_loader import UpsertLoader
 
 __all__ = [
     'BaseLoader',
     'LoadResult',
     'QuickLoader',
+    'UpsertLoader',
 ]
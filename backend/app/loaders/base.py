@@ -5,12 +5,14 @@ Define interface que todos os loaders devem implementar.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
 
+from app.core.stage_metrics import StageMetrics
+
 
 @dataclass
 class LoadResult:
@@ -23,6 +25,16 @@ class LoadResult:
     errors: List[str]
     started_at: datetime
     finished_at: datetime
+    skipped: bool = False
+    rows_updated: int = 0
+    rows_deleted: int = 0
+    changed_bills: int = 0
+    # Tempo/linhas/RSS por etapa (parse, split, dataframe, insert, ...)
+    stages: List[StageMetrics] = field(default_factory=list)
+    # Linhas gravadas por tabela filha (ex: SI_DATAPAGTO_receipts)
+    child_rows: Dict[str, int] = field(default_factory=dict)
+    # Relatório da etapa validate (ValidationReport.to_dict), se rodou
+    validation: Optional[Dict[str, Any]] = None
     
     @property
     def success_rate(self) -> float:
@@ -34,10 +46,36 @@ class LoadResult:
     
     def __str__(self) -> str:
         """RepresentaÃ§Ã£o em string."""
+        if self.skipped:
+            return f"OK {self.table}: arquivo inalterado, carga ignorada"
+        if self.rows_updated or self.rows_deleted:
+            return (
+                f"OK {self.table}: +{self.rows_inserted} ~{self.rows_updated} "
+                f"-{self.rows_deleted} registros em {self.execution_time:.2f}s"
+            )
         return (
             f"OK {self.table}: {self.rows_inserted} registros "
             f"({self.success_rate:.1f}% sucesso) em {self.execution_time:.2f}s"
         )
+    
+    def stage(self, name: str) -> Optional[StageMetrics]:
+        """Métricas de uma etapa (None se não foi executada)."""
+        return next((s for s in self.stages if s.name == name), None)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Resumo serializável (evento file_done do stream de métricas)."""
+        return {
+            "table": self.table,
+            "success": self.success,
+            "skipped": self.skipped,
+            "rows_inserted": self.rows_inserted,
+            "rows_updated": self.rows_updated,
+            "rows_deleted": self.rows_deleted,
+            "child_rows": dict(self.child_rows),
+            "seconds": round(self.execution_time, 4),
+            "stages": [s.to_dict() for s in self.stages],
+            "validation": self.validation,
+        }
 
 
 class BaseLoader(ABC):
@@ -1,13 +1,37 @@
 """
 Loader Rápido - Modo INSERT simples.
 
-Ideal para datasets pequenos/médios. ~940 linhas/segundo.
+Ideal para datasets pequenos/médios. ~940 linhas/segundo via pandas.to_sql;
+com insert_method='executemany' as linhas vão direto para cursor.executemany
+do PyMySQL, sem DataFrame nem SQL montado pelo SQLAlchemy.
+
+Com checkpoint=True o arquivo é lido em streaming e cada lote é confirmado
+junto com o checkpoint (load_checkpoints); resume=True continua do último
+lote confirmado (ver app/utils/load_checkpoint.py).
+
+Com validate_before_insert na config, cada lote passa pela etapa
+"validate" (StreamingValidator) antes do INSERT; o relatório vai em
+LoadResult.validation e não bloqueia a carga.
+
+Linhas repetidas são descartadas no split (deduplicate_split) e as tabelas
+ganham índice UNIQUE em _row_hash: recarregar o mesmo arquivo em append
+não duplica nada, e os INSERTs ignoram as linhas já gravadas.
+
+if_exists='truncate' recarrega sem recriar: as tabelas existentes são
+esvaziadas (TRUNCATE no MySQL) e mantêm colunas e índices. Fora do
+modo checkpoint, os índices secundários não únicos saem antes do INSERT
+em massa e são recriados uma vez no fim (etapa "index").
+
+Com bulk_session na config, a carga roda no perfil de carga em massa
+(DatabaseManager.bulk_session) e termina com ANALYZE TABLE nas tabelas
+carregadas (etapa "analyze").
 """
 
 import time
 import json
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from uuid import uuid4
 import pandas as pd
@@ -16,14 +40,25 @@ import sqlalchemy as sa
 from app.loaders.base import BaseLoader, LoadResult
 from app.core import get_logger
 from app.core.database import DatabaseManager
+from app.core.dialect import get_dialect
+from app.core.stage_metrics import StageRecorder
 from app.utils.json_handler import JSONParser
+from app.utils.column_stats import ColumnStats, SchemaStats
+from app.utils.load_checkpoint import CheckpointState, LoadCheckpoint
+from app.utils.row_hashes import ROW_HASH_FIELD, deduplicate_split
+from app.utils.upload_tracker import FileHashCache
+from app.validators.streaming import StreamingValidator
 from app.core.exceptions import LoaderError
 
 logger = get_logger(__name__)
 
 
+# Métodos de inserção suportados por QuickLoader.load
+INSERT_METHODS = ('to_sql', 'executemany')
+
+
 class QuickLoader(BaseLoader):
-    """Loader usando pandas.to_sql() com método 'multi'."""
+    """Loader usando pandas.to_sql() ou executemany nativo, sem linhas repetidas."""
 
     @staticmethod
     def _infer_sql_type(series: pd.Series) -> str:
@@ -59,6 +94,178 @@ class QuickLoader(BaseLoader):
                 )
                 conn.execute(stmt)
 
+    @staticmethod
+    def _infer_sql_type_from_stats(stats: ColumnStats) -> str:
+        """Equivalente a _infer_sql_type, usando SchemaStats em vez de Series."""
+        if stats.types == {'int'}:
+            return "BIGINT"
+        if stats.types and stats.types <= {'int', 'float'}:
+            return "DOUBLE"
+        if stats.types == {'bool'}:
+            return "TINYINT(1)"
+        return "TEXT"
+
+    @staticmethod
+    def _prepare_table_from_stats(
+        conn,
+        table_name: str,
+        stats: SchemaStats,
+        if_exists: str,
+    ) -> None:
+        """
+        Cria/ajusta a tabela para o caminho executemany (papel do to_sql).
+
+        Respeita if_exists como o pandas: fail levanta erro, replace recria,
+        append só adiciona colunas que faltam. truncate esvazia a tabela e
+        segue como append (definição e índices ficam).
+        """
+        inspector = sa.inspect(conn)
+        exists = inspector.has_table(table_name)
+
+        if exists and if_exists == 'fail':
+            raise LoaderError(f"Tabela '{table_name}' já existe")
+
+        if exists and if_exists == 'replace':
+            conn.execute(sa.text(f"DROP TABLE `{table_name}`"))
+            exists = False
+
+        if exists and if_exists == 'truncate':
+            conn.execute(sa.text(get_dialect(conn).truncate_sql(table_name)))
+
+        if not exists:
+            col_defs = ",\n  ".join(
+                f"`{col}` {QuickLoader._infer_sql_type_from_stats(col_stats)}"
+                for col, col_stats in stats.columns.items()
+            )
+            conn.execute(sa.text(
+                f"CREATE TABLE `{table_name}` (\n  {col_defs}\n)"
+                f"{get_dialect(conn).create_table_suffix()}"
+            ))
+        else:
+            existing_cols = {col["name"] for col in inspector.get_columns(table_name)}
+            for col, col_stats in stats.columns.items():
+                if col in existing_cols:
+                    continue
+                col_type = QuickLoader._infer_sql_type_from_stats(col_stats)
+                conn.execute(sa.text(
+                    f"ALTER TABLE `{table_name}` ADD COLUMN `{col}` {col_type}"
+                ))
+
+        if ROW_HASH_FIELD in stats.columns:
+            QuickLoader._ensure_unique_index(conn, table_name)
+
+    @staticmethod
+    def _ensure_unique_index(conn, table_name: str) -> bool:
+        """
+        Cria o índice UNIQUE em _row_hash (chave única das linhas).
+
+        Tabelas antigas recebem a coluna vazia: NULLs não conflitam, então o
+        índice entra sem erro e vale para as cargas seguintes.
+
+        Returns:
+            bool: True se o índice foi criado
+        """
+        index_name = f"uk_{table_name}_row_hash"[:64]
+        # _row_hash é TEXT: o prefixo de 32 cobre o hash inteiro (32 hex)
+        return get_dialect(conn).ensure_index(
+            conn, table_name, index_name, [ROW_HASH_FIELD], prefix_length=32, unique=True
+        )
+
+    @staticmethod
+    def _insert_sql(conn, table_name: str, columns: list) -> str:
+        """INSERT com placeholders; com _row_hash, linhas já gravadas são ignoradas."""
+        dialect = get_dialect(conn)
+        cols_sql = ", ".join(f"`{col}`" for col in columns)
+        placeholders = ", ".join([dialect.placeholder] * len(columns))
+        insert_sql = f"INSERT INTO `{table_name}` ({cols_sql}) VALUES ({placeholders})"
+        if ROW_HASH_FIELD in columns:
+            insert_sql += " " + dialect.ignore_duplicates_clause([ROW_HASH_FIELD])
+        return insert_sql
+
+    @staticmethod
+    def _to_sql_inserter():
+        """
+        method para um DataFrame.to_sql: executemany com o INSERT de _insert_sql.
+
+        No primeiro chunk garante o índice único (a tabela pode ter acabado
+        de ser criada pelo pandas); o método devolve as linhas inseridas,
+        sem as ignoradas, e o to_sql devolve a soma.
+        """
+        ready = set()
+
+        def insert(pd_table, conn, keys, data_iter) -> int:
+            columns = list(keys)
+            if ROW_HASH_FIELD in columns and pd_table.name not in ready:
+                QuickLoader._ensure_unique_index(conn, pd_table.name)
+                ready.add(pd_table.name)
+            insert_sql = QuickLoader._insert_sql(conn, pd_table.name, columns)
+            result = conn.exec_driver_sql(insert_sql, [tuple(row) for row in data_iter])
+            return max(result.rowcount, 0)
+
+        return insert
+
+    @staticmethod
+    def _insert_executemany(
+        conn,
+        table_name: str,
+        rows: list,
+        if_exists: str,
+        chunk_size: int,
+    ) -> int:
+        """
+        Insere linhas com cursor.executemany do driver.
+
+        No MySQL o PyMySQL reescreve INSERT ... VALUES (%s, ...) em
+        statements multi-row de até max_stmt_length bytes, então o custo por
+        célula fica só no escape do driver; no SQLite o sqlite3 reaproveita
+        o statement preparado. Roda no mesmo cursor/transação de conn.
+
+        Args:
+            conn: Conexão SQLAlchemy em transação (engine.begin())
+            table_name: Tabela destino
+            rows: Lista de dicts (saída de _split_nested)
+            if_exists: fail, replace ou append
+            chunk_size: Linhas convertidas para tupla por vez
+
+        Returns:
+            int: Linhas inseridas
+        """
+        if not rows:
+            return 0
+
+        stats = SchemaStats().update(rows)
+        columns = stats.column_names
+        QuickLoader._prepare_table_from_stats(conn, table_name, stats, if_exists)
+
+        return QuickLoader._executemany(conn, table_name, rows, columns, chunk_size)
+
+    @staticmethod
+    def _executemany(conn, table_name: str, rows: list, columns: list, chunk_size: int) -> int:
+        """
+        INSERT das linhas nas colunas dadas (a tabela já deve existir).
+
+        Returns:
+            int: Linhas inseridas; com _row_hash, sem as já gravadas (no
+                MySQL o rowcount conta as encontradas também, por FOUND_ROWS)
+        """
+        insert_sql = QuickLoader._insert_sql(conn, table_name, columns)
+
+        inserted = 0
+        cursor = conn.connection.cursor()
+        try:
+            get_dialect(conn).prepare_cursor(cursor, conn)
+            for start in range(0, len(rows), chunk_size):
+                batch = [
+                    tuple(map(row.get, columns))
+                    for row in rows[start:start + chunk_size]
+                ]
+                cursor.executemany(insert_sql, batch)
+                inserted += cursor.rowcount if cursor.rowcount >= 0 else len(batch)
+        finally:
+            cursor.close()
+
+        return inserted
+
     @staticmethod
     def _split_nested(
         data: list,
@@ -217,6 +424,417 @@ class QuickLoader(BaseLoader):
 
         return {"main": main_rows, **child_rows}
     
+    @staticmethod
+    def _split_config(data: list, table_name: str) -> Dict[str, Any]:
+        """
+        Configuração de campos de _split_nested para a tabela.
+
+        Campos aninhados são detectados no primeiro registro; tabelas
+        SI_EXTRATO_CLIENTE* e SI_DATACOMPETPARCELAS explodem listas na principal.
+        """
+        # Configura dinamicamente campos aninhados
+        first_row = next((r for r in data if isinstance(r, dict)), {})
+
+        list_fields = {}
+        if "receipts" in first_row:
+            list_fields["receipts"] = f"{table_name}_receipts"
+        if "receiptsCategories" in first_row:
+            list_fields["receiptsCategories"] = f"{table_name}_receiptsCategories"
+        if "installments" in first_row:
+            list_fields["installments"] = f"{table_name}_installments"
+        if "units" in first_row:
+            list_fields["units"] = f"{table_name}_units"
+
+        flatten_dict_fields = set()
+        for fld in ("company", "costCenter", "customer"):
+            if fld in first_row:
+                flatten_dict_fields.add(fld)
+
+        table_name_upper = table_name.upper()
+        explode_fields = set()
+        if "EXTRATO_CLIENTE" in table_name_upper:
+            explode_fields.add("installments")
+            explode_fields.add("receipts")
+        if "DATACOMPETPARCELAS" in table_name_upper or "DATA_COMPETENCIA" in table_name_upper:
+            explode_fields.add("receipts")
+            explode_fields.add("receiptsCategories")
+
+        return {
+            "keep_dict_fields": {"paymentTerm"},
+            "list_fields": list_fields,
+            "flatten_dict_fields": flatten_dict_fields,
+            "explode_fields": explode_fields,
+        }
+
+    @classmethod
+    def _split_for_table(
+        cls,
+        data: list,
+        table_name: str,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, list]:
+        """
+        Aplica _split_nested com a configuração de campos da tabela.
+
+        Sem config, ela vem de _split_config(data); cargas em lotes passam a
+        do primeiro lote para manter o mesmo layout em todos.
+        Linhas repetidas saem aqui (deduplicate_split), já com _row_hash.
+        """
+        split = cls._split_nested(data, **(config or cls._split_config(data, table_name)))
+        removed = deduplicate_split(split)
+        if removed:
+            logger.info(f"✓ {removed} linhas repetidas descartadas em {table_name}")
+        return split
+
+    def _load_to_sql(
+        self,
+        engine,
+        table_name: str,
+        split: Dict[str, list],
+        if_exists: str,
+        chunk_size: int,
+        stages: Optional[StageRecorder] = None,
+    ) -> int:
+        """Insere tabela principal e filhas com pandas.to_sql."""
+        stages = stages or StageRecorder(table_name)
+
+        # Converte para DataFrame (tabela principal)
+        with stages.stage("dataframe", table_name) as stage:
+            df = pd.DataFrame(split["main"])
+            stage.rows = len(df)
+        logger.info(f"✓ DataFrame principal: {df.shape[0]} linhas × {df.shape[1]} colunas")
+
+        # Garante colunas antes de inserir (preserva dados existentes)
+        self._ensure_table_columns(engine, table_name, df)
+        self._ensure_existing_unique_indexes(engine, table_name, split, if_exists)
+        inserter = self._to_sql_inserter()
+        # Usa uma conexão transacional explícita para garantir rollback em erro.
+        with engine.begin() as conn:
+            with stages.stage("insert", table_name) as stage:
+                rows_inserted = df.to_sql(
+                    table_name,
+                    con=conn,
+                    if_exists=if_exists,
+                    index=False,
+                    method=inserter,
+                    chunksize=chunk_size,
+                )
+                stage.rows = rows_inserted
+            logger.info(f"✓ Inseridos: {rows_inserted} registros")
+
+            # Insere tabelas filhas
+            for child_table, rows in split.items():
+                if child_table == "main":
+                    continue
+                if not rows:
+                    continue
+                with stages.stage("dataframe", child_table) as stage:
+                    child_df = pd.DataFrame(rows)
+                    stage.rows = len(child_df)
+                self._ensure_table_columns(engine, child_table, child_df)
+                with stages.stage("insert", child_table) as stage:
+                    stage.rows = child_df.to_sql(
+                        child_table,
+                        con=conn,
+                        if_exists=if_exists,
+                        index=False,
+                        method=inserter,
+                        chunksize=chunk_size,
+                    )
+                logger.info(
+                    f"✓ Inseridos: {stage.rows} registros em {child_table}"
+                )
+
+        return rows_inserted
+
+    @staticmethod
+    def _truncate_for_reload(
+        engine,
+        table_name: str,
+        split: Dict[str, list],
+        defer_indexes: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Esvazia as tabelas existentes da carga (principal e filhas).
+
+        Com defer_indexes, os índices secundários não únicos também saem
+        (o INSERT em massa não paga a manutenção linha a linha) e voltam
+        em _restore_indexes. O UNIQUE de _row_hash fica: os INSERTs
+        dependem dele para ignorar repetidas.
+
+        Returns:
+            list: Índices removidos ({"table", "name", "columns", "prefix_length"})
+        """
+        deferred = []
+        with engine.begin() as conn:
+            dialect = get_dialect(conn)
+            inspector = sa.inspect(conn)
+            for key, rows in split.items():
+                target = table_name if key == "main" else key
+                if not rows or not inspector.has_table(target):
+                    continue
+                if defer_indexes:
+                    for index in dialect.deferrable_indexes(conn, target):
+                        dialect.drop_index(conn, target, index["name"])
+                        deferred.append({"table": target, **index})
+                conn.execute(sa.text(dialect.truncate_sql(target)))
+                logger.info(f"✓ {target} esvaziada (truncate)")
+        if deferred:
+            logger.info(f"✓ {len(deferred)} índices secundários adiados para o fim da carga")
+        return deferred
+
+    @staticmethod
+    def _restore_indexes(
+        engine,
+        deferred: List[Dict[str, Any]],
+        stages: StageRecorder,
+    ) -> None:
+        """Recria os índices removidos por _truncate_for_reload (um build por índice)."""
+        for index in deferred:
+            with engine.begin() as conn:
+                dialect = get_dialect(conn)
+                if dialect.index_exists(conn, index["table"], index["name"]):
+                    continue
+                with stages.stage("index", index["table"]):
+                    dialect.create_index(
+                        conn, index["table"], index["name"], index["columns"],
+                        index["prefix_length"],
+                    )
+            logger.info(f"✓ Índice {index['name']} recriado em {index['table']}")
+
+    @staticmethod
+    def _ensure_existing_unique_indexes(
+        engine,
+        table_name: str,
+        split: Dict[str, list],
+        if_exists: str,
+    ) -> None:
+        """
+        Índice único nas tabelas que já existem e vão receber append.
+
+        Roda antes da transação dos INSERTs (DDL no MySQL faz commit
+        implícito); tabelas novas ganham o índice no primeiro chunk.
+        """
+        if if_exists != 'append':
+            return
+        with engine.begin() as conn:
+            inspector = sa.inspect(conn)
+            for key, rows in split.items():
+                target = table_name if key == "main" else key
+                if not rows or not inspector.has_table(target):
+                    continue
+                columns = {col["name"] for col in inspector.get_columns(target)}
+                if ROW_HASH_FIELD not in columns:
+                    conn.execute(sa.text(
+                        f"ALTER TABLE `{target}` ADD COLUMN `{ROW_HASH_FIELD}` TEXT"
+                    ))
+                QuickLoader._ensure_unique_index(conn, target)
+
+    def _load_executemany(
+        self,
+        engine,
+        table_name: str,
+        split: Dict[str, list],
+        if_exists: str,
+        chunk_size: int,
+        stages: Optional[StageRecorder] = None,
+    ) -> int:
+        """Insere tabela principal e filhas com cursor.executemany."""
+        stages = stages or StageRecorder(table_name)
+        with engine.begin() as conn:
+            with stages.stage("insert", table_name) as stage:
+                rows_inserted = self._insert_executemany(
+                    conn, table_name, split["main"], if_exists, chunk_size
+                )
+                stage.rows = rows_inserted
+            logger.info(f"✓ Inseridos: {rows_inserted} registros (executemany)")
+
+            for child_table, rows in split.items():
+                if child_table == "main":
+                    continue
+                if not rows:
+                    continue
+                with stages.stage("insert", child_table) as stage:
+                    inserted = self._insert_executemany(
+                        conn, child_table, rows, if_exists, chunk_size
+                    )
+                    stage.rows = inserted
+                logger.info(
+                    f"✓ Inseridos: {inserted} registros em {child_table} (executemany)"
+                )
+
+        return rows_inserted
+    
+    def _bulk_session(self, if_exists: str, checkpoint: bool):
+        """
+        Perfil de carga em massa se bulk_session estiver na config.
+
+        unique_checks só é desligado quando as tabelas começam vazias
+        (replace/truncate sem checkpoint): as linhas já vêm deduplicadas do
+        split e não há linha antiga para colidir no UNIQUE de _row_hash.
+        """
+        if not self.config.get('bulk_session'):
+            return nullcontext()
+        return DatabaseManager.bulk_session(
+            skip_unique_checks=if_exists in ('replace', 'truncate') and not checkpoint,
+            skip_binlog=bool(self.config.get('bulk_skip_binlog')),
+        )
+
+    def _analyze(self, stages: StageRecorder, table_name: str, child_rows: Dict[str, int]) -> None:
+        """ANALYZE TABLE uma vez no fim da carga (perfil bulk_session)."""
+        if not self.config.get('bulk_session'):
+            return
+        try:
+            with stages.stage("analyze", table_name):
+                DatabaseManager.analyze_tables([table_name, *child_rows])
+        except Exception as e:
+            # Dados já confirmados: estatísticas velhas não invalidam a carga
+            logger.warning(f"⚠ ANALYZE TABLE falhou em {table_name}: {e}")
+
+    def _new_validator(self) -> Optional[StreamingValidator]:
+        """Validador da carga, se validate_before_insert estiver ligado."""
+        if self.config.get('validate_before_insert'):
+            return StreamingValidator()
+        return None
+
+    @staticmethod
+    def _validate(
+        validator: Optional[StreamingValidator],
+        stages: StageRecorder,
+        table_name: str,
+        split: Dict[str, list],
+        chunk_size: int,
+    ) -> None:
+        """Etapa validate: checa o split em lotes de chunk_size linhas."""
+        if validator is None:
+            return
+        with stages.stage("validate") as stage:
+            stage.rows = validator.validate_split(table_name, split, chunk_size)
+
+    @staticmethod
+    def _validation_report(validator) -> Optional[Dict[str, Any]]:
+        """Loga e devolve o relatório da validação (None se não rodou)."""
+        if validator is None:
+            return None
+        report = validator.report
+        if report.valid:
+            logger.info("✓ Validação: nenhum problema encontrado")
+        else:
+            errors = report.errors
+            logger.warning(f"⚠ Validação: {len(errors)} problemas: {'; '.join(errors[:10])}")
+        return report.to_dict()
+
+    def _load_checkpointed(
+        self,
+        engine,
+        file_path: Path,
+        table_name: str,
+        lines: bool,
+        if_exists: str,
+        chunk_size: int,
+        resume: bool,
+        stages: StageRecorder,
+    ) -> tuple:
+        """
+        Carga em lotes de chunk_size registros, um commit por lote.
+
+        Cada lote faz primeiro o DDL das tabelas (no MySQL o DDL faz commit
+        implícito) e depois, numa única transação, os INSERTs da principal e
+        das filhas mais o checkpoint. if_exists vale na primeira vez que a
+        carga toca cada tabela; depois é append.
+
+        Returns:
+            tuple: (linhas na principal, {filha: linhas}, relatório de validação)
+                desta execução
+        """
+        checkpoints = LoadCheckpoint(engine)
+        file_hash = FileHashCache().get_hash(file_path)
+
+        state = checkpoints.get(table_name) if resume else None
+        if state and state.file_hash != file_hash:
+            logger.warning(
+                f"Checkpoint de {table_name} é de outro conteúdo "
+                f"(hash {state.file_hash[:12]}): recomeçando do início"
+            )
+            state = None
+        if state:
+            logger.info(
+                f"↻ Retomando {table_name} após {state.records_done} registros "
+                f"({state.batches_done} lotes confirmados)"
+            )
+        state = state or CheckpointState(file_hash=file_hash)
+
+        to_skip = state.records_done
+        split_config = None
+        validator = self._new_validator()
+        rows_inserted = 0
+        child_rows: Dict[str, int] = {}
+        records = JSONParser.iterate_file(file_path, lines=lines, chunk_size=chunk_size)
+
+        while True:
+            with stages.stage("parse") as stage:
+                batch = next(records, None)
+                stage.rows = len(batch) if batch else 0
+            if batch is None:
+                break
+            # Layout das tabelas vem do primeiro registro do arquivo (mesmo
+            # ao retomar), não do primeiro de cada lote
+            if split_config is None:
+                split_config = self._split_config(batch, table_name)
+
+            # Registros já confirmados (o chunk_size pode ter mudado entre execuções)
+            if to_skip:
+                skipped = min(to_skip, len(batch))
+                batch = batch[skipped:]
+                to_skip -= skipped
+                if not batch:
+                    continue
+
+            with stages.stage("split") as stage:
+                split = self._split_for_table(batch, table_name, split_config)
+                stage.rows = sum(len(rows) for rows in split.values())
+            self._validate(validator, stages, table_name, split, chunk_size)
+
+            targets = []
+            with engine.begin() as conn:
+                for key, rows in split.items():
+                    if not rows:
+                        continue
+                    target = table_name if key == "main" else key
+                    stats = SchemaStats().update(rows)
+                    mode = 'append' if target in state.tables else if_exists
+                    self._prepare_table_from_stats(conn, target, stats, mode)
+                    targets.append((target, rows, stats.column_names))
+
+            inserted = {}
+            with engine.begin() as conn:
+                for target, rows, columns in targets:
+                    with stages.stage("insert", target) as stage:
+                        stage.rows = self._executemany(conn, target, rows, columns, chunk_size)
+                    inserted[target] = stage.rows
+                state = CheckpointState(
+                    file_hash=file_hash,
+                    records_done=state.records_done + len(batch),
+                    batches_done=state.batches_done + 1,
+                    tables=state.tables + [t for t, _, _ in targets if t not in state.tables],
+                )
+                checkpoints.save(conn, table_name, file_path, state)
+
+            for target, count in inserted.items():
+                if target == table_name:
+                    rows_inserted += count
+                else:
+                    child_rows[target] = child_rows.get(target, 0) + count
+            logger.info(
+                f"✓ Lote {state.batches_done}: {state.records_done} registros confirmados"
+            )
+
+        if not state.batches_done:
+            raise LoaderError("Arquivo está vazio")
+
+        checkpoints.clear(table_name)
+        return rows_inserted, child_rows, self._validation_report(validator)
+
     def load(
         self,
         file_path: Path,
@@ -225,6 +843,9 @@ class QuickLoader(BaseLoader):
         if_exists: str = 'append',
         chunk_size: Optional[int] = None,
         normalize: bool = False,
+        insert_method: str = 'to_sql',
+        checkpoint: bool = False,
+        resume: bool = False,
         **kwargs,
     ) -> LoadResult:
         """
@@ -234,135 +855,112 @@ class QuickLoader(BaseLoader):
             file_path: Caminho do arquivo
             table_name: Nome da tabela
             lines: Se True, trata como NDJSON
-            if_exists: fail, replace ou append
+            if_exists: fail, replace, append ou truncate (esvazia e mantém índices)
             chunk_size: Tamanho do chunk (padrão: 5000)
             normalize: Normaliza JSON aninhado
+            insert_method: 'to_sql' (pandas) ou 'executemany' (PyMySQL direto)
+            checkpoint: Commit por lote com checkpoint (sempre via executemany)
+            resume: Continua do último checkpoint do mesmo arquivo (implica checkpoint)
             **kwargs: Argumentos adicionais
         
         Returns:
-            LoadResult: Resultado do carregamento
+            LoadResult: Resultado do carregamento (com tempo por etapa em stages)
         """
         start_time = datetime.now()
+        stages = StageRecorder(table_name)
         
         try:
+            if insert_method not in INSERT_METHODS:
+                raise LoaderError(
+                    f"insert_method inválido: {insert_method} (use {', '.join(INSERT_METHODS)})"
+                )
+
             logger.info(f"Iniciando QuickLoader para {file_path} → {table_name}")
             
+            if checkpoint or resume:
+                engine = DatabaseManager.get_engine()
+                try:
+                    with self._bulk_session(if_exists, checkpoint=True):
+                        rows_inserted, child_rows, validation = self._load_checkpointed(
+                            engine, Path(file_path), table_name, lines, if_exists,
+                            chunk_size or 5000, resume, stages,
+                        )
+                except LoaderError:
+                    raise
+                except Exception as e:
+                    logger.error(f"✗ Erro na inserção (lotes confirmados ficam no checkpoint): {e}")
+                    try:
+                        DatabaseManager.dispose_pool(f"erro de inserção em {table_name}")
+                    except Exception:
+                        pass
+                    raise LoaderError(str(e))
+                self._analyze(stages, table_name, child_rows)
+                return self._result(
+                    table_name, start_time, rows_inserted, stages, child_rows,
+                    validation=validation,
+                )
+            
             # Parse JSON
-            data = JSONParser.parse_file(file_path, lines=lines)
+            with stages.stage("parse") as stage:
+                data = JSONParser.parse_file(file_path, lines=lines)
+                stage.rows = len(data)
             logger.info(f"✓ Parseado: {len(data)} registros")
             
             if not data:
                 raise LoaderError("Arquivo está vazio")
 
             # Separa listas aninhadas em tabelas filhas e mantém paymentTerm na principal
-            # Configura dinamicamente campos aninhados
-            first_row = next((r for r in data if isinstance(r, dict)), {})
-
-            list_fields = {}
-            if "receipts" in first_row:
-                list_fields["receipts"] = f"{table_name}_receipts"
-            if "receiptsCategories" in first_row:
-                list_fields["receiptsCategories"] = f"{table_name}_receiptsCategories"
-            if "installments" in first_row:
-                list_fields["installments"] = f"{table_name}_installments"
-            if "units" in first_row:
-                list_fields["units"] = f"{table_name}_units"
-
-            flatten_dict_fields = set()
-            for fld in ("company", "costCenter", "customer"):
-                if fld in first_row:
-                    flatten_dict_fields.add(fld)
-
-            table_name_upper = table_name.upper()
-            explode_fields = set()
-            if "EXTRATO_CLIENTE" in table_name_upper:
-                explode_fields.add("installments")
-                explode_fields.add("receipts")
-            if "DATACOMPETPARCELAS" in table_name_upper or "DATA_COMPETENCIA" in table_name_upper:
-                explode_fields.add("receipts")
-                explode_fields.add("receiptsCategories")
-
-            split = self._split_nested(
-                data,
-                keep_dict_fields={"paymentTerm"},
-                list_fields=list_fields,
-                flatten_dict_fields=flatten_dict_fields,
-                explode_fields=explode_fields,
-            )
+            with stages.stage("split") as stage:
+                split = self._split_for_table(data, table_name)
+                stage.rows = sum(len(rows) for rows in split.values())
+            child_rows = {
+                child: len(rows) for child, rows in split.items() if child != "main" and rows
+            }
+            chunk_size = chunk_size or 5000
 
-            # Converte para DataFrame (tabela principal)
-            df = pd.DataFrame(split["main"])
-            logger.info(f"✓ DataFrame principal: {df.shape[0]} linhas × {df.shape[1]} colunas")
-            
-            # Carrega com pandas
+            validator = self._new_validator()
+            self._validate(validator, stages, table_name, split, chunk_size)
+            validation = self._validation_report(validator)
+
+            # Carrega no banco
             engine = DatabaseManager.get_engine()
-            chunk_size = chunk_size or 5000
             
             rows_inserted = 0
             rows_failed = 0
+            deferred = []
             
-            try:
-                # Garante colunas antes de inserir (preserva dados existentes)
-                self._ensure_table_columns(engine, table_name, df)
-                # Usa uma conexão transacional explícita para garantir rollback em erro.
-                with engine.begin() as conn:
-                    df.to_sql(
-                        table_name,
-                        con=conn,
-                        if_exists=if_exists,
-                        index=False,
-                        method='multi',
-                        chunksize=chunk_size,
-                    )
-                    rows_inserted = len(df)
-                    logger.info(f"✓ Inseridos: {rows_inserted} registros")
-
-                    # Insere tabelas filhas
-                    for child_table, rows in split.items():
-                        if child_table == "main":
-                            continue
-                        if not rows:
-                            continue
-                        child_df = pd.DataFrame(rows)
-                        self._ensure_table_columns(engine, child_table, child_df)
-                        child_df.to_sql(
-                            child_table,
-                            con=conn,
-                            if_exists=if_exists,
-                            index=False,
-                            method='multi',
-                            chunksize=chunk_size,
+            with self._bulk_session(if_exists, checkpoint=False):
+                try:
+                    if if_exists == 'truncate':
+                        deferred = self._truncate_for_reload(engine, table_name, split)
+                        if_exists = 'append'
+                    if insert_method == 'executemany':
+                        rows_inserted = self._load_executemany(
+                            engine, table_name, split, if_exists, chunk_size, stages
                         )
-                        logger.info(
-                            f"✓ Inseridos: {len(child_df)} registros em {child_table}"
+                    else:
+                        rows_inserted = self._load_to_sql(
+                            engine, table_name, split, if_exists, chunk_size, stages
                         )
             
-            except Exception as e:
-                logger.error(f"✗ Erro na inserção: {e}")
-                rows_failed = len(df)
-                # Evita reutilização de conexão inválida no próximo arquivo/job.
-                try:
-                    engine.dispose()
-                except Exception:
-                    pass
-                raise LoaderError(str(e))
-            
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+                except Exception as e:
+                    logger.error(f"✗ Erro na inserção: {e}")
+                    rows_failed = len(split["main"])
+                    # Evita reutilização de conexão inválida no próximo arquivo/job.
+                    try:
+                        DatabaseManager.dispose_pool(f"erro de inserção em {table_name}")
+                    except Exception:
+                        pass
+                    raise LoaderError(str(e))
+                finally:
+                    # Mesmo com erro: a tabela não fica sem os índices de consulta
+                    self._restore_indexes(engine, deferred, stages)
+            self._analyze(stages, table_name, child_rows)
             
-            result = LoadResult(
-                success=True,
-                table=table_name,
-                rows_inserted=rows_inserted,
-                rows_failed=rows_failed,
-                execution_time=execution_time,
-                errors=[],
-                started_at=start_time,
-                finished_at=end_time,
+            return self._result(
+                table_name, start_time, rows_inserted, stages, child_rows, rows_failed,
+                validation=validation,
             )
-            
-            logger.info(f"✓ {result}")
-            return result
         
         except Exception as e:
             end_time = datetime.now()
@@ -379,4 +977,35 @@ class QuickLoader(BaseLoader):
                 errors=[str(e)],
                 started_at=start_time,
                 finished_at=end_time,
+                stages=stages.stages,
             )
+
+    @staticmethod
+    def _result(
+        table_name: str,
+        start_time: datetime,
+        rows_inserted: int,
+        stages: StageRecorder,
+        child_rows: Dict[str, int],
+        rows_failed: int = 0,
+        validation: Optional[Dict[str, Any]] = None,
+    ) -> LoadResult:
+        """LoadResult de sucesso (loga resultado e etapas)."""
+        end_time = datetime.now()
+        result = LoadResult(
+            success=True,
+            table=table_name,
+            rows_inserted=rows_inserted,
+            rows_failed=rows_failed,
+            execution_time=(end_time - start_time).total_seconds(),
+            errors=[],
+            started_at=start_time,
+            finished_at=end_time,
+            stages=stages.stages,
+            child_rows=child_rows,
+            validation=validation,
+        )
+        
+        logger.info(f"✓ {result}")
+        logger.info(f"Etapas: {stages.summary()}")
+        return result
@@ -0,0 +1,302 @@
+"""
+Loader Incremental - Modo UPSERT por diferença de hashes.
+
+Compara o hash de cada linha achatada com o da carga anterior
+(_row_hashes) e aplica apenas inserções, alterações e remoções.
+Numa recarga noturna em que poucos títulos mudaram, o banco recebe
+O(mudanças) operações em vez da tabela inteira.
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+from datetime import datetime
+import pandas as pd
+import sqlalchemy as sa
+
+from app.loaders.base import LoadResult
+from app.loaders.quick_loader import QuickLoader, INSERT_METHODS
+from app.core import get_logger
+from app.core.database import DatabaseManager
+from app.core.dialect import get_dialect
+from app.core.stage_metrics import StageRecorder
+from app.utils.json_handler import JSONParser
+from app.utils.column_stats import SchemaStats
+from app.utils.row_hashes import (
+    RowHashStore,
+    assign_row_keys,
+    bill_of,
+    delete_rows_by_key,
+    diff_hashes,
+    natural_key,
+    row_hash,
+    stable_id,
+)
+from app.core.exceptions import LoaderError
+
+logger = get_logger(__name__)
+
+
+class UpsertLoader(QuickLoader):
+    """Loader que aplica só as linhas alteradas desde a última carga."""
+
+    @staticmethod
+    def _assign_stable_ids(data: list) -> None:
+        """
+        Define _row_id determinístico nos registros brutos.
+
+        Assim _parent_id das tabelas filhas não muda entre cargas e linhas
+        filhas inalteradas continuam apontando para o pai correto.
+        """
+        seen: Dict[str, int] = {}
+        for record in data:
+            if not isinstance(record, dict):
+                continue
+            base = natural_key(record)
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+            record["_row_id"] = stable_id(f"{base}#{occurrence}")
+
+    @staticmethod
+    def _in_sync(engine, table_name: str, stored_count: int) -> bool:
+        """
+        Verifica se a tabela ainda corresponde aos hashes armazenados.
+
+        Uma carga completa por outro modo (ex: quick com replace) recria a
+        tabela sem _row_key ou muda a contagem: nesse caso recarrega tudo.
+        """
+        if stored_count == 0:
+            return False
+        inspector = sa.inspect(engine)
+        if not inspector.has_table(table_name):
+            return False
+        columns = {col["name"] for col in inspector.get_columns(table_name)}
+        if "_row_key" not in columns:
+            return False
+        with engine.connect() as conn:
+            count = conn.execute(sa.text(f"SELECT COUNT(*) FROM `{table_name}`")).scalar()
+        return count == stored_count
+
+    @staticmethod
+    def _ensure_row_key_index(engine, table_name: str) -> None:
+        """Cria índice em _row_key (usado pelos DELETEs incrementais)."""
+        index_name = f"idx_{table_name}_row_key"[:64]
+        with engine.begin() as conn:
+            get_dialect(conn).ensure_index(
+                conn, table_name, index_name, ["_row_key"], prefix_length=100
+            )
+
+    def _insert_rows(
+        self,
+        conn,
+        table_name: str,
+        rows: list,
+        if_exists: str,
+        chunk_size: int,
+        insert_method: str,
+    ) -> int:
+        """Insere linhas pelo método escolhido, na transação de conn."""
+        if insert_method == 'executemany':
+            return self._insert_executemany(conn, table_name, rows, if_exists, chunk_size)
+
+        df = pd.DataFrame(rows)
+        df.to_sql(
+            table_name,
+            con=conn,
+            if_exists=if_exists,
+            index=False,
+            method=self._to_sql_inserter(),
+            chunksize=chunk_size,
+        )
+        return len(df)
+
+    def _apply_table(
+        self,
+        engine,
+        store: RowHashStore,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        chunk_size: int,
+        insert_method: str,
+        stages: Optional[StageRecorder] = None,
+    ) -> Dict[str, int]:
+        """
+        Sincroniza uma tabela (principal ou filha) com as linhas da carga.
+
+        Returns:
+            Dict com inserted, updated, deleted e bills (títulos marcados)
+        """
+        stages = stages or StageRecorder(table_name)
+        with stages.stage("hash", table_name) as stage:
+            assign_row_keys(rows)
+            new = {row["_row_key"]: (row_hash(row), *bill_of(row)) for row in rows}
+            old = store.load(table_name)
+            stage.rows = len(rows)
+
+        if not self._in_sync(engine, table_name, len(old)):
+            # Primeira carga (ou tabela fora de sincronia): carga completa
+            logger.info(f"Carga completa de {table_name}: {len(rows)} linhas")
+            if rows:
+                with stages.stage("insert", table_name) as stage:
+                    with engine.begin() as conn:
+                        self._insert_rows(conn, table_name, rows, 'replace', chunk_size, insert_method)
+                        store.save(conn, table_name, new, replace_all=True)
+                        bills = {entry[1:] for entry in new.values()}
+                        bills |= {entry[1:] for entry in old.values()}
+                        marked = store.mark_changed_bills(conn, table_name, bills)
+                    self._ensure_row_key_index(engine, table_name)
+                    stage.rows = len(rows)
+            else:
+                with engine.begin() as conn:
+                    store.forget(conn, table_name)
+                marked = 0
+            return {'inserted': len(rows), 'updated': 0, 'deleted': 0, 'bills': marked}
+
+        diff = diff_hashes(
+            {key: entry[0] for key, entry in old.items()},
+            {key: entry[0] for key, entry in new.items()},
+        )
+        if not diff:
+            logger.info(f"✓ {table_name}: nenhuma linha alterada")
+            return {'inserted': 0, 'updated': 0, 'deleted': 0, 'bills': 0}
+
+        to_insert = diff.to_insert
+        insert_rows = [row for row in rows if row["_row_key"] in to_insert]
+
+        # Colunas novas antes da transação: DDL no MySQL faz commit implícito
+        if insert_rows:
+            with engine.begin() as conn:
+                self._prepare_table_from_stats(
+                    conn, table_name, SchemaStats().update(insert_rows), 'append'
+                )
+
+        with stages.stage("insert", table_name) as stage, engine.begin() as conn:
+            delete_rows_by_key(conn, table_name, sorted(diff.changed))
+            if insert_rows:
+                self._insert_rows(conn, table_name, insert_rows, 'append', chunk_size, insert_method)
+            store.save(
+                conn,
+                table_name,
+                {key: new[key] for key in to_insert},
+                deleted=diff.deleted,
+            )
+            bills = {new[key][1:] for key in to_insert}
+            bills |= {old[key][1:] for key in diff.changed}
+            marked = store.mark_changed_bills(conn, table_name, bills)
+            stage.rows = len(insert_rows) + len(diff.deleted)
+
+        logger.info(
+            f"✓ {table_name}: +{len(diff.inserted)} ~{len(diff.updated)} "
+            f"-{len(diff.deleted)} linhas, {marked} títulos marcados"
+        )
+        return {
+            'inserted': len(diff.inserted),
+            'updated': len(diff.updated),
+            'deleted': len(diff.deleted),
+            'bills': marked,
+        }
+
+    def load(
+        self,
+        file_path: Path,
+        table_name: str,
+        lines: bool = False,
+        if_exists: str = 'append',
+        chunk_size: Optional[int] = None,
+        insert_method: str = 'to_sql',
+        **kwargs,
+    ) -> LoadResult:
+        """
+        Carrega JSON aplicando só as diferenças.
+
+        Args:
+            file_path: Caminho do arquivo
+            table_name: Nome da tabela
+            lines: Se True, trata como NDJSON
+            if_exists: Ignorado; a primeira carga (ou fora de sincronia) sempre recria
+            chunk_size: Tamanho do chunk (padrão: 5000)
+            insert_method: 'to_sql' (pandas) ou 'executemany' (PyMySQL direto)
+            **kwargs: Argumentos adicionais
+
+        Returns:
+            LoadResult: rows_inserted/rows_updated/rows_deleted da tabela principal
+        """
+        start_time = datetime.now()
+        stages = StageRecorder(table_name)
+
+        try:
+            if insert_method not in INSERT_METHODS:
+                raise LoaderError(
+                    f"insert_method inválido: {insert_method} (use {', '.join(INSERT_METHODS)})"
+                )
+
+            logger.info(f"Iniciando UpsertLoader para {file_path} → {table_name}")
+
+            with stages.stage("parse") as stage:
+                data = JSONParser.parse_file(file_path, lines=lines)
+                stage.rows = len(data)
+            logger.info(f"✓ Parseado: {len(data)} registros")
+
+            if not data:
+                raise LoaderError("Arquivo está vazio")
+
+            with stages.stage("split") as stage:
+                self._assign_stable_ids(data)
+                split = self._split_for_table(data, table_name)
+                stage.rows = sum(len(rows) for rows in split.values())
+
+            engine = DatabaseManager.get_engine()
+            store = RowHashStore(engine)
+            chunk_size = chunk_size or 5000
+
+            try:
+                counts = {}
+                for target, rows in split.items():
+                    target_table = table_name if target == "main" else target
+                    counts[target_table] = self._apply_table(
+                        engine, store, target_table, rows, chunk_size, insert_method, stages
+                    )
+            except Exception as e:
+                logger.error(f"✗ Erro na inserção: {e}")
+                try:
+                    DatabaseManager.dispose_pool(f"erro de upsert em {table_name}")
+                except Exception:
+                    pass
+                raise LoaderError(str(e))
+
+            main = counts[table_name]
+            end_time = datetime.now()
+            result = LoadResult(
+                success=True,
+                table=table_name,
+                rows_inserted=main['inserted'],
+                rows_failed=0,
+                execution_time=(end_time - start_time).total_seconds(),
+                errors=[],
+                started_at=start_time,
+                finished_at=end_time,
+                rows_updated=main['updated'],
+                rows_deleted=main['deleted'],
+                changed_bills=sum(c['bills'] for c in counts.values()),
+                stages=stages.stages,
+                child_rows={
+                    child: len(rows) for child, rows in split.items() if child != "main" and rows
+                },
+            )
+            logger.info(f"✓ {result}")
+            logger.info(f"Etapas: {stages.summary()}")
+            return result
+
+        except Exception as e:
+            end_time = datetime.now()
+            logger.error(f"✗ Erro no UpsertLoader: {e}")
+            return LoadResult(
+                success=False,
+                table=table_name,
+                rows_inserted=0,
+                rows_failed=0,
+                execution_time=(end_time - start_time).total_seconds(),
+                errors=[str(e)],
+                started_at=start_time,
+                finished_at=end_time,
+                stages=stages.stages,
+            )
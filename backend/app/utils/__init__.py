@@ -3,6 +3,9 @@ Init do módulo utils.
 """
 
 from app.utils.json_handler import JSONParser, flatten_json, normalize_nested, to_dataframe
+from app.utils.column_stats import ColumnStats, SchemaStats
+from app.utils.load_checkpoint import CheckpointState, LoadCheckpoint
+from app.utils.row_hashes import RowDiff, RowHashStore, diff_hashes
 from app.utils.schema_manager import SchemaInferencer, create_column_spec, validate_schema_match
 
 __all__ = [
@@ -10,6 +13,13 @@ __all__ = [
     'flatten_json',
     'normalize_nested',
     'to_dataframe',
+    'ColumnStats',
+    'SchemaStats',
+    'CheckpointState',
+    'LoadCheckpoint',
+    'RowDiff',
+    'RowHashStore',
+    'diff_hashes',
     'SchemaInferencer',
     'create_column_spec',
     'validate_schema_match',
@@ -0,0 +1,204 @@
+"""
+Estatísticas incrementais de colunas para inferência de schema.
+
+Acumula, lote a lote, contagem de nulos, mínimo/máximo, tamanho máximo e
+tipos Python observados por coluna. Acumuladores de processos diferentes
+podem ser combinados com merge(), permitindo inferir o schema do arquivo
+inteiro sem montar um DataFrame.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+# Limites usados para decidir entre INT e BIGINT (mesma regra do SchemaInferencer)
+INT32_MAX = 2**31
+INT32_MIN = -(2**31)
+
+
+@dataclass
+class ColumnStats:
+    """Estatísticas de uma coluna."""
+    count: int = 0
+    null_count: int = 0
+    min_value: Optional[Any] = None
+    max_value: Optional[Any] = None
+    max_length: int = 0
+    types: Set[str] = field(default_factory=set)
+
+    def update(self, value: Any) -> None:
+        """Atualiza as estatísticas com um valor."""
+        self.count += 1
+
+        if value is None:
+            self.null_count += 1
+            return
+
+        # bool é subclasse de int: precisa ser testado antes
+        if isinstance(value, bool):
+            self.types.add('bool')
+        elif isinstance(value, int):
+            self.types.add('int')
+            self._update_range(value)
+        elif isinstance(value, float):
+            if value != value:  # NaN conta como nulo
+                self.null_count += 1
+                return
+            self.types.add('float')
+            self._update_range(value)
+        elif isinstance(value, str):
+            self.types.add('str')
+            length = len(value)
+            if length > self.max_length:
+                self.max_length = length
+        elif isinstance(value, (dict, list)):
+            self.types.add('json')
+        else:
+            self.types.add('str')
+            length = len(str(value))
+            if length > self.max_length:
+                self.max_length = length
+
+    def _update_range(self, value) -> None:
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def merge(self, other: 'ColumnStats') -> 'ColumnStats':
+        """Incorpora estatísticas de outro acumulador (ex: outro processo)."""
+        self.count += other.count
+        self.null_count += other.null_count
+        if other.min_value is not None:
+            self._update_range(other.min_value)
+        if other.max_value is not None:
+            self._update_range(other.max_value)
+        self.max_length = max(self.max_length, other.max_length)
+        self.types |= other.types
+        return self
+
+    @property
+    def all_null(self) -> bool:
+        """True se a coluna só recebeu nulos."""
+        return not self.types
+
+    @property
+    def text_length(self) -> int:
+        """Tamanho máximo quando a coluna precisar virar texto."""
+        length = self.max_length
+        for value in (self.min_value, self.max_value):
+            if value is not None:
+                length = max(length, len(str(value)))
+        return length
+
+    def sql_type(self) -> str:
+        """Mapeia as estatísticas para tipo SQL (mesmas regras de SchemaInferencer)."""
+        types = self.types
+
+        if not types:
+            return 'VARCHAR(255)'
+
+        if types == {'bool'}:
+            return 'BOOLEAN'
+
+        if types == {'int'}:
+            if self.max_value > INT32_MAX or self.min_value < INT32_MIN:
+                return 'BIGINT(20)'
+            return 'INT(11)'
+
+        if types <= {'int', 'float'}:
+            return 'DOUBLE'
+
+        if types == {'json'}:
+            return 'JSON'
+
+        max_len = self.text_length
+        if max_len < 256:
+            return f'VARCHAR({max_len + 10})'
+        elif max_len < 65536:
+            return 'TEXT'
+        return 'LONGTEXT'
+
+
+class SchemaStats:
+    """Acumulador de estatísticas para todas as colunas de uma tabela."""
+
+    def __init__(self):
+        self.columns: Dict[str, ColumnStats] = {}
+        self.row_count: int = 0
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> 'SchemaStats':
+        """
+        Atualiza estatísticas com um lote de registros.
+
+        Colunas ausentes em um registro contam como nulas, como aconteceria
+        no DataFrame equivalente.
+
+        Args:
+            records: Lote de dicts (ex: chunk de JSONParser.iterate_file)
+
+        Returns:
+            SchemaStats: o próprio acumulador
+        """
+        columns = self.columns
+
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+
+            self.row_count += 1
+
+            for key, value in record.items():
+                stats = columns.get(key)
+                if stats is None:
+                    # Coluna nova: registros anteriores não tinham o campo
+                    stats = ColumnStats(
+                        count=self.row_count - 1,
+                        null_count=self.row_count - 1,
+                    )
+                    columns[key] = stats
+                stats.update(value)
+
+            if len(record) != len(columns):
+                for key, stats in columns.items():
+                    if key not in record:
+                        stats.count += 1
+                        stats.null_count += 1
+
+        return self
+
+    def merge(self, other: 'SchemaStats') -> 'SchemaStats':
+        """
+        Combina com acumulador de outro lote/processo.
+
+        Args:
+            other: Estatísticas calculadas sobre outros registros
+
+        Returns:
+            SchemaStats: o próprio acumulador
+        """
+        for key, stats in self.columns.items():
+            if key not in other.columns:
+                stats.count += other.row_count
+                stats.null_count += other.row_count
+
+        for key, other_stats in other.columns.items():
+            stats = self.columns.get(key)
+            if stats is None:
+                stats = ColumnStats(count=self.row_count, null_count=self.row_count)
+                self.columns[key] = stats
+            stats.merge(other_stats)
+
+        self.row_count += other.row_count
+        return self
+
+    def infer_types(self) -> Dict[str, str]:
+        """
+        Retorna {coluna: tipo_sql} na ordem em que as colunas apareceram.
+        """
+        return {col: stats.sql_type() for col, stats in self.columns.items()}
+
+    @property
+    def column_names(self) -> List[str]:
+        """Colunas na ordem de aparição."""
+        return list(self.columns)
@@ -0,0 +1,101 @@
+"""
+Projeção das categorias por parcela (<tabela>_categories).
+
+O loader explode receiptsCategories na própria SI_DATACOMPETPARCELAS e,
+dentro de cada categoria, os receipts aninhados: a mesma parcela/categoria
+vira uma linha por receipt, iguais em tudo que a QUERY_PADRAO lê e
+diferentes só nos campos do receipt. Juntar a tabela direto multiplicaria
+as linhas do relatório.
+
+Depois de cada carga a tabela é projetada nas colunas que a consulta usa,
+sem repetições (SELECT DISTINCT): uma linha por parcela, categoria e
+centro de custo. A consolidação junta a projeção em vez da tabela.
+"""
+
+from typing import Optional
+
+from sqlalchemy import inspect, text
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Tabelas de competência cujas categorias são explodidas na principal
+SOURCE_MARKERS = ("DATACOMPETPARCELAS", "DATA_COMPETENCIA")
+
+# Colunas lidas pela QUERY_PADRAO (chave do join primeiro)
+PROJECTION_COLUMNS = (
+    "companyId",
+    "billId",
+    "installmentId",
+    "costCenterId",
+    "costCenterName",
+    "financialCategoryId",
+    "financialCategoryName",
+    "financialCategoryRate",
+    "documentNumber",
+    "documentIdentificationName",
+)
+
+
+def categories_table(table_name: str) -> str:
+    """Nome da projeção de uma tabela de competência."""
+    return f"{table_name}_categories"
+
+
+def rebuild_categories(engine, table_name: str) -> Optional[int]:
+    """
+    Recria o conteúdo da projeção a partir da tabela de competência.
+
+    A tabela é criada (vazia, com os tipos da origem) só na primeira vez;
+    DELETE e INSERT ... SELECT rodam na mesma transação, como na tabela de
+    casamento dos receipts.
+
+    Returns:
+        int: Linhas gravadas, ou None se a tabela não tem as colunas
+    """
+    columns = {col["name"] for col in inspect(engine).get_columns(table_name)}
+    missing = [col for col in PROJECTION_COLUMNS if col not in columns]
+    if missing:
+        logger.warning(
+            f"⚠ {table_name} sem {', '.join(missing)}: projeção de categorias não gerada"
+        )
+        return None
+
+    projection = categories_table(table_name)
+    select = f"""
+        SELECT DISTINCT {", ".join(f"`{col}`" for col in PROJECTION_COLUMNS)}
+        FROM `{table_name}`
+        WHERE `financialCategoryId` IS NOT NULL
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS `{projection}` AS {select} AND 1 = 0"))
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM `{projection}`"))
+        result = conn.execute(text(
+            f"INSERT INTO `{projection}` ({', '.join(PROJECTION_COLUMNS)}) {select}"
+        ))
+    logger.info(f"✓ {projection}: {result.rowcount} categorias por parcela")
+    return result.rowcount
+
+
+def refresh_categories(engine, table_name: str, changed: bool = True) -> Optional[int]:
+    """
+    Atualiza a projeção de categorias depois da carga de table_name.
+
+    Só age nas tabelas de competência (SOURCE_MARKERS no nome). Com
+    changed=False (carga pulada, arquivo inalterado) só gera a projeção se
+    ela ainda não existir.
+
+    Returns:
+        int: Linhas gravadas, ou None se nada foi feito
+    """
+    if not any(marker in table_name.upper() for marker in SOURCE_MARKERS):
+        return None
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return None
+    if not changed and inspector.has_table(categories_table(table_name)):
+        return None
+    return rebuild_categories(engine, table_name)
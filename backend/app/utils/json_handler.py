@@ -77,6 +77,16 @@ class JSONParser:
         sample_size: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Parse JSON Array (lista) ou objeto com chave 'data'."""
+        if sample_size:
+            # Amostra: lê só o início do arquivo em vez de carregar tudo
+            data = []
+            for record in JSONParser.stream_json_array(file_path):
+                data.append(record)
+                if len(data) >= sample_size:
+                    break
+            logger.info(f"✓ JSON Array (amostra): {len(data)} registros")
+            return data
+        
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
@@ -89,9 +99,6 @@ class JSONParser:
                 "JSON deve ser um array de objetos ou um objeto com chave 'data' contendo um array"
             )
         
-        if sample_size:
-            data = data[:sample_size]
-        
         logger.info(f"✓ JSON Array: {len(data)} registros")
         return data
     
@@ -125,22 +132,12 @@ class JSONParser:
                                 yield chunk
                                 chunk = []
             else:
-                # JSON array - lê tudo e itera em chunks
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # Suporta wrapper {"data": [...]}
-                if isinstance(data, dict) and "data" in data:
-                    data = data["data"]
-
-                if not isinstance(data, list):
-                    raise InvalidFormatError(
-                        "JSON deve ser um array de objetos ou um objeto com chave 'data' contendo um array"
-                    )
-
-                for i in range(0, len(data), chunk_size):
-                    yield data[i:i + chunk_size]
-                return
+                # JSON array - decodifica incrementalmente, um registro por vez
+                for record in JSONParser.stream_json_array(file_path):
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
             
             # Yield último chunk
             if chunk:
@@ -150,6 +147,123 @@ class JSONParser:
             logger.error(f"Erro ao iterar arquivo: {e}")
             raise ParsingError(str(e))
 
+    
+    @staticmethod
+    def stream_json_array(
+        file_path: Union[str, Path],
+        buffer_size: int = 1 << 20,
+    ) -> Iterator[Any]:
+        """
+        Itera os registros de um JSON Array sem carregar o arquivo inteiro.
+        
+        Suporta array no topo ou wrapper {"data": [...]} (formato do Sienge).
+        Lê blocos de buffer_size caracteres e decodifica um registro por vez
+        com JSONDecoder.raw_decode, então a memória fica limitada ao maior
+        registro + buffer.
+        
+        Args:
+            file_path: Caminho do arquivo
+            buffer_size: Tamanho do bloco de leitura
+        
+        Yields:
+            Registros do array, na ordem do arquivo
+        
+        Raises:
+            InvalidFormatError: Se não houver array no topo nem em 'data'
+        """
+        decoder = json.JSONDecoder()
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            buf = f.read(buffer_size)
+            pos = 0
+            eof = not buf
+            
+            def fill() -> bool:
+                """Descarta o que já foi consumido e lê mais um bloco."""
+                nonlocal buf, pos, eof
+                if eof:
+                    return False
+                more = f.read(buffer_size)
+                if not more:
+                    eof = True
+                    return False
+                buf = buf[pos:] + more
+                pos = 0
+                return True
+            
+            def skip_ws() -> str:
+                """Avança espaços e retorna o próximo caractere ('' no fim)."""
+                nonlocal pos
+                while True:
+                    while pos < len(buf) and buf[pos] in ' \t\r\n':
+                        pos += 1
+                    if pos < len(buf):
+                        return buf[pos]
+                    if not fill():
+                        return ''
+            
+            def decode() -> Any:
+                """Decodifica um valor completo a partir de pos."""
+                nonlocal pos
+                # Garante folga para não cortar números no meio (ex: "3." de "3.14")
+                while len(buf) - pos < 64 and fill():
+                    pass
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if fill():
+                            continue
+                        raise
+                    # Número no fim do buffer pode estar truncado: lê mais e refaz
+                    if end == len(buf) and fill():
+                        continue
+                    pos = end
+                    return value
+            
+            if skip_ws() == '\ufeff':
+                pos += 1
+            
+            first = skip_ws()
+            if first == '{':
+                # Procura a chave 'data' sem decodificar o resto do objeto
+                pos += 1
+                while True:
+                    char = skip_ws()
+                    if char == '}' or char == '':
+                        raise InvalidFormatError(
+                            "JSON deve ser um array de objetos ou um objeto com chave 'data' contendo um array"
+                        )
+                    if char == ',':
+                        pos += 1
+                        continue
+                    key = decode()
+                    if skip_ws() != ':':
+                        raise json.JSONDecodeError("Esperado ':'", buf, pos)
+                    pos += 1
+                    if skip_ws() == '[' and key == 'data':
+                        break
+                    decode()
+            elif first != '[':
+                raise InvalidFormatError(
+                    "JSON deve ser um array de objetos ou um objeto com chave 'data' contendo um array"
+                )
+            
+            # Dentro do array
+            pos += 1
+            while True:
+                char = skip_ws()
+                if char == ']':
+                    return
+                if char == '':
+                    raise json.JSONDecodeError("Array não terminado", buf, pos)
+                yield decode()
+                char = skip_ws()
+                if char == ',':
+                    pos += 1
+                elif char != ']':
+                    raise json.JSONDecodeError("Esperado ',' ou ']'", buf, pos)
+
 
 def flatten_json(
     data: Dict[str, Any],
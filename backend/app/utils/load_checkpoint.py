@@ -0,0 +1,121 @@
+"""
+Checkpoints de carga por lote (QuickLoader com checkpoint=True).
+
+Cada lote de registros é inserido na mesma transação que atualiza a linha
+da tabela em load_checkpoints: ou o lote e o checkpoint entram juntos, ou
+nenhum dos dois. Assim uma nova tentativa com --resume continua exatamente
+do primeiro registro não confirmado, sem duplicar linhas.
+
+O checkpoint guarda o hash do arquivo: se o conteúdo mudou, a carga
+recomeça do zero.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from app.core.dialect import get_dialect
+
+
+@dataclass
+class CheckpointState:
+    """Progresso confirmado de uma carga."""
+    file_hash: str
+    records_done: int = 0
+    batches_done: int = 0
+    # Tabelas (principal e filhas) já criadas/limpas por esta carga
+    tables: List[str] = field(default_factory=list)
+
+
+class LoadCheckpoint:
+    """Leitura e gravação de checkpoints na tabela load_checkpoints."""
+
+    TABLE = "load_checkpoints"
+
+    def __init__(self, engine):
+        """
+        Inicializa e cria a tabela de checkpoints se necessário.
+
+        Args:
+            engine: SQLAlchemy Engine
+        """
+        self.engine = engine
+        self.dialect = get_dialect(engine)
+        self._ensure_table()
+
+    def _ensure_table(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    table_name VARCHAR(255) NOT NULL PRIMARY KEY,
+                    file_name VARCHAR(255) NOT NULL,
+                    file_hash VARCHAR(64) NOT NULL,
+                    records_done BIGINT NOT NULL DEFAULT 0,
+                    batches_done INT NOT NULL DEFAULT 0,
+                    tables_done TEXT,
+                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                ){self.dialect.create_table_suffix()}
+            """))
+
+    def get(self, table_name: str) -> Optional[CheckpointState]:
+        """Último checkpoint confirmado da tabela, ou None."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    f"SELECT file_hash, records_done, batches_done, tables_done "
+                    f"FROM {self.TABLE} WHERE table_name = :table_name"
+                ),
+                {"table_name": table_name},
+            ).fetchone()
+        if row is None:
+            return None
+        return CheckpointState(
+            file_hash=row[0],
+            records_done=int(row[1]),
+            batches_done=int(row[2]),
+            tables=[t for t in (row[3] or "").split(",") if t],
+        )
+
+    def save(self, conn, table_name: str, file_path: Path, state: CheckpointState) -> None:
+        """
+        Grava o checkpoint na conexão/transação do lote.
+
+        Args:
+            conn: Conexão em transação (a mesma dos INSERTs do lote)
+            table_name: Tabela principal da carga
+            file_path: Arquivo sendo carregado
+            state: Progresso após o lote
+        """
+        upsert = self.dialect.upsert_clause(
+            ("table_name",),
+            update_columns=(
+                "file_name", "file_hash", "records_done", "batches_done", "tables_done",
+            ),
+            touch_columns=("updated_at",),
+        )
+        conn.execute(
+            text(f"""
+                INSERT INTO {self.TABLE}
+                (table_name, file_name, file_hash, records_done, batches_done, tables_done)
+                VALUES (:table_name, :file_name, :file_hash, :records_done, :batches_done, :tables)
+                {upsert}
+            """),
+            {
+                "table_name": table_name,
+                "file_name": Path(file_path).name,
+                "file_hash": state.file_hash,
+                "records_done": state.records_done,
+                "batches_done": state.batches_done,
+                "tables": ",".join(state.tables),
+            },
+        )
+
+    def clear(self, table_name: str) -> None:
+        """Remove o checkpoint (carga concluída)."""
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"DELETE FROM {self.TABLE} WHERE table_name = :table_name"),
+                {"table_name": table_name},
+            )
@@ -0,0 +1,119 @@
+"""
+Tabela de casamento dos receipts com o extrato (<tabela>_receipts_match).
+
+A QUERY_PADRAO acha o receipt de cada parcela do extrato pela chave
+(empresa, título, parcela) e pelo valor: netAmount = receiptValue. Na
+tabela filha criada pelo loader isso é igualdade de DOUBLE sobre colunas
+TEXT/DOUBLE, com um índice largo. Depois de cada carga de SI_DATAPAGTO a
+mesma informação é materializada numa tabela compacta e tipada: chave
+inteira (companyId, billId, installmentId, amountCents) mais o
+accountNumber, tudo na chave primária. O join compara inteiros e é
+resolvido só pelo índice (cobertura), sem ler a tabela.
+
+accountNumber faz parte da chave e não pode ser NULL: ausente vira '' e a
+consulta devolve NULLIF(accountNumber, '').
+"""
+
+from typing import Optional
+
+from sqlalchemy import inspect, text
+
+from app.core.dialect import get_dialect
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Tabelas cujos receipts alimentam a QUERY_PADRAO (SI_DATAPAGTO, bench_SI_DATAPAGTO...)
+SOURCE_MARKER = "DATAPAGTO"
+
+# Colunas da tabela filha obrigatórias para o casamento
+SOURCE_COLUMNS = ("companyId", "billId", "installmentId", "netAmount")
+
+MATCH_COLUMNS = ("companyId", "billId", "installmentId", "amountCents", "accountNumber")
+
+
+def receipts_match_table(receipts_table: str) -> str:
+    """Nome da tabela de casamento de uma tabela de receipts."""
+    return f"{receipts_table}_match"
+
+
+def match_table_ddl(match_table: str, dialect) -> str:
+    """CREATE TABLE da tabela de casamento (guardada na ordem da chave)."""
+    return f"""
+    CREATE TABLE IF NOT EXISTS `{match_table}` (
+      companyId BIGINT NOT NULL,
+      billId BIGINT NOT NULL,
+      installmentId BIGINT NOT NULL,
+      amountCents BIGINT NOT NULL,
+      accountNumber VARCHAR(50) NOT NULL DEFAULT '',
+      PRIMARY KEY ({", ".join(MATCH_COLUMNS)})
+    ){dialect.create_table_suffix(clustered=True)}
+    """
+
+
+def rebuild_receipts_match(engine, receipts_table: str) -> Optional[int]:
+    """
+    Recria o conteúdo da tabela de casamento a partir dos receipts.
+
+    DELETE e INSERT ... SELECT rodam na mesma transação: a consolidação
+    nunca vê a tabela vazia no meio da troca.
+
+    Returns:
+        int: Chaves gravadas, ou None se a tabela de receipts não tem as
+            colunas do casamento
+    """
+    columns = {col["name"] for col in inspect(engine).get_columns(receipts_table)}
+    missing = [col for col in SOURCE_COLUMNS if col not in columns]
+    if missing:
+        logger.warning(
+            f"⚠ {receipts_table} sem {', '.join(missing)}: tabela de casamento não gerada"
+        )
+        return None
+
+    match_table = receipts_match_table(receipts_table)
+    account = "COALESCE(`accountNumber`, '')" if "accountNumber" in columns else "''"
+    with engine.begin() as conn:
+        dialect = get_dialect(conn)
+        cast = dialect.cast_integer
+        conn.execute(text(match_table_ddl(match_table, dialect)))
+        conn.execute(text(f"DELETE FROM `{match_table}`"))
+        result = conn.execute(text(f"""
+            INSERT INTO `{match_table}` ({", ".join(MATCH_COLUMNS)})
+            SELECT DISTINCT
+              {cast("`companyId`")},
+              {cast("`billId`")},
+              {cast("`installmentId`")},
+              {cast("ROUND(`netAmount` * 100)")},
+              {account}
+            FROM `{receipts_table}`
+            WHERE `companyId` IS NOT NULL
+              AND `billId` IS NOT NULL
+              AND `installmentId` IS NOT NULL
+              AND `netAmount` IS NOT NULL
+            ORDER BY 1, 2, 3, 4, 5
+        """))
+    logger.info(f"✓ {match_table}: {result.rowcount} chaves de casamento")
+    return result.rowcount
+
+
+def refresh_receipts_match(engine, table_name: str, changed: bool = True) -> Optional[int]:
+    """
+    Atualiza a tabela de casamento depois da carga de table_name.
+
+    Só age nas tabelas de pagamento (SOURCE_MARKER no nome) que têm
+    tabela filha de receipts. Com changed=False (carga pulada, arquivo
+    inalterado) só gera a tabela se ela ainda não existir.
+
+    Returns:
+        int: Chaves gravadas, ou None se nada foi feito
+    """
+    if SOURCE_MARKER not in table_name.upper():
+        return None
+    receipts_table = f"{table_name}_receipts"
+    inspector = inspect(engine)
+    if not inspector.has_table(receipts_table):
+        return None
+    if not changed and inspector.has_table(receipts_match_table(receipts_table)):
+        return None
+    return rebuild_receipts_match(engine, receipts_table)
@@ -0,0 +1,386 @@
+"""
+Detecção de mudanças por registro via hash de linha.
+
+Cada linha achatada recebe uma chave estável (_row_key) montada a partir
+das chaves naturais do Sienge (companyId, billReceivableId, billId,
+installmentId, id) e um hash do conteúdo. Os hashes ficam na tabela
+_row_hashes; numa recarga basta comparar para saber o que inserir,
+atualizar ou remover. Os títulos afetados vão para _changed_bills, que a
+consolidação incremental (query/execute_query.py --incremental) consome.
+
+O mesmo hash, gravado em _row_hash por deduplicate_split, é a chave única
+das tabelas SI_*: linhas repetidas (arquivo recarregado em append, explosão
+de listas replicando registros) não entram duas vezes, e a QUERY_PADRAO
+dispensa o SELECT DISTINCT.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text, bindparam
+
+from app.core.dialect import get_dialect
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Campos usados (na ordem) para montar a chave natural de uma linha
+NATURAL_KEY_FIELDS = (
+    "companyId",
+    "billReceivableId",
+    "billId",
+    "installmentId",
+    "id",
+    "Id",
+)
+
+# Colunas técnicas que não entram no hash do conteúdo
+HASH_EXCLUDED_FIELDS = frozenset({"_row_id", "_parent_id", "_row_key", "_row_hash"})
+
+# Coluna com o hash do conteúdo, chave única das tabelas carregadas
+ROW_HASH_FIELD = "_row_hash"
+
+# Tamanho dos lotes de IN (...) em DELETE/SELECT
+KEY_BATCH_SIZE = 1000
+
+
+def natural_key(row: Dict[str, Any]) -> str:
+    """
+    Monta a chave natural de uma linha (sem o sufixo de ocorrência).
+
+    Exemplo:
+        >>> natural_key({"companyId": 1, "billId": 10, "installmentId": 2, "x": 5})
+        'companyId=1|billId=10|installmentId=2'
+    """
+    return "|".join(
+        f"{key}={row[key]}" for key in NATURAL_KEY_FIELDS if key in row
+    )
+
+
+def assign_row_keys(rows: Iterable[Dict[str, Any]], field_name: str = "_row_key") -> None:
+    """
+    Grava em cada linha uma chave única e estável.
+
+    Linhas com a mesma chave natural (ex: vários receipts da mesma parcela
+    explodidos na tabela principal) recebem sufixo #0, #1, ... na ordem do
+    arquivo, que é estável entre sincronizações do Sienge.
+    """
+    seen: Dict[str, int] = {}
+    for row in rows:
+        base = natural_key(row)
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        row[field_name] = f"{base}#{occurrence}"
+
+
+def stable_id(key: str) -> str:
+    """Id determinístico (32 hex) para usar como _row_id a partir de uma chave."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def row_hash(row: Dict[str, Any]) -> str:
+    """Hash do conteúdo da linha, ignorando colunas técnicas."""
+    payload = {k: v for k, v in row.items() if k not in HASH_EXCLUDED_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _occurrence_hash(digest: str, occurrence: int) -> str:
+    """Hash da n-ésima linha igual do mesmo registro (a primeira mantém o hash)."""
+    if not occurrence:
+        return digest
+    return hashlib.blake2b(
+        f"{digest}#{occurrence}".encode("ascii"), digest_size=16
+    ).hexdigest()
+
+
+def deduplicate_split(split: Dict[str, List[Dict[str, Any]]]) -> int:
+    """
+    Remove linhas repetidas de um split (saída de _split_nested), no lugar.
+
+    Cada linha ganha ROW_HASH_FIELD com o hash do conteúdo; fica a primeira
+    ocorrência. Nas filhas o hash inclui o hash do pai (não o _parent_id,
+    que é um uuid por registro) e o _parent_id de um pai descartado passa a
+    apontar para o pai mantido: filhas de registros repetidos colapsam,
+    filhas de registros distintos com o mesmo conteúdo continuam separadas.
+
+    Itens iguais da mesma lista de um registro (dois receipts idênticos,
+    explodidos na principal ou numa filha) são linhas distintas: o hash
+    leva a ocorrência do conteúdo dentro do registro, como o sufixo #n de
+    assign_row_keys. Só o mesmo registro entregue de novo colapsa.
+
+    Returns:
+        int: Linhas descartadas (todas as tabelas)
+    """
+    removed = 0
+    parent_hashes: Dict[Any, str] = {}
+    kept_ids: Dict[str, Any] = {}
+
+    unique = []
+    occurrences: Dict[Tuple[Any, str], int] = {}
+    for row in split.get("main", []):
+        digest = row_hash(row)
+        # Linhas explodidas do mesmo registro compartilham o _row_id
+        if row.get("_row_id") is not None:
+            slot = (row["_row_id"], digest)
+            digest = _occurrence_hash(digest, occurrences.get(slot, 0))
+            occurrences[slot] = occurrences.get(slot, 0) + 1
+        row[ROW_HASH_FIELD] = digest
+        if "_row_id" in row:
+            parent_hashes[row["_row_id"]] = digest
+        if digest in kept_ids:
+            continue
+        kept_ids[digest] = row.get("_row_id")
+        unique.append(row)
+    removed += len(split.get("main", [])) - len(unique)
+    if "main" in split:
+        split["main"] = unique
+
+    for target, rows in split.items():
+        if target == "main":
+            continue
+        seen: Set[str] = set()
+        unique = []
+        occurrences = {}
+        for row in rows:
+            parent_hash = parent_hashes.get(row.get("_parent_id"))
+            digest = row_hash(row)
+            slot = (row.get("_parent_id"), digest)
+            digest = _occurrence_hash(digest, occurrences.get(slot, 0))
+            occurrences[slot] = occurrences.get(slot, 0) + 1
+            if parent_hash is not None:
+                row["_parent_id"] = kept_ids[parent_hash]
+                digest = hashlib.blake2b(
+                    f"{parent_hash}:{digest}".encode("ascii"), digest_size=16
+                ).hexdigest()
+            row[ROW_HASH_FIELD] = digest
+            if digest in seen:
+                continue
+            seen.add(digest)
+            unique.append(row)
+        removed += len(rows) - len(unique)
+        split[target] = unique
+
+    return removed
+
+
+def bill_of(row: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    """Retorna (companyId, billId) da linha, ou None onde não houver inteiro."""
+
+    def _as_int(value):
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    bill = row.get("billReceivableId", row.get("billId"))
+    return _as_int(row.get("companyId")), _as_int(bill)
+
+
+@dataclass
+class RowDiff:
+    """Diferença entre hashes armazenados e hashes da nova carga."""
+    inserted: Set[str] = field(default_factory=set)
+    updated: Set[str] = field(default_factory=set)
+    deleted: Set[str] = field(default_factory=set)
+
+    @property
+    def changed(self) -> Set[str]:
+        """Chaves cujas linhas antigas precisam sair da tabela."""
+        return self.updated | self.deleted
+
+    @property
+    def to_insert(self) -> Set[str]:
+        """Chaves cujas linhas novas precisam entrar na tabela."""
+        return self.inserted | self.updated
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+def diff_hashes(old: Dict[str, str], new: Dict[str, str]) -> RowDiff:
+    """
+    Compara {chave: hash} antigo e novo.
+
+    Args:
+        old: Hashes armazenados
+        new: Hashes da carga atual
+
+    Returns:
+        RowDiff com chaves inseridas, alteradas e removidas
+    """
+    diff = RowDiff()
+    for key, digest in new.items():
+        previous = old.get(key)
+        if previous is None:
+            diff.inserted.add(key)
+        elif previous != digest:
+            diff.updated.add(key)
+    diff.deleted = set(old) - set(new)
+    return diff
+
+
+class RowHashStore:
+    """Persistência dos hashes de linha e dos títulos alterados."""
+
+    def __init__(self, engine):
+        """
+        Inicializa o store.
+
+        Args:
+            engine: SQLAlchemy Engine
+        """
+        self.engine = engine
+        self._ensure_tables()
+
+    def _ensure_tables(self) -> None:
+        """Cria _row_hashes e _changed_bills se não existirem."""
+        suffix = get_dialect(self.engine).create_table_suffix()
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS _row_hashes (
+                    table_name VARCHAR(64) NOT NULL,
+                    row_key VARCHAR(255) NOT NULL,
+                    row_hash CHAR(32) NOT NULL,
+                    company_id BIGINT NULL,
+                    bill_id BIGINT NULL,
+                    PRIMARY KEY (table_name, row_key)
+                ){suffix}
+            """))
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS _changed_bills (
+                    company_id BIGINT NOT NULL,
+                    bill_id BIGINT NOT NULL,
+                    source_table VARCHAR(64) NOT NULL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (company_id, bill_id, source_table)
+                ){suffix}
+            """))
+
+    def load(self, table_name: str) -> Dict[str, Tuple[str, Optional[int], Optional[int]]]:
+        """
+        Lê os hashes armazenados de uma tabela.
+
+        Returns:
+            Dict {row_key: (row_hash, company_id, bill_id)}
+        """
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                text(
+                    "SELECT row_key, row_hash, company_id, bill_id "
+                    "FROM _row_hashes WHERE table_name = :table_name"
+                ),
+                {"table_name": table_name},
+            )
+            return {r[0]: (r[1], r[2], r[3]) for r in result}
+
+    def save(
+        self,
+        conn,
+        table_name: str,
+        entries: Dict[str, Tuple[str, Optional[int], Optional[int]]],
+        deleted: Iterable[str] = (),
+        replace_all: bool = False,
+    ) -> None:
+        """
+        Atualiza hashes dentro da transação da carga.
+
+        Args:
+            conn: Conexão em transação (a mesma que alterou a tabela)
+            table_name: Tabela de origem
+            entries: {row_key: (row_hash, company_id, bill_id)} a gravar
+            deleted: Chaves removidas
+            replace_all: Apaga todos os hashes da tabela antes de gravar
+        """
+        if replace_all:
+            conn.execute(
+                text("DELETE FROM _row_hashes WHERE table_name = :table_name"),
+                {"table_name": table_name},
+            )
+        else:
+            keys = list(set(deleted) | set(entries))
+            stmt = text(
+                "DELETE FROM _row_hashes WHERE table_name = :table_name AND row_key IN :keys"
+            ).bindparams(bindparam("keys", expanding=True))
+            for start in range(0, len(keys), KEY_BATCH_SIZE):
+                conn.execute(
+                    stmt,
+                    {"table_name": table_name, "keys": keys[start:start + KEY_BATCH_SIZE]},
+                )
+
+        params = [
+            {
+                "table_name": table_name,
+                "row_key": key,
+                "row_hash": digest,
+                "company_id": company_id,
+                "bill_id": bill_id,
+            }
+            for key, (digest, company_id, bill_id) in entries.items()
+        ]
+        insert = text(
+            "INSERT INTO _row_hashes (table_name, row_key, row_hash, company_id, bill_id) "
+            "VALUES (:table_name, :row_key, :row_hash, :company_id, :bill_id)"
+        )
+        for start in range(0, len(params), KEY_BATCH_SIZE):
+            conn.execute(insert, params[start:start + KEY_BATCH_SIZE])
+
+    def forget(self, conn, table_name: str) -> None:
+        """Remove os hashes de uma tabela (força carga completa na próxima vez)."""
+        conn.execute(
+            text("DELETE FROM _row_hashes WHERE table_name = :table_name"),
+            {"table_name": table_name},
+        )
+
+    @staticmethod
+    def mark_changed_bills(
+        conn,
+        source_table: str,
+        bills: Iterable[Tuple[Optional[int], Optional[int]]],
+    ) -> int:
+        """
+        Registra títulos alterados para a consolidação incremental.
+
+        Args:
+            conn: Conexão em transação
+            source_table: Tabela onde a mudança ocorreu
+            bills: Pares (companyId, billId)
+
+        Returns:
+            int: Quantidade de títulos registrados
+        """
+        params = [
+            {"company_id": company_id, "bill_id": bill_id, "source_table": source_table}
+            for company_id, bill_id in set(bills)
+            if company_id is not None and bill_id is not None
+        ]
+        upsert = get_dialect(conn).upsert_clause(
+            ("company_id", "bill_id", "source_table"), touch_columns=("changed_at",)
+        )
+        stmt = text(
+            "INSERT INTO _changed_bills (company_id, bill_id, source_table) "
+            f"VALUES (:company_id, :bill_id, :source_table) {upsert}"
+        )
+        for start in range(0, len(params), KEY_BATCH_SIZE):
+            conn.execute(stmt, params[start:start + KEY_BATCH_SIZE])
+        return len(params)
+
+
+def delete_rows_by_key(conn, table_name: str, keys: List[str], key_column: str = "_row_key") -> int:
+    """
+    Apaga linhas de table_name cujo key_column está em keys (em lotes).
+
+    Returns:
+        int: Linhas apagadas
+    """
+    stmt = text(
+        f"DELETE FROM `{table_name}` WHERE `{key_column}` IN :keys"
+    ).bindparams(bindparam("keys", expanding=True))
+    deleted = 0
+    for start in range(0, len(keys), KEY_BATCH_SIZE):
+        result = conn.execute(stmt, {"keys": keys[start:start + KEY_BATCH_SIZE]})
+        deleted += result.rowcount or 0
+    return deleted
@@ -11,6 +11,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.types import TypeEngine
 from app.core.logger import get_logger
+from app.utils.column_stats import SchemaStats
 from datetime import datetime, date
 
 logger = get_logger(__name__)
@@ -117,7 +118,40 @@ class SchemaInferencer:
             str: Comando SQL CREATE TABLE
         """
         types = SchemaInferencer.infer_types(df)
+        return SchemaInferencer._build_create_table(table_name, types, indexes)
+    
+    @staticmethod
+    def generate_create_table_from_stats(
+        table_name: str,
+        stats: SchemaStats,
+        primary_key: Optional[str] = None,
+        indexes: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Gera comando CREATE TABLE a partir de estatísticas acumuladas.
+        
+        Evita montar um DataFrame: os tipos vêm de SchemaStats, que pode
+        ter sido alimentado com o arquivo inteiro em streaming.
         
+        Args:
+            table_name: Nome da tabela
+            stats: Estatísticas das colunas
+            primary_key: Nome da coluna chave primária
+            indexes: Colunas para criar índices
+        
+        Returns:
+            str: Comando SQL CREATE TABLE
+        """
+        types = stats.infer_types()
+        return SchemaInferencer._build_create_table(table_name, types, indexes)
+    
+    @staticmethod
+    def _build_create_table(
+        table_name: str,
+        types: Dict[str, str],
+        indexes: Optional[List[str]] = None,
+    ) -> str:
+        """Monta o CREATE TABLE a partir de {coluna: tipo_sql}."""
         columns = []
         
         # ID auto-increment como PK por padrão
@@ -1,55 +1,145 @@
 """
 Sistema de rastreamento de uploads JSON.
 
-Evita reuploads de arquivos duplicados usando hash SHA256.
+Evita reuploads de arquivos duplicados usando hash de conteúdo (BLAKE2b).
+O hash é calculado com leituras de 1 MB e cacheado por (tamanho, mtime),
+então arquivos intocados nem chegam a ser relidos.
 """
 
 import hashlib
 import json
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlalchemy import text, Column, String, DateTime, Integer, Float
 from sqlalchemy.orm import declarative_base
 
+from app.core.dialect import get_dialect
+
 Base = declarative_base()
 
+# Leitura em blocos de 1 MB (menos syscalls que os 4 KB anteriores)
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Cache padrão de hashes: backend/.cache/file_hashes.json
+DEFAULT_HASH_CACHE = Path(__file__).resolve().parents[2] / '.cache' / 'file_hashes.json'
+
 
 def calculate_file_hash(file_path: Path) -> str:
     """
-    Calcula o hash SHA256 de um arquivo.
+    Calcula o hash BLAKE2b (256 bits) de um arquivo.
+    
+    BLAKE2b é mais rápido que SHA256 em CPUs 64 bits e gera os mesmos
+    64 caracteres hex, compatível com a coluna file_hash.
     
     Args:
         file_path: Caminho do arquivo
     
     Returns:
-        Hash SHA256 em hexadecimal
+        Hash em hexadecimal
     """
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    file_hash = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            file_hash.update(view[:n])
+    return file_hash.hexdigest()
+
+
+class FileHashCache:
+    """
+    Cache de hashes por caminho, validado por tamanho + mtime.
+    
+    Se o arquivo não mudou de tamanho nem de mtime desde o último cálculo,
+    devolve o hash salvo sem reler o conteúdo.
+    """
+    
+    def __init__(self, cache_path: Optional[Path] = DEFAULT_HASH_CACHE):
+        """
+        Inicializa o cache.
+        
+        Args:
+            cache_path: Arquivo JSON de persistência (None = só em memória)
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._entries: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._load()
+    
+    def _load(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except Exception:
+            self._entries = {}
+    
+    def _save(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"⚠️ Aviso ao salvar cache de hashes: {e}")
+    
+    def get_hash(self, file_path: Path) -> str:
+        """
+        Retorna o hash do arquivo, recalculando só se tamanho/mtime mudaram.
+        
+        Args:
+            file_path: Caminho do arquivo
+        
+        Returns:
+            Hash BLAKE2b em hexadecimal
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        key = str(file_path.resolve())
+        
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        
+        file_hash = calculate_file_hash(file_path)
+        with self._lock:
+            self._entries[key] = [stat.st_size, stat.st_mtime_ns, file_hash]
+            self._save()
+        return file_hash
 
 
 class UploadTracker:
     """Gerencia rastreamento de uploads no banco de dados."""
     
-    def __init__(self, engine):
+    def __init__(self, engine, hash_cache: Optional[FileHashCache] = None):
         """
         Inicializa o rastreador.
         
         Args:
             engine: SQLAlchemy Engine
+            hash_cache: Cache de hashes (padrão: backend/.cache/file_hashes.json)
         """
         self.engine = engine
+        self.hash_cache = hash_cache or FileHashCache()
         self._ensure_tracking_table()
     
     def _ensure_tracking_table(self):
         """Cria a tabela de rastreamento se não existir."""
-        create_table_sql = """
+        dialect = get_dialect(self.engine)
+        create_table_sql = f"""
         CREATE TABLE IF NOT EXISTS uploads_tracking (
-            id INT AUTO_INCREMENT PRIMARY KEY,
+            id {dialect.auto_increment_pk},
             file_name VARCHAR(255) NOT NULL,
             file_hash VARCHAR(64) NOT NULL UNIQUE,
             table_name VARCHAR(255) NOT NULL,
@@ -58,14 +148,14 @@ class UploadTracker:
             upload_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
             execution_time_seconds FLOAT NOT NULL,
             status VARCHAR(50) NOT NULL,
-            error_message TEXT,
-            INDEX idx_file_hash (file_hash),
-            INDEX idx_upload_date (upload_date)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+            error_message TEXT
+        ){dialect.create_table_suffix()}
         """
         try:
             with self.engine.connect() as connection:
                 connection.execute(text(create_table_sql))
+                dialect.ensure_index(connection, 'uploads_tracking', 'idx_file_hash', ['file_hash'])
+                dialect.ensure_index(connection, 'uploads_tracking', 'idx_upload_date', ['upload_date'])
                 connection.commit()
         except Exception as e:
             print(f"⚠️ Aviso ao criar tabela de rastreamento: {e}")
@@ -80,7 +170,7 @@ class UploadTracker:
         Returns:
             Dicionário com informações do upload anterior, ou None
         """
-        file_hash = calculate_file_hash(file_path)
+        file_hash = self.hash_cache.get_hash(file_path)
         
         query = text("""
             SELECT id, file_name, table_name, rows_inserted, upload_date, status
@@ -109,6 +199,50 @@ class UploadTracker:
         
         return None
     
+    def is_current(self, file_path: Path, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Verifica se a última carga bem-sucedida em table_name veio deste conteúdo.
+        
+        Diferente de file_already_uploaded, compara com o upload MAIS RECENTE
+        da tabela: se o arquivo voltou a um conteúdo antigo (A → B → A), a
+        tabela tem B e o arquivo precisa ser recarregado.
+        
+        Args:
+            file_path: Caminho do arquivo
+            table_name: Tabela destino
+        
+        Returns:
+            Dicionário com o upload anterior se o conteúdo é o mesmo, ou None
+        """
+        file_hash = self.hash_cache.get_hash(file_path)
+        
+        query = text("""
+            SELECT id, file_name, file_hash, rows_inserted, upload_date, status
+            FROM uploads_tracking
+            WHERE table_name = :table_name
+            ORDER BY upload_date DESC, id DESC
+            LIMIT 1
+        """)
+        
+        try:
+            with self.engine.connect() as connection:
+                result = connection.execute(query, {"table_name": table_name}).fetchone()
+        except Exception as e:
+            print(f"⚠️ Erro ao verificar arquivo: {e}")
+            return None
+        
+        if result and result[2] == file_hash and result[5] == 'success':
+            return {
+                'id': result[0],
+                'file_name': result[1],
+                'table_name': table_name,
+                'rows_inserted': result[3],
+                'upload_date': result[4],
+                'status': result[5],
+                'file_hash': file_hash
+            }
+        return None
+    
     def register_upload(self, file_path: Path, table_name: str, rows_inserted: int, 
                        execution_time: float, status: str = 'success', 
                        error_message: Optional[str] = None) -> bool:
@@ -126,16 +260,25 @@ class UploadTracker:
         Returns:
             True se registrado com sucesso
         """
-        file_hash = calculate_file_hash(file_path)
+        file_hash = self.hash_cache.get_hash(file_path)
         file_size = file_path.stat().st_size
         
-        insert_sql = text("""
+        # file_hash é UNIQUE: recarga do mesmo conteúdo atualiza o registro
+        upsert = get_dialect(self.engine).upsert_clause(
+            ('file_hash',),
+            update_columns=(
+                'file_name', 'table_name', 'rows_inserted', 'file_size_bytes',
+                'execution_time_seconds', 'status', 'error_message', 'upload_date',
+            ),
+        )
+        insert_sql = text(f"""
             INSERT INTO uploads_tracking 
             (file_name, file_hash, table_name, rows_inserted, file_size_bytes, 
              execution_time_seconds, status, error_message, upload_date)
             VALUES 
             (:file_name, :file_hash, :table_name, :rows_inserted, :file_size, 
              :exec_time, :status, :error_msg, :upload_date)
+            {upsert}
         """)
         
         try:
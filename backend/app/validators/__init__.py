@@ -1,11 +1,24 @@
 """
 Validators para dados e schema.
+
+DataValidator/ReferentialValidator checam DataFrames inteiros;
+StreamingValidator (streaming.py) aplica as mesmas regras lote a lote
+durante a carga.
 """
 
 from typing import Dict, List, Tuple, Any
 import pandas as pd
 from app.core.logger import get_logger
 from app.core.exceptions import ValidationError
+from app.validators.streaming import (
+    ForeignKey,
+    KeyIndex,
+    StreamingValidator,
+    TableReport,
+    ValidationReport,
+    ValidationRules,
+    key_hashes,
+)
 
 logger = get_logger(__name__)
 
@@ -126,14 +139,28 @@ class ReferentialValidator:
         elif parent_column not in parent_df.columns:
             errors.append(f"Coluna PK não existe: {parent_column}")
         else:
-            # Verifica se todos os FKs existem no parent
-            parent_values = set(parent_df[parent_column].unique())
-            child_values = child_df[child_column].dropna().unique()
+            # Verifica se todos os FKs existem no parent (hash + busca binária)
+            parent_index = KeyIndex.from_frame(parent_df, [parent_column])
+            child_values = child_df[[child_column]].dropna().drop_duplicates()
             
-            orphans = set(child_values) - parent_values
-            if orphans:
+            orphans = child_values[~parent_index.contains(
+                key_hashes(child_values, [child_column])
+            )]
+            if len(orphans):
                 errors.append(
                     f"{len(orphans)} registros órfãos em {child_column}"
                 )
         
         return len(errors) == 0, errors
+
+
+__all__ = [
+    'DataValidator',
+    'ReferentialValidator',
+    'StreamingValidator',
+    'ValidationRules',
+    'ValidationReport',
+    'TableReport',
+    'ForeignKey',
+    'KeyIndex',
+]
@@ -0,0 +1,346 @@
+"""
+Validação por lote durante a carga (etapa "validate" do QuickLoader).
+
+Cada lote vira um DataFrame só com as colunas das regras e é checado com
+operações vetorizadas (isna, hash, searchsorted): nulos em colunas
+obrigatórias, chaves duplicadas (inclusive entre lotes), valores fora de
+faixa e chaves estrangeiras órfãs. O resultado é um ValidationReport
+acumulado, sem segunda passada pelos dados.
+
+Chaves (únicas e estrangeiras) são guardadas como hash uint64 em arrays
+ordenados (KeyIndex): 8 bytes por chave, consulta por busca binária.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Chaves de relacionamento dos arquivos SI_* (mesmas do _split_nested)
+LINK_KEYS = ("companyId", "billId", "installmentId")
+
+# Runs ordenados antes de compactar o KeyIndex num único array
+MAX_INDEX_RUNS = 8
+
+
+def key_hashes(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """
+    Hash uint64 por linha das colunas da chave.
+
+    Valores são normalizados para texto antes do hash: 10 (JSON), 10.0
+    (coluna float por causa de NULLs) e '10' (VARCHAR no banco) viram a
+    mesma chave.
+    """
+    keys = {}
+    for col in columns:
+        values = df[col]
+        if pd.api.types.is_float_dtype(values):
+            finite = values.dropna()
+            if (finite == np.floor(finite)).all():
+                values = values.astype("Int64")
+        keys[col] = values.astype(str)
+    keys = pd.DataFrame(keys, index=df.index)
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+
+class KeyIndex:
+    """
+    Conjunto compacto de chaves (hash uint64) em arrays ordenados.
+
+    Chaves novas entram como runs ordenados; com muitos runs eles são
+    fundidos num só. contains() faz busca binária vetorizada em cada run.
+    """
+
+    def __init__(self):
+        self._runs: List[np.ndarray] = []
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Sequence[str]) -> 'KeyIndex':
+        """Índice das chaves não nulas de um DataFrame."""
+        index = cls()
+        index.add(key_hashes(df.dropna(subset=list(columns)), columns))
+        return index
+
+    @classmethod
+    def from_table(
+        cls,
+        engine,
+        table_name: str,
+        columns: Sequence[str],
+        chunk_size: int = 100_000,
+    ) -> 'KeyIndex':
+        """
+        Índice das chaves de uma tabela do banco, lido em chunks uma única vez.
+
+        Args:
+            engine: SQLAlchemy Engine
+            table_name: Tabela pai
+            columns: Colunas da chave
+            chunk_size: Linhas por leitura
+        """
+        index = cls()
+        cols_sql = ", ".join(f"`{col}`" for col in columns)
+        not_null = " AND ".join(f"`{col}` IS NOT NULL" for col in columns)
+        query = text(f"SELECT {cols_sql} FROM `{table_name}` WHERE {not_null}")
+        with engine.connect() as conn:
+            for chunk in pd.read_sql(query, conn, chunksize=chunk_size):
+                index.add(key_hashes(chunk, columns))
+        return index
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Acrescenta hashes ao índice."""
+        if len(hashes):
+            self._runs.append(np.unique(hashes))
+        if len(self._runs) > MAX_INDEX_RUNS:
+            self._runs = [np.unique(np.concatenate(self._runs))]
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara booleana: quais hashes já estão no índice."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            pos = np.searchsorted(run, hashes)
+            pos[pos == len(run)] = 0
+            found |= run[pos] == hashes
+        return found
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays."""
+        return sum(run.nbytes for run in self._runs)
+
+
+@dataclass
+class ForeignKey:
+    """
+    Chave estrangeira de uma tabela.
+
+    O índice pai vem pronto (ex: KeyIndex.from_table) ou, sem index, é
+    montado pelo próprio validador com os lotes já validados de
+    parent_table (tabela principal da mesma carga).
+    """
+    columns: List[str]
+    parent_table: str
+    parent_columns: List[str]
+    index: Optional[KeyIndex] = None
+
+
+@dataclass
+class ValidationRules:
+    """Regras de uma tabela."""
+    required: List[str] = field(default_factory=list)
+    unique: List[str] = field(default_factory=list)
+    ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    foreign_keys: List[ForeignKey] = field(default_factory=list)
+
+    @property
+    def columns(self) -> List[str]:
+        """Colunas usadas pelas regras (as únicas que viram DataFrame)."""
+        cols = list(self.required) + list(self.unique) + list(self.ranges)
+        for fk in self.foreign_keys:
+            cols += fk.columns
+        return list(dict.fromkeys(cols))
+
+
+@dataclass
+class TableReport:
+    """Problemas encontrados numa tabela."""
+    rows: int = 0
+    missing_columns: List[str] = field(default_factory=list)
+    nulls: Dict[str, int] = field(default_factory=dict)
+    duplicates: int = 0
+    out_of_range: Dict[str, int] = field(default_factory=dict)
+    orphans: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> bool:
+        return not (
+            self.missing_columns or self.nulls or self.duplicates
+            or self.out_of_range or self.orphans
+        )
+
+    def errors(self, table_name: str) -> List[str]:
+        """Mensagens no formato do DataValidator."""
+        errors = [f"{table_name}: coluna obrigatória faltando: {col}" for col in self.missing_columns]
+        errors += [f"{table_name}: coluna '{col}' tem {n} NULLs" for col, n in self.nulls.items()]
+        if self.duplicates:
+            errors.append(f"{table_name}: {self.duplicates} registros duplicados")
+        errors += [
+            f"{table_name}: {n} valores fora do range em {col}"
+            for col, n in self.out_of_range.items()
+        ]
+        errors += [
+            f"{table_name}: {n} registros órfãos em {col}" for col, n in self.orphans.items()
+        ]
+        return errors
+
+
+@dataclass
+class ValidationReport:
+    """Relatório acumulado de todas as tabelas de uma carga."""
+    tables: Dict[str, TableReport] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> bool:
+        return all(report.valid for report in self.tables.values())
+
+    @property
+    def errors(self) -> List[str]:
+        return [e for name, report in self.tables.items() for e in report.errors(name)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "valid": self.valid,
+            "tables": {
+                name: {
+                    "rows": report.rows,
+                    "missing_columns": list(report.missing_columns),
+                    "nulls": dict(report.nulls),
+                    "duplicates": report.duplicates,
+                    "out_of_range": dict(report.out_of_range),
+                    "orphans": dict(report.orphans),
+                }
+                for name, report in self.tables.items()
+            },
+        }
+
+
+def _add_counts(target: Dict[str, int], key: str, count: int) -> None:
+    if count:
+        target[key] = target.get(key, 0) + int(count)
+
+
+class StreamingValidator:
+    """
+    Valida lotes de linhas (dicts) conforme as regras de cada tabela.
+
+    Exemplo:
+        >>> validator = StreamingValidator({"SI_X": ValidationRules(required=["billId"])})
+        >>> for batch in JSONParser.iterate_file(path):
+        ...     validator.validate("SI_X", batch)
+        >>> validator.report.errors
+    """
+
+    def __init__(self, rules: Optional[Dict[str, ValidationRules]] = None):
+        self.rules: Dict[str, ValidationRules] = dict(rules or {})
+        self.report = ValidationReport()
+        # Chaves únicas já vistas por tabela
+        self._seen: Dict[str, KeyIndex] = {}
+        # Índices de pais montados a partir dos lotes validados
+        self._parents: Dict[Tuple[str, Tuple[str, ...]], KeyIndex] = {}
+
+    def validate(self, table_name: str, rows: Iterable[Dict[str, Any]]) -> TableReport:
+        """
+        Valida um lote e acumula no relatório.
+
+        Args:
+            table_name: Tabela destino do lote
+            rows: Linhas do lote (dicts)
+
+        Returns:
+            TableReport: Relatório acumulado da tabela
+        """
+        report = self.report.tables.setdefault(table_name, TableReport())
+        rows = rows if isinstance(rows, list) else list(rows)
+        report.rows += len(rows)
+        rules = self.rules.get(table_name)
+        parent_keys = [key for key in self._parents if key[0] == table_name]
+        if not rows or (rules is None and not parent_keys):
+            return report
+
+        wanted = (rules.columns if rules else []) + [c for _, cols in parent_keys for c in cols]
+        wanted = list(dict.fromkeys(wanted))
+        df = pd.DataFrame.from_records(rows, columns=wanted)
+        # Colunas que existem em algum registro (ausente != presente com NULL)
+        seen_keys = set().union(*(row.keys() for row in rows if isinstance(row, dict)))
+        present = {col for col in wanted if col in seen_keys}
+
+        if rules:
+            self._check(table_name, rules, df, present, report)
+
+        # Este lote passa a ser pai das filhas validadas depois
+        for key in parent_keys:
+            cols = list(key[1])
+            if set(cols) <= present:
+                self._parents[key].add(key_hashes(df.dropna(subset=cols), cols))
+
+        return report
+
+    def _check(self, table_name, rules, df, present, report) -> None:
+        for col in rules.required:
+            if col not in present:
+                if col not in report.missing_columns:
+                    report.missing_columns.append(col)
+                continue
+            _add_counts(report.nulls, col, df[col].isna().sum())
+
+        if rules.unique and set(rules.unique) <= present:
+            hashes = key_hashes(df, rules.unique)
+            seen = self._seen.setdefault(table_name, KeyIndex())
+            dup = pd.Series(hashes).duplicated().to_numpy() | seen.contains(hashes)
+            report.duplicates += int(dup.sum())
+            seen.add(hashes)
+
+        for col, (min_val, max_val) in rules.ranges.items():
+            if col not in present:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+            out = (values < min_val) | (values > max_val)
+            _add_counts(report.out_of_range, col, out.sum())
+
+        for fk in rules.foreign_keys:
+            if not set(fk.columns) <= present:
+                continue
+            index = fk.index
+            if index is None:
+                index = self._parents.get((fk.parent_table, tuple(fk.parent_columns)))
+                if index is None:
+                    continue
+            keys = df[fk.columns].dropna()
+            orphans = ~index.contains(key_hashes(keys, fk.columns))
+            _add_counts(report.orphans, ",".join(fk.columns), orphans.sum())
+
+    def expect_parent(self, parent_table: str, parent_columns: Sequence[str]) -> None:
+        """Registra que os lotes de parent_table alimentam um índice de pais."""
+        self._parents.setdefault((parent_table, tuple(parent_columns)), KeyIndex())
+
+    def add_split_rules(self, table_name: str, split: Dict[str, list]) -> None:
+        """
+        Regras padrão para a saída de QuickLoader._split_for_table.
+
+        Principal: chaves de relacionamento presentes (LINK_KEYS) são
+        obrigatórias. Filhas: _parent_id deve existir em _row_id da
+        principal. Pode ser chamado a cada lote: só tabelas novas ganham regras.
+        """
+        if table_name not in self.rules:
+            first_row = next((r for r in split.get("main", []) if isinstance(r, dict)), {})
+            self.rules[table_name] = ValidationRules(
+                required=[key for key in LINK_KEYS if key in first_row],
+            )
+            self.expect_parent(table_name, ["_row_id"])
+        for child in split:
+            if child != "main" and child not in self.rules:
+                self.rules[child] = ValidationRules(foreign_keys=[
+                    ForeignKey(["_parent_id"], table_name, ["_row_id"])
+                ])
+
+    def validate_split(self, table_name: str, split: Dict[str, list], batch_size: int) -> int:
+        """
+        Valida principal e filhas de um split, em lotes de batch_size linhas.
+
+        Returns:
+            int: Linhas validadas
+        """
+        self.add_split_rules(table_name, split)
+        total = 0
+        # "main" vem primeiro: os _row_id entram no índice antes das filhas
+        for key, rows in split.items():
+            target = table_name if key == "main" else key
+            for start in range(0, len(rows), batch_size):
+                self.validate(target, rows[start:start + batch_size])
+            total += len(rows)
+        return total
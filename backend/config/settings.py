@@ -38,6 +38,18 @@ class ChunkSize(int, Enum):
     UPSERT = 1000
 
 
+# Banco SQLite padrão quando DB_DIALECT=sqlite e SQLITE_PATH não é informado
+DEFAULT_SQLITE_PATH = BACKEND_DIR / "data" / "relatorio.sqlite3"
+
+
+def resolve_sqlite_path(value: Optional[str]) -> Path:
+    """SQLITE_PATH relativo é resolvido a partir de backend/ (independe do cwd)."""
+    if not value:
+        return DEFAULT_SQLITE_PATH
+    path = Path(value)
+    return path if path.is_absolute() else BACKEND_DIR / path
+
+
 @dataclass
 class DatabaseConfig:
     """Configuração de banco de dados."""
@@ -51,11 +63,16 @@ class DatabaseConfig:
     max_overflow: int = 20
     pool_timeout: int = 30
     pool_recycle: int = 3600
+    stats_log_interval: int = 60  # segundos entre logs de métricas do pool (0 desliga)
     echo: bool = False
+    dialect: str = "mysql"  # mysql ou sqlite (arquivo local, sem servidor)
+    sqlite_path: Path = DEFAULT_SQLITE_PATH
     
     @property
     def url(self) -> str:
         """Retorna URL SQLAlchemy com encoding de caracteres especiais."""
+        if self.dialect == "sqlite":
+            return f"sqlite:///{self.sqlite_path}"
         password_encoded = quote(self.password, safe='')
         return (
             f"mysql+pymysql://{self.user}:{password_encoded}@"
@@ -74,6 +91,10 @@ class LoggerConfig:
     log_dir: Path = Path("logs")
     max_bytes: int = 10 * 1024 * 1024  # 10 MB
     backup_count: int = 5
+    # Console/arquivo em thread própria via QueueHandler/QueueListener
+    use_queue: bool = False
+    # Registros por segundo por ponto de chamada (0 = sem limite)
+    rate_limit_per_second: int = 0
 
 
 @dataclass
@@ -118,13 +139,18 @@ class AppConfig:
                 user=os.getenv("MYSQL_USER", "root"),
                 password=os.getenv("MYSQL_PASSWORD", ""),
                 database=os.getenv("MYSQL_DATABASE", ""),
+                stats_log_interval=int(os.getenv("DB_POOL_STATS_INTERVAL", 60)),
                 echo=self.debug,
+                dialect=os.getenv("DB_DIALECT", "mysql").strip().lower(),
+                sqlite_path=resolve_sqlite_path(os.getenv("SQLITE_PATH")),
             )
         
         if self.logger is None:
             self.logger = LoggerConfig(
                 level="DEBUG" if self.debug else "INFO",
                 log_dir=self.root_dir / "logs",
+                use_queue=os.getenv("LOG_QUEUE", "0") == "1",
+                rate_limit_per_second=int(os.getenv("LOG_RATE_LIMIT", 0)),
             )
         
         if self.processing is None:
@@ -135,10 +161,15 @@ class AppConfig:
     
     def validate(self) -> None:
         """Valida configuração."""
-        if not self.database.user:
-            raise ValueError("MYSQL_USER não configurado")
-        if not self.database.database:
-            raise ValueError("MYSQL_DATABASE não configurado")
+        if self.database.dialect not in ("mysql", "sqlite"):
+            raise ValueError(f"DB_DIALECT inválido: {self.database.dialect} (use mysql ou sqlite)")
+        if self.database.dialect == "sqlite":
+            self.database.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            if not self.database.user:
+                raise ValueError("MYSQL_USER não configurado")
+            if not self.database.database:
+                raise ValueError("MYSQL_DATABASE não configurado")
         
         # Cria diretórios se não existirem
         self.logger.log_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Compara os caminhos de INSERT do QuickLoader (to_sql x executemany).
+
+Carrega o mesmo arquivo em tabelas temporárias (<tabela>__bench_<metodo>),
+mede linhas/segundo de cada método e remove as tabelas ao final.
+
+Uso:
+    python scripts/benchmark_insert.py --file data/SI_DATAPAGTO.json
+    python scripts/benchmark_insert.py --file data/SI_DATAPAGTO.json --repeat 3
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# ⚠️ VALIDA VIRTUAL ENVIRONMENT
+if 'VIRTUAL_ENV' not in os.environ and not hasattr(sys, 'real_prefix') and sys.prefix == sys.base_prefix:
+    error_msg = f"""
+╔════════════════════════════════════════════════════════════════════════════╗
+║                    ❌ ERRO: VIRTUAL ENVIRONMENT NÃO ATIVADO               ║
+╚════════════════════════════════════════════════════════════════════════════╝
+
+Execute primeiro:
+   Windows: .venv\\Scripts\\activate
+   macOS/Linux: source .venv/bin/activate
+"""
+    print(error_msg, file=sys.stderr)
+    sys.exit(1)
+
+import argparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.application import JSONMySQLApplication, ApplicationConfig
+from app.core import setup_logger, DatabaseManager
+from app.loaders.quick_loader import INSERT_METHODS
+
+logger = setup_logger('benchmark_insert')
+
+
+def drop_bench_tables(table_prefix: str) -> None:
+    """Remove tabelas criadas pelo benchmark (principal e filhas)."""
+    inspector = DatabaseManager.get_inspector()
+    with DatabaseManager.connection() as conn:
+        for table in inspector.get_table_names():
+            if table.startswith(table_prefix):
+                conn.execute(text(f"DROP TABLE IF EXISTS `{table}`"))
+        conn.commit()
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark to_sql x executemany no QuickLoader'
+    )
+    parser.add_argument('--file', type=Path, required=True, help='Arquivo JSON')
+    parser.add_argument('--table', type=str, help='Nome base da tabela (default: nome do arquivo)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Tamanho do chunk')
+    parser.add_argument('--repeat', type=int, default=1, help='Execuções por método')
+    parser.add_argument('--lines', action='store_true', help='Trata como NDJSON')
+    args = parser.parse_args()
+
+    base_table = args.table or args.file.stem
+    app = JSONMySQLApplication(ApplicationConfig(chunk_size=args.chunk_size))
+
+    results = {}
+    try:
+        for method in INSERT_METHODS:
+            table_name = f"{base_table}__bench_{method}"
+            timings = []
+            for _ in range(args.repeat):
+                result = app.load_json(
+                    args.file,
+                    table_name,
+                    lines=args.lines,
+                    if_exists='replace',
+                    insert_method=method,
+                )
+                if not result.success:
+                    logger.error(f"Falha em {method}: {result.errors}")
+                    return 1
+                timings.append(result.execution_time)
+            best = min(timings)
+            results[method] = (result.rows_inserted, best)
+            drop_bench_tables(f"{base_table}__bench_")
+    finally:
+        drop_bench_tables(f"{base_table}__bench_")
+        app.cleanup()
+
+    print(f"\n{'='*60}")
+    print(f"Benchmark de INSERT: {args.file.name} (melhor de {args.repeat})")
+    baseline = results.get('to_sql', (0, 0))[1]
+    for method, (rows, seconds) in results.items():
+        rate = rows / seconds if seconds else 0
+        speedup = f" ({baseline / seconds:.1f}x)" if baseline and seconds else ""
+        print(f"  {method:<12} {rows:>10} linhas  {seconds:8.2f}s  {rate:10.0f} linhas/s{speedup}")
+    print(f"{'='*60}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,7 +10,6 @@ Mantém tudo na mesma tabela, sem criar novas tabelas.
 
 import sys
 import os
-import json
 from pathlib import Path
 
 # ⚠️ VALIDA VIRTUAL ENVIRONMENT
@@ -30,19 +29,30 @@ Execute primeiro:
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.application import JSONMySQLApplication, ApplicationConfig
-from app.core import setup_logger, DatabaseManager
-from sqlalchemy import text
-import pandas as pd
+from app.core import setup_logger, DatabaseManager, get_dialect
+from sqlalchemy import inspect, text
 
 logger = setup_logger('flatten_same_table')
 
+# Linhas por UPDATE (faixa de id): limita lock e undo log de cada transação
+DEFAULT_CHUNK_SIZE = 50_000
+
 
 class InPlaceFlattener:
-    """Desagrupa colunas JSON mantendo na mesma tabela."""
+    """
+    Desagrupa colunas JSON mantendo na mesma tabela.
+    
+    Tudo roda no banco, sem trazer as linhas para o Python: as funções JSON
+    do dialeto (JSON_LENGTH, JSON_UNQUOTE(JSON_EXTRACT(...)) no MySQL) são
+    aplicadas por UPDATEs em faixas de id de `chunk_size` linhas, cada
+    faixa na sua transação.
+    """
     
-    def __init__(self, engine):
+    def __init__(self, engine, chunk_size: int = DEFAULT_CHUNK_SIZE):
         """Inicializa."""
         self.engine = engine
+        self.chunk_size = chunk_size
+        self.dialect = get_dialect(engine)
     
     def flatten_column_in_place(self, table_name: str, column_name: str) -> int:
         """
@@ -57,7 +67,7 @@ class InPlaceFlattener:
             receipts: [{"amount": 100}, {"amount": 200}]
             →
             receipts_count: 2
-            receipts_data_json: "[{...}, {...}]"  (JSON completo preservado)
+            receipts: "[{...}, {...}]"  (JSON completo preservado)
         
         Args:
             table_name: Nome da tabela
@@ -69,176 +79,113 @@ class InPlaceFlattener:
         print(f"\n   📊 Desagrupando: {table_name}.{column_name}")
         
         try:
-            # Lê todos os dados
-            query = text(f"SELECT id, {column_name} FROM {table_name}")
-            with self.engine.connect() as conn:
-                df = pd.read_sql(query, conn)
+            kind = self._detect_kind(table_name, column_name)
             
-            print(f"      Lidas {len(df)} linhas")
-            
-            # Verifica o tipo de dados
-            sample_value = None
-            for value in df[column_name]:
-                if pd.notna(value):
-                    try:
-                        if isinstance(value, str):
-                            sample_value = json.loads(value)
-                        else:
-                            sample_value = value
-                        if sample_value:
-                            break
-                    except:
-                        pass
-            
-            if not sample_value:
+            if kind is None:
                 print(f"      ⚠️ Nenhum dado válido encontrado")
                 return 0
             
             # Se é array, apenas faz contagem e preserva JSON
-            if isinstance(sample_value, list):
+            if kind == 'ARRAY':
                 print(f"      Array detectado - preservando como JSON")
-                with self.engine.connect() as conn:
-                    trans = conn.begin()
-                    try:
-                        # Adiciona coluna de contagem
-                        add_count_sql = text(f"""
-                            ALTER TABLE {table_name} 
-                            ADD COLUMN {column_name}_count INT DEFAULT 0
-                        """)
-                        conn.execute(add_count_sql)
-                        
-                        # Atualiza contagens
-                        for idx, row in df.iterrows():
-                            try:
-                                if isinstance(row[column_name], str):
-                                    data = json.loads(row[column_name])
-                                else:
-                                    data = row[column_name]
-                                
-                                count = len(data) if isinstance(data, list) else 1
-                                update_sql = text(f"""
-                                    UPDATE {table_name}
-                                    SET {column_name}_count = {count}
-                                    WHERE id = {row['id']}
-                                """)
-                                conn.execute(update_sql)
-                            except:
-                                pass
-                        
-                        trans.commit()
-                        print(f"      ✅ Coluna {column_name}_count adicionada com contagens")
-                        return 1
-                    
-                    except Exception as e:
-                        trans.rollback()
-                        raise e
+                count_col = f"{column_name}_count"
+                self._add_columns(table_name, {count_col: "INT DEFAULT 0"})
+                
+                # Array → número de itens; outro JSON válido → 1; inválido fica 0
+                value = f"`{column_name}`"
+                json_type = self.dialect.json_type(value)
+                count_expr = (
+                    f"CASE WHEN {json_type} IS NULL OR {json_type} = 'NULL' THEN `{count_col}` "
+                    f"WHEN {json_type} = 'ARRAY' THEN {self.dialect.json_length(value)} "
+                    f"ELSE 1 END"
+                )
+                updated = self._update_in_chunks(table_name, f"`{count_col}` = {count_expr}")
+                print(f"      ✅ Coluna {count_col} adicionada com contagens ({updated} linhas)")
+                return 1
             
             # Se é objeto, desagrupa os campos
-            elif isinstance(sample_value, dict):
-                print(f"      Objeto detectado - desagrupando campos")
-                
-                # Coleta todas as chaves possíveis
-                all_keys = set()
-                for value in df[column_name]:
-                    if pd.notna(value):
-                        try:
-                            if isinstance(value, str):
-                                data = json.loads(value)
-                            else:
-                                data = value
-                            
-                            if isinstance(data, dict):
-                                all_keys.update(data.keys())
-                        except:
-                            pass
-                
-                if not all_keys:
-                    print(f"      ⚠️ Nenhuma chave encontrada")
-                    return 0
-                
-                print(f"      Chaves encontradas: {all_keys}")
-                
-                # Cria novas colunas para cada chave
-                new_columns = {}
-                for key in all_keys:
-                    new_col_name = f"{column_name}_{key}"
-                    new_columns[new_col_name] = []
-                    
-                    for value in df[column_name]:
-                        if pd.notna(value):
-                            try:
-                                if isinstance(value, str):
-                                    data = json.loads(value)
-                                else:
-                                    data = value
-                                
-                                if isinstance(data, dict):
-                                    new_columns[new_col_name].append(data.get(key))
-                            except:
-                                new_columns[new_col_name].append(None)
-                        else:
-                            new_columns[new_col_name].append(None)
-                
-                # Atualiza a tabela
-                with self.engine.connect() as conn:
-                    trans = conn.begin()
-                    
-                    try:
-                        # Remove coluna original
-                        drop_col_sql = text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
-                        conn.execute(drop_col_sql)
-                        print(f"      ✓ Coluna original removida")
-                        
-                        # Adiciona novas colunas
-                        for new_col_name in new_columns.keys():
-                            add_col_sql = text(f"""
-                                ALTER TABLE {table_name} 
-                                ADD COLUMN {new_col_name} LONGTEXT
-                            """)
-                            conn.execute(add_col_sql)
-                        
-                        print(f"      ✓ {len(new_columns)} novas colunas adicionadas")
-                        
-                        # Atualiza dados
-                        for idx, row in df.iterrows():
-                            set_parts = []
-                            for col_name, values in new_columns.items():
-                                value = values[idx]
-                                quoted = self._quote_value(value)
-                                set_parts.append(f"{col_name} = {quoted}")
-                            
-                            set_clause = ", ".join(set_parts)
-                            update_sql = text(f"""
-                                UPDATE {table_name}
-                                SET {set_clause}
-                                WHERE id = {row['id']}
-                            """)
-                            conn.execute(update_sql)
-                        
-                        trans.commit()
-                        print(f"      ✅ {len(df)} linhas atualizadas")
-                        return len(new_columns)
-                    
-                    except Exception as e:
-                        trans.rollback()
-                        raise e
+            print(f"      Objeto detectado - desagrupando campos")
             
-            else:
-                print(f"      ⚠️ Tipo de dados não reconhecido")
+            with self.engine.connect() as conn:
+                all_keys = sorted(self.dialect.json_object_keys(conn, table_name, column_name))
+            
+            if not all_keys:
+                print(f"      ⚠️ Nenhuma chave encontrada")
                 return 0
+            
+            print(f"      Chaves encontradas: {all_keys}")
+            
+            new_columns = {f"{column_name}_{key}": key for key in all_keys}
+            self._add_columns(table_name, {col: "LONGTEXT" for col in new_columns})
+            print(f"      ✓ {len(new_columns)} novas colunas adicionadas")
+            
+            set_clause = ", ".join(
+                f"`{col}` = {self.dialect.json_extract_text(f'`{column_name}`', key)}"
+                for col, key in new_columns.items()
+            )
+            updated = self._update_in_chunks(table_name, set_clause)
+            
+            # Só remove a original depois de copiar tudo: se cair no meio,
+            # basta rodar de novo
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE `{table_name}` DROP COLUMN `{column_name}`"))
+            print(f"      ✓ Coluna original removida")
+            
+            print(f"      ✅ {updated} linhas atualizadas")
+            return len(new_columns)
         
         except Exception as e:
             print(f"      ❌ Erro: {e}")
             return 0
     
-    def _quote_value(self, value):
-        """Escapa valor para SQL."""
-        if value is None or pd.isna(value):
-            return "NULL"
-        if isinstance(value, str):
-            escaped = value.replace("'", "\\'")
-            return f"'{escaped}'"
-        return str(value)
+    def _detect_kind(self, table_name: str, column_name: str):
+        """Tipo (ARRAY/OBJECT) do primeiro valor JSON não vazio da coluna."""
+        value = f"`{column_name}`"
+        json_type = self.dialect.json_type(value)
+        query = text(f"""
+            SELECT {json_type} FROM `{table_name}`
+            WHERE CASE {json_type}
+                WHEN 'ARRAY' THEN {self.dialect.json_length(value)} > 0
+                WHEN 'OBJECT' THEN {value} <> '{{}}'
+            END
+            ORDER BY id
+            LIMIT 1
+        """)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+    
+    def _add_columns(self, table_name: str, columns: dict) -> None:
+        """ALTER TABLE ADD COLUMN das colunas que ainda não existem."""
+        with self.engine.begin() as conn:
+            existing = {col['name'] for col in inspect(conn).get_columns(table_name)}
+            for col_name, col_type in columns.items():
+                if col_name not in existing:
+                    conn.execute(text(
+                        f"ALTER TABLE `{table_name}` ADD COLUMN `{col_name}` {col_type}"
+                    ))
+    
+    def _id_ranges(self, table_name: str):
+        """Faixas [início, fim] de id com até chunk_size ids cada."""
+        with self.engine.connect() as conn:
+            low, high = conn.execute(
+                text(f"SELECT MIN(id), MAX(id) FROM `{table_name}`")
+            ).one()
+        if low is None:
+            return
+        for start in range(low, high + 1, self.chunk_size):
+            yield start, min(start + self.chunk_size - 1, high)
+    
+    def _update_in_chunks(self, table_name: str, set_clause: str) -> int:
+        """Executa UPDATE ... SET set_clause por faixa de id, uma transação por faixa."""
+        update_sql = text(
+            f"UPDATE `{table_name}` SET {set_clause} WHERE id BETWEEN :start AND :end"
+        )
+        total = 0
+        for start, end in self._id_ranges(table_name):
+            with self.engine.begin() as conn:
+                total += conn.execute(update_sql, {"start": start, "end": end}).rowcount
+            print(f"      … ids {start}-{end}: {total} linhas")
+        return total
 
 
 def main():
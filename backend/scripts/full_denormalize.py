@@ -6,46 +6,71 @@ Estratégia:
 - receipts array: expande cada índice como colunas (receipts_0_*, receipts_1_*, etc)
 - receiptsCategories array: expande cada índice como colunas (receiptsCategories_0_*, etc)
 - Mantém tudo na MESMA TABELA
+
+Roda em duas passadas pelo arquivo, ambas em streaming (nunca há o JSON
+inteiro nem um DataFrame em memória):
+1. Descobre as colunas (tamanho dos arrays e chaves de cada item) e os
+   tipos com SchemaStats; a tabela é criada uma vez com esse DDL.
+2. Monta cada linha numa tupla de posições fixas e insere em lotes.
 """
 
 import json
 import sys
 from pathlib import Path
-from sqlalchemy import text
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.core.database import DatabaseManager
+from app.core.dialect import get_dialect
 from app.core.logger import setup_logger
+from app.loaders.quick_loader import QuickLoader
+from app.utils.column_stats import SchemaStats
+from app.utils.json_handler import JSONParser
 
 logger = setup_logger("full_denormalize")
 
+# Registros por lote (passada 1: SchemaStats; passada 2: executemany)
+BATCH_SIZE = 2000
 
-def get_max_array_sizes(file_path):
-    """Descobrir tamanho máximo dos arrays."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-    
-    if isinstance(json_data, dict) and "data" in json_data:
-        data = json_data["data"]
-    elif isinstance(json_data, list):
-        data = json_data
-    else:
-        raise ValueError(f"Unexpected JSON structure in {file_path}")
+
+def _batches(file_path, size=BATCH_SIZE):
+    """Lotes de registros desagrupados, lendo o arquivo em streaming."""
+    batch = []
+    for record in JSONParser.stream_json_array(file_path):
+        batch.append(flatten_record(record))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def scan_columns(file_path):
+    """
+    Passada 1: colunas e tipos da tabela larga.
     
-    max_receipts = 0
-    max_categories = 0
+    As colunas receipts_{i}_{prop} ficam exatamente as que aparecem no
+    arquivo (tamanho máximo de cada array x chaves dos itens).
     
-    for record in data:
-        if isinstance(record.get("receipts"), list):
-            max_receipts = max(max_receipts, len(record["receipts"]))
-        if isinstance(record.get("receiptsCategories"), list):
-            max_categories = max(max_categories, len(record["receiptsCategories"]))
+    Returns:
+        SchemaStats: Colunas na ordem de aparição, com estatísticas
+    """
+    stats = SchemaStats()
+    for batch in _batches(file_path):
+        stats.update(batch)
+    return stats
+
+
+def get_max_array_sizes(stats):
+    """Tamanho máximo dos arrays, a partir das contagens da passada 1."""
+    def max_count(column):
+        col_stats = stats.columns.get(column)
+        return int(col_stats.max_value or 0) if col_stats else 0
     
-    return max_receipts, max_categories
+    return max_count("receipts_count"), max_count("receiptsCategories_count")
 
 
-def flatten_record(record, max_receipts, max_categories):
+def flatten_record(record):
     """Desagrupar registro completamente."""
     flattened = {}
     
@@ -96,32 +121,14 @@ def rebuild_table_from_json(file_path, table_name):
     """Reconstruir tabela a partir do JSON."""
     logger.info(f"Lendo JSON: {file_path}")
     
-    # Descobrir tamanhos máximos
-    logger.info("Analisando tamanhos de arrays...")
-    max_receipts, max_categories = get_max_array_sizes(file_path)
+    # Passada 1: dicionário de colunas
+    logger.info("Analisando colunas e tamanhos de arrays...")
+    stats = scan_columns(file_path)
+    max_receipts, max_categories = get_max_array_sizes(stats)
     logger.info(f"  Max receipts: {max_receipts}, Max categories: {max_categories}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-    
-    if isinstance(json_data, dict) and "data" in json_data:
-        data = json_data["data"]
-    elif isinstance(json_data, list):
-        data = json_data
-    else:
-        raise ValueError(f"Unexpected JSON structure in {file_path}")
-    
-    logger.info(f"Total de registros: {len(data)}")
-    
-    # Desagrupar todos os registros
-    flattened_data = []
-    for i, record in enumerate(data):
-        flattened = flatten_record(record, max_receipts, max_categories)
-        flattened_data.append(flattened)
-        if (i + 1) % 1000 == 0:
-            logger.info(f"  [{i + 1}] registros processados...")
-    
-    logger.info(f"Desagrupamento concluido: {len(flattened_data)} registros")
+    columns = stats.column_names
+    logger.info(f"Total de registros: {stats.row_count} ({len(columns)} colunas)")
     
     # Initialize database
     from dotenv import load_dotenv
@@ -140,40 +147,69 @@ def rebuild_table_from_json(file_path, table_name):
     
     DatabaseManager.initialize(database_url)
     
-    # Obter conexão do banco
-    db = DatabaseManager()
     engine = DatabaseManager.get_engine()
     
-    logger.info(f"Deletando tabela antiga: {table_name}")
+    logger.info(f"Recriando tabela: {table_name}")
     try:
-        with db.connection() as conn:
-            conn.execute(text(f"DROP TABLE IF EXISTS `{table_name}`"))
-            conn.commit()
-            logger.info(f"Tabela deletada")
+        with engine.begin() as conn:
+            QuickLoader._prepare_table_from_stats(conn, table_name, stats, 'replace')
+        logger.info(f"Tabela criada com {len(columns)} colunas")
     except Exception as e:
-        logger.error(f"Erro ao deletar tabela: {e}")
+        logger.error(f"Erro ao criar tabela: {e}")
         raise
     
-    logger.info(f"Inserindo {len(flattened_data)} registros...")
+    logger.info(f"Inserindo {stats.row_count} registros...")
     try:
-        import pandas as pd
-        df = pd.DataFrame(flattened_data)
-        logger.info(f"DataFrame shape: {df.shape[0]} rows x {df.shape[1]} cols")
-        
-        df.to_sql(
-            table_name,
-            con=engine,
-            if_exists='replace',
-            index=False,
-            method='multi',
-            chunksize=500,
-        )
-        logger.info(f"Dados inseridos com sucesso")
+        inserted = insert_rows(engine, file_path, table_name, columns)
+        logger.info(f"Dados inseridos com sucesso ({inserted} registros)")
     except Exception as e:
         logger.error(f"Erro ao inserir dados: {e}")
         raise
 
 
+def insert_rows(engine, file_path, table_name, columns):
+    """
+    Passada 2: insere as linhas em lotes, na ordem fixa de `columns`.
+    
+    Cada linha é uma lista pré-alocada; o valor vai direto para a posição
+    da coluna. Colunas ausentes no registro ficam NULL.
+    
+    Returns:
+        int: Registros inseridos
+    """
+    positions = {col: idx for idx, col in enumerate(columns)}
+    width = len(columns)
+    
+    dialect = get_dialect(engine)
+    cols_sql = ", ".join(f"`{col}`" for col in columns)
+    placeholders = ", ".join([dialect.placeholder] * width)
+    insert_sql = f"INSERT INTO `{table_name}` ({cols_sql}) VALUES ({placeholders})"
+    
+    inserted = 0
+    for batch in _batches(file_path):
+        rows = []
+        for flattened in batch:
+            row = [None] * width
+            for key, value in flattened.items():
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value, ensure_ascii=False, default=str)
+                row[positions[key]] = value
+            rows.append(row)
+        
+        with engine.begin() as conn:
+            cursor = conn.connection.cursor()
+            try:
+                dialect.prepare_cursor(cursor, conn)
+                cursor.executemany(insert_sql, rows)
+            finally:
+                cursor.close()
+        
+        inserted += len(rows)
+        logger.info(f"  [{inserted}] registros inseridos...")
+    
+    return inserted
+
+
 def main():
     """Reconstruir ambas as tabelas."""
     files_config = [
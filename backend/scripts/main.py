@@ -5,6 +5,8 @@ Script principal - CLI para carregar JSON em MySQL.
 Uso:
     python scripts/main.py --file data/arquivo.json --table minha_tabela
     python scripts/main.py --dir data/ --pattern "*.json"
+    python scripts/main.py --file data/SI_GRANDE.json --checkpoint   # commit por lote
+    python scripts/main.py --file data/SI_GRANDE.json --resume       # continua do checkpoint
 """
 
 import sys
@@ -75,7 +77,14 @@ import argparse
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.application import JSONMySQLApplication, ApplicationConfig
-from app.core import setup_logger, get_logger
+from app.core import (
+    setup_logger,
+    get_logger,
+    emit_metric,
+    enable_metrics_stream,
+    Profiler,
+    PROFILE_MODES,
+)
 
 logger = setup_logger('main')
 
@@ -94,6 +103,19 @@ def resolve_table_name(file_path: Path, explicit_table: str = None) -> str:
     return TABLE_NAME_ALIASES.get(stem, stem)
 
 
+def emit_run_start(files, table_names) -> None:
+    """Evento inicial do stream de métricas: arquivos e bytes a carregar."""
+    entries = [
+        {"file": f.name, "table": t, "bytes": f.stat().st_size if f.exists() else 0}
+        for f, t in zip(files, table_names)
+    ]
+    emit_metric(
+        "run_start",
+        files=entries,
+        total_bytes=sum(e["bytes"] for e in entries),
+    )
+
+
 def main():
     """Função principal."""
     parser = argparse.ArgumentParser(
@@ -138,12 +160,44 @@ def main():
         default=5000,
         help='Tamanho do chunk'
     )
+    parser.add_argument(
+        '--insert-method',
+        type=str,
+        default='to_sql',
+        choices=['to_sql', 'executemany'],
+        help='Caminho de INSERT: pandas.to_sql ou cursor.executemany (PyMySQL)'
+    )
     parser.add_argument(
         '--if-exists',
         type=str,
         default='append',
-        choices=['fail', 'replace', 'append'],
-        help='AÃ§Ã£o se tabela existe'
+        choices=['fail', 'replace', 'append', 'truncate'],
+        help='Ação se tabela existe (truncate esvazia e mantém colunas e índices)'
+    )
+    parser.add_argument(
+        '--skip-unchanged',
+        action='store_true',
+        help='Pula arquivos cujo conteúdo (hash) já foi carregado com sucesso na mesma tabela'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        action='store_true',
+        help='Commit por lote (--chunk-size registros) com checkpoint em load_checkpoints (modo quick/load)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continua do último lote confirmado do mesmo arquivo (implica --checkpoint)'
+    )
+    parser.add_argument(
+        '--bulk-session',
+        action='store_true',
+        help='Carga no perfil de sessão em massa (unique/foreign_key_checks) com ANALYZE TABLE no fim'
+    )
+    parser.add_argument(
+        '--no-binlog',
+        action='store_true',
+        help='Com --bulk-session, não grava a carga no binlog (sql_log_bin=0, exige privilégio)'
     )
     parser.add_argument(
         '--env',
@@ -162,8 +216,22 @@ def main():
         action='store_true',
         help='Trata como NDJSON (newline-delimited)'
     )
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='Emite métricas por etapa como JSON-lines no stderr (usado pelo api-server)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=PROFILE_MODES,
+        help='Perfila cada etapa (cpu: cProfile, mem: tracemalloc) em logs/profiles/'
+    )
     
     args = parser.parse_args()
+    if args.metrics:
+        enable_metrics_stream()
+    profiler = Profiler(args.profile, 'main').activate()
     
     app = None
     try:
@@ -173,6 +241,9 @@ def main():
             debug=args.debug,
             loader_mode=args.mode,
             chunk_size=args.chunk_size,
+            insert_method=args.insert_method,
+            bulk_session=args.bulk_session,
+            bulk_skip_binlog=args.no_binlog,
         )
         
         app = JSONMySQLApplication(app_config)
@@ -184,14 +255,20 @@ def main():
             # - Se o usuÃ¡rio informou --table, usa esse nome
             # - SenÃ£o, usa o nome do arquivo sem extensÃ£o
             table_name = resolve_table_name(args.file, args.table)
+            emit_run_start([args.file], [table_name])
             
             result = app.load_json(
                 args.file,
                 table_name,
                 lines=args.lines,
                 if_exists=args.if_exists,
+                skip_unchanged=args.skip_unchanged,
+                checkpoint=args.checkpoint,
+                resume=args.resume,
             )
             
+            emit_metric("run_done", files=1, success=result.success)
+            
             print(f"\n{'='*60}")
             print(f"Resultado: {result}")
             print(f"{'='*60}\n")
@@ -231,12 +308,22 @@ def main():
 
             selected_files = list(selected.values())
             selected_table_names = [resolve_table_name(f) for f in selected_files]
+            emit_run_start(selected_files, selected_table_names)
 
             results = app.load_multiple(
                 selected_files,
                 table_names=selected_table_names,
                 lines=args.lines,
                 if_exists=args.if_exists,
+                skip_unchanged=args.skip_unchanged,
+                checkpoint=args.checkpoint,
+                resume=args.resume,
+            )
+            
+            emit_metric(
+                "run_done",
+                files=len(results),
+                success=all(r.success for r in results),
             )
             
             print(f"\n{'='*60}")
@@ -254,6 +341,7 @@ def main():
     finally:
         if app:
             app.cleanup()
+        profiler.finish()
 
 
 if __name__ == '__main__':
@@ -3,8 +3,18 @@
 Script para desagrupar colunas JSON já existentes no banco de dados.
 
 Transforma dados agrupados em estrutura relacional desnormalizada.
+
+Uso:
+    python scripts/migrate_denormalize_existing.py
+    python scripts/migrate_denormalize_existing.py --json-table --chunk-size 20000
+
+Com --json-table a expansão roda inteira no banco (INSERT ... SELECT com
+JSON_TABLE no MySQL 8, json_each no SQLite), em faixas de id da tabela
+principal. Se for interrompida, rodar de novo continua após o maior id já
+presente na tabela relacionada.
 """
 
+import argparse
 import sys
 import os
 import json
@@ -28,19 +38,32 @@ Execute primeiro:
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.application import JSONMySQLApplication, ApplicationConfig
-from app.core import setup_logger, DatabaseManager
-from sqlalchemy import text
+from app.core import setup_logger, DatabaseManager, get_dialect
+from sqlalchemy import inspect, text
 import pandas as pd
 
 logger = setup_logger('migrate_denorm')
 
+# Linhas da tabela principal por INSERT ... SELECT no modo --json-table
+DEFAULT_CHUNK_SIZE = 20_000
+
 
 class ColumnDenormalizer:
     """Desagrupa colunas JSON em tabelas relacionadas."""
     
-    def __init__(self, engine):
-        """Inicializa denormalizador."""
+    def __init__(self, engine, use_json_table: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Inicializa denormalizador.
+        
+        Args:
+            engine: Engine SQLAlchemy
+            use_json_table: Expande no banco, sem trazer linhas para o Python
+            chunk_size: Linhas da tabela principal por INSERT no modo JSON_TABLE
+        """
         self.engine = engine
+        self.use_json_table = use_json_table
+        self.chunk_size = chunk_size
+        self.dialect = get_dialect(engine)
     
     def denormalize_column(self, table_name: str, column_name: str, child_table_name: str) -> int:
         """
@@ -56,6 +79,9 @@ class ColumnDenormalizer:
         """
         print(f"\n   📊 Desagrupando: {table_name}.{column_name} → {child_table_name}")
         
+        if self.use_json_table:
+            return self._denormalize_in_database(table_name, column_name, child_table_name)
+        
         try:
             # Lê dados da tabela principal
             query = text(f"SELECT * FROM {table_name}")
@@ -128,27 +154,131 @@ class ColumnDenormalizer:
             print(f"      ✅ {len(child_rows)} linhas inseridas em {child_table_name}")
             
             # Remove coluna da tabela principal
+            self._drop_column(table_name, column_name)
+            
+            return len(child_rows)
+        
+        except Exception as e:
+            print(f"      ❌ Erro: {e}")
+            return 0
+    
+    def _denormalize_in_database(self, table_name: str, column_name: str, child_table_name: str) -> int:
+        """
+        Modo --json-table: INSERT INTO filha SELECT ... FROM principal, JSON_TABLE(...).
+        
+        Cada faixa de id é um INSERT ... SELECT (uma transação); a coluna só
+        é removida depois da última faixa.
+        """
+        parent_col = f"{table_name}_id"
+        value = f"t.`{column_name}`"
+        
+        try:
             with self.engine.connect() as conn:
-                drop_col = text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
-                conn.execute(drop_col)
-                conn.commit()
+                kind = conn.execute(text(
+                    f"SELECT {self.dialect.json_type(value)} FROM `{table_name}` AS t "
+                    f"WHERE {self.dialect.json_type(value)} IN ('ARRAY', 'OBJECT') "
+                    f"ORDER BY t.id LIMIT 1"
+                )).scalar()
+                is_array = kind == 'ARRAY'
+                keys = sorted(self.dialect.json_object_keys(
+                    conn, table_name, column_name, array_items=is_array
+                ))
             
-            print(f"      ✓ Coluna removida de {table_name}")
+            if not keys:
+                print(f"      ⚠️ Nenhum dado para desagrupar")
+                return 0
             
-            return len(child_rows)
+            print(f"      {'Array' if is_array else 'Objeto'} com chaves: {keys}")
+            
+            if is_array:
+                items, index_expr, item = self.dialect.json_array_items(value, "j")
+                source = f"`{table_name}` AS t, {items}"
+                key_columns = [parent_col, '_index']
+                select_parts = ["t.id", index_expr]
+            else:
+                item = value
+                source = f"`{table_name}` AS t"
+                key_columns = [parent_col]
+                select_parts = ["t.id"]
+            
+            # Tipos da filha a partir de um item de exemplo (uma linha só)
+            with self.engine.connect() as conn:
+                sample_json = conn.execute(text(
+                    f"SELECT {item} FROM {source} "
+                    f"WHERE {self.dialect.json_type(item)} = 'OBJECT' LIMIT 1"
+                )).scalar()
+            sample = json.loads(sample_json) if isinstance(sample_json, str) else sample_json or {}
+            sample_row = {col: None for col in key_columns}
+            sample_row.update({key: sample.get(key) for key in keys})
+            self._create_child_table(child_table_name, sample_row)
+            
+            columns = ", ".join(f"`{col}`" for col in key_columns + keys)
+            selects = ", ".join(
+                select_parts + [self.dialect.json_extract_text(item, key) for key in keys]
+            )
+            insert_sql = text(f"""
+                INSERT INTO `{child_table_name}` ({columns})
+                SELECT {selects}
+                FROM {source}
+                WHERE t.id BETWEEN :start AND :end
+                  AND {self.dialect.json_type(item)} = 'OBJECT'
+            """)
+            
+            total = 0
+            for start, end in self._id_ranges(table_name, self._resume_after(child_table_name, parent_col)):
+                with self.engine.begin() as conn:
+                    total += conn.execute(insert_sql, {"start": start, "end": end}).rowcount
+                print(f"      … ids {start}-{end}: {total} linhas inseridas")
+            
+            print(f"      ✅ {total} linhas inseridas em {child_table_name}")
+            
+            self._drop_column(table_name, column_name)
+            
+            return total
         
         except Exception as e:
             print(f"      ❌ Erro: {e}")
             return 0
     
+    def _resume_after(self, child_table_name: str, parent_col: str):
+        """Maior id da principal já expandido (retomada), ou None se a filha está vazia."""
+        with self.engine.connect() as conn:
+            last = conn.execute(
+                text(f"SELECT MAX(`{parent_col}` + 0) FROM `{child_table_name}`")
+            ).scalar()
+        if last is not None:
+            print(f"      ↻ Retomando após id {int(last)}")
+            return int(last)
+        return None
+    
+    def _id_ranges(self, table_name: str, after=None):
+        """Faixas [início, fim] de id com até chunk_size ids cada."""
+        with self.engine.connect() as conn:
+            low, high = conn.execute(
+                text(f"SELECT MIN(id), MAX(id) FROM `{table_name}`")
+            ).one()
+        if low is None:
+            return
+        if after is not None:
+            low = max(low, after + 1)
+        for start in range(low, high + 1, self.chunk_size):
+            yield start, min(start + self.chunk_size - 1, high)
+    
+    def _drop_column(self, table_name: str, column_name: str):
+        """Remove a coluna já desagrupada da tabela principal."""
+        with self.engine.connect() as conn:
+            drop_col = text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
+            conn.execute(drop_col)
+            conn.commit()
+        
+        print(f"      ✓ Coluna removida de {table_name}")
+    
     def _create_child_table(self, table_name: str, sample_row: dict):
         """Cria tabela relacionada se não existir."""
         try:
             # Verifica se tabela existe
             with self.engine.connect() as conn:
-                result = conn.execute(
-                    text(f"SELECT 1 FROM information_schema.TABLES WHERE TABLE_NAME = '{table_name}'")
-                ).fetchone()
+                result = inspect(conn).has_table(table_name)
             
             if result:
                 print(f"      ℹ️ Tabela {table_name} já existe")
@@ -166,12 +296,16 @@ class ColumnDenormalizer:
                 else:
                     columns.append(f"{key} LONGTEXT")
             
+            suffix = self.dialect.create_table_suffix()
+            if self.dialect.name == 'mysql':
+                suffix += " COLLATE=utf8mb4_unicode_ci"
+            
             create_sql = f"""
             CREATE TABLE {table_name} (
-                id INT AUTO_INCREMENT PRIMARY KEY,
+                id {self.dialect.auto_increment_pk},
                 {', '.join(columns)},
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            ){suffix}
             """
             
             with self.engine.connect() as conn:
@@ -184,13 +318,16 @@ class ColumnDenormalizer:
             print(f"      ⚠️ Erro ao criar tabela: {e}")
 
 
-def migrate_table(table_name: str, columns_to_denormalize: list):
+def migrate_table(table_name: str, columns_to_denormalize: list,
+                  use_json_table: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
     """
     Migra uma tabela denormalizando as colunas especificadas.
     
     Args:
         table_name: Nome da tabela
         columns_to_denormalize: Lista de (column_name, child_table_name)
+        use_json_table: Expande no banco (JSON_TABLE) em vez de no Python
+        chunk_size: Linhas da tabela principal por INSERT no modo JSON_TABLE
     """
     print(f"\n{'='*70}")
     print(f"🔄 MIGRANDO TABELA: {table_name}")
@@ -198,7 +335,11 @@ def migrate_table(table_name: str, columns_to_denormalize: list):
     
     app_config = ApplicationConfig()
     app = JSONMySQLApplication(app_config)
-    denormalizer = ColumnDenormalizer(DatabaseManager.get_engine())
+    denormalizer = ColumnDenormalizer(
+        DatabaseManager.get_engine(),
+        use_json_table=use_json_table,
+        chunk_size=chunk_size,
+    )
     
     total_rows = 0
     
@@ -212,6 +353,20 @@ def migrate_table(table_name: str, columns_to_denormalize: list):
 
 def main():
     """Função principal."""
+    parser = argparse.ArgumentParser(description='Desagrupa colunas JSON em tabelas relacionadas')
+    parser.add_argument(
+        '--json-table',
+        action='store_true',
+        help='Expande no banco (JSON_TABLE no MySQL 8), em faixas de id retomáveis',
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Linhas da tabela principal por INSERT no modo --json-table (padrão: {DEFAULT_CHUNK_SIZE})',
+    )
+    args = parser.parse_args()
+    
     try:
         print("\n" + "="*70)
         print("🔄 DESAGRUPADOR DE COLUNAS JSON")
@@ -254,7 +409,7 @@ def main():
         
         # Executa migrações
         for migration in migrations:
-            migrate_table(migration['table'], migration['columns'])
+            migrate_table(migration['table'], migration['columns'], args.json_table, args.chunk_size)
         
         print("\n" + "="*70)
         print("✨ Todas as migrações foram concluídas com sucesso!")
@@ -0,0 +1,46 @@
+"""
+Configuração comum dos testes.
+
+sqlite_db: DatabaseManager num SQLite temporário (sem MySQL).
+write_json_records / count_rows: arquivos {"data": [...]} e contagens.
+query/ e relatorio/ entram no path para testar os scripts sem servidor.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adiciona backend/ ao path para importar app/ e config/
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Scripts de query/ e relatorio/ (execute_query, plano_consulta, generate_report, generators)
+REPO_DIR = BACKEND_DIR.parent
+for sub in ("query", "relatorio"):
+    if str(REPO_DIR / sub) not in sys.path:
+        sys.path.append(str(REPO_DIR / sub))
+
+from app.core.database import DatabaseManager
+from sqlalchemy import text
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    DatabaseManager.initialize(f"sqlite:///{tmp_path / 'test.db'}", stats_log_interval=0)
+    try:
+        yield DatabaseManager.get_engine()
+    finally:
+        DatabaseManager.dispose()
+
+
+def write_json_records(path: Path, records: list) -> Path:
+    """Grava records no formato da API ({"data": [...]})."""
+    path.write_text(json.dumps({"data": records}), encoding="utf-8")
+    return path
+
+
+def count_rows(engine, table: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM `{table}`")).scalar()
@@ -0,0 +1,73 @@
+"""
+Perfil de carga em massa (DatabaseManager.bulk_session) em SQLite.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import DatabaseManager
+from app.core.dialect import MySQLDialect
+from app.loaders import QuickLoader
+from conftest import write_json_records
+
+# PRAGMA synchronous: 0 = OFF (perfil), 1 = NORMAL (on_connect)
+SYNC_OFF, SYNC_NORMAL = 0, 1
+
+
+def _synchronous(conn):
+    return conn.exec_driver_sql("PRAGMA synchronous").scalar()
+
+
+def test_settings_restored_when_connection_returns_to_pool(sqlite_db):
+    held = sqlite_db.connect()
+    try:
+        with DatabaseManager.bulk_session():
+            with sqlite_db.connect() as conn:
+                assert _synchronous(conn) == SYNC_OFF
+            # Conexão tirada antes do bloco não recebe o perfil
+            assert _synchronous(held) == SYNC_NORMAL
+            inside = sqlite_db.connect()
+        # Ainda emprestada: restaura só no checkin
+        assert _synchronous(inside) == SYNC_OFF
+        inside.close()
+    finally:
+        held.close()
+
+    for _ in range(2):
+        with sqlite_db.connect() as conn:
+            assert _synchronous(conn) == SYNC_NORMAL
+
+
+def test_settings_restored_after_error(sqlite_db):
+    with pytest.raises(RuntimeError):
+        with DatabaseManager.bulk_session():
+            with sqlite_db.connect():
+                raise RuntimeError("falha na carga")
+
+    with sqlite_db.connect() as conn:
+        assert _synchronous(conn) == SYNC_NORMAL
+
+
+def test_mysql_profile_keeps_unique_checks_unless_asked():
+    assert "unique_checks" not in MySQLDialect().bulk_session_settings()
+    settings = MySQLDialect().bulk_session_settings(skip_unique_checks=True, skip_binlog=True)
+    assert settings["unique_checks"] == 0
+    assert settings["foreign_key_checks"] == 0
+    assert settings["sql_log_bin"] == 0
+
+
+def test_loader_analyzes_loaded_tables(sqlite_db, tmp_path):
+    path = write_json_records(tmp_path / "SI_T.json", [
+        {"companyId": 1, "billId": 10, "installmentId": i, "receipts": [{"netAmount": i}]}
+        for i in range(1, 4)
+    ])
+
+    loader = QuickLoader({"bulk_session": True})
+    result = loader.load(path, "SI_T", if_exists="truncate")
+
+    assert result.success, result.errors
+    assert result.stage("analyze").tables == {"SI_T": 0}
+    with sqlite_db.connect() as conn:
+        analyzed = {row[0] for row in conn.execute(text("SELECT tbl FROM sqlite_stat1"))}
+        assert {"SI_T", "SI_T_receipts"} <= analyzed
+        assert _synchronous(conn) == SYNC_NORMAL
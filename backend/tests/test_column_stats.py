@@ -0,0 +1,63 @@
+"""
+Testes de SchemaStats / streaming de JSON (sem MySQL).
+"""
+
+import json
+
+from app.utils.column_stats import SchemaStats
+from app.utils.json_handler import JSONParser
+from app.utils.schema_manager import SchemaInferencer
+
+
+def test_stats_cover_late_values():
+    records = [{"id": 1, "name": "a"} for _ in range(200)]
+    records.append({"id": 2**40, "name": "x" * 300, "extra": 1.5})
+
+    stats = SchemaStats().update(records)
+    types = stats.infer_types()
+
+    assert types["id"] == "BIGINT(20)"
+    assert types["name"] == "TEXT"
+    assert types["extra"] == "DOUBLE"
+    assert stats.columns["extra"].null_count == 200
+    assert stats.row_count == 201
+
+
+def test_merge_equals_single_pass():
+    records = [
+        {"a": i, "b": None if i % 3 else f"v{i}", "c": [i]} for i in range(100)
+    ]
+    records[50]["d"] = True
+
+    single = SchemaStats().update(records)
+    merged = SchemaStats().update(records[:40]).merge(SchemaStats().update(records[40:]))
+
+    assert merged.row_count == single.row_count
+    assert merged.infer_types() == single.infer_types()
+    for col, stats in single.columns.items():
+        other = merged.columns[col]
+        assert (other.count, other.null_count) == (stats.count, stats.null_count)
+        assert (other.min_value, other.max_value) == (stats.min_value, stats.max_value)
+
+
+def test_ddl_from_stats():
+    stats = SchemaStats().update([{"companyId": 1, "payload": {"k": 1}}])
+    ddl = SchemaInferencer.generate_create_table_from_stats("t", stats)
+
+    assert "`companyId` INT(11)" in ddl
+    assert "`payload` JSON NULL" in ddl
+
+
+def test_stream_json_array_with_data_wrapper(tmp_path):
+    data = [{"id": i, "text": "é" * (i % 7), "value": i * 1.25} for i in range(500)]
+    path = tmp_path / "wrapped.json"
+    path.write_text(
+        json.dumps({"meta": {"pages": [1, 2]}, "data": data}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+    streamed = list(JSONParser.stream_json_array(path, buffer_size=64))
+    chunks = list(JSONParser.iterate_file(path, chunk_size=128))
+
+    assert streamed == data
+    assert [len(c) for c in chunks] == [128, 128, 128, 116]
@@ -0,0 +1,133 @@
+"""
+Projeção das categorias (SI_DATACOMPETPARCELAS_categories) e consolidação em SQLite.
+"""
+
+import os
+import subprocess
+import sys
+
+from sqlalchemy import text
+
+from app.loaders import QuickLoader
+from app.utils.competence_categories import refresh_categories
+from app.utils.receipts_match import refresh_receipts_match
+from conftest import REPO_DIR, count_rows, write_json_records
+
+
+def _load(tmp_path, table_name, records):
+    path = write_json_records(tmp_path / f"{table_name}.json", records)
+    result = QuickLoader().load(path, table_name, if_exists="replace")
+    assert result.success, result.errors
+
+
+def _category(category_id, rate, receipts):
+    return {
+        "costCenterId": 7, "costCenterName": "OBRA 7",
+        "financialCategoryId": category_id, "financialCategoryName": f"PLANO {category_id}",
+        "financialCategoryRate": rate,
+        "receipts": [{"date": f"2026-02-0{i + 1}", "netAmount": value}
+                     for i, value in enumerate(receipts)],
+    }
+
+
+def _competence():
+    # Receipts aninhados nas categorias: uma linha por receipt na tabela
+    return [
+        {"companyId": 1, "billId": 10, "installmentId": 1,
+         "documentNumber": "CT-10", "documentIdentificationName": "CONTRATO",
+         "receiptsCategories": [_category("1010101", 100.0, [60.0, 40.0])]},
+        {"companyId": 1, "billId": 10, "installmentId": 2,
+         "documentNumber": "CT-10", "documentIdentificationName": "CONTRATO",
+         "receiptsCategories": [_category("1010101", 60.0, [50.0, 50.0]),
+                                _category("1010102", 40.0, [50.0, 50.0])]},
+    ]
+
+
+def _extract():
+    return [{
+        "companyId": 1, "companyName": "ALFA", "customerId": 5, "customerName": "CLIENTE",
+        "customerDocument": "123", "billReceivableId": 10,
+        "lastRenegotiationDate": "2026-01-01",
+        "installments": [
+            {"id": i, "paymentTerms": {"id": "PM", "descrition": "MENSAL"},
+             "originalValue": 100.0, "dueDate": "2026-02-01",
+             "receipts": [{"date": "2026-02-01", "value": 100.0, "extra": 0.0, "discount": 0.0}]}
+            for i in (1, 2)
+        ],
+    }]
+
+
+def _payments():
+    return [
+        {"companyId": 1, "billId": 10, "installmentId": i,
+         "receipts": [{"netAmount": 100.0, "accountNumber": "001"}]}
+        for i in (1, 2)
+    ]
+
+
+def test_projection_has_one_row_per_installment_category(sqlite_db, tmp_path):
+    _load(tmp_path, "SI_DATACOMPETPARCELAS", _competence())
+
+    assert count_rows(sqlite_db, "SI_DATACOMPETPARCELAS") == 6
+    assert refresh_categories(sqlite_db, "SI_DATACOMPETPARCELAS") == 3
+    with sqlite_db.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT installmentId, financialCategoryId, financialCategoryRate "
+            "FROM SI_DATACOMPETPARCELAS_categories ORDER BY 1, 2"
+        )).fetchall()
+    assert rows == [(1, "1010101", 100.0), (2, "1010101", 60.0), (2, "1010102", 40.0)]
+
+    # Recarga refaz o conteúdo; carga pulada não mexe na projeção existente
+    assert refresh_categories(sqlite_db, "SI_DATACOMPETPARCELAS") == 3
+    assert refresh_categories(sqlite_db, "SI_DATACOMPETPARCELAS", changed=False) is None
+    assert count_rows(sqlite_db, "SI_DATACOMPETPARCELAS_categories") == 3
+
+
+def test_projection_only_for_competence_tables(sqlite_db, tmp_path):
+    _load(tmp_path, "SI_DATAPAGTO", _payments())
+    assert refresh_categories(sqlite_db, "SI_DATAPAGTO") is None
+
+
+def _execute_query(db_path, *args):
+    env = dict(os.environ, DB_DIALECT="sqlite", SQLITE_PATH=str(db_path))
+    return subprocess.run(
+        [sys.executable, "execute_query.py", "--plano", "ignorar", *args],
+        cwd=REPO_DIR / "query",
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_consolidation_does_not_repeat_nested_category_receipts(sqlite_db, tmp_path):
+    _load(tmp_path, "SI_EXTRATO_CLIENTE_HISTORICO", _extract())
+    _load(tmp_path, "SI_DATACOMPETPARCELAS", _competence())
+    _load(tmp_path, "SI_DATAPAGTO", _payments())
+    refresh_receipts_match(sqlite_db, "SI_DATAPAGTO")
+    refresh_categories(sqlite_db, "SI_DATACOMPETPARCELAS")
+    db_path = tmp_path / "test.db"
+
+    unicidade = _execute_query(db_path, "--verificar-unicidade")
+    assert unicidade.returncode == 0, unicidade.stderr
+    assert "Linhas: 3 | distintas: 3" in unicidade.stderr
+
+    consolidacao = _execute_query(db_path)
+    assert consolidacao.returncode == 0, consolidacao.stderr
+    with sqlite_db.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT NumeroDaParcela, numPlanoFinanceiro, ValorLiquido "
+            "FROM RELATORIO_CONSOLIDADO ORDER BY 1, 2"
+        )).fetchall()
+    assert rows == [(1, "1010101", "100,00"), (2, "1010101", "60,00"), (2, "1010102", "40,00")]
+
+
+def test_consolidation_requires_projection(sqlite_db, tmp_path):
+    _load(tmp_path, "SI_EXTRATO_CLIENTE_HISTORICO", _extract())
+    _load(tmp_path, "SI_DATACOMPETPARCELAS", _competence())
+    _load(tmp_path, "SI_DATAPAGTO", _payments())
+    refresh_receipts_match(sqlite_db, "SI_DATAPAGTO")
+
+    result = _execute_query(tmp_path / "test.db")
+
+    assert result.returncode != 0
+    assert "SI_DATACOMPETPARCELAS_categories ausente" in result.stderr
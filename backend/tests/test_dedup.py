@@ -0,0 +1,116 @@
+"""
+Linhas únicas nas tabelas carregadas (deduplicate_split + UNIQUE em _row_hash).
+"""
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.loaders import QuickLoader
+from app.utils.row_hashes import ROW_HASH_FIELD, deduplicate_split
+from conftest import count_rows, write_json_records
+
+
+def _records():
+    return [
+        {"companyId": 1, "billId": 10, "installmentId": i,
+         "receipts": [{"netAmount": 50.0, "accountNumber": "001"}]}
+        for i in range(1, 4)
+    ]
+
+
+def test_split_drops_repeated_records_and_their_children():
+    data = _records() + _records()[:1]
+    split = QuickLoader._split_for_table(data, "SI_T")
+
+    assert len(split["main"]) == 3
+    assert all(row[ROW_HASH_FIELD] for row in split["main"])
+    # Mesmo receipt em parcelas diferentes continua separado
+    assert len(split["SI_T_receipts"]) == 3
+    parent_ids = {row["_row_id"] for row in split["main"]}
+    assert {row["_parent_id"] for row in split["SI_T_receipts"]} == parent_ids
+
+
+def test_children_of_repeated_parent_point_to_kept_parent():
+    split = {
+        "main": [{"_row_id": "a", "billId": 1}, {"_row_id": "b", "billId": 1}],
+        "SI_T_receipts": [
+            {"_parent_id": "a", "netAmount": 1},
+            {"_parent_id": "b", "netAmount": 1},
+            {"_parent_id": "b", "netAmount": 2},
+        ],
+    }
+
+    assert deduplicate_split(split) == 2
+    assert [row["_row_id"] for row in split["main"]] == ["a"]
+    assert [(r["_parent_id"], r["netAmount"]) for r in split["SI_T_receipts"]] == [
+        ("a", 1), ("a", 2),
+    ]
+
+
+def _identical_receipts():
+    receipt = {"netAmount": 100, "date": "2026-01-05"}
+    return {"companyId": 1, "billId": 10, "installmentId": 1,
+            "receipts": [dict(receipt), dict(receipt)]}
+
+
+def test_identical_items_of_one_record_are_kept():
+    # Dois receipts iguais na filha; a reentrega do registro colapsa
+    split = QuickLoader._split_for_table(
+        [_identical_receipts(), _identical_receipts()], "SI_DATAPAGTOPARCELAS"
+    )
+
+    assert len(split["main"]) == 1
+    receipts = split["SI_DATAPAGTOPARCELAS_receipts"]
+    assert len(receipts) == 2
+    assert len({row[ROW_HASH_FIELD] for row in receipts}) == 2
+
+
+def test_identical_exploded_items_of_one_record_are_kept():
+    # SI_EXTRATO_CLIENTE* explode receipts na própria principal
+    split = QuickLoader._split_for_table(
+        [_identical_receipts(), _identical_receipts()], "SI_EXTRATO_CLIENTE_HISTORICO"
+    )
+
+    assert len(split["main"]) == 2
+    assert len({row[ROW_HASH_FIELD] for row in split["main"]}) == 2
+
+
+def test_reloading_identical_items_in_append(sqlite_db, tmp_path):
+    path = write_json_records(tmp_path / "SI_T.json", [_identical_receipts()])
+
+    for _ in range(2):
+        result = QuickLoader().load(path, "SI_T", if_exists="append")
+        assert result.success, result.errors
+
+    assert count_rows(sqlite_db, "SI_T") == 1
+    assert count_rows(sqlite_db, "SI_T_receipts") == 2
+
+
+@pytest.mark.parametrize("insert_method", ["to_sql", "executemany"])
+def test_reloading_in_append_does_not_duplicate(sqlite_db, tmp_path, insert_method):
+    path = write_json_records(tmp_path / "SI_T.json", _records())
+
+    first = QuickLoader().load(path, "SI_T", if_exists="append", insert_method=insert_method)
+    second = QuickLoader().load(path, "SI_T", if_exists="append", insert_method=insert_method)
+
+    assert first.success and second.success, (first.errors, second.errors)
+    assert first.rows_inserted == 3
+    assert second.rows_inserted == 0
+    assert count_rows(sqlite_db, "SI_T") == 3
+    assert count_rows(sqlite_db, "SI_T_receipts") == 3
+    indexes = {idx["name"]: idx for idx in inspect(sqlite_db).get_indexes("SI_T")}
+    assert indexes["uk_SI_T_row_hash"]["unique"]
+
+
+def test_append_to_table_loaded_before_dedup(sqlite_db, tmp_path):
+    with sqlite_db.begin() as conn:
+        conn.execute(text("CREATE TABLE SI_T (companyId BIGINT, billId BIGINT)"))
+        conn.execute(text("INSERT INTO SI_T VALUES (1, 10), (1, 10)"))
+    path = write_json_records(tmp_path / "SI_T.json", _records())
+
+    for _ in range(2):
+        result = QuickLoader().load(path, "SI_T", if_exists="append")
+        assert result.success, result.errors
+
+    # Linhas antigas ficam (hash NULL); as novas entram uma vez só
+    assert count_rows(sqlite_db, "SI_T") == 5
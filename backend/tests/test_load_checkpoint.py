@@ -0,0 +1,97 @@
+"""
+Carga com checkpoint por lote (QuickLoader checkpoint/resume).
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.loaders import QuickLoader
+from app.loaders import quick_loader
+from app.utils.load_checkpoint import LoadCheckpoint
+from app.utils.upload_tracker import FileHashCache
+from conftest import count_rows, write_json_records
+
+
+@pytest.fixture(autouse=True)
+def memory_hash_cache(monkeypatch):
+    # Cache de hashes só em memória (não escreve em backend/.cache)
+    monkeypatch.setattr(quick_loader, "FileHashCache", lambda: FileHashCache(None))
+
+
+def _write(path, n):
+    return write_json_records(path, [
+        {"companyId": 1, "billId": 10, "installmentId": i, "receipts": [{"netAmount": i}]}
+        for i in range(n)
+    ])
+
+
+def _fail_on_batch(monkeypatch, batch_number):
+    """Faz o INSERT da principal falhar no lote `batch_number`."""
+    original = QuickLoader._executemany
+    calls = {"main": 0}
+
+    def flaky(conn, table_name, rows, columns, chunk_size):
+        if table_name == "SI_T":
+            calls["main"] += 1
+            if calls["main"] == batch_number:
+                raise RuntimeError("conexão perdida")
+        return original(conn, table_name, rows, columns, chunk_size)
+
+    monkeypatch.setattr(QuickLoader, "_executemany", staticmethod(flaky))
+
+
+def test_resume_continues_after_last_committed_batch(sqlite_db, tmp_path, monkeypatch):
+    path = _write(tmp_path / "SI_T.json", 25)
+
+    with monkeypatch.context() as patch:
+        _fail_on_batch(patch, 3)
+        failed = QuickLoader().load(path, "SI_T", if_exists="replace",
+                                    chunk_size=10, checkpoint=True)
+    assert not failed.success
+    assert count_rows(sqlite_db, "SI_T") == 20
+    assert LoadCheckpoint(sqlite_db).get("SI_T").records_done == 20
+
+    # chunk_size diferente: o corte continua no registro 20
+    result = QuickLoader().load(path, "SI_T", if_exists="replace",
+                                chunk_size=7, resume=True)
+
+    assert result.success, result.errors
+    assert result.rows_inserted == 5
+    with sqlite_db.connect() as conn:
+        ids = [r[0] for r in conn.execute(text("SELECT installmentId FROM SI_T"))]
+    assert sorted(ids) == list(range(25))
+    assert count_rows(sqlite_db, "SI_T_receipts") == 25
+    assert LoadCheckpoint(sqlite_db).get("SI_T") is None
+
+
+def test_batches_keep_layout_of_first_record(sqlite_db, tmp_path):
+    # Segundo lote começa por um registro sem receipts
+    records = [
+        {"companyId": 1, "billId": 10, "installmentId": i, "receipts": [{"netAmount": i}]}
+        for i in range(5)
+    ]
+    del records[2]["receipts"]
+    path = write_json_records(tmp_path / "SI_T.json", records)
+
+    result = QuickLoader().load(path, "SI_T", if_exists="replace",
+                                chunk_size=2, checkpoint=True)
+
+    assert result.success, result.errors
+    assert count_rows(sqlite_db, "SI_T_receipts") == 4
+    with sqlite_db.connect() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(SI_T)"))}
+    assert "receipts" not in columns
+
+
+def test_resume_restarts_when_file_changed(sqlite_db, tmp_path, monkeypatch):
+    path = _write(tmp_path / "SI_T.json", 25)
+    with monkeypatch.context() as patch:
+        _fail_on_batch(patch, 2)
+        QuickLoader().load(path, "SI_T", if_exists="replace", chunk_size=10, checkpoint=True)
+
+    _write(path, 12)
+    result = QuickLoader().load(path, "SI_T", if_exists="replace", chunk_size=10, resume=True)
+
+    assert result.success, result.errors
+    assert result.rows_inserted == 12
+    assert count_rows(sqlite_db, "SI_T") == 12
@@ -0,0 +1,67 @@
+"""
+Logging em modo fila (QueueHandler/QueueListener) e limite por ponto de chamada.
+"""
+
+import logging
+import threading
+
+from app.core import logger as logger_module
+from app.core.logger import RateLimitFilter, setup_logger, shutdown_logging
+from config.settings import LoggerConfig
+
+
+def _config(tmp_path, **kwargs):
+    return LoggerConfig(level="INFO", log_dir=tmp_path, format="%(message)s", **kwargs)
+
+
+def test_queue_mode_writes_from_listener_thread(tmp_path):
+    threads = set()
+
+    class ThreadRecorder(logging.Filter):
+        def filter(self, record):
+            threads.add(threading.current_thread().name)
+            return True
+
+    logger = setup_logger("teste_fila", _config(tmp_path, use_queue=True))
+    (handler,) = logger.handlers
+    assert isinstance(handler, logging.handlers.QueueHandler)
+
+    for sink in logger_module._listeners["teste_fila"].handlers:
+        sink.addFilter(ThreadRecorder())
+
+    data = {"n": 1}
+    logger.info("registro %s", data)
+    data["n"] = 2  # mensagem já resolvida na thread de quem logou
+    shutdown_logging()
+
+    assert (tmp_path / "teste_fila.log").read_text(encoding="utf-8") == "registro {'n': 1}\n"
+    assert threading.current_thread().name not in threads
+
+
+def test_rate_limit_per_call_site(tmp_path):
+    logger = setup_logger("teste_limite", _config(tmp_path, rate_limit_per_second=3))
+
+    for i in range(10):
+        logger.info("linha %d", i)
+    logger.warning("aviso sempre passa")
+    for handler in logger.handlers:
+        handler.close()
+
+    lines = (tmp_path / "teste_limite.log").read_text(encoding="utf-8").splitlines()
+    assert lines == ["linha 0", "linha 1", "linha 2", "aviso sempre passa"]
+
+
+def test_rate_limit_reports_suppressed_count():
+    limit = RateLimitFilter(rate=1, per=60.0)
+
+    def record():
+        return logging.LogRecord("x", logging.INFO, "f.py", 7, "msg", None, None)
+
+    assert limit.filter(record())
+    assert not limit.filter(record())
+    assert not limit.filter(record())
+
+    limit.per = 0.0
+    rec = record()
+    assert limit.filter(rec)
+    assert rec.getMessage() == "msg [+2 mensagens suprimidas]"
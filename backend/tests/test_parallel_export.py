@@ -0,0 +1,152 @@
+"""
+Exportação paralela do relatório (relatorio/generate_report.py --paralelo).
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import generate_report
+from conftest import REPO_DIR
+
+COLUMNS = (
+    "Codigoempresa", "NomeDaEmpresa", "CodigoDoCentroDeCusto", "NomeDoCentroDeCusto",
+    "CodigoDoPlanoFinanceiroComMascara", "numPlanoFinanceiro", "PlanoFinanceiro",
+    "CodigoDoCliente", "NomeDoCliente", "NumeroCPFCNPJ", "NumeroDoDocumento",
+    "NomeDoDocumento", "NumeroDoTitulo", "NumeroDaParcela", "NomeDoTipoDeCondicao",
+    "DataDeEmissao", "DataDeVencimento", "ValorOriginalRateado", "SaldoAtual",
+    "ValorDaBaixaRateado", "Datadabaixa", "AcrescimoRateado", "DescontoRateado",
+    "ValorLiquido", "numConta", "StatusParcela",
+)
+
+
+@pytest.fixture
+def relatorio_db(tmp_path):
+    path = tmp_path / "relatorio.sqlite3"
+    defs = ", ".join(
+        f"{col} INTEGER" if col in ("NumeroDoTitulo", "NumeroDaParcela") else f"{col} TEXT"
+        for col in COLUMNS
+    )
+    rows = []
+    for titulo in range(1, 21):
+        for parcela in range(1, titulo % 3 + 2):
+            row = {col: f"{col[:4]}{titulo}" for col in COLUMNS}
+            row.update(NumeroDoTitulo=titulo, NumeroDaParcela=parcela, Codigoempresa=titulo % 2)
+            # Cresce com o título: só a última parte tem o valor mais largo do TXT
+            row["NomeDoCliente"] = "Cliente " + "x" * titulo
+            row["NomeDaEmpresa"] = "Ação Ltda"
+            rows.append(row)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            f"CREATE TABLE RELATORIO_CONSOLIDADO (id INTEGER PRIMARY KEY AUTOINCREMENT, {defs})"
+        )
+        conn.executemany(
+            f"INSERT INTO RELATORIO_CONSOLIDADO ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(COLUMNS))})",
+            [tuple(row[col] for col in COLUMNS) for row in rows],
+        )
+    return path
+
+
+def _gerar(db_path, output_dir, formato, *args):
+    env = dict(os.environ, DB_DIALECT="sqlite", SQLITE_PATH=str(db_path))
+    env.pop("REPORT_WORKERS", None)
+    proc = subprocess.run(
+        [sys.executable, "generate_report.py", "--formato", formato,
+         "--output-dir", str(output_dir), *args],
+        cwd=REPO_DIR / "relatorio",
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+    return result, (output_dir / result["fileName"]).read_bytes()
+
+
+@pytest.mark.parametrize("formato", ["csv", "txt"])
+def test_parallel_output_matches_serial(relatorio_db, tmp_path, formato):
+    serial, esperado = _gerar(relatorio_db, tmp_path / "serial", formato)
+    paralelo, obtido = _gerar(relatorio_db, tmp_path / "paralelo", formato, "--paralelo", "3")
+
+    assert obtido == esperado
+    assert paralelo["recordCount"] == serial["recordCount"] == 41
+    # Partes temporárias não ficam no diretório
+    assert os.listdir(tmp_path / "paralelo") == [paralelo["fileName"]]
+    if formato == "csv":
+        assert obtido.startswith(b"\xef\xbb\xbf") and obtido.count(b"\xef\xbb\xbf") == 1
+
+
+def test_parallel_with_filter_matches_serial(relatorio_db, tmp_path):
+    _, esperado = _gerar(relatorio_db, tmp_path / "serial", "csv", "--empresa", "1")
+    _, obtido = _gerar(
+        relatorio_db, tmp_path / "paralelo", "csv", "--empresa", "1", "--paralelo", "4"
+    )
+    assert obtido == esperado
+
+
+def test_ranges_cover_titles_without_splitting_them(relatorio_db, monkeypatch):
+    monkeypatch.setattr(generate_report, "PLACEHOLDER", "?")
+    conn = sqlite3.connect(relatorio_db)
+    conn.row_factory = generate_report._dict_factory
+    try:
+        faixas = generate_report.calcular_faixas(conn.cursor(), {}, 3)
+        vazias = generate_report.calcular_faixas(conn.cursor(), {"empresa": [9]}, 3)
+    finally:
+        conn.close()
+
+    assert len(faixas) == 3
+    assert faixas[0][0] == 1 and faixas[-1][1] is None
+    # Fim de cada faixa é o início da próxima
+    assert all(fim == proxima[0] for (_, fim), proxima in zip(faixas, faixas[1:]))
+    assert vazias == []
+
+
+def _partes(tmp_path, conteudos):
+    caminhos = []
+    for i, conteudo in enumerate(conteudos):
+        caminho = tmp_path / f"parte{i}.csv"
+        caminho.write_bytes(conteudo)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def test_concatenate_parts_with_empty_part(tmp_path):
+    partes = _partes(tmp_path, [b"\xef\xbb\xbfa;b\r\n1;2\r\n", b"", b"3;4\r\n"])
+
+    metodos = generate_report.concatenar_partes(partes, tmp_path / "saida.csv")
+
+    assert (tmp_path / "saida.csv").read_bytes() == b"\xef\xbb\xbfa;b\r\n1;2\r\n3;4\r\n"
+    assert not any(parte.exists() for parte in partes)
+    assert len(metodos) == 1
+
+
+@pytest.mark.parametrize("sem", [("copy_file_range",), ("copy_file_range", "sendfile")])
+def test_concatenate_falls_back_when_kernel_copy_unavailable(tmp_path, monkeypatch, sem):
+    for nome in sem:
+        monkeypatch.delattr(os, nome, raising=False)
+    partes = _partes(tmp_path, [b"x" * 70000, b"y" * 3])
+
+    metodos = generate_report.concatenar_partes(partes, tmp_path / "saida.txt")
+
+    assert (tmp_path / "saida.txt").read_bytes() == b"x" * 70000 + b"y" * 3
+    esperado = "read/write" if "sendfile" in sem or not hasattr(os, "sendfile") else "sendfile"
+    assert metodos == {esperado}
+
+
+def test_copy_falls_back_to_read_write_on_os_error(tmp_path, monkeypatch):
+    def recusa(*args):
+        raise OSError("nao suportado")
+
+    monkeypatch.setattr(os, "copy_file_range", recusa, raising=False)
+    monkeypatch.setattr(os, "sendfile", recusa, raising=False)
+    partes = _partes(tmp_path, [b"abc", b"def"])
+
+    metodos = generate_report.concatenar_partes(partes, tmp_path / "saida.txt")
+
+    assert (tmp_path / "saida.txt").read_bytes() == b"abcdef"
+    assert metodos == {"read/write"}
@@ -0,0 +1,47 @@
+"""
+Testes da instrumentação do pool (SQLite em arquivo, sem MySQL).
+"""
+
+import threading
+
+from sqlalchemy import text
+
+from app.core.database import DatabaseManager
+
+
+def test_stats_track_checkouts_and_disposes(tmp_path):
+    DatabaseManager.initialize(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        pool_size=2,
+        max_overflow=2,
+        stats_log_interval=0,
+    )
+    try:
+        barrier = threading.Barrier(3)
+
+        def worker():
+            with DatabaseManager.connection() as conn:
+                conn.execute(text("SELECT 1"))
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        DatabaseManager.dispose_pool("teste")
+        assert DatabaseManager.test_connection()
+
+        stats = DatabaseManager.stats()
+        assert stats["checkouts"] == 4
+        assert stats["peak_in_use"] == 3
+        assert stats["peak_overflow"] == 1
+        assert stats["in_use"] == 0
+        assert sum(stats["checkout_wait_histogram"].values()) == 4
+        assert stats["disposes"] == 1
+        assert stats["dispose_reasons"] == {"teste": 1}
+    finally:
+        DatabaseManager.dispose()
+
+    assert DatabaseManager.stats() == {}
@@ -0,0 +1,60 @@
+"""
+Profiling por etapa (--profile cpu|mem).
+"""
+
+import pstats
+
+import pytest
+
+from app.core.profiling import Profiler
+from app.core.stage_metrics import StageRecorder
+
+
+def _work():
+    return sorted(str(i) for i in range(20000))
+
+
+def test_cpu_profile_per_stage_via_stage_recorder(tmp_path, capsys):
+    profiler = Profiler("cpu", "teste", output_dir=tmp_path).activate()
+    stages = StageRecorder("t")
+    for _ in range(2):
+        with stages.stage("split"):
+            _work()
+    with stages.stage("insert"):
+        # Etapa aninhada conta na externa
+        with profiler.stage("interna"):
+            _work()
+
+    files = profiler.finish()
+
+    assert sorted(p.name.rsplit("-", 1)[1] for p in files) == ["insert.prof", "split.prof"]
+    stats = pstats.Stats(str(next(p for p in files if p.name.endswith("split.prof"))))
+    assert any(func == "_work" and data[0] == 2 for (_, _, func), data in stats.stats.items())
+    assert "split" in capsys.readouterr().err
+
+
+def test_mem_profile_writes_top_allocations(tmp_path):
+    profiler = Profiler("mem", "teste", output_dir=tmp_path, top_n=3).activate()
+    with profiler.stage("parse"):
+        data = _work()
+
+    (path,) = profiler.finish()
+
+    report = path.read_text(encoding="utf-8").splitlines()
+    assert path.name.endswith("parse.mem.txt")
+    assert report[0].startswith("# parse #1: pico")
+    assert "test_profiling.py" in report[1]
+    assert data
+
+
+def test_disabled_profiler_is_noop(tmp_path):
+    profiler = Profiler(None, "teste", output_dir=tmp_path).activate()
+    with profiler.stage("parse"):
+        _work()
+    assert profiler.finish() == []
+    assert not any(tmp_path.iterdir())
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        Profiler("io", "teste")
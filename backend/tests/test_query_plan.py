@@ -0,0 +1,190 @@
+"""
+Plano da consolidação (query/plano_consulta.py): normalização e regressões.
+"""
+
+import sqlite3
+
+import pytest
+
+from plano_consulta import (
+    MonitorPlano,
+    PlanoRegredido,
+    TABELA_PLANOS,
+    _plano_mysql,
+    _plano_sqlite,
+    comparar_planos,
+    fingerprint,
+    resumo,
+)
+
+
+def _explain_mysql(acesso_ech, filesort=False, cost="12.50"):
+    return {
+        "query_block": {
+            "select_id": 1,
+            "cost_info": {"query_cost": cost},
+            "ordering_operation": {
+                "using_filesort": filesort,
+                "nested_loop": [
+                    {"table": {"table_name": "sd", "access_type": "ALL", "rows_examined_per_scan": 40}},
+                    {"table": {
+                        "table_name": "ech",
+                        "access_type": acesso_ech,
+                        "key": "idx_ech_join" if acesso_ech != "ALL" else None,
+                        "rows_examined_per_scan": 1,
+                    }},
+                ],
+            },
+        }
+    }
+
+
+def test_mysql_plan_keeps_join_order_access_and_flags():
+    plano = _plano_mysql(_explain_mysql("ref", filesort=True))
+
+    assert plano == {
+        "tabelas": [
+            {"tabela": "sd", "acesso": "ALL", "indice": None},
+            {"tabela": "ech", "acesso": "ref", "indice": "idx_ech_join"},
+        ],
+        "flags": ["filesort"],
+    }
+    assert resumo(plano) == "sd ALL; ech ref(idx_ech_join) | filesort"
+
+
+def test_costs_do_not_change_fingerprint():
+    a = _plano_mysql(_explain_mysql("ref", cost="12.50"))
+    b = _plano_mysql(_explain_mysql("ref", cost="9001.00"))
+
+    assert fingerprint(a) == fingerprint(b)
+    assert len(fingerprint(a)) == 32
+    assert fingerprint(a) != fingerprint(_plano_mysql(_explain_mysql("eq_ref")))
+    assert comparar_planos(a, b) == []
+
+
+def test_lost_join_index_is_a_regression():
+    antes = _plano_mysql(_explain_mysql("ref"))
+    depois = _plano_mysql(_explain_mysql("ALL", filesort=True))
+
+    assert comparar_planos(antes, depois) == [
+        "ech: ref(idx_ech_join) -> ALL(-)",
+        "passou a usar filesort",
+    ]
+    # Melhorar o acesso ou perder uma flag não é regressão
+    assert comparar_planos(depois, antes) == []
+
+
+SQLITE_REF = [
+    "SCAN sd",
+    "SEARCH ech USING INDEX idx_ech_join (companyId=? AND billId=?)",
+    "SEARCH sc USING INTEGER PRIMARY KEY (rowid=?)",
+    "USE TEMP B-TREE FOR ORDER BY",
+]
+
+
+def test_sqlite_plan_rows():
+    plano = _plano_sqlite(SQLITE_REF + [
+        "SEARCH p USING COVERING INDEX idx_p (x>?)",
+        "SCAN d USING COVERING INDEX idx_d",
+        "USE TEMP B-TREE FOR DISTINCT",
+        "CORRELATED SCALAR SUBQUERY 1",
+    ])
+
+    assert plano["tabelas"] == [
+        {"tabela": "sd", "acesso": "ALL", "indice": None},
+        {"tabela": "ech", "acesso": "ref", "indice": "idx_ech_join"},
+        {"tabela": "sc", "acesso": "ref", "indice": "PRIMARY"},
+        {"tabela": "p", "acesso": "range", "indice": "idx_p"},
+        {"tabela": "d", "acesso": "index", "indice": "idx_d"},
+    ]
+    assert plano["flags"] == ["filesort", "temporaria"]
+
+
+def test_sqlite_regression_and_stable_fingerprint():
+    antes = _plano_sqlite(SQLITE_REF)
+    depois = _plano_sqlite(["SCAN sd", "SCAN ech", "SEARCH sc USING INTEGER PRIMARY KEY (rowid=?)",
+                            "USE TEMP B-TREE FOR ORDER BY", "USE TEMP B-TREE FOR GROUP BY"])
+
+    assert fingerprint(_plano_sqlite(list(SQLITE_REF))) == fingerprint(antes)
+    assert comparar_planos(antes, depois) == [
+        "ech: ref(idx_ech_join) -> ALL(-)",
+        "passou a usar temporaria",
+    ]
+
+
+def _dict_factory(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "planos.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE sd (companyId INTEGER, billId INTEGER);
+            CREATE TABLE ech (companyId INTEGER, billId INTEGER, valor TEXT);
+            CREATE INDEX idx_ech_join ON ech (companyId, billId);
+        """)
+    return path
+
+
+def _monitor(db_path, **kwargs):
+    # Uma conexão por execução, como na consolidação. Sem índice automático,
+    # perder idx_ech_join vira SCAN, como o ALL do MySQL
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = _dict_factory
+    conn.execute("PRAGMA automatic_index = OFF")
+    return MonitorPlano(conn.cursor(), "sqlite", **kwargs)
+
+
+SQL = "SELECT * FROM sd JOIN ech ON ech.companyId = sd.companyId AND ech.billId = sd.billId"
+
+
+def _registros(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            f"SELECT fingerprint, regressed FROM {TABELA_PLANOS} ORDER BY id"
+        ).fetchall()
+
+
+def test_monitor_fails_on_dropped_index_until_accepted(db_path):
+    _monitor(db_path, modo="falhar").verificar("completa", SQL)
+    monitor = _monitor(db_path, modo="falhar")
+    monitor.verificar("completa", SQL)
+    monitor.registrar(1.5, 10)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP INDEX idx_ech_join")
+    with pytest.raises(PlanoRegredido, match="ech: ref"):
+        _monitor(db_path, modo="falhar").verificar("completa", SQL)
+
+    # Regredido fica gravado, mas não vira referência
+    regredido = _monitor(db_path, modo="avisar")
+    regredido.verificar("completa", SQL)
+    assert regredido.regressoes
+    regredido.registrar()
+
+    aceito = _monitor(db_path, modo="falhar", aceitar=True)
+    aceito.verificar("completa", SQL)
+    aceito.registrar()
+    _monitor(db_path, modo="falhar").verificar("completa", SQL)
+
+    registros = _registros(db_path)
+    assert [regressed for _, regressed in registros] == [0, 1, 1, 0]
+    assert registros[0][0] != registros[1][0] == registros[3][0]
+
+
+def test_monitor_ignore_mode_skips_explain(db_path):
+    monitor = _monitor(db_path, modo="ignorar")
+    assert monitor.verificar("completa", SQL) is None
+    monitor.registrar()
+    with sqlite3.connect(db_path) as conn:
+        tabela = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = ?", (TABELA_PLANOS,)
+        ).fetchone()
+    assert tabela is None
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        MonitorPlano(None, "sqlite", modo="talvez")
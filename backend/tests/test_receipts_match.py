@@ -0,0 +1,56 @@
+"""
+Tabela de casamento dos receipts (SI_DATAPAGTO_receipts_match) em SQLite.
+"""
+
+from sqlalchemy import inspect, text
+
+from app.loaders import QuickLoader
+from app.utils.receipts_match import refresh_receipts_match
+from conftest import write_json_records
+
+
+def _load(engine, tmp_path, table_name, records):
+    path = write_json_records(tmp_path / f"{table_name}.json", records)
+    result = QuickLoader().load(path, table_name, if_exists="replace")
+    assert result.success, result.errors
+    return refresh_receipts_match(engine, table_name)
+
+
+def _receipts():
+    return [
+        {"companyId": 1, "billId": 10, "installmentId": 1, "receipts": [
+            {"netAmount": 100.1, "accountNumber": "001"},
+            # Mesmo receipt em outro lançamento: uma chave só
+            {"netAmount": 100.10000000000001, "accountNumber": "001", "date": "2026-01-02"},
+            {"netAmount": 5, "accountNumber": None},
+        ]},
+        {"companyId": 1, "billId": 11, "installmentId": 2, "receipts": [{"id": 7}]},
+    ]
+
+
+def test_match_table_has_integer_cents_and_empty_account(sqlite_db, tmp_path):
+    assert _load(sqlite_db, tmp_path, "SI_DATAPAGTO", _receipts()) == 2
+
+    with sqlite_db.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT companyId, billId, installmentId, amountCents, accountNumber "
+            "FROM SI_DATAPAGTO_receipts_match"
+        )).fetchall()
+    assert rows == [(1, 10, 1, 500, ""), (1, 10, 1, 10010, "001")]
+    assert inspect(sqlite_db).get_pk_constraint("SI_DATAPAGTO_receipts_match")[
+        "constrained_columns"
+    ] == ["companyId", "billId", "installmentId", "amountCents", "accountNumber"]
+
+
+def test_match_table_only_for_payment_tables(sqlite_db, tmp_path):
+    assert _load(sqlite_db, tmp_path, "SI_DATAEMISSAO", _receipts()) is None
+    assert not inspect(sqlite_db).has_table("SI_DATAEMISSAO_receipts_match")
+
+
+def test_skipped_load_only_creates_missing_table(sqlite_db, tmp_path):
+    _load(sqlite_db, tmp_path, "SI_DATAPAGTO", _receipts())
+
+    assert refresh_receipts_match(sqlite_db, "SI_DATAPAGTO", changed=False) is None
+    with sqlite_db.begin() as conn:
+        conn.execute(text("DROP TABLE SI_DATAPAGTO_receipts_match"))
+    assert refresh_receipts_match(sqlite_db, "SI_DATAPAGTO", changed=False) == 2
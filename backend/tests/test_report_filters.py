@@ -0,0 +1,76 @@
+"""
+Filtros do relatório no WHERE (relatorio/generate_report.py).
+"""
+
+import argparse
+
+import pytest
+
+import generate_report
+from generate_report import _data_iso, montar_where, sufixo_filtros
+
+
+@pytest.fixture(params=["?", "%s"])
+def placeholder(request, monkeypatch):
+    monkeypatch.setattr(generate_report, "PLACEHOLDER", request.param)
+    return request.param
+
+
+def test_single_value_uses_equality(placeholder):
+    where, params = montar_where({"empresa": [1], "status": "Aberto"})
+
+    assert where == (
+        f"WHERE Codigoempresa = {placeholder}\n      AND StatusParcela = {placeholder}"
+    )
+    assert params == [1, "Aberto"]
+
+
+def test_multiple_values_use_in(placeholder):
+    where, params = montar_where({"centro_custo": ["A", "B", "C"]})
+
+    assert where == f"WHERE CodigoDoCentroDeCusto IN ({placeholder}, {placeholder}, {placeholder})"
+    assert params == ["A", "B", "C"]
+
+
+def test_empty_filters_are_dropped():
+    assert montar_where(None) == ("", [])
+    assert montar_where({"empresa": [], "status": None, "vencimento_de": ""}) == ("", [])
+
+
+def test_date_range_and_open_ended_range(placeholder):
+    where, params = montar_where(
+        {"vencimento_de": "2026-01-01", "vencimento_ate": "2026-01-31"}, faixa=(100, None)
+    )
+
+    assert where.split("\n      AND ") == [
+        f"WHERE DataDeVencimento >= {placeholder}",
+        f"DataDeVencimento <= {placeholder}",
+        f"NumeroDoTitulo >= {placeholder}",
+    ]
+    assert params == ["2026-01-01", "2026-01-31", 100]
+
+    where, params = montar_where({}, faixa=(100, 200))
+    assert where.endswith(f"NumeroDoTitulo < {placeholder}")
+    assert params == [100, 200]
+
+
+@pytest.mark.parametrize("filtros, sufixo", [
+    ({}, ""),
+    ({"empresa": [1, 2], "vencimento_de": "2026-01-01", "status": ["Aberto"]},
+     "emp1-2_venc20260101-_stAberto"),
+    ({"centro_custo": ["CC-01"], "baixa_ate": "2026-02-28"}, "ccCC01_baixa-20260228"),
+    ({"vencimento_de": "2026-01-01", "vencimento_ate": "2026-01-31"}, "venc20260101-20260131"),
+])
+def test_file_name_suffix(filtros, sufixo):
+    assert sufixo_filtros(filtros) == sufixo
+
+
+def test_file_name_includes_suffix():
+    nome = generate_report.gerar_nome_arquivo("xls", 812, {"empresa": [1]})
+    assert nome.endswith("_emp1_812.xlsx")
+
+
+def test_data_iso_argument():
+    assert _data_iso("2026-01-31") == "2026-01-31"
+    with pytest.raises(argparse.ArgumentTypeError):
+        _data_iso("31/01/2026")
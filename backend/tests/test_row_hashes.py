@@ -0,0 +1,61 @@
+"""
+Testes da detecção de mudanças por linha (sem MySQL).
+"""
+
+import copy
+
+from app.loaders.upsert_loader import UpsertLoader
+from app.utils.row_hashes import assign_row_keys, diff_hashes, row_hash
+
+
+def _records():
+    return [
+        {"companyId": 1, "billReceivableId": 10, "Id": 1, "value": 100.0,
+         "receipts": [{"netAmount": 100.0}]},
+        {"companyId": 1, "billReceivableId": 11, "Id": 1, "value": 50.0,
+         "receipts": []},
+    ]
+
+
+def _hashes(data, table_name="SI_DATAPAGTO"):
+    UpsertLoader._assign_stable_ids(data)
+    split = UpsertLoader._split_for_table(data, table_name)
+    result = {}
+    for target, rows in split.items():
+        assign_row_keys(rows)
+        result[target] = {row["_row_key"]: row_hash(row) for row in rows}
+    return result
+
+
+def test_row_keys_are_unique_for_repeated_natural_keys():
+    rows = [{"companyId": 1, "billId": 5}, {"companyId": 1, "billId": 5}, {"companyId": 2}]
+    assign_row_keys(rows)
+
+    assert [r["_row_key"] for r in rows] == [
+        "companyId=1|billId=5#0",
+        "companyId=1|billId=5#1",
+        "companyId=2#0",
+    ]
+
+
+def test_reload_without_changes_produces_empty_diff():
+    first = _hashes(_records())
+    second = _hashes(_records())
+
+    assert first.keys() == second.keys()
+    for target in first:
+        assert not diff_hashes(first[target], second[target])
+
+
+def test_diff_detects_insert_update_and_delete():
+    old = _hashes(_records())["main"]
+
+    data = _records()
+    data[0]["value"] = 120.0
+    del data[1]
+    data.append(copy.deepcopy(data[0]) | {"billReceivableId": 12})
+    diff = diff_hashes(old, _hashes(data)["main"])
+
+    assert diff.updated == {"companyId=1|billReceivableId=10|Id=1#0"}
+    assert diff.deleted == {"companyId=1|billReceivableId=11|Id=1#0"}
+    assert diff.inserted == {"companyId=1|billReceivableId=12|Id=1#0"}
@@ -0,0 +1,102 @@
+"""
+Carga completa em SQLite (sem MySQL): QuickLoader nos dois métodos e UpsertLoader.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.core.dialect import MySQLDialect, SQLiteDialect
+from app.loaders import QuickLoader, UpsertLoader
+from conftest import count_rows, write_json_records
+
+
+def _records(value=100.0):
+    return [
+        {"companyId": 1, "billId": 10, "installmentId": i, "originalAmount": value + i,
+         "paymentTerm": {"id": "PM", "descrition": "PARCELAS MENSAIS"},
+         "receipts": [{"netAmount": value + i, "accountNumber": "001"}]}
+        for i in range(1, 4)
+    ]
+
+
+@pytest.mark.parametrize("insert_method", ["to_sql", "executemany"])
+def test_quick_loader_on_sqlite(sqlite_db, tmp_path, insert_method):
+    path = write_json_records(tmp_path / "SI_DATAPAGTO.json", _records())
+
+    result = QuickLoader().load(path, "SI_DATAPAGTO", if_exists="replace",
+                                insert_method=insert_method)
+
+    assert result.success, result.errors
+    assert count_rows(sqlite_db, "SI_DATAPAGTO") == 3
+    assert count_rows(sqlite_db, "SI_DATAPAGTO_receipts") == 3
+
+
+def test_upsert_loader_applies_only_changes_on_sqlite(sqlite_db, tmp_path):
+    loader = UpsertLoader()
+    first = loader.load(write_json_records(tmp_path / "a.json", _records()), "SI_DATAPAGTO")
+    assert first.success, first.errors
+    assert first.rows_inserted == 3
+
+    records = _records()
+    records[0]["originalAmount"] = 999.0
+    second = loader.load(write_json_records(tmp_path / "b.json", records[:2]), "SI_DATAPAGTO")
+
+    assert second.success, second.errors
+    assert (second.rows_inserted, second.rows_updated, second.rows_deleted) == (0, 1, 1)
+    assert count_rows(sqlite_db, "SI_DATAPAGTO") == 2
+    with sqlite_db.connect() as conn:
+        bills = conn.execute(text("SELECT DISTINCT company_id, bill_id FROM _changed_bills"))
+        assert bills.fetchall() == [(1, 10)]
+
+
+def test_upsert_clause_per_dialect():
+    assert MySQLDialect().upsert_clause(("k",), ("v",), ("t",)) == (
+        "ON DUPLICATE KEY UPDATE v = VALUES(v), t = CURRENT_TIMESTAMP"
+    )
+    assert SQLiteDialect().upsert_clause(("k",), ("v",), ("t",)) == (
+        "ON CONFLICT (k) DO UPDATE SET v = excluded.v, t = CURRENT_TIMESTAMP"
+    )
+    assert MySQLDialect().ignore_duplicates_clause(("k",)) == "ON DUPLICATE KEY UPDATE k = k"
+    assert SQLiteDialect().ignore_duplicates_clause(("k",)) == "ON CONFLICT (k) DO NOTHING"
+    assert MySQLDialect().truncate_sql("t") == "TRUNCATE TABLE `t`"
+    assert SQLiteDialect().truncate_sql("t") == "DELETE FROM `t`"
+
+
+def test_json_functions_on_sqlite(sqlite_db):
+    dialect = SQLiteDialect()
+    with sqlite_db.begin() as conn:
+        conn.execute(text("CREATE TABLE j (id INTEGER PRIMARY KEY, v TEXT)"))
+        conn.execute(text("INSERT INTO j (v) VALUES (:v)"), [
+            {"v": '{"id": "PM", "description": null}'},
+            {"v": '[1, 2, 3]'},
+            {"v": 'lixo'},
+        ])
+        rows = conn.execute(text(
+            f"SELECT {dialect.json_type('v')}, {dialect.json_length('v')}, "
+            f"{dialect.json_extract_text('v', 'id')}, "
+            f"{dialect.json_extract_text('v', 'description')} FROM j ORDER BY id"
+        )).fetchall()
+        keys = dialect.json_object_keys(conn, "j", "v")
+
+    assert rows == [("OBJECT", 0, "PM", None), ("ARRAY", 3, None, None), (None, None, None, None)]
+    assert keys == {"id", "description"}
+
+
+def test_json_array_items_on_sqlite(sqlite_db):
+    dialect = SQLiteDialect()
+    items, index, item = dialect.json_array_items("t.v", "a")
+    with sqlite_db.begin() as conn:
+        conn.execute(text("CREATE TABLE j (id INTEGER PRIMARY KEY, v TEXT)"))
+        conn.execute(text("INSERT INTO j (v) VALUES (:v)"), [
+            {"v": '[{"net": 1.5}, "x", {"net": 2, "acc": "001"}]'},
+            {"v": '{"net": 9}'},
+            {"v": 'lixo'},
+        ])
+        rows = conn.execute(text(
+            f"SELECT t.id, {index}, {dialect.json_extract_text(item, 'net')} "
+            f"FROM j AS t, {items} WHERE {dialect.json_type(item)} = 'OBJECT'"
+        )).fetchall()
+        keys = dialect.json_object_keys(conn, "j", "v", array_items=True)
+
+    assert rows == [(1, 0, 1.5), (1, 2, 2)]
+    assert keys == {"net", "acc"}
@@ -0,0 +1,66 @@
+"""
+Métricas por etapa: StageRecorder, stream JSON-lines e LoadResult.stages.
+"""
+
+import json
+
+import pytest
+
+from app.core.stage_metrics import StageRecorder, enable_metrics_stream
+from app.loaders import QuickLoader
+from conftest import write_json_records
+
+
+@pytest.fixture
+def metrics_stream():
+    enable_metrics_stream()
+    try:
+        yield
+    finally:
+        enable_metrics_stream(False)
+
+
+def _events(stderr):
+    return [json.loads(line) for line in stderr.splitlines() if line.startswith("{")]
+
+
+def test_stage_recorder_accumulates_per_table(metrics_stream, capsys):
+    stages = StageRecorder("SI_DATAPAGTO")
+    with stages.stage("insert", "SI_DATAPAGTO") as stage:
+        stage.rows = 3
+    with stages.stage("insert", "SI_DATAPAGTO_receipts") as stage:
+        stage.rows = 5
+
+    (insert,) = stages.stages
+    assert insert.rows == 8
+    assert insert.tables == {"SI_DATAPAGTO": 3, "SI_DATAPAGTO_receipts": 5}
+
+    events = _events(capsys.readouterr().err)
+    assert [(e["event"], e["table"], e["rows"]) for e in events] == [
+        ("stage", "SI_DATAPAGTO", 3),
+        ("stage", "SI_DATAPAGTO_receipts", 5),
+    ]
+
+
+def test_stream_disabled_by_default(capsys):
+    with StageRecorder("t").stage("parse") as stage:
+        stage.rows = 1
+    assert _events(capsys.readouterr().err) == []
+
+
+def test_quick_loader_reports_stages(sqlite_db, tmp_path):
+    records = [
+        {"companyId": 1, "billId": 10, "installmentId": i,
+         "receipts": [{"netAmount": 1.0}, {"netAmount": 2.0}]}
+        for i in range(4)
+    ]
+    path = write_json_records(tmp_path / "SI_DATAPAGTO.json", records)
+
+    result = QuickLoader().load(path, "SI_DATAPAGTO", if_exists="replace")
+
+    assert result.success, result.errors
+    assert [s.name for s in result.stages] == ["parse", "split", "dataframe", "insert"]
+    assert result.stage("parse").rows == 4
+    assert result.stage("insert").tables == {"SI_DATAPAGTO": 4, "SI_DATAPAGTO_receipts": 8}
+    assert result.child_rows == {"SI_DATAPAGTO_receipts": 8}
+    assert result.metrics()["stages"][0]["stage"] == "parse"
@@ -0,0 +1,73 @@
+"""
+Recarga com if_exists='truncate': a tabela é esvaziada e mantém os índices.
+"""
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.loaders import QuickLoader
+from conftest import write_json_records
+
+
+def _write(tmp_path, installments):
+    return write_json_records(tmp_path / "SI_T.json", [
+        {"companyId": 1, "billId": 10, "installmentId": i,
+         "receipts": [{"netAmount": 50.0 + i, "accountNumber": "001"}]}
+        for i in installments
+    ])
+
+
+def _indexes(engine, table):
+    return {idx["name"]: idx for idx in inspect(engine).get_indexes(table)}
+
+
+@pytest.mark.parametrize("insert_method", ["to_sql", "executemany"])
+def test_truncate_keeps_indexes_and_replaces_rows(sqlite_db, tmp_path, insert_method):
+    first = QuickLoader().load(
+        _write(tmp_path, [1, 2, 3]), "SI_T", if_exists="replace", insert_method=insert_method
+    )
+    assert first.success, first.errors
+    with sqlite_db.begin() as conn:
+        conn.execute(text("CREATE INDEX idx_t_join ON SI_T (companyId, billId)"))
+        conn.execute(text("CREATE INDEX idx_tr_join ON SI_T_receipts (netAmount)"))
+
+    second = QuickLoader().load(
+        _write(tmp_path, [4, 5]), "SI_T", if_exists="truncate", insert_method=insert_method
+    )
+
+    assert second.success, second.errors
+    assert second.rows_inserted == 2
+    with sqlite_db.connect() as conn:
+        assert conn.execute(text("SELECT installmentId FROM SI_T ORDER BY 1")).fetchall() == [
+            (4,), (5,),
+        ]
+        assert conn.execute(text("SELECT COUNT(*) FROM SI_T_receipts")).scalar() == 2
+    indexes = _indexes(sqlite_db, "SI_T")
+    assert indexes["idx_t_join"]["column_names"] == ["companyId", "billId"]
+    assert indexes["uk_SI_T_row_hash"]["unique"]
+    assert "idx_tr_join" in _indexes(sqlite_db, "SI_T_receipts")
+    # Índices adiados voltam na etapa "index"
+    assert second.stage("index").tables == {"SI_T": 0, "SI_T_receipts": 0}
+
+
+def test_truncate_creates_missing_table(sqlite_db, tmp_path):
+    result = QuickLoader().load(_write(tmp_path, [1]), "SI_T", if_exists="truncate")
+
+    assert result.success, result.errors
+    assert result.rows_inserted == 1
+    assert result.stage("index") is None
+
+
+def test_truncate_with_checkpoint_keeps_indexes(sqlite_db, tmp_path):
+    QuickLoader().load(_write(tmp_path, [1, 2]), "SI_T", if_exists="replace")
+    with sqlite_db.begin() as conn:
+        conn.execute(text("CREATE INDEX idx_t_join ON SI_T (companyId, billId)"))
+
+    result = QuickLoader().load(
+        _write(tmp_path, [3]), "SI_T", if_exists="truncate", checkpoint=True
+    )
+
+    assert result.success, result.errors
+    with sqlite_db.connect() as conn:
+        assert conn.execute(text("SELECT installmentId FROM SI_T")).fetchall() == [(3,)]
+    assert "idx_t_join" in _indexes(sqlite_db, "SI_T")
@@ -0,0 +1,42 @@
+"""
+Testes do hash de arquivos do UploadTracker (sem MySQL).
+"""
+
+import hashlib
+import os
+
+from app.utils import upload_tracker
+from app.utils.upload_tracker import FileHashCache, calculate_file_hash
+
+
+def test_hash_is_blake2b_over_whole_file(tmp_path):
+    path = tmp_path / "SI_TESTE.json"
+    content = os.urandom(3 * upload_tracker.HASH_BUFFER_SIZE + 123)
+    path.write_bytes(content)
+
+    assert calculate_file_hash(path) == hashlib.blake2b(content, digest_size=32).hexdigest()
+
+
+def test_cache_skips_rehash_until_size_or_mtime_change(tmp_path, monkeypatch):
+    path = tmp_path / "SI_TESTE.json"
+    path.write_bytes(b'{"data": [1]}')
+
+    calls = []
+    real_hash = upload_tracker.calculate_file_hash
+    monkeypatch.setattr(
+        upload_tracker, "calculate_file_hash", lambda p: calls.append(p) or real_hash(p)
+    )
+
+    cache_file = tmp_path / "cache" / "hashes.json"
+    first = FileHashCache(cache_file).get_hash(path)
+    # Nova instância lê o cache persistido: não recalcula
+    assert FileHashCache(cache_file).get_hash(path) == first
+    assert len(calls) == 1
+
+    path.write_bytes(b'{"data": [2]}')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = FileHashCache(cache_file).get_hash(path)
+
+    assert second != first
+    assert len(calls) == 2
@@ -0,0 +1,97 @@
+"""
+Relatório XLSX (relatorio/generators/xls_generator.py) e conversão pt-BR.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from generators import xls_generator
+from generators.conversao import parse_data, parse_valor_br
+from generators.xls_generator import MONEY_FORMAT, XLSGenerator
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1.234,56", 1234.56),
+    ("1234,5", 1234.5),
+    ("-5", -5.0),
+    ("-1.000.000,01", -1000000.01),
+    (" 12,30 ", 12.3),
+    (7, 7.0),
+])
+def test_parse_valor_br_numbers(value, expected):
+    assert parse_valor_br(value) == pytest.approx(expected)
+    assert isinstance(parse_valor_br(value), float)
+
+
+@pytest.mark.parametrize("value", ["abc", "1,234.56", "12.34", "", None, True])
+def test_parse_valor_br_keeps_other_values(value):
+    assert parse_valor_br(value) is value
+
+
+def test_parse_data():
+    assert parse_data("2026-02-05") == date(2026, 2, 5)
+    assert parse_data("2026-02-05 10:30:00") == date(2026, 2, 5)
+    assert parse_data("05/02/2026") == "05/02/2026"
+    assert parse_data("") == ""
+    assert parse_data(date(2026, 2, 5)) == date(2026, 2, 5)
+
+
+def _rows(n):
+    return [
+        {"NumeroDoTitulo": i, "ValorLiquido": f"1.{i:03d},50", "DataDeVencimento": "2026-01-31",
+         "StatusParcela": "Aberto"}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(params=["xlsxwriter", "openpyxl"])
+def openpyxl(request, monkeypatch):
+    """Escrita pelo backend do parâmetro; leitura sempre com openpyxl."""
+    module = pytest.importorskip("openpyxl")
+    if request.param == "xlsxwriter":
+        pytest.importorskip("xlsxwriter")
+    else:
+        monkeypatch.setattr(xls_generator, "xlsxwriter", None)
+    return module
+
+
+def test_rolls_over_to_next_sheet_at_max_rows(openpyxl, tmp_path):
+    path = tmp_path / "r.xlsx"
+
+    assert XLSGenerator(max_rows=3).generate(_rows(7), path) == 7
+
+    wb = openpyxl.load_workbook(path)
+    assert wb.sheetnames == ["Relatorio", "Relatorio_2", "Relatorio_3"]
+    # Cada planilha tem cabeçalho próprio; a última recebe o resto
+    assert [ws.max_row for ws in wb.worksheets] == [4, 4, 2]
+    assert wb["Relatorio_2"]["A1"].value == "NumeroDoTitulo"
+    assert wb["Relatorio_3"]["A2"].value == 6
+
+
+def test_exact_multiple_of_max_rows_has_no_empty_sheet(openpyxl, tmp_path):
+    path = tmp_path / "r.xlsx"
+    XLSGenerator(max_rows=3).generate(_rows(6), path)
+    assert openpyxl.load_workbook(path).sheetnames == ["Relatorio", "Relatorio_2"]
+
+
+def test_money_and_dates_are_typed_cells(openpyxl, tmp_path):
+    path = tmp_path / "r.xlsx"
+    rows = _rows(1) + [{"NumeroDoTitulo": 1, "ValorLiquido": "abc", "DataDeVencimento": None,
+                        "StatusParcela": "Pago"}]
+    XLSGenerator().generate(rows, path)
+
+    ws = openpyxl.load_workbook(path)["Relatorio"]
+    money, day = ws["B2"], ws["C2"]
+    assert money.value == pytest.approx(1000.5)
+    assert money.number_format == MONEY_FORMAT
+    assert isinstance(day.value, datetime) and day.value.date() == date(2026, 1, 31)
+    assert day.is_date
+    # Fora do formato pt-BR continua texto
+    assert ws["B3"].value == "abc"
+    assert ws["C3"].value is None
+
+
+def test_empty_rows_raise(tmp_path):
+    with pytest.raises(ValueError):
+        XLSGenerator().generate([], tmp_path / "r.xlsx")
@@ -0,0 +1,12 @@
+"""
+Benchmarks do pipeline carga → consolidação → exportação.
+
+Gera dados sintéticos determinísticos no formato dos arquivos SI_* do
+Sienge e mede vazão e pico de RSS de JSONParser, _split_nested, cada
+modo de carga, a QUERY_PADRAO e cada gerador de relatório.
+
+Uso:
+    python -m benchmarks --scale 10k
+    python -m benchmarks --scale 100k --suite parser --suite split
+    python -m benchmarks --scale 1m --db --json resultados.json
+"""
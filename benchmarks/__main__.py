@@ -0,0 +1,120 @@
+"""
+Linha de comando dos benchmarks (python -m benchmarks).
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.harness import (
+    ROOT_DIR,
+    BenchContext,
+    BenchResult,
+    format_table,
+    list_cases,
+    run_case,
+)
+from benchmarks.suites import SUITES
+from benchmarks.synthetic import SCALES, ensure_dataset, parse_scale
+
+DEFAULT_DATA_DIR = ROOT_DIR / "benchmarks" / ".data"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks do pipeline com dados sintéticos do Sienge",
+    )
+    parser.add_argument(
+        "--scale",
+        default="10k",
+        help=f"Número de parcelas ({', '.join(SCALES)} ou inteiro; default: 10k)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador (default: 42)")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=SUITES,
+        help="Suíte a rodar (repetível; default: todas)",
+    )
+    parser.add_argument("--case", help="Roda só casos cujo nome contém este texto")
+    parser.add_argument("--repeat", type=int, default=1, help="Execuções por caso (mediana)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Chunk dos loaders")
+    parser.add_argument(
+        "--db",
+        action="store_true",
+        help="Habilita suítes que gravam no banco do backend/.env (tabelas bench_*)",
+    )
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Cache dos dados sintéticos")
+    parser.add_argument("--json", type=Path, help="Grava resultados em JSON")
+    parser.add_argument("--list", action="store_true", help="Só lista os casos")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    scale = parse_scale(args.scale)
+
+    work_dir = args.data_dir / "work"
+    work_dir.mkdir(parents=True, exist_ok=True)
+    ctx = BenchContext(
+        scale=scale,
+        seed=args.seed,
+        data_dir=args.data_dir,
+        work_dir=work_dir,
+        repeat=args.repeat,
+        use_db=args.db,
+        chunk_size=args.chunk_size,
+    )
+
+    started = time.perf_counter()
+    paths = ensure_dataset(args.data_dir, scale, args.seed)
+    total_mb = sum(p.stat().st_size for p in paths.values()) / (1024 * 1024)
+    print(
+        f"Dados sintéticos: {scale} parcelas, seed {args.seed}, {total_mb:.1f} MB "
+        f"({time.perf_counter() - started:.1f}s) em {paths['SI_DATAPAGTO'].parent}",
+        file=sys.stderr,
+    )
+
+    results = []
+    for suite in args.suite or SUITES:
+        for case in list_cases(suite, ctx):
+            if args.case and args.case not in case.name:
+                continue
+            if args.list:
+                db_note = " (--db)" if case.requires_db else ""
+                print(f"{suite}.{case.name}{db_note}")
+                continue
+            if case.requires_db and not args.db:
+                results.append(BenchResult(
+                    suite=suite, case=case.name, unit=case.unit, skipped="requer --db"
+                ))
+                continue
+            print(f"→ {suite}.{case.name}", file=sys.stderr)
+            results.append(run_case(suite, case.name, ctx))
+
+    if args.list:
+        return 0
+
+    print(format_table(results))
+
+    if args.json:
+        payload = {
+            "created_at": datetime.now().isoformat(),
+            "scale": scale,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": sys.version.split()[0],
+            "results": [r.to_dict() for r in results],
+        }
+        args.json.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        print(f"Resultados gravados em {args.json}", file=sys.stderr)
+
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
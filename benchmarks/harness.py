@@ -0,0 +1,220 @@
+"""
+Execução e medição dos casos de benchmark.
+
+Cada caso roda em um processo novo (spawn) para que o pico de RSS medido
+seja só dele, sem a memória deixada por casos anteriores. Dentro do
+processo, o setup (gerar/ler arquivos) fica fora da medição: o pico é
+zerado via /proc/self/clear_refs antes do trecho medido quando o kernel
+permite; senão cai para ru_maxrss (pico do processo inteiro).
+"""
+
+import importlib
+import logging
+import os
+import resource
+import statistics
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def add_project_paths() -> None:
+    """Torna importáveis backend/app, query/ e relatorio/generators."""
+    for sub in ("backend", "query", "relatorio"):
+        path = str(ROOT_DIR / sub)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+@dataclass
+class BenchContext:
+    """Parâmetros compartilhados por todos os casos (precisa ser picklable)."""
+    scale: int
+    seed: int
+    data_dir: Path
+    work_dir: Path
+    repeat: int = 1
+    use_db: bool = False
+    chunk_size: int = 5000
+
+
+@dataclass
+class Case:
+    """
+    Caso de benchmark.
+
+    setup() roda fora da medição e devolve o estado passado a run();
+    run(state) devolve quantos itens (registros/linhas) processou.
+    """
+    name: str
+    run: Callable[[Any], int]
+    setup: Callable[[], Any] = lambda: None
+    input_bytes: int = 0
+    requires_db: bool = False
+    unit: str = "registros"
+
+
+@dataclass
+class BenchResult:
+    """Resultado de um caso."""
+    suite: str
+    case: str
+    items: int = 0
+    unit: str = "registros"
+    seconds: float = 0.0
+    runs: List[float] = field(default_factory=list)
+    input_bytes: int = 0
+    rss_before_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+    skipped: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Itens por segundo (mediana das execuções)."""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """MB de entrada por segundo, quando o caso lê arquivo."""
+        if not self.input_bytes or not self.seconds:
+            return 0.0
+        return self.input_bytes / (1024 * 1024) / self.seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["throughput"] = self.throughput
+        data["mb_per_second"] = self.mb_per_second
+        return data
+
+
+# ----------------------------------------------------------------------
+# Memória
+# ----------------------------------------------------------------------
+def _read_status_kb(key: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Zera o pico de RSS (VmHWM) do processo. Só Linux."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def current_rss_mb() -> float:
+    """RSS atual em MB (0 se indisponível)."""
+    kb = _read_status_kb("VmRSS")
+    return kb / 1024 if kb else 0.0
+
+
+def peak_rss_mb() -> float:
+    """Pico de RSS em MB (VmHWM, ou ru_maxrss fora do Linux)."""
+    kb = _read_status_kb("VmHWM")
+    if kb:
+        return kb / 1024
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes, Linux reporta KB
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+# ----------------------------------------------------------------------
+# Execução
+# ----------------------------------------------------------------------
+def _find_case(suite: str, case_name: str, ctx: BenchContext) -> Case:
+    module = importlib.import_module(f"benchmarks.suites.{suite}")
+    for case in module.cases(ctx):
+        if case.name == case_name:
+            return case
+    raise KeyError(f"Caso {suite}.{case_name} não encontrado")
+
+
+def run_case_in_process(suite: str, case_name: str, ctx: BenchContext) -> BenchResult:
+    """Roda um caso no processo atual (ponto de entrada do processo filho)."""
+    add_project_paths()
+    if not os.getenv("BENCH_VERBOSE"):
+        # Logs INFO por chunk distorcem a medição e poluem a saída
+        logging.disable(logging.INFO)
+    result = BenchResult(suite=suite, case=case_name)
+    try:
+        case = _find_case(suite, case_name, ctx)
+        result.unit = case.unit
+        result.input_bytes = case.input_bytes
+
+        for _ in range(max(1, ctx.repeat)):
+            state = case.setup()
+            result.rss_before_mb = current_rss_mb()
+            reset_peak_rss()
+            started = time.perf_counter()
+            result.items = case.run(state)
+            result.runs.append(time.perf_counter() - started)
+            result.peak_rss_mb = max(result.peak_rss_mb, peak_rss_mb())
+            del state
+
+        result.seconds = statistics.median(result.runs)
+    except ModuleNotFoundError as exc:
+        # Dependência opcional ausente (ex: openpyxl para xlsx)
+        result.skipped = f"módulo {exc.name} não instalado"
+    except Exception as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+        if os.getenv("BENCH_TRACEBACK"):
+            traceback.print_exc()
+    return result
+
+
+def run_case(suite: str, case_name: str, ctx: BenchContext) -> BenchResult:
+    """Roda um caso em processo novo (spawn)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case_in_process, suite, case_name, ctx).result()
+
+
+def list_cases(suite: str, ctx: BenchContext) -> List[Case]:
+    """Casos de uma suíte (sem executar)."""
+    add_project_paths()
+    module = importlib.import_module(f"benchmarks.suites.{suite}")
+    return module.cases(ctx)
+
+
+# ----------------------------------------------------------------------
+# Relatório
+# ----------------------------------------------------------------------
+def format_table(results: List[BenchResult]) -> str:
+    """Tabela de texto com vazão e RSS (antes da medição e pico)."""
+    width = max([len("caso")] + [len(r.case) for r in results]) + 2
+    header = (
+        f"{'suíte':<14}{'caso':<{width}}{'itens':>10}{'tempo (s)':>11}"
+        f"{'itens/s':>12}{'MB/s':>8}{'RSS base (MB)':>15}{'RSS pico (MB)':>15}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        label = f"{r.suite:<14}{r.case:<{width}}"
+        if r.skipped:
+            lines.append(f"{label}ignorado: {r.skipped}")
+            continue
+        if r.error:
+            lines.append(f"{label}ERRO: {r.error}")
+            continue
+        mbps = f"{r.mb_per_second:.1f}" if r.mb_per_second else "-"
+        lines.append(
+            f"{label}{r.items:>10}{r.seconds:>11.3f}{r.throughput:>12,.0f}"
+            f"{mbps:>8}{r.rss_before_mb:>15.1f}{r.peak_rss_mb:>15.1f}"
+        )
+    return "\n".join(lines)
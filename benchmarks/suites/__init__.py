@@ -0,0 +1,14 @@
+"""
+Suítes de benchmark.
+
+Cada módulo expõe cases(ctx) -> List[Case]. A ordem de SUITES segue o
+pipeline: parse → split → carga → consolidação → relatório.
+"""
+
+SUITES = (
+    "parser",
+    "split",
+    "loaders",
+    "consolidation",
+    "reports",
+)
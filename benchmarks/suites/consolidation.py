@@ -0,0 +1,80 @@
+"""
+Consolidação: QUERY_PADRAO sobre as tabelas carregadas.
+
+O setup carrega os três arquivos usados pela query em tabelas bench_*
+(QuickLoader, to_sql) e cria os mesmos índices de INDICES_FONTE; a
+medição é o INSERT ... SELECT em bench_RELATORIO_CONSOLIDADO. As tabelas
+reais e RELATORIO_CONSOLIDADO não são tocadas. Só roda com --db; com
+DB_DIALECT=sqlite usa o arquivo SQLite e a QUERY_PADRAO_SQLITE.
+"""
+
+import re
+from typing import List
+
+from benchmarks.harness import BenchContext, Case
+from benchmarks.synthetic import ensure_dataset
+from benchmarks.suites.loaders import BENCH_PREFIX, drop_bench_tables, load, make_app
+
+SOURCE_FILES = (
+    "SI_EXTRATO_CLIENTE_HISTORICO",
+    "SI_DATACOMPETPARCELAS",
+    "SI_DATAPAGTO",
+)
+
+_TABLE_NAMES = re.compile(r"\b(SI_\w+|RELATORIO_CONSOLIDADO)\b")
+
+
+def bench_sql(sql: str) -> str:
+    """Troca os nomes das tabelas reais pelas bench_*."""
+    return _TABLE_NAMES.sub(lambda m: BENCH_PREFIX + m.group(1), sql)
+
+
+def _setup(ctx: BenchContext):
+    import execute_query as eq
+
+    paths = ensure_dataset(ctx.data_dir, ctx.scale, ctx.seed)
+    app = make_app(ctx)
+    for file_name in SOURCE_FILES:
+        table_name = BENCH_PREFIX + file_name
+        drop_bench_tables(app, table_name)
+        load(app, paths[file_name], table_name)
+
+    connection = eq.conectar()
+    cursor = connection.cursor()
+    # Nomes de índice também prefixados: no SQLite são globais no arquivo
+    eq.garantir_indices_fonte(cursor, [
+        (BENCH_PREFIX + table, BENCH_PREFIX + index,
+         bench_sql(ddl).replace(index, BENCH_PREFIX + index))
+        for table, index, ddl in eq.INDICES_FONTE
+    ])
+    cursor.execute(bench_sql("DROP TABLE IF EXISTS RELATORIO_CONSOLIDADO"))
+    for ddl in eq.ddl_relatorio(BENCH_PREFIX + "RELATORIO_CONSOLIDADO"):
+        cursor.execute(ddl)
+    connection.commit()
+    return connection, eq
+
+
+def _consolidate(state) -> int:
+    connection, eq = state
+    try:
+        cursor = connection.cursor()
+        cursor.execute(bench_sql(eq.sql_insert_consolidado(eq.query_padrao())))
+        rows = cursor.rowcount
+        connection.commit()
+        return rows
+    finally:
+        connection.close()
+
+
+def cases(ctx: BenchContext) -> List[Case]:
+    paths = ensure_dataset(ctx.data_dir, ctx.scale, ctx.seed)
+    return [
+        Case(
+            name="query_padrao",
+            setup=lambda: _setup(ctx),
+            run=_consolidate,
+            input_bytes=sum(paths[f].stat().st_size for f in SOURCE_FILES),
+            requires_db=True,
+            unit="linhas",
+        ),
+    ]
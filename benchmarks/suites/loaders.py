@@ -0,0 +1,158 @@
+"""
+Carga no banco: QuickLoader (to_sql / executemany) e UpsertLoader.
+
+Usa tabelas bench_<SI_*> (e filhas bench_<SI_*>_receipts, ...) no banco
+configurado em backend/.env; nada com o nome real é tocado. Só roda com
+--db. Para o upsert são medidos três cenários: carga inicial, recarga
+sem mudanças e recarga com ~1% das parcelas alteradas. A recarga completa
+com truncate é medida com e sem o perfil de sessão em massa
+(reload_truncate x reload_bulk, este já com o ANALYZE TABLE no fim).
+"""
+
+from pathlib import Path
+from typing import List
+
+from benchmarks.harness import BenchContext, Case
+from benchmarks.synthetic import ensure_dataset, write_json
+
+BENCH_PREFIX = "bench_"
+
+# (nome do caso, loader_mode, insert_method)
+MODES = (
+    ("quick_to_sql", "quick", "to_sql"),
+    ("quick_executemany", "quick", "executemany"),
+    ("upsert_initial", "upsert", "to_sql"),
+)
+
+
+# (nome do caso, bulk_session) das recargas completas com truncate
+RELOADS = (
+    ("reload_truncate", False),
+    ("reload_bulk", True),
+)
+
+
+def make_app(
+    ctx: BenchContext,
+    loader_mode: str = "quick",
+    insert_method: str = "to_sql",
+    bulk_session: bool = False,
+):
+    from app.application import JSONMySQLApplication, ApplicationConfig
+
+    return JSONMySQLApplication(ApplicationConfig(
+        chunk_size=ctx.chunk_size,
+        loader_mode=loader_mode,
+        insert_method=insert_method,
+        bulk_session=bulk_session,
+    ))
+
+
+def load(app, path: Path, table_name: str, if_exists: str = "replace", **kwargs) -> int:
+    """Carrega e devolve registros afetados na tabela principal."""
+    result = app.load_json(path, table_name, if_exists=if_exists, **kwargs)
+    if not result.success:
+        raise RuntimeError("; ".join(result.errors))
+    return result.rows_inserted + result.rows_updated + result.rows_deleted
+
+
+def drop_bench_tables(app, table_name: str) -> None:
+    """Remove a tabela e as filhas, forçando carga completa no upsert."""
+    from sqlalchemy import text
+    from app.core import DatabaseManager
+
+    with DatabaseManager.connection() as conn:
+        for table in DatabaseManager.get_inspector().get_table_names():
+            if table == table_name or table.startswith(f"{table_name}_"):
+                conn.execute(text(f"DROP TABLE IF EXISTS `{table}`"))
+        conn.commit()
+
+
+def changed_copy(ctx: BenchContext, path: Path, every: int = 100) -> Path:
+    """Cópia do arquivo com o valor de 1 a cada `every` registros alterado."""
+    from app.utils.json_handler import JSONParser
+
+    target = ctx.work_dir / f"{path.stem}.changed-{every}.json"
+    if target.exists():
+        return target
+
+    def records():
+        for index, record in enumerate(JSONParser.stream_json_array(path)):
+            if index % every == 0:
+                for item in record.get("installments") or [record]:
+                    for key in ("originalValue", "originalAmount"):
+                        if key in item:
+                            item[key] = round(item[key] + 1.0, 2)
+            yield record
+
+    write_json(target, records())
+    return target
+
+
+def cases(ctx: BenchContext) -> List[Case]:
+    result = []
+    for file_name, path in ensure_dataset(ctx.data_dir, ctx.scale, ctx.seed).items():
+        table_name = f"{BENCH_PREFIX}{file_name}"
+        size = path.stat().st_size
+
+        for case_name, mode, method in MODES:
+            def setup(mode=mode, method=method, table_name=table_name):
+                app = make_app(ctx, mode, method)
+                drop_bench_tables(app, table_name)
+                return app
+
+            result.append(Case(
+                name=f"{case_name}:{file_name}",
+                setup=setup,
+                run=lambda app, p=path, t=table_name: load(app, p, t),
+                input_bytes=size,
+                requires_db=True,
+            ))
+
+        # Recarga completa sobre tabela existente (índices mantidos pelo truncate)
+        for case_name, bulk in RELOADS:
+            def setup_loaded(bulk=bulk, p=path, t=table_name):
+                app = make_app(ctx, bulk_session=bulk)
+                drop_bench_tables(app, t)
+                load(app, p, t)
+                return app
+
+            result.append(Case(
+                name=f"{case_name}:{file_name}",
+                setup=setup_loaded,
+                run=lambda app, p=path, t=table_name: load(app, p, t, if_exists="truncate"),
+                input_bytes=size,
+                requires_db=True,
+            ))
+
+        # Recargas: vazão medida em registros do arquivo, não em linhas alteradas
+        def setup_synced(p=path, t=table_name, changed=False):
+            from app.utils.json_handler import JSONParser
+
+            app = make_app(ctx, "upsert")
+            drop_bench_tables(app, t)
+            load(app, p, t)
+            source = changed_copy(ctx, p) if changed else p
+            records = sum(1 for _ in JSONParser.stream_json_array(source))
+            return app, source, records
+
+        def reload(state, t=table_name):
+            app, source, records = state
+            load(app, source, t)
+            return records
+
+        result.append(Case(
+            name=f"upsert_noop:{file_name}",
+            setup=setup_synced,
+            run=reload,
+            input_bytes=size,
+            requires_db=True,
+        ))
+        result.append(Case(
+            name=f"upsert_1pct:{file_name}",
+            setup=lambda p=path, t=table_name: setup_synced(p, t, changed=True),
+            run=reload,
+            input_bytes=size,
+            requires_db=True,
+        ))
+    return result
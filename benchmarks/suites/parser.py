@@ -0,0 +1,36 @@
+"""
+JSONParser: json.load do arquivo inteiro x decodificação incremental.
+"""
+
+from typing import List
+
+from benchmarks.harness import BenchContext, Case
+from benchmarks.synthetic import ensure_dataset
+
+
+def cases(ctx: BenchContext) -> List[Case]:
+    from app.utils.json_handler import JSONParser
+
+    result = []
+    for file_name, path in ensure_dataset(ctx.data_dir, ctx.scale, ctx.seed).items():
+        size = path.stat().st_size
+        result.extend([
+            Case(
+                name=f"parse_file:{file_name}",
+                run=lambda _, p=path: len(JSONParser.parse_file(p)),
+                input_bytes=size,
+            ),
+            Case(
+                name=f"stream:{file_name}",
+                run=lambda _, p=path: sum(1 for _ in JSONParser.stream_json_array(p)),
+                input_bytes=size,
+            ),
+            Case(
+                name=f"iterate_file:{file_name}",
+                run=lambda _, p=path: sum(
+                    len(chunk) for chunk in JSONParser.iterate_file(p, chunk_size=ctx.chunk_size)
+                ),
+                input_bytes=size,
+            ),
+        ])
+    return result
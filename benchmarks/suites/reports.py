@@ -0,0 +1,47 @@
+"""
+Geradores de relatório (relatorio/generators) sobre linhas consolidadas.
+
+As linhas vêm de synthetic.consolidated_rows (mesmo formato que
+buscar_dados_consolidados devolve), montadas no setup; só a escrita do
+arquivo é medida.
+"""
+
+from typing import List
+
+from benchmarks.harness import BenchContext, Case
+from benchmarks.synthetic import consolidated_rows
+
+# formato -> (módulo, classe), como GENERATORS em generate_report.py
+GENERATORS = {
+    "csv": ("generators.csv_generator", "CSVGenerator"),
+    "xlsx": ("generators.xls_generator", "XLSGenerator"),
+    "txt": ("generators.txt_generator", "TXTGenerator"),
+}
+
+
+def _setup(ctx: BenchContext, fmt: str):
+    import importlib
+
+    module_name, class_name = GENERATORS[fmt]
+    generator = getattr(importlib.import_module(module_name), class_name)()
+    return generator, consolidated_rows(ctx.scale, ctx.seed)
+
+
+def _generate(ctx: BenchContext, fmt: str, state) -> int:
+    generator, rows = state
+    filepath = ctx.work_dir / f"relatorio_bench.{fmt}"
+    generator.generate(rows, str(filepath))
+    filepath.unlink()
+    return len(rows)
+
+
+def cases(ctx: BenchContext) -> List[Case]:
+    return [
+        Case(
+            name=f"generate:{fmt}",
+            setup=lambda fmt=fmt: _setup(ctx, fmt),
+            run=lambda state, fmt=fmt: _generate(ctx, fmt, state),
+            unit="linhas",
+        )
+        for fmt in GENERATORS
+    ]
@@ -0,0 +1,31 @@
+"""
+QuickLoader._split_nested: achatamento/explosão dos campos aninhados.
+
+O parse do arquivo fica no setup; só o split é medido. Os itens contados
+são as linhas produzidas (principal + filhas).
+"""
+
+from typing import List
+
+from benchmarks.harness import BenchContext, Case
+from benchmarks.synthetic import ensure_dataset
+
+
+def _split(loader_class, data, table_name: str) -> int:
+    split = loader_class._split_for_table(data, table_name)
+    return sum(len(rows) for rows in split.values())
+
+
+def cases(ctx: BenchContext) -> List[Case]:
+    from app.loaders import QuickLoader
+    from app.utils.json_handler import JSONParser
+
+    result = []
+    for file_name, path in ensure_dataset(ctx.data_dir, ctx.scale, ctx.seed).items():
+        result.append(Case(
+            name=f"split_nested:{file_name}",
+            setup=lambda p=path: JSONParser.parse_file(p),
+            run=lambda data, t=file_name: _split(QuickLoader, data, t),
+            unit="linhas",
+        ))
+    return result
@@ -0,0 +1,467 @@
+"""
+Gerador determinístico de dados sintéticos no formato do Sienge.
+
+Produz os quatro arquivos SI_*.json baixados pelo siengeSyncService:
+
+- SI_EXTRATO_CLIENTE_HISTORICO: extrato do cliente (installments com
+  receipts aninhados, paymentTerms e units)
+- SI_DATACOMPETPARCELAS / SI_DATAPAGTO / SI_DATAEMISSAO: endpoint /income
+  (paymentTerm, receipts, receiptsCategories)
+
+As chaves (companyId, billId, installmentId, netAmount) batem entre os
+arquivos, então a QUERY_PADRAO encontra os mesmos joins que nos dados reais.
+A escala é o número de parcelas; a mesma (escala, seed) gera sempre os
+mesmos bytes.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Escalas nomeadas aceitas na linha de comando
+SCALES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+SI_FILES = (
+    "SI_EXTRATO_CLIENTE_HISTORICO",
+    "SI_DATACOMPETPARCELAS",
+    "SI_DATAPAGTO",
+    "SI_DATAEMISSAO",
+)
+
+# Mesma ordem de QUERY_PADRAO/QUERY_COLUMNS (query/execute_query.py)
+CONSOLIDATED_COLUMNS = [
+    "Codigoempresa",
+    "NomeDaEmpresa",
+    "CodigoDoCentroDeCusto",
+    "NomeDoCentroDeCusto",
+    "CodigoDoPlanoFinanceiroComMascara",
+    "numPlanoFinanceiro",
+    "PlanoFinanceiro",
+    "CodigoDoCliente",
+    "NomeDoCliente",
+    "NumeroCPFCNPJ",
+    "NumeroDoDocumento",
+    "NomeDoDocumento",
+    "NumeroDoTitulo",
+    "NumeroDaParcela",
+    "NomeDoTipoDeCondicao",
+    "DataDeEmissao",
+    "DataDeVencimento",
+    "ValorOriginalRateado",
+    "SaldoAtual",
+    "ValorDaBaixaRateado",
+    "Datadabaixa",
+    "AcrescimoRateado",
+    "DescontoRateado",
+    "ValorLiquido",
+    "numConta",
+    "StatusParcela",
+]
+
+BASE_DATE = date(2023, 1, 1)
+INSTALLMENTS_PER_BILL = 4
+
+COMPANIES = [
+    (1, "FUNDO IMOBILIARIO ALFA"),
+    (2, "FUNDO IMOBILIARIO BETA"),
+    (3, "LOTEAMENTO GAMA SPE LTDA"),
+]
+COST_CENTERS = [
+    (101, "RESIDENCIAL JARDIM DAS FLORES"),
+    (102, "LOTEAMENTO PARQUE DAS AGUAS"),
+    (103, "CONDOMINIO VILA NOVA"),
+    (104, "EDIFICIO CENTRAL"),
+]
+FINANCIAL_CATEGORIES = [
+    ("1010101", "VENDA DE LOTES"),
+    ("1010102", "VENDA DE UNIDADES"),
+    ("1010201", "JUROS CONTRATUAIS"),
+    ("1010202", "CORRECAO MONETARIA"),
+    ("1020101", "MULTAS POR ATRASO"),
+]
+PAYMENT_TERMS = [
+    ("PM", "PARCELAS MENSAIS"),
+    ("AT", "ATO"),
+    ("BA", "BALAO ANUAL"),
+    ("FI", "FINANCIAMENTO"),
+]
+DOCUMENTS = [
+    ("CT", "CONTRATO"),
+    ("NF", "NOTA FISCAL"),
+    ("RC", "RECIBO"),
+]
+ACCOUNTS = ["0012345-6", "0098765-4", "0055555-1", "REAPROFIN"]
+FIRST_NAMES = ["ANA", "BRUNO", "CARLA", "DIEGO", "ELISA", "FABIO", "GABRIELA", "HUGO"]
+LAST_NAMES = ["SILVA", "SOUZA", "OLIVEIRA", "PEREIRA", "COSTA", "ALMEIDA", "LIMA"]
+
+
+def parse_scale(value: str) -> int:
+    """Converte '10k', '100k', '1m' ou um inteiro em número de parcelas."""
+    key = value.strip().lower()
+    if key in SCALES:
+        return SCALES[key]
+    return int(key.replace("_", ""))
+
+
+def _iso(day: date) -> str:
+    return day.isoformat()
+
+
+def _money(rng: random.Random, low: float, high: float) -> float:
+    return round(rng.uniform(low, high), 2)
+
+
+class _Installment:
+    """Parcela sintética compartilhada por todos os arquivos."""
+
+    __slots__ = (
+        "company", "bill_id", "installment_id", "number", "customer",
+        "due", "original", "receipts", "cost_center", "categories",
+        "payment_term", "document", "issue",
+    )
+
+
+def _installments(count: int, seed: int) -> Iterator[_Installment]:
+    """
+    Gera parcelas em ordem de título.
+
+    Cada título tem até INSTALLMENTS_PER_BILL parcelas; cerca de 60% das
+    parcelas têm baixa (uma ou duas receipts) e cada parcela é rateada em
+    uma ou duas categorias financeiras.
+    """
+    rng = random.Random(seed)
+    bill_id = 100_000
+    produced = 0
+
+    while produced < count:
+        bill_id += 1
+        company = COMPANIES[bill_id % len(COMPANIES)]
+        customer_id = 5_000 + rng.randrange(count // 3 + 10)
+        customer = (
+            customer_id,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"{rng.randrange(10**10, 10**11):011d}",
+        )
+        cost_center = rng.choice(COST_CENTERS)
+        payment_term = rng.choice(PAYMENT_TERMS)
+        document = rng.choice(DOCUMENTS)
+        issue = BASE_DATE + timedelta(days=rng.randrange(365))
+
+        for number in range(1, INSTALLMENTS_PER_BILL + 1):
+            if produced >= count:
+                break
+            produced += 1
+
+            inst = _Installment()
+            inst.company = company
+            inst.bill_id = bill_id
+            inst.installment_id = number
+            inst.number = number
+            inst.customer = customer
+            inst.cost_center = cost_center
+            inst.payment_term = payment_term
+            inst.document = document
+            inst.issue = issue
+            inst.due = issue + timedelta(days=30 * number)
+            inst.original = _money(rng, 500, 25_000)
+
+            if rng.random() < 0.6:
+                paid = inst.original if rng.random() < 0.7 else round(inst.original * 0.5, 2)
+                receipts = [(paid, inst.due + timedelta(days=rng.randrange(-5, 20)))]
+                if rng.random() < 0.1:
+                    receipts.append((_money(rng, 10, 200), inst.due + timedelta(days=40)))
+                inst.receipts = receipts
+            else:
+                inst.receipts = []
+
+            first = rng.choice(FINANCIAL_CATEGORIES)
+            if rng.random() < 0.3:
+                second = rng.choice(FINANCIAL_CATEGORIES)
+                inst.categories = [(first, 70.0), (second, 30.0)]
+            else:
+                inst.categories = [(first, 100.0)]
+
+            yield inst
+
+
+def _extract_records(count: int, seed: int) -> Iterator[Dict[str, Any]]:
+    """SI_EXTRATO_CLIENTE_HISTORICO: um registro por título."""
+    rng = random.Random(seed + 1)
+    current: Dict[str, Any] = {}
+
+    for inst in _installments(count, seed):
+        if current.get("billReceivableId") != inst.bill_id:
+            if current:
+                yield current
+            current = {
+                "companyId": inst.company[0],
+                "companyName": inst.company[1],
+                "customerId": inst.customer[0],
+                "customerName": inst.customer[1],
+                "customerDocument": inst.customer[2],
+                "billReceivableId": inst.bill_id,
+                "emissionDate": _iso(inst.issue),
+                "lastRenegotiationDate": _iso(inst.issue),
+                "correctionDate": None,
+                "document": f"{inst.document[0]}-{inst.bill_id}",
+                "privateArea": _money(rng, 150, 900),
+                "oldestInstallmentDate": _iso(inst.issue + timedelta(days=30)),
+                "revokedBillReceivableDate": None,
+                "units": [{"id": inst.bill_id % 997, "name": f"LOTE {inst.bill_id % 997:03d}"}],
+                "installments": [],
+            }
+
+        current["installments"].append({
+            "id": inst.installment_id,
+            "annualCorrection": False,
+            "sentToScripturalCharge": False,
+            "paymentTerms": {"id": inst.payment_term[0], "descrition": inst.payment_term[1]},
+            "baseDate": _iso(inst.issue),
+            "originalValue": inst.original,
+            "dueDate": _iso(inst.due),
+            "indexerId": 1,
+            "indexerName": "INCC",
+            "generatedBillet": True,
+            "currentBalance": round(inst.original - sum(v for v, _ in inst.receipts), 2),
+            "currentBalanceWithAddition": inst.original,
+            "receipts": [
+                {
+                    "date": _iso(day),
+                    "value": value,
+                    "extra": _money(rng, 0, 50) if day > inst.due else 0.0,
+                    "discount": 0.0,
+                    "type": "Recebimento",
+                }
+                for value, day in inst.receipts
+            ],
+        })
+
+    if current:
+        yield current
+
+
+def _income_records(count: int, seed: int, selection: str) -> Iterator[Dict[str, Any]]:
+    """Endpoint /income (COMPET/PAGTO/EMISSAO): um registro por parcela."""
+    rng = random.Random(seed + ord(selection))
+
+    for inst in _installments(count, seed):
+        # PAGTO só traz parcelas com baixa
+        if selection == "P" and not inst.receipts:
+            continue
+
+        receipts = [
+            {
+                "operationTypeId": 1,
+                "operationTypeName": "Recebimento",
+                "grossAmount": value,
+                "monetaryCorrectionAmount": 0.0,
+                "interestAmount": 0.0,
+                "fineAmount": 0.0,
+                "discountAmount": 0.0,
+                "taxAmount": 0.0,
+                "netAmount": value,
+                "additionAmount": 0.0,
+                "insuranceAmount": 0.0,
+                "dueAdmAmount": 0.0,
+                "calculationDate": _iso(day),
+                "paymentDate": _iso(day),
+                "accountCompanyId": inst.company[0],
+                "accountNumber": rng.choice(ACCOUNTS),
+                "accountType": "C",
+                "sequencialNumber": index + 1,
+                "correctedNetAmount": value,
+                "embeddedInterestAmount": 0.0,
+                "proRata": 0.0,
+            }
+            for index, (value, day) in enumerate(inst.receipts)
+        ]
+        categories = [
+            {
+                "costCenterId": inst.cost_center[0],
+                "costCenterName": inst.cost_center[1],
+                "financialCategoryId": category[0],
+                "financialCategoryName": category[1],
+                "financialCategoryReducer": category[0][-3:],
+                "financialCategoryType": "R",
+                "financialCategoryRate": rate,
+            }
+            for category, rate in inst.categories
+        ]
+
+        yield {
+            "companyId": inst.company[0],
+            "companyName": inst.company[1],
+            "businessAreaId": 1,
+            "businessAreaName": "INCORPORACAO",
+            "projectId": inst.cost_center[0],
+            "projectName": inst.cost_center[1],
+            "clientId": inst.customer[0],
+            "clientName": inst.customer[1],
+            "billId": inst.bill_id,
+            "installmentId": inst.installment_id,
+            "documentIdentificationId": inst.document[0],
+            "documentIdentificationName": inst.document[1],
+            "documentNumber": f"{inst.document[0]}-{inst.bill_id}",
+            "documentForecast": "N",
+            "originId": "CR",
+            "originalAmount": inst.original,
+            "discountAmount": 0.0,
+            "taxAmount": 0.0,
+            "indexerId": 1,
+            "indexerName": "INCC",
+            "dueDate": _iso(inst.due),
+            "issueDate": _iso(inst.issue),
+            "billDate": _iso(inst.issue),
+            "installmentBaseDate": _iso(inst.issue),
+            "balanceAmount": round(inst.original - sum(v for v, _ in inst.receipts), 2),
+            "correctedBalanceAmount": inst.original,
+            "periodicityType": "Mensal",
+            "embeddedInterestAmount": 0.0,
+            "interestType": "S",
+            "interestRate": 0.5,
+            "correctionType": "M",
+            "interestBaseDate": _iso(inst.issue),
+            "defaulterSituation": None,
+            "subJudicie": "N",
+            "mainUnit": f"LOTE {inst.bill_id % 997:03d}",
+            "installmentNumber": f"{inst.number}/{INSTALLMENTS_PER_BILL}",
+            "paymentTerm": {"id": inst.payment_term[0], "descrition": inst.payment_term[1]},
+            "costCenter": {"id": inst.cost_center[0], "name": inst.cost_center[1]},
+            "customer": {"id": inst.customer[0], "document": inst.customer[2]},
+            "receipts": receipts,
+            "receiptsCategories": categories,
+        }
+
+
+def iter_records(file_name: str, count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    Registros sintéticos de um arquivo SI_*.
+
+    Args:
+        file_name: Um dos SI_FILES
+        count: Número de parcelas (escala)
+        seed: Semente do gerador
+
+    Returns:
+        Iterator de dicts no formato do Sienge
+    """
+    if file_name == "SI_EXTRATO_CLIENTE_HISTORICO":
+        return _extract_records(count, seed)
+    if file_name == "SI_DATACOMPETPARCELAS":
+        return _income_records(count, seed, "B")
+    if file_name == "SI_DATAPAGTO":
+        return _income_records(count, seed, "P")
+    if file_name == "SI_DATAEMISSAO":
+        return _income_records(count, seed, "I")
+    raise ValueError(f"Arquivo desconhecido: {file_name}")
+
+
+def write_json(path: Path, records: Iterator[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Grava {"data": [...]} em streaming (não monta a lista em memória).
+
+    Returns:
+        Tuple (registros, bytes)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write('{"data": [')
+        for record in records:
+            if count:
+                f.write(",\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("]}\n")
+    tmp_path.replace(path)
+    return count, path.stat().st_size
+
+
+def ensure_dataset(data_dir: Path, count: int, seed: int = 42) -> Dict[str, Path]:
+    """
+    Gera (ou reaproveita) os quatro arquivos em data_dir/<count>-<seed>/.
+
+    Returns:
+        Dict {SI_*: caminho do arquivo}
+    """
+    target = Path(data_dir) / f"{count}-{seed}"
+    paths = {}
+    for file_name in SI_FILES:
+        path = target / f"{file_name}.json"
+        if not path.exists():
+            write_json(path, iter_records(file_name, count, seed))
+        paths[file_name] = path
+    return paths
+
+
+def _br_money(value: float) -> str:
+    """Formata como FORMAT(...) + REPLACE da QUERY_PADRAO (1.234,56)."""
+    return f"{value:,.2f}".replace(",", "#").replace(".", ",").replace("#", ".")
+
+
+def consolidated_rows(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Linhas no formato de RELATORIO_CONSOLIDADO (entrada dos geradores).
+
+    Derivadas das mesmas parcelas sintéticas, uma linha por categoria,
+    com valores já formatados como a QUERY_PADRAO entrega.
+    """
+    rng = random.Random(seed + 7)
+    rows: List[Dict[str, Any]] = []
+
+    for inst in _installments(count, seed):
+        received = sum(v for v, _ in inst.receipts)
+        receipt_day = inst.receipts[0][1] if inst.receipts else None
+        account = rng.choice(ACCOUNTS) if inst.receipts else None
+        if account == "REAPROFIN":
+            status = "Distrato"
+        elif received == 0:
+            status = "A Receber"
+        elif inst.original > received:
+            status = "Pagamento Parcial"
+        else:
+            status = "Pagamento Total"
+
+        for (category_id, category_name), rate in inst.categories:
+            original = round(inst.original * rate / 100, 2)
+            paid = round(received * rate / 100, 2)
+            rows.append({
+                "Codigoempresa": inst.company[0],
+                "NomeDaEmpresa": inst.company[1],
+                "CodigoDoCentroDeCusto": str(inst.cost_center[0]),
+                "NomeDoCentroDeCusto": inst.cost_center[1],
+                "CodigoDoPlanoFinanceiroComMascara": (
+                    f"{category_id[0]}.{category_id[1:3]}.{category_id[3:5]}.{category_id[5:7]}"
+                ),
+                "numPlanoFinanceiro": category_id,
+                "PlanoFinanceiro": category_name,
+                "CodigoDoCliente": inst.customer[0],
+                "NomeDoCliente": inst.customer[1],
+                "NumeroCPFCNPJ": inst.customer[2],
+                "NumeroDoDocumento": f"{inst.document[0]}-{inst.bill_id}",
+                "NomeDoDocumento": inst.document[1],
+                "NumeroDoTitulo": inst.bill_id,
+                "NumeroDaParcela": inst.installment_id,
+                "NomeDoTipoDeCondicao": inst.payment_term[1],
+                "DataDeEmissao": inst.issue,
+                "DataDeVencimento": inst.due,
+                "ValorOriginalRateado": _br_money(original),
+                "SaldoAtual": _br_money(original - paid),
+                "ValorDaBaixaRateado": _br_money(paid),
+                "Datadabaixa": receipt_day,
+                "AcrescimoRateado": _br_money(0),
+                "DescontoRateado": _br_money(0),
+                "ValorLiquido": _br_money(paid),
+                "numConta": account,
+                "StatusParcela": status,
+            })
+
+    return rows
@@ -5,7 +5,9 @@ function FormatSelector({ value, onChange, disabled }) {
   const formats = [
     { id: 'csv', label: 'CSV', description: 'Planilha separada por ponto-e-vírgula' },
     { id: 'xls', label: 'Excel', description: 'Arquivo Excel (.xlsx)' },
-    { id: 'txt', label: 'TXT', description: 'Texto formatado em colunas' }
+    { id: 'txt', label: 'TXT', description: 'Texto formatado em colunas' },
+    { id: 'parquet', label: 'Parquet', description: 'Colunar tipado para pandas/Power BI' },
+    { id: 'feather', label: 'Feather', description: 'Arrow IPC para pandas' }
   ];
   
   return (
@@ -22,7 +24,7 @@ function FormatSelector({ value, onChange, disabled }) {
             data-testid={`format-option-${format.id}`}
           >
             <div className="format-icon">
-              {format.id === 'csv' && (
+              {['csv', 'parquet', 'feather'].includes(format.id) && (
                 <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
                   <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
                   <polyline points="14 2 14 8 20 8"></polyline>
@@ -41,7 +41,9 @@ function HistoryItem({ item }) {
     const badges = {
       csv: { label: 'CSV', color: '#48bb78' },
       xls: { label: 'Excel', color: '#4299e1' },
-      txt: { label: 'TXT', color: '#9f7aea' }
+      txt: { label: 'TXT', color: '#9f7aea' },
+      parquet: { label: 'Parquet', color: '#ed8936' },
+      feather: { label: 'Feather', color: '#38b2ac' }
     };
     return badges[formato] || { label: formato.toUpperCase(), color: '#718096' };
   };
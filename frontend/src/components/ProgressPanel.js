@@ -43,7 +43,8 @@ function ProgressPanel({ job }) {
       <div className="progress-details">
         <span data-testid="progress-percentage">{progress.percentage}%</span>
         <span data-testid="progress-records">
-          {progress.recordsProcessed.toLocaleString()} / {progress.totalRecords.toLocaleString()} registros
+          {progress.recordsProcessed.toLocaleString()}
+          {progress.totalRecords ? ` / ${progress.totalRecords.toLocaleString()}` : ''} registros
         </span>
       </div>
     </div>
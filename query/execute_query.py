@@ -1,13 +1,24 @@
 #!/usr/bin/env python3
-"""Execute Query Padrao - Consolida dados do Sienge."""
+"""Execute Query Padrao - Consolida dados do Sienge.
 
+Roda no MySQL (padrao) ou num arquivo SQLite local com DB_DIALECT=sqlite
+(mesmo SQLITE_PATH do backend), para CI e benchmarks sem servidor.
+"""
+
+import argparse
+import importlib.util
 import os
+import sqlite3
 import sys
+import time
+from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
 
 import pymysql
 from dotenv import load_dotenv
 
+import plano_consulta
+
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 BACKEND_ENV = ROOT_DIR / "backend" / ".env"
@@ -28,8 +39,35 @@ def _required_env(name: str) -> str:
     return value
 
 
+def _load_profiling():
+    # Carrega backend/app/core/profiling.py (so stdlib) sem importar o pacote app
+    path = ROOT_DIR / "backend" / "app" / "core" / "profiling.py"
+    spec = importlib.util.spec_from_file_location("profiling", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+profiling = _load_profiling()
+
+
+def _sqlite_path() -> Path:
+    # Mesma regra do backend (config/settings.py): relativo a backend/
+    value = (os.getenv("SQLITE_PATH") or "").strip()
+    if not value:
+        return ROOT_DIR / "backend" / "data" / "relatorio.sqlite3"
+    path = Path(value)
+    return path if path.is_absolute() else ROOT_DIR / "backend" / path
+
+
 _load_envs()
 
+DB_DIALECT = (os.getenv("DB_DIALECT") or "mysql").strip().lower()
+if DB_DIALECT not in ("mysql", "sqlite"):
+    raise ValueError(f"DB_DIALECT invalido: {DB_DIALECT} (use mysql ou sqlite)")
+
+SQLITE_PATH = _sqlite_path()
+
 MYSQL_CONFIG = {
     "host": _required_env("MYSQL_HOST"),
     "port": int((os.getenv("MYSQL_PORT") or "3306").strip()),
@@ -38,21 +76,30 @@ MYSQL_CONFIG = {
     "database": _required_env("MYSQL_DATABASE"),
     "charset": "utf8mb4",
     "cursorclass": pymysql.cursors.DictCursor,
-}
-
-
-QUERY_PADRAO = """
-SELECT DISTINCT
+} if DB_DIALECT == "mysql" else None
+
+
+# Sem DISTINCT: os loaders do backend garantem linhas unicas nas tabelas
+# SI_* (indice UNIQUE em _row_hash), entao o join nao gera repetidas e o
+# MySQL nao precisa materializar e deduplicar o resultado numa tabela
+# temporaria. --verificar-unicidade confere isso; --distinct volta ao antigo.
+#
+# Os receipts vem de SI_DATAPAGTO_receipts_match, gerada pelo backend a cada
+# carga do SI_DATAPAGTO (app/utils/receipts_match.py): chave inteira com o
+# valor em centavos e accountNumber ('' quando ausente), toda na chave
+# primaria. O valor casa por centavos em vez de igualdade de DOUBLE.
+#
+# As categorias vem de SI_DATACOMPETPARCELAS_categories, tambem gerada pelo
+# backend (app/utils/competence_categories.py): a tabela de competencia tem
+# uma linha por receipt aninhado em cada categoria, a projecao uma por
+# parcela/categoria, e o join com ela nao repete linhas do relatorio.
+_QUERY_PADRAO_TEMPLATE = """
+SELECT
   ech.companyId AS Codigoempresa,
   ech.companyName AS NomeDaEmpresa,
-  CAST(sd.costCenterId AS CHAR) AS CodigoDoCentroDeCusto,
+  CAST(sd.costCenterId AS {texto}) AS CodigoDoCentroDeCusto,
   sd.costCenterName AS NomeDoCentroDeCusto,
-  CONCAT(
-    SUBSTRING(sd.financialCategoryId, 1, 1), '.',
-    SUBSTRING(sd.financialCategoryId, 2, 2), '.',
-    SUBSTRING(sd.financialCategoryId, 4, 2), '.',
-    SUBSTRING(sd.financialCategoryId, 6, 2)
-  ) AS CodigoDoPlanoFinanceiroComMascara,
+  {mascara_plano} AS CodigoDoPlanoFinanceiroComMascara,
   sd.financialCategoryId AS numPlanoFinanceiro,
   sd.financialCategoryName AS PlanoFinanceiro,
   ech.customerId AS CodigoDoCliente,
@@ -65,51 +112,106 @@ SELECT DISTINCT
   ech.paymentTermsDescrition AS NomeDoTipoDeCondicao,
   DATE(ech.lastRenegotiationDate) AS DataDeEmissao,
   DATE(ech.dueDate) AS DataDeVencimento,
-  REPLACE(REPLACE(REPLACE(FORMAT(
-    ROUND(COALESCE(ech.originalValue, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2), 2
-  ), ',', '#'), '.', ','), '#', '.') AS ValorOriginalRateado,
-  REPLACE(REPLACE(REPLACE(FORMAT(
-    ROUND(COALESCE(ech.originalValue, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2) -
-    ROUND(COALESCE(ech.receiptValue, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2), 2
-  ), ',', '#'), '.', ','), '#', '.') AS SaldoAtual,
-  REPLACE(REPLACE(REPLACE(FORMAT(
-    ROUND(COALESCE(ech.receiptValue, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2), 2
-  ), ',', '#'), '.', ','), '#', '.') AS ValorDaBaixaRateado,
+  {valor_original} AS ValorOriginalRateado,
+  {saldo} AS SaldoAtual,
+  {valor_baixa} AS ValorDaBaixaRateado,
   DATE(ech.receiptDate) AS Datadabaixa,
-  REPLACE(REPLACE(REPLACE(FORMAT(
-    ROUND(COALESCE(ech.receiptExtra, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2), 2
-  ), ',', '#'), '.', ','), '#', '.') AS AcrescimoRateado,
-  REPLACE(REPLACE(REPLACE(FORMAT(
-    ROUND(COALESCE(ech.receiptDiscount, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2), 2
-  ), ',', '#'), '.', ','), '#', '.') AS DescontoRateado,
-  REPLACE(REPLACE(REPLACE(FORMAT(
-    ROUND(COALESCE(ech.receiptValue, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2) +
-    ROUND(COALESCE(ech.receiptExtra, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2) -
-    ROUND(COALESCE(ech.receiptDiscount, 0) * COALESCE(sd.financialCategoryRate, 0) / 100, 2), 2
-  ), ',', '#'), '.', ','), '#', '.') AS ValorLiquido,
-  sdr.accountNumber AS numConta,
-  IF (
-    UPPER(TRIM(sdr.accountNumber)) = 'REAPROFIN',
-    'Distrato',
-    IF (COALESCE(ech.receiptValue,0) = 0, 'A Receber',
-        IF (ech.originalValue > ech.receiptValue,'Pagamento Parcial',
-            IF (ech.originalValue = ech.receiptValue,'Pagamento Total', '')
-        )
-    )
-  ) AS StatusParcela
+  {acrescimo} AS AcrescimoRateado,
+  {desconto} AS DescontoRateado,
+  {valor_liquido} AS ValorLiquido,
+  NULLIF(sdr.accountNumber, '') AS numConta,
+  {status} AS StatusParcela
 FROM SI_EXTRATO_CLIENTE_HISTORICO ech
-LEFT JOIN SI_DATACOMPETPARCELAS sd
+LEFT JOIN SI_DATACOMPETPARCELAS_categories sd
   ON sd.companyId = ech.companyId
   AND sd.billId = ech.billReceivableId
   AND sd.installmentId = ech.Id
-LEFT JOIN SI_DATAPAGTO_receipts sdr
-  ON sdr.billId = ech.billReceivableId
-  AND sdr.companyId = ech.companyId
+LEFT JOIN SI_DATAPAGTO_receipts_match sdr
+  ON sdr.companyId = ech.companyId
+  AND sdr.billId = ech.billReceivableId
   AND sdr.installmentId = ech.Id
-  AND sdr.netAmount = ech.receiptValue
+  AND sdr.amountCents = CAST(ROUND(ech.receiptValue * 100) AS {inteiro})
 WHERE sd.financialCategoryId IS NOT NULL
 """
 
+# Mascara do plano financeiro: 1.23.45.67 (inicio, tamanho de cada parte)
+_PARTES_PLANO = ((1, 1), (2, 2), (4, 2), (6, 2))
+
+_STATUS_MYSQL = """IF (
+    UPPER(TRIM(sdr.accountNumber)) = 'REAPROFIN',
+    'Distrato',
+    IF (COALESCE(ech.receiptValue,0) = 0, 'A Receber',
+        IF (ech.originalValue > ech.receiptValue,'Pagamento Parcial',
+            IF (ech.originalValue = ech.receiptValue,'Pagamento Total', '')
+        )
+    )
+  )"""
+
+_STATUS_SQLITE = """CASE
+    WHEN UPPER(TRIM(sdr.accountNumber)) = 'REAPROFIN' THEN 'Distrato'
+    WHEN COALESCE(ech.receiptValue, 0) = 0 THEN 'A Receber'
+    WHEN ech.originalValue > ech.receiptValue THEN 'Pagamento Parcial'
+    WHEN ech.originalValue = ech.receiptValue THEN 'Pagamento Total'
+    ELSE ''
+  END"""
+
+
+def _montar_query_padrao(dialeto: str) -> str:
+    """
+    QUERY_PADRAO no dialeto pedido, a partir do template unico.
+
+    So mudam os fragmentos sem equivalente comum: FORMAT + REPLACE vira
+    FORMAT_BR (registrada em conectar()), IF vira CASE, CONCAT vira ||,
+    CHAR/SIGNED viram TEXT/INTEGER e a divisao por 100 e real no SQLite
+    (inteiro / 100 trunca).
+    """
+    sqlite = dialeto == "sqlite"
+    cem = "100.0" if sqlite else "100"
+
+    def rateado(coluna):
+        return (
+            f"ROUND(COALESCE(ech.{coluna}, 0) * COALESCE(sd.financialCategoryRate, 0) / {cem}, 2)"
+        )
+
+    def moeda(*termos):
+        # termos: coluna, depois pares (operador, coluna)
+        expr = rateado(termos[0])
+        for operador, coluna in zip(termos[1::2], termos[2::2]):
+            expr += f" {operador}\n    {rateado(coluna)}"
+        if sqlite:
+            return f"FORMAT_BR(\n    {expr}\n  )"
+        return (
+            f"REPLACE(REPLACE(REPLACE(FORMAT(\n    {expr}, 2\n"
+            "  ), ',', '#'), '.', ','), '#', '.')"
+        )
+
+    if sqlite:
+        mascara = " || '.' ||\n    ".join(
+            f"SUBSTR(sd.financialCategoryId, {inicio}, {tamanho})"
+            for inicio, tamanho in _PARTES_PLANO
+        )
+    else:
+        mascara = "CONCAT(\n    " + ", '.',\n    ".join(
+            f"SUBSTRING(sd.financialCategoryId, {inicio}, {tamanho})"
+            for inicio, tamanho in _PARTES_PLANO
+        ) + "\n  )"
+
+    return _QUERY_PADRAO_TEMPLATE.format(
+        texto="TEXT" if sqlite else "CHAR",
+        inteiro="INTEGER" if sqlite else "SIGNED",
+        mascara_plano=mascara,
+        valor_original=moeda("originalValue"),
+        saldo=moeda("originalValue", "-", "receiptValue"),
+        valor_baixa=moeda("receiptValue"),
+        acrescimo=moeda("receiptExtra"),
+        desconto=moeda("receiptDiscount"),
+        valor_liquido=moeda("receiptValue", "+", "receiptExtra", "-", "receiptDiscount"),
+        status=_STATUS_SQLITE if sqlite else _STATUS_MYSQL,
+    )
+
+
+QUERY_PADRAO = _montar_query_padrao("mysql")
+QUERY_PADRAO_SQLITE = _montar_query_padrao("sqlite")
 
 QUERY_COLUMNS = [
     "Codigoempresa",
@@ -143,7 +245,7 @@ QUERY_COLUMNS = [
 
 DDL_RELATORIO_EXATO = """
 CREATE TABLE IF NOT EXISTS RELATORIO_CONSOLIDADO (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id BIGINT NOT NULL AUTO_INCREMENT,
     Codigoempresa BIGINT,
     NomeDaEmpresa VARCHAR(255),
     CodigoDoCentroDeCusto VARCHAR(100),
@@ -156,8 +258,8 @@ CREATE TABLE IF NOT EXISTS RELATORIO_CONSOLIDADO (
     NumeroCPFCNPJ VARCHAR(50),
     NumeroDoDocumento VARCHAR(80),
     NomeDoDocumento VARCHAR(255),
-    NumeroDoTitulo BIGINT,
-    NumeroDaParcela BIGINT,
+    NumeroDoTitulo BIGINT NOT NULL,
+    NumeroDaParcela BIGINT NOT NULL,
     NomeDoTipoDeCondicao VARCHAR(120),
     DataDeEmissao DATE NULL,
     DataDeVencimento DATE NULL,
@@ -171,21 +273,195 @@ CREATE TABLE IF NOT EXISTS RELATORIO_CONSOLIDADO (
     numConta VARCHAR(50),
     StatusParcela VARCHAR(30),
     data_execucao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (NumeroDoTitulo, NumeroDaParcela, id),
+    UNIQUE KEY uk_id (id),
     INDEX idx_data_execucao (data_execucao),
-    INDEX idx_titulo (NumeroDoTitulo),
-    INDEX idx_cliente (CodigoDoCliente)
+    INDEX idx_cliente (CodigoDoCliente),
+    INDEX idx_empresa_vencimento (Codigoempresa, DataDeVencimento),
+    INDEX idx_empresa_baixa (Codigoempresa, Datadabaixa),
+    INDEX idx_empresa_centro_vencimento (Codigoempresa, CodigoDoCentroDeCusto, DataDeVencimento),
+    INDEX idx_vencimento_status (DataDeVencimento, StatusParcela),
+    INDEX idx_baixa_status (Datadabaixa, StatusParcela)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
 """
 
 
+# Colunas da ordem de exportacao (ORDER BY do generate_report.py)
+ORDEM_EXPORTACAO = ("NumeroDoTitulo", "NumeroDaParcela")
+
+# Indice do SQLite equivalente a chave primaria do MySQL
+INDICE_ORDEM_SQLITE = "idx_ordem_exportacao"
+
+
+def ddl_relatorio(table_name: str = "RELATORIO_CONSOLIDADO") -> list:
+    """
+    Statements de criacao da tabela consolidada no dialeto configurado.
+
+    No SQLite, AUTO_INCREMENT vira INTEGER PRIMARY KEY AUTOINCREMENT, os
+    INDEX inline viram CREATE INDEX separados (nome prefixado pela tabela,
+    pois indices sao globais no arquivo) e ENGINE/CHARSET saem. A ordem das
+    colunas e a mesma.
+
+    No MySQL a chave primaria (clustered no InnoDB) e a ordem de exportacao
+    (NumeroDoTitulo, NumeroDaParcela, id). O SQLite mantem o rowid como
+    chave e ganha um indice idx_ordem_exportacao com as mesmas colunas.
+    """
+    ddl = DDL_RELATORIO_EXATO.replace("RELATORIO_CONSOLIDADO", table_name)
+    if DB_DIALECT != "sqlite":
+        return [ddl]
+    columns, indexes = [], []
+    for line in ddl.strip().splitlines()[1:-1]:
+        line = line.strip().rstrip(",")
+        if line.startswith("INDEX "):
+            _, name, cols = line.split(" ", 2)
+            indexes.append(
+                f"CREATE INDEX IF NOT EXISTS {table_name}_{name} ON {table_name} {cols}"
+            )
+        elif line.startswith("PRIMARY KEY "):
+            cols = line[len("PRIMARY KEY "):]
+            indexes.append(
+                f"CREATE INDEX IF NOT EXISTS {table_name}_{INDICE_ORDEM_SQLITE} "
+                f"ON {table_name} {cols}"
+            )
+        elif line.startswith("UNIQUE KEY uk_id "):
+            continue  # id ja e o rowid
+        else:
+            columns.append(
+                line.replace("BIGINT NOT NULL AUTO_INCREMENT", "INTEGER PRIMARY KEY AUTOINCREMENT")
+            )
+    create = f"CREATE TABLE IF NOT EXISTS {table_name} (\n    " + ",\n    ".join(columns) + "\n)"
+    return [create, *indexes]
+
+
+def indices_relatorio(table_name: str = "RELATORIO_CONSOLIDADO") -> list:
+    """
+    Indices de DDL_RELATORIO_EXATO como (tabela, indice, DDL).
+
+    Usado no modo incremental, em que a tabela ja existe e pode ter sido
+    criada antes de um indice novo entrar no DDL.
+    """
+    idx_defs = []
+    for line in DDL_RELATORIO_EXATO.strip().splitlines():
+        line = line.strip().rstrip(",")
+        if not line.startswith("INDEX "):
+            continue
+        _, name, cols = line.split(" ", 2)
+        if DB_DIALECT == "sqlite":
+            name = f"{table_name}_{name}"
+        idx_defs.append((table_name, name, f"CREATE INDEX {name} ON {table_name} {cols}"))
+    return idx_defs
+
+
+def sql_insert_consolidado(query: str, table_name: str = "RELATORIO_CONSOLIDADO") -> str:
+    """
+    INSERT ... SELECT da consulta na tabela consolidada, ja na ordem de exportacao.
+
+    Com as linhas chegando ordenadas pela chave primaria, o InnoDB preenche
+    as paginas em sequencia (sem page splits) e no SQLite o rowid segue a
+    mesma ordem do indice idx_ordem_exportacao.
+    """
+    columns_csv = ", ".join(QUERY_COLUMNS)
+    return f"""
+    INSERT INTO {table_name} ({columns_csv})
+    {sql_select_consolidado(query)}
+    """
+
+
+def sql_select_consolidado(query: str) -> str:
+    """SELECT do INSERT de sql_insert_consolidado (o que o EXPLAIN analisa)."""
+    return f"""
+    SELECT {", ".join(QUERY_COLUMNS)}
+    FROM ({query}) q
+    ORDER BY {", ".join(ORDEM_EXPORTACAO)}
+    """
+
+
+def _format_br(value):
+    """FORMAT(x, 2) do MySQL com separadores trocados: 1234.5 -> '1.234,50'."""
+    if value is None:
+        return None
+    rounded = Decimal(repr(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return f"{rounded:,.2f}".replace(",", "#").replace(".", ",").replace("#", ".")
+
+
+def _dict_factory(cursor, row):
+    # Mesmo formato do DictCursor do PyMySQL
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+def conectar():
+    """Abre conexao no banco configurado (DB_DIALECT)."""
+    if DB_DIALECT == "sqlite":
+        if not SQLITE_PATH.exists():
+            raise FileNotFoundError(f"Banco SQLite nao encontrado: {SQLITE_PATH}")
+        connection = sqlite3.connect(SQLITE_PATH)
+        connection.row_factory = _dict_factory
+        connection.create_function("FORMAT_BR", 1, _format_br, deterministic=True)
+        return connection
+    return pymysql.connect(**MYSQL_CONFIG)
+
+
+def query_padrao(distinct: bool = False) -> str:
+    """QUERY_PADRAO no dialeto configurado (com SELECT DISTINCT se distinct=True)."""
+    query = QUERY_PADRAO_SQLITE if DB_DIALECT == "sqlite" else QUERY_PADRAO
+    if distinct:
+        query = query.replace("SELECT\n", "SELECT DISTINCT\n", 1)
+    return query
+
+
+def verificar_unicidade(cursor, amostra: int = 5) -> dict:
+    """
+    Confere se a QUERY_PADRAO sem DISTINCT devolve o mesmo conjunto de linhas.
+
+    Compara COUNT(*) da consulta com e sem DISTINCT e, se houver diferenca,
+    traz ate `amostra` grupos repetidos (titulo, parcela e quantidade) para
+    localizar a origem nas tabelas SI_*.
+
+    Returns:
+        dict: linhas, distintas, repetidas e amostra
+    """
+    cursor.execute(f"SELECT COUNT(*) AS total FROM ({query_padrao()}) q")
+    linhas = cursor.fetchone()["total"]
+    cursor.execute(f"SELECT COUNT(*) AS total FROM ({query_padrao(distinct=True)}) q")
+    distintas = cursor.fetchone()["total"]
+
+    grupos = []
+    if linhas != distintas:
+        colunas = ", ".join(QUERY_COLUMNS)
+        cursor.execute(
+            f"""
+            SELECT NumeroDoTitulo, NumeroDaParcela, COUNT(*) AS vezes
+            FROM ({query_padrao()}) q
+            GROUP BY {colunas}
+            HAVING COUNT(*) > 1
+            LIMIT {int(amostra)}
+            """
+        )
+        grupos = cursor.fetchall()
+
+    return {
+        "linhas": linhas,
+        "distintas": distintas,
+        "repetidas": linhas - distintas,
+        "amostra": grupos,
+    }
+
+
 def criar_tabela_consolidada(cursor) -> None:
     # Garante schema e ordem de colunas exatamente iguais ao padrao exigido.
     cursor.execute("DROP TABLE IF EXISTS RELATORIO_CONSOLIDADO")
-    cursor.execute(DDL_RELATORIO_EXATO)
+    for ddl in ddl_relatorio():
+        cursor.execute(ddl)
     print("Tabela RELATORIO_CONSOLIDADO recriada no padrao da QUERY_PADRAO", file=sys.stderr)
 
 
 def _index_exists(cursor, table_name: str, index_name: str) -> bool:
+    if DB_DIALECT == "sqlite":
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND name = ?",
+            (table_name, index_name),
+        )
+        return cursor.fetchone() is not None
     cursor.execute(
         """
         SELECT 1
@@ -200,26 +476,31 @@ def _index_exists(cursor, table_name: str, index_name: str) -> bool:
     return cursor.fetchone() is not None
 
 
-def garantir_indices_fonte(cursor) -> None:
-    """Cria índices de join quando ausentes para acelerar a etapa 2."""
-    idx_defs = [
-        (
-            "SI_EXTRATO_CLIENTE_HISTORICO",
-            "idx_ech_join",
-            "CREATE INDEX idx_ech_join ON SI_EXTRATO_CLIENTE_HISTORICO (companyId, billReceivableId, Id)",
-        ),
-        (
-            "SI_DATACOMPETPARCELAS",
-            "idx_sd_join",
-            "CREATE INDEX idx_sd_join ON SI_DATACOMPETPARCELAS (companyId, billId, installmentId)",
-        ),
-        (
-            "SI_DATAPAGTO_receipts",
-            "idx_sdr_join",
-            "CREATE INDEX idx_sdr_join ON SI_DATAPAGTO_receipts (companyId, billId, installmentId, netAmount)",
-        ),
-    ]
+# Indices de join usados pela QUERY_PADRAO: (tabela, indice, DDL)
+INDICES_FONTE = [
+    (
+        "SI_EXTRATO_CLIENTE_HISTORICO",
+        "idx_ech_join",
+        "CREATE INDEX idx_ech_join ON SI_EXTRATO_CLIENTE_HISTORICO (companyId, billReceivableId, Id)",
+    ),
+    (
+        "SI_DATACOMPETPARCELAS_categories",
+        "idx_sdc_join",
+        "CREATE INDEX idx_sdc_join ON SI_DATACOMPETPARCELAS_categories "
+        "(companyId, billId, installmentId)",
+    ),
+]
 
+# Tabelas geradas pelo backend ao fim da carga da origem: (tabela, origem).
+# A de casamento dos receipts ja tem o join na chave primaria
+TABELAS_DERIVADAS = (
+    ("SI_DATAPAGTO_receipts_match", "SI_DATAPAGTO"),
+    ("SI_DATACOMPETPARCELAS_categories", "SI_DATACOMPETPARCELAS"),
+)
+
+
+def garantir_indices_fonte(cursor, idx_defs=INDICES_FONTE) -> None:
+    """Cria índices de join quando ausentes para acelerar a etapa 2."""
     for table_name, index_name, ddl in idx_defs:
         if _index_exists(cursor, table_name, index_name):
             continue
@@ -228,26 +509,210 @@ def garantir_indices_fonte(cursor) -> None:
         print(f"Indice criado: {index_name}", file=sys.stderr)
 
 
+def _table_exists(cursor, table_name: str) -> bool:
+    if DB_DIALECT == "sqlite":
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table_name,),
+        )
+        return cursor.fetchone() is not None
+    cursor.execute(
+        """
+        SELECT 1
+        FROM information_schema.tables
+        WHERE table_schema = DATABASE()
+          AND table_name = %s
+        LIMIT 1
+        """,
+        (table_name,),
+    )
+    return cursor.fetchone() is not None
+
+
+def garantir_tabelas_derivadas(cursor) -> None:
+    """Falha cedo se o backend ainda nao gerou as tabelas derivadas das cargas."""
+    for tabela, origem in TABELAS_DERIVADAS:
+        if not _table_exists(cursor, tabela):
+            raise RuntimeError(
+                f"Tabela {tabela} ausente: rode a carga do {origem} "
+                "pelo backend (scripts/main.py), que gera a tabela ao final"
+            )
+
+
+def _layout_exportacao(cursor, table_name: str = "RELATORIO_CONSOLIDADO") -> bool:
+    """Tabela ja tem a chave (MySQL) ou indice (SQLite) na ordem de exportacao."""
+    if DB_DIALECT == "sqlite":
+        return _index_exists(cursor, table_name, f"{table_name}_{INDICE_ORDEM_SQLITE}")
+    cursor.execute(
+        """
+        SELECT column_name AS coluna
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+          AND table_name = %s
+          AND index_name = 'PRIMARY'
+        ORDER BY seq_in_index
+        """,
+        (table_name,),
+    )
+    return tuple(row["coluna"] for row in cursor.fetchall()) == (*ORDEM_EXPORTACAO, "id")
+
+
+def limpar_titulos_alterados(cursor) -> None:
+    # _changed_bills e preenchida pelo modo upsert do backend
+    if _table_exists(cursor, "_changed_bills"):
+        cursor.execute("DELETE FROM _changed_bills")
+
+
+def executar_incremental(cursor, distinct: bool = False, monitor=None) -> int | None:
+    """
+    Reconsolida apenas os titulos registrados em _changed_bills.
+
+    Retorna None quando nao ha base para o incremental (tabela consolidada
+    ou _changed_bills ausentes) e a consolidacao completa deve rodar. Com
+    monitor (plano_consulta.MonitorPlano), o plano e verificado antes do DELETE.
+    """
+    if not _table_exists(cursor, "RELATORIO_CONSOLIDADO") or not _table_exists(cursor, "_changed_bills"):
+        print("Sem base para consolidacao incremental, executando completa", file=sys.stderr)
+        return None
+    if not _layout_exportacao(cursor):
+        print(
+            "RELATORIO_CONSOLIDADO sem chave na ordem de exportacao, executando completa",
+            file=sys.stderr,
+        )
+        return None
+    garantir_indices_fonte(cursor, indices_relatorio())
+
+    cursor.execute(
+        "SELECT COUNT(*) AS total FROM (SELECT DISTINCT company_id, bill_id FROM _changed_bills) cb"
+    )
+    total = cursor.fetchone()["total"]
+    print(f"Titulos alterados desde a ultima consolidacao: {total}", file=sys.stderr)
+    if not total:
+        return 0
+
+    query_alterados = query_padrao(distinct) + """  AND EXISTS (
+    SELECT 1 FROM _changed_bills cb
+    WHERE cb.company_id = ech.companyId
+      AND cb.bill_id = ech.billReceivableId
+  )
+"""
+    if monitor is not None:
+        monitor.verificar("incremental", sql_select_consolidado(query_alterados))
+
+    if DB_DIALECT == "sqlite":
+        # SQLite nao tem DELETE com JOIN
+        cursor.execute(
+            """
+            DELETE FROM RELATORIO_CONSOLIDADO
+            WHERE EXISTS (
+              SELECT 1 FROM _changed_bills cb
+              WHERE cb.company_id = RELATORIO_CONSOLIDADO.Codigoempresa
+                AND cb.bill_id = RELATORIO_CONSOLIDADO.NumeroDoTitulo
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            DELETE rc
+            FROM RELATORIO_CONSOLIDADO rc
+            JOIN (SELECT DISTINCT company_id, bill_id FROM _changed_bills) cb
+              ON cb.company_id = rc.Codigoempresa
+              AND cb.bill_id = rc.NumeroDoTitulo
+            """
+        )
+    print(f"Linhas consolidadas removidas: {cursor.rowcount}", file=sys.stderr)
+
+    cursor.execute(sql_insert_consolidado(query_alterados))
+    rows_inserted = cursor.rowcount
+    print(f"Query incremental executada: {rows_inserted} registros inseridos", file=sys.stderr)
+    return rows_inserted
+
+
 def limpar_dados_antigos(cursor) -> None:
-    cursor.execute("TRUNCATE TABLE RELATORIO_CONSOLIDADO")
+    if DB_DIALECT == "sqlite":
+        cursor.execute("DELETE FROM RELATORIO_CONSOLIDADO")
+    else:
+        cursor.execute("TRUNCATE TABLE RELATORIO_CONSOLIDADO")
     print("Tabela RELATORIO_CONSOLIDADO limpa", file=sys.stderr)
 
 
-def executar_query_e_inserir(cursor) -> int:
+def executar_query_e_inserir(cursor, distinct: bool = False) -> int:
     print("Executando query consolidada...", file=sys.stderr)
-    columns_csv = ", ".join(QUERY_COLUMNS)
-    insert_query = f"""
-    INSERT INTO RELATORIO_CONSOLIDADO ({columns_csv})
-    SELECT {columns_csv}
-    FROM ({QUERY_PADRAO}) q
-    """
-    cursor.execute(insert_query)
+    cursor.execute(sql_insert_consolidado(query_padrao(distinct)))
     rows_inserted = cursor.rowcount
     print(f"Query executada: {rows_inserted} registros inseridos", file=sys.stderr)
     return rows_inserted
 
 
-def main() -> int:
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Consolida dados do Sienge em RELATORIO_CONSOLIDADO")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reconsolida so os titulos alterados pelo modo upsert (_changed_bills)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=profiling.PROFILE_MODES,
+        help="Perfila cada etapa (cpu: cProfile, mem: tracemalloc) em backend/logs/profiles/",
+    )
+    parser.add_argument(
+        "--distinct",
+        action="store_true",
+        help="Consolida com SELECT DISTINCT (tabelas SI_* carregadas antes da deduplicacao)",
+    )
+    parser.add_argument(
+        "--verificar-unicidade",
+        action="store_true",
+        help="So confere se a consulta sem DISTINCT repete linhas (codigo 2 se repetir)",
+    )
+    parser.add_argument(
+        "--plano",
+        choices=plano_consulta.MODOS,
+        default=os.getenv("QUERY_PLAN_CHECK") or "avisar",
+        help="Plano pior que o ultimo registrado em _query_plans: avisar (padrao), "
+             "falhar (codigo 3, sem consolidar) ou ignorar (nem captura)",
+    )
+    parser.add_argument(
+        "--explain-analyze",
+        action="store_true",
+        help="Grava tambem o EXPLAIN ANALYZE (MySQL 8.0.18+; executa a consulta uma vez a mais)",
+    )
+    parser.add_argument(
+        "--aceitar-plano",
+        action="store_true",
+        help="Aceita o plano atual como referencia mesmo que tenha piorado",
+    )
+    return parser.parse_args(argv)
+
+
+def _relatar_unicidade(resultado: dict) -> int:
+    print(
+        f"Linhas: {resultado['linhas']} | distintas: {resultado['distintas']}",
+        file=sys.stderr,
+    )
+    if not resultado["repetidas"]:
+        print("OK: a consulta sem DISTINCT devolve o mesmo resultado", file=sys.stderr)
+        return 0
+    print(
+        f"ATENCAO: {resultado['repetidas']} linhas repetidas; recarregue as tabelas "
+        "SI_* com replace ou consolide com --distinct",
+        file=sys.stderr,
+    )
+    for grupo in resultado["amostra"]:
+        print(
+            f"  titulo {grupo['NumeroDoTitulo']} parcela {grupo['NumeroDaParcela']}: "
+            f"{grupo['vezes']}x",
+            file=sys.stderr,
+        )
+    return 2
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    profiler = profiling.Profiler(args.profile, "execute_query").activate()
+
     print("=" * 60, file=sys.stderr)
     print("EXECUTANDO QUERY PADRAO - CONSOLIDACAO DE DADOS", file=sys.stderr)
     print("=" * 60, file=sys.stderr)
@@ -255,27 +720,56 @@ def main() -> int:
 
     connection = None
     try:
-        print(
-            f"Conectando em {MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}...",
-            file=sys.stderr,
-        )
-        connection = pymysql.connect(**MYSQL_CONFIG)
-        cursor = connection.cursor()
-
-        print("Conectado ao MySQL", file=sys.stderr)
+        if DB_DIALECT == "sqlite":
+            print(f"Abrindo SQLite {SQLITE_PATH}...", file=sys.stderr)
+        else:
+            print(
+                f"Conectando em {MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}...",
+                file=sys.stderr,
+            )
+        with profiler.stage("conexao"):
+            connection = conectar()
+            cursor = connection.cursor()
+
+        print(f"Conectado ({DB_DIALECT})", file=sys.stderr)
         print(file=sys.stderr)
 
-        garantir_indices_fonte(cursor)
-        criar_tabela_consolidada(cursor)
-        limpar_dados_antigos(cursor)
-        rows = executar_query_e_inserir(cursor)
-        connection.commit()
+        with profiler.stage("indices"):
+            garantir_tabelas_derivadas(cursor)
+            garantir_indices_fonte(cursor)
+        if args.verificar_unicidade:
+            with profiler.stage("unicidade"):
+                return _relatar_unicidade(verificar_unicidade(cursor))
+        monitor = plano_consulta.MonitorPlano(
+            cursor, DB_DIALECT, modo=args.plano, analyze=args.explain_analyze,
+            aceitar=args.aceitar_plano,
+        )
+        with profiler.stage("consolidacao"):
+            inicio = time.perf_counter()
+            rows = None
+            if args.incremental:
+                rows = executar_incremental(cursor, args.distinct, monitor)
+            if rows is None:
+                # Antes do DROP: no modo falhar a tabela atual fica intacta
+                monitor.verificar("completa", sql_select_consolidado(query_padrao(args.distinct)))
+                criar_tabela_consolidada(cursor)
+                limpar_dados_antigos(cursor)
+                rows = executar_query_e_inserir(cursor, args.distinct)
+            limpar_titulos_alterados(cursor)
+            monitor.registrar(round(time.perf_counter() - inicio, 3), rows)
+        with profiler.stage("commit"):
+            connection.commit()
 
         print(file=sys.stderr)
         print("=" * 60, file=sys.stderr)
         print(f"SUCESSO: {rows} registros consolidados", file=sys.stderr)
         print("=" * 60, file=sys.stderr)
         return 0
+    except plano_consulta.PlanoRegredido as exc:
+        print(f"\nERRO: {exc}", file=sys.stderr)
+        # Nada foi consolidado; fica so o registro do plano regredido
+        connection.commit()
+        return 3
     except Exception as exc:
         print(f"\nERRO: {exc}", file=sys.stderr)
         if connection:
@@ -284,6 +778,7 @@ def main() -> int:
     finally:
         if connection:
             connection.close()
+        profiler.finish()
 
 
 if __name__ == "__main__":
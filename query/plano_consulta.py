@@ -0,0 +1,318 @@
+"""Plano de execucao da consolidacao: captura, fingerprint e regressao.
+
+Antes de consolidar, o EXPLAIN da consulta (FORMAT=JSON no MySQL, QUERY
+PLAN no SQLite) e reduzido ao que importa para o desempenho: a ordem das
+tabelas do join, o tipo de acesso de cada uma (ref, eq_ref, ALL...), o
+indice usado e se ha tabela temporaria ou filesort. Custos e estimativas
+de linhas ficam de fora, entao o fingerprint so muda quando o plano muda.
+
+Cada execucao grava plano, fingerprint e tempo em _query_plans. O plano
+novo e comparado com o ultimo sem regressao da mesma consulta: um acesso
+que piora (ex: ref -> ALL, tipico de indice de join perdido numa recarga
+com replace) ou uma temporaria/filesort nova e uma regressao. Planos
+regredidos sao gravados marcados, sem virar referencia, ate que
+--aceitar-plano aceite o plano atual como nova referencia.
+"""
+
+import hashlib
+import json
+import re
+import sys
+
+# Tipos de acesso do MySQL, do melhor para o pior
+ACCESS_RANK = {
+    "system": 0,
+    "const": 0,
+    "eq_ref": 1,
+    "ref": 2,
+    "fulltext": 2,
+    "ref_or_null": 3,
+    "unique_subquery": 3,
+    "index_subquery": 4,
+    "index_merge": 4,
+    "range": 5,
+    "index": 6,
+    "ALL": 7,
+}
+
+MODOS = ("avisar", "falhar", "ignorar")
+
+# EXPLAIN ANALYZE existe a partir do MySQL 8.0.18 (MariaDB usa ANALYZE)
+VERSAO_EXPLAIN_ANALYZE = (8, 0, 18)
+
+TABELA_PLANOS = "_query_plans"
+
+_SQLITE_DETALHE = re.compile(
+    r"^(?P<op>SCAN|SEARCH) (?P<tabela>\S+)"
+    r"(?: USING (?P<tipo>COVERING INDEX|INDEX|PRIMARY KEY|INTEGER PRIMARY KEY)"
+    r"(?: (?P<indice>\w+))?)?(?: \((?P<cond>.*)\))?"
+)
+
+
+class PlanoRegredido(RuntimeError):
+    """Plano da consolidacao piorou em relacao ao ultimo registrado."""
+
+
+def _valor(row) -> str:
+    # Cursores de dict: EXPLAIN devolve uma coluna so
+    return next(iter(row.values()))
+
+
+def _plano_mysql(explain: dict) -> dict:
+    tabelas, flags = [], set()
+
+    def visitar(node):
+        if isinstance(node, dict):
+            if node.get("using_temporary_table"):
+                flags.add("temporaria")
+            if node.get("using_filesort"):
+                flags.add("filesort")
+            tabela = node.get("table")
+            if isinstance(tabela, dict) and "access_type" in tabela:
+                tabelas.append({
+                    "tabela": tabela.get("table_name"),
+                    "acesso": tabela["access_type"],
+                    "indice": tabela.get("key"),
+                })
+            for value in node.values():
+                visitar(value)
+        elif isinstance(node, list):
+            for item in node:
+                visitar(item)
+
+    visitar(explain)
+    return {"tabelas": tabelas, "flags": sorted(flags)}
+
+
+def _plano_sqlite(detalhes) -> dict:
+    tabelas, flags = [], set()
+    for detalhe in detalhes:
+        if detalhe.startswith("USE TEMP B-TREE"):
+            flags.add("filesort" if "ORDER BY" in detalhe else "temporaria")
+            continue
+        match = _SQLITE_DETALHE.match(detalhe)
+        if not match:
+            continue
+        tipo, cond = match.group("tipo"), match.group("cond") or ""
+        if match.group("op") == "SCAN":
+            acesso = "index" if tipo else "ALL"
+        elif "<" in cond or ">" in cond:
+            acesso = "range"
+        else:
+            acesso = "ref"
+        indice = match.group("indice")
+        if tipo and "PRIMARY KEY" in tipo:
+            indice = "PRIMARY"
+        tabelas.append({"tabela": match.group("tabela"), "acesso": acesso, "indice": indice})
+    return {"tabelas": tabelas, "flags": sorted(flags)}
+
+
+def capturar_plano(cursor, sql: str, dialeto: str) -> dict:
+    """
+    Plano normalizado da consulta: tabelas (na ordem do join) e flags.
+
+    Returns:
+        dict: {"tabelas": [{"tabela", "acesso", "indice"}], "flags": [...]}
+    """
+    if dialeto == "sqlite":
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return _plano_sqlite(row["detail"] for row in cursor.fetchall())
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+    return _plano_mysql(json.loads(_valor(cursor.fetchone())))
+
+
+def fingerprint(plano: dict) -> str:
+    """Hash (32 hex) do plano normalizado."""
+    encoded = json.dumps(plano, sort_keys=True)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def resumo(plano: dict) -> str:
+    """Plano em uma linha: 'sd ALL; ech ref(idx_ech_join) | temporaria'."""
+    partes = [
+        f"{t['tabela']} {t['acesso']}" + (f"({t['indice']})" if t["indice"] else "")
+        for t in plano["tabelas"]
+    ]
+    texto = "; ".join(partes)
+    return f"{texto} | {', '.join(plano['flags'])}" if plano["flags"] else texto
+
+
+def comparar_planos(anterior: dict, atual: dict) -> list:
+    """
+    Regressoes do plano atual em relacao ao anterior.
+
+    Returns:
+        list: Mensagens (vazia se nada piorou)
+    """
+    regressoes = []
+    antes = {t["tabela"]: t for t in anterior["tabelas"]}
+    for tabela in atual["tabelas"]:
+        velho = antes.get(tabela["tabela"])
+        if velho is None:
+            continue
+        rank_velho = ACCESS_RANK.get(velho["acesso"], len(ACCESS_RANK))
+        rank_novo = ACCESS_RANK.get(tabela["acesso"], len(ACCESS_RANK))
+        if rank_novo > rank_velho:
+            regressoes.append(
+                f"{tabela['tabela']}: {velho['acesso']}({velho['indice'] or '-'}) -> "
+                f"{tabela['acesso']}({tabela['indice'] or '-'})"
+            )
+    for flag in sorted(set(atual["flags"]) - set(anterior["flags"])):
+        regressoes.append(f"passou a usar {flag}")
+    return regressoes
+
+
+def _versao(texto: str) -> tuple:
+    numeros = re.match(r"(\d+)\.(\d+)\.(\d+)", texto or "")
+    return tuple(int(n) for n in numeros.groups()) if numeros else ()
+
+
+def explain_analyze(cursor, sql: str, dialeto: str):
+    """
+    Saida do EXPLAIN ANALYZE (executa a consulta), ou None sem suporte.
+
+    So no MySQL >= 8.0.18; MariaDB e SQLite devolvem None.
+    """
+    if dialeto == "sqlite":
+        return None
+    cursor.execute("SELECT VERSION() AS versao")
+    versao = cursor.fetchone()["versao"]
+    if "mariadb" in versao.lower() or _versao(versao) < VERSAO_EXPLAIN_ANALYZE:
+        return None
+    cursor.execute(f"EXPLAIN ANALYZE {sql}")
+    return _valor(cursor.fetchone())
+
+
+def ddl_planos(dialeto: str) -> str:
+    """CREATE TABLE do historico de planos."""
+    if dialeto == "sqlite":
+        return f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_PLANOS} (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          query_name VARCHAR(40) NOT NULL,
+          fingerprint CHAR(32) NOT NULL,
+          plan TEXT NOT NULL,
+          explain_analyze TEXT NULL,
+          regressed INTEGER NOT NULL DEFAULT 0,
+          seconds DOUBLE NULL,
+          rows_affected BIGINT NULL,
+          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    return f"""
+    CREATE TABLE IF NOT EXISTS {TABELA_PLANOS} (
+      id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+      query_name VARCHAR(40) NOT NULL,
+      fingerprint CHAR(32) NOT NULL,
+      plan TEXT NOT NULL,
+      explain_analyze MEDIUMTEXT NULL,
+      regressed TINYINT NOT NULL DEFAULT 0,
+      seconds DOUBLE NULL,
+      rows_affected BIGINT NULL,
+      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+      INDEX idx_query_name (query_name, id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """
+
+
+class MonitorPlano:
+    """
+    Verifica o plano antes de consolidar e registra o resultado depois.
+
+    Exemplo:
+        >>> monitor = MonitorPlano(cursor, "mysql", modo="falhar")
+        >>> monitor.verificar("completa", sql)   # PlanoRegredido se piorou
+        >>> ...consolidacao...
+        >>> monitor.registrar(segundos, linhas)
+    """
+
+    def __init__(
+        self,
+        cursor,
+        dialeto: str,
+        modo: str = "avisar",
+        analyze: bool = False,
+        aceitar: bool = False,
+    ):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de plano invalido: {modo} (use {', '.join(MODOS)})")
+        self.cursor = cursor
+        self.dialeto = dialeto
+        self.modo = modo
+        self.analyze = analyze
+        self.aceitar = aceitar
+        self.placeholder = "?" if dialeto == "sqlite" else "%s"
+        self.consulta = None
+        self.plano = None
+        self.analyze_texto = None
+        self.regressoes = []
+
+    def _ultimo_plano(self, consulta: str):
+        self.cursor.execute(
+            f"SELECT plan FROM {TABELA_PLANOS} "
+            f"WHERE query_name = {self.placeholder} AND regressed = 0 "
+            "ORDER BY id DESC LIMIT 1",
+            (consulta,),
+        )
+        row = self.cursor.fetchone()
+        return json.loads(row["plan"]) if row else None
+
+    def verificar(self, consulta: str, sql: str) -> dict:
+        """
+        Captura e compara o plano de `sql` (nome logico `consulta`).
+
+        Raises:
+            PlanoRegredido: No modo falhar, se o plano piorou (ja registrado)
+        """
+        if self.modo == "ignorar":
+            return None
+        self.cursor.execute(ddl_planos(self.dialeto))
+        self.consulta = consulta
+        self.plano = capturar_plano(self.cursor, sql, self.dialeto)
+        print(
+            f"Plano {consulta} [{fingerprint(self.plano)[:12]}]: {resumo(self.plano)}",
+            file=sys.stderr,
+        )
+
+        anterior = self._ultimo_plano(consulta)
+        self.regressoes = comparar_planos(anterior, self.plano) if anterior else []
+        for regressao in self.regressoes:
+            print(f"ATENCAO: plano {consulta} piorou: {regressao}", file=sys.stderr)
+        if self.regressoes and self.aceitar:
+            print(f"Plano {consulta} aceito como nova referencia", file=sys.stderr)
+            self.regressoes = []
+
+        if self.analyze:
+            self.analyze_texto = explain_analyze(self.cursor, sql, self.dialeto)
+            if self.analyze_texto is None:
+                print("EXPLAIN ANALYZE sem suporte neste banco", file=sys.stderr)
+
+        if self.regressoes and self.modo == "falhar":
+            self.registrar()
+            raise PlanoRegredido(
+                f"plano {consulta} piorou ({'; '.join(self.regressoes)}); "
+                "rode com --plano avisar para consolidar mesmo assim"
+            )
+        return self.plano
+
+    def registrar(self, segundos=None, linhas=None) -> None:
+        """Grava o ultimo plano verificado com tempo e linhas da consolidacao."""
+        if self.plano is None:
+            return
+        p = self.placeholder
+        self.cursor.execute(
+            f"""
+            INSERT INTO {TABELA_PLANOS}
+              (query_name, fingerprint, plan, explain_analyze, regressed, seconds, rows_affected)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+            """,
+            (
+                self.consulta,
+                fingerprint(self.plano),
+                json.dumps(self.plano, sort_keys=True),
+                self.analyze_texto,
+                1 if self.regressoes else 0,
+                segundos,
+                linhas,
+            ),
+        )
@@ -12,6 +12,10 @@ Uso (exemplos):
   python3 generate_report.py --formato csv  --output-dir ./downloads
   python3 generate_report.py --formato xlsx --output-dir ./downloads
   python3 generate_report.py --formato txt  --output-dir ./downloads
+  python3 generate_report.py --formato parquet --output-dir ./downloads
+  python3 generate_report.py --formato csv  --output-dir ./downloads --paralelo 4
+  python3 generate_report.py --formato xlsx --output-dir ./downloads --empresa 1 \
+      --vencimento-de 2026-01-01 --vencimento-ate 2026-01-31 --status Aberto
 
 ObservaÃ§Ãµes importantes:
 - Este script são chamado pelo Node (pythonRunner.runReportGeneration) e precisa imprimir um JSON vÃ¡lido em STDOUT.
@@ -19,15 +23,22 @@ ObservaÃ§Ãµes importantes:
 """
 
 import argparse
+import importlib.util
+import itertools
 import json
 import os
+import re
+import shutil
+import sqlite3
 import sys
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
 
 import pymysql
 from dotenv import load_dotenv
 
+from generators.columnar_generator import FeatherGenerator, ParquetGenerator
 from generators.csv_generator import CSVGenerator
 from generators.xls_generator import XLSGenerator
 from generators.txt_generator import TXTGenerator
@@ -55,6 +66,54 @@ MYSQL_CONFIG = {
     'cursorclass': pymysql.cursors.DictCursor,  # retorna cada linha como dict {coluna: valor}
 }
 
+# Profiling por etapa (--profile cpu|mem): backend/app/core/profiling.py usa so a
+# stdlib e e carregado direto do arquivo, sem importar o pacote app do backend.
+_profiling_spec = importlib.util.spec_from_file_location(
+    'profiling', backend_path / 'app' / 'core' / 'profiling.py'
+)
+profiling = importlib.util.module_from_spec(_profiling_spec)
+_profiling_spec.loader.exec_module(profiling)
+
+# Banco: mysql (padrao) ou sqlite (arquivo local, mesmo SQLITE_PATH do backend)
+DB_DIALECT = (os.getenv('DB_DIALECT') or 'mysql').strip().lower()
+SQLITE_PATH = Path(os.getenv('SQLITE_PATH') or 'data/relatorio.sqlite3')
+if not SQLITE_PATH.is_absolute():
+    SQLITE_PATH = backend_path / SQLITE_PATH
+
+
+# Linhas lidas do cursor por vez: o relatorio e gerado em streaming,
+# sem carregar a tabela inteira em memoria
+FETCH_BATCH_SIZE = int(os.getenv('REPORT_FETCH_BATCH_SIZE') or 5000)
+
+
+def _dict_factory(cursor, row):
+    # Mesmo formato do DictCursor do PyMySQL
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+def conectar():
+    """Abre conexao no banco configurado (DB_DIALECT)."""
+    if DB_DIALECT == 'sqlite':
+        if not SQLITE_PATH.exists():
+            raise FileNotFoundError(f'Banco SQLite nao encontrado: {SQLITE_PATH}')
+        connection = sqlite3.connect(SQLITE_PATH)
+        connection.row_factory = _dict_factory
+        return connection
+    return pymysql.connect(**MYSQL_CONFIG)
+
+
+def abrir_cursor(connection):
+    """
+    Cursor para leitura em streaming.
+
+    No MySQL usa SSDictCursor (sem buffer no cliente: as linhas vem do
+    servidor conforme fetchmany). O cursor do sqlite3 ja e preguicoso.
+    """
+    if DB_DIALECT == 'sqlite':
+        return connection.cursor()
+    return connection.cursor(pymysql.cursors.SSDictCursor)
+
+
 # Mapeia formato -> classe geradora.
 # Nota: "xls" e "xlsx" apontam para XLSGenerator, porÃ©m o arquivo gerado sai como XLSX.
 GENERATORS = {
@@ -62,21 +121,127 @@ GENERATORS = {
     'xls': XLSGenerator,
     'xlsx': XLSGenerator,
     'txt': TXTGenerator,
+    'parquet': ParquetGenerator,
+    'feather': FeatherGenerator,
 }
 
 
+# =============================================================================
+# Filtros (push-down no WHERE)
+# =============================================================================
+# Placeholder do driver: sqlite3 usa ?, PyMySQL usa %s
+PLACEHOLDER = '?' if DB_DIALECT == 'sqlite' else '%s'
+
+# (filtro, coluna, operador, prefixo no nome do arquivo). Cada combinacao
+# tipica tem indice composto em DDL_RELATORIO_EXATO (query/execute_query.py).
+FILTROS = [
+    ('empresa', 'Codigoempresa', 'IN', 'emp'),
+    ('centro_custo', 'CodigoDoCentroDeCusto', 'IN', 'cc'),
+    ('vencimento_de', 'DataDeVencimento', '>=', 'venc'),
+    ('vencimento_ate', 'DataDeVencimento', '<=', 'venc'),
+    ('baixa_de', 'Datadabaixa', '>=', 'baixa'),
+    ('baixa_ate', 'Datadabaixa', '<=', 'baixa'),
+    ('status', 'StatusParcela', 'IN', 'st'),
+]
+
+
+def _vazio(valor):
+    return valor is None or valor == '' or valor == []
+
+
+def montar_where(filtros, faixa=None):
+    """
+    Monta o WHERE parametrizado a partir dos filtros informados.
+
+    Listas viram IN (...); filtros vazios sao ignorados. Os valores vao
+    como parametros do driver, nunca concatenados no SQL. faixa
+    (inicio, fim) restringe NumeroDoTitulo a [inicio, fim); fim None e aberto.
+
+    Returns:
+        tuple: (clausula WHERE ou '', lista de parametros)
+    """
+    clauses, params = [], []
+    for nome, coluna, operador, _ in FILTROS:
+        valor = (filtros or {}).get(nome)
+        if _vazio(valor):
+            continue
+        if operador == 'IN':
+            valores = list(valor) if isinstance(valor, (list, tuple)) else [valor]
+            if len(valores) == 1:
+                clauses.append(f'{coluna} = {PLACEHOLDER}')
+            else:
+                clauses.append(f"{coluna} IN ({', '.join([PLACEHOLDER] * len(valores))})")
+            params.extend(valores)
+        else:
+            clauses.append(f'{coluna} {operador} {PLACEHOLDER}')
+            params.append(valor)
+    if faixa is not None:
+        inicio, fim = faixa
+        clauses.append(f'NumeroDoTitulo >= {PLACEHOLDER}')
+        params.append(inicio)
+        if fim is not None:
+            clauses.append(f'NumeroDoTitulo < {PLACEHOLDER}')
+            params.append(fim)
+    if not clauses:
+        return '', []
+    return 'WHERE ' + '\n      AND '.join(clauses), params
+
+
+def _parte_nome(valor):
+    return re.sub(r'[^0-9A-Za-z]+', '', str(valor))
+
+
+def sufixo_filtros(filtros):
+    """
+    Resumo dos filtros para o nome do arquivo.
+
+    Exemplo: emp1_venc20260101-20260131_stAberto
+    """
+    filtros = filtros or {}
+    partes = []
+    for nome, prefixo in (('empresa', 'emp'), ('centro_custo', 'cc')):
+        if not _vazio(filtros.get(nome)):
+            partes.append(prefixo + '-'.join(_parte_nome(v) for v in filtros[nome]))
+    for base, prefixo in (('vencimento', 'venc'), ('baixa', 'baixa')):
+        de, ate = filtros.get(f'{base}_de'), filtros.get(f'{base}_ate')
+        if not (_vazio(de) and _vazio(ate)):
+            partes.append(f"{prefixo}{_parte_nome(de or '')}-{_parte_nome(ate or '')}")
+    if not _vazio(filtros.get('status')):
+        partes.append('st' + '-'.join(_parte_nome(v) for v in filtros['status']))
+    return '_'.join(partes)
+
+
+def _mensagem_sem_dados(filtros):
+    return 'Nenhum dado encontrado em RELATORIO_CONSOLIDADO' + (
+        f' para os filtros {filtros}' if filtros else ''
+    )
+
+
+def _data_iso(valor):
+    """Tipo do argparse: data AAAA-MM-DD."""
+    try:
+        return date.fromisoformat(valor).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'data invalida (use AAAA-MM-DD): {valor}')
+
+
 # =============================================================================
 # Camada de dados (MySQL)
 # =============================================================================
-def buscar_dados_consolidados(cursor):
+def buscar_dados_consolidados(cursor, filtros=None, batch_size=FETCH_BATCH_SIZE, faixa=None):
     """
     Busca os dados do relatÃ³rio consolidado.
 
     Importante:
     - Usa SELECT explÃ­cito de colunas para manter estabilidade no layout do relatÃ³rio.
     - Ordena por Titulo, ParcelaSequencial para facilitar leitura e conferÃªncia.
+      E a ordem da chave primaria (NumeroDoTitulo, NumeroDaParcela, id) da tabela:
+      sem filtro, o banco le direto pelo indice, sem ordenacao temporaria.
+    - Retorna um iterador: as linhas sao lidas em blocos de batch_size (fetchmany).
+    - Filtros (empresa, centro de custo, datas, status) vao no WHERE (montar_where).
     """
-    query = """
+    where, params = montar_where(filtros, faixa)
+    query = f"""
     SELECT
         Codigoempresa,
         NomeDaEmpresa,
@@ -105,10 +270,167 @@ def buscar_dados_consolidados(cursor):
         numConta,
         StatusParcela
     FROM RELATORIO_CONSOLIDADO
-    ORDER BY NumeroDoTitulo, NumeroDaParcela
+    {where}
+    ORDER BY NumeroDoTitulo, NumeroDaParcela, id
+    """
+    cursor.execute(query, params)
+    return _iterar_cursor(cursor, batch_size)
+
+
+def _iterar_cursor(cursor, batch_size):
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield from batch
+
+
+# =============================================================================
+# Exportacao paralela (CSV/TXT)
+# =============================================================================
+# Formatos em que as partes podem ser concatenadas byte a byte
+FORMATOS_PARALELOS = ('csv', 'txt')
+
+
+def calcular_faixas(cursor, filtros, partes):
     """
-    cursor.execute(query)
-    return cursor.fetchall()
+    Divide NumeroDoTitulo em ate `partes` faixas com quantidades parecidas de linhas.
+
+    NTILE sobre NumeroDoTitulo (indice da chave primaria) com os mesmos
+    filtros da exportacao; o menor titulo de cada grupo abre uma faixa. Um
+    titulo nunca fica dividido entre duas faixas, entao a ordem final e a
+    mesma da exportacao serial.
+
+    Returns:
+        list: [(inicio, fim), ...] com fim exclusivo; o ultimo fim e None.
+              Vazia quando nao ha linhas.
+    """
+    where, params = montar_where(filtros)
+    cursor.execute(
+        f"""
+        SELECT MIN(NumeroDoTitulo) AS inicio
+        FROM (
+            SELECT NumeroDoTitulo, NTILE({int(partes)}) OVER (ORDER BY NumeroDoTitulo) AS parte
+            FROM RELATORIO_CONSOLIDADO
+            {where}
+        ) t
+        GROUP BY parte
+        """,
+        params,
+    )
+    inicios = sorted({row['inicio'] for row in cursor.fetchall()})
+    fins = inicios[1:] + [None]
+    return list(zip(inicios, fins))
+
+
+def _linhas_da_faixa(filtros, faixa):
+    """Abre conexao propria (processo do pool) e le as linhas da faixa."""
+    connection = conectar()
+    try:
+        yield from buscar_dados_consolidados(abrir_cursor(connection), filtros, faixa=faixa)
+    finally:
+        connection.close()
+
+
+def _larguras_parte(filtros, faixa):
+    """Worker: larguras das colunas TXT de uma faixa (primeira passada)."""
+    return TXTGenerator.column_widths(_linhas_da_faixa(filtros, faixa))
+
+
+def _exportar_parte(formato, filtros, faixa, caminho, header, widths=None):
+    """Worker: escreve a parte de uma faixa e retorna a quantidade de linhas."""
+    rows = _linhas_da_faixa(filtros, faixa)
+    if formato == 'txt':
+        return TXTGenerator().generate(rows, caminho, widths=widths, header=header)
+    return GENERATORS[formato]().generate(rows, caminho, header=header)
+
+
+def exportar_paralelo(formato, filtros, faixas, output_dir, workers):
+    """
+    Escreve uma parte por faixa em processos separados.
+
+    So a primeira parte leva BOM/cabecalho. No TXT as larguras das colunas
+    precisam valer para todas as partes: uma primeira passada (tambem
+    paralela) calcula a largura de cada faixa e as partes usam o maximo.
+
+    Returns:
+        tuple: (caminhos das partes na ordem, total de linhas)
+    """
+    caminhos = [
+        output_dir / f'.relatorio_{os.getpid()}.parte{i + 1:03d}.{formato}'
+        for i in range(len(faixas))
+    ]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            widths = None
+            if formato == 'txt':
+                widths = TXTGenerator.merge_widths(
+                    pool.map(_larguras_parte, [filtros] * len(faixas), faixas)
+                )
+            futures = [
+                pool.submit(_exportar_parte, formato, filtros, faixa, caminho, i == 0, widths)
+                for i, (faixa, caminho) in enumerate(zip(faixas, caminhos))
+            ]
+            total = sum(future.result() for future in futures)
+    except BaseException:
+        for caminho in caminhos:
+            caminho.unlink(missing_ok=True)
+        raise
+    return caminhos, total
+
+
+def _copiar_para(origem_fd, destino_fd, tamanho):
+    """
+    Anexa `tamanho` bytes de origem_fd em destino_fd, a partir das posicoes atuais.
+
+    Tenta copy_file_range (copia dentro do kernel, ou reflink no mesmo
+    sistema de arquivos), depois sendfile e, se nenhum estiver disponivel
+    ou o sistema de arquivos recusar, read/write comum.
+
+    Returns:
+        str: Metodo que terminou a copia
+    """
+    metodos = []
+    if hasattr(os, 'copy_file_range'):
+        metodos.append(('copy_file_range', lambda n: os.copy_file_range(origem_fd, destino_fd, n)))
+    if hasattr(os, 'sendfile'):
+        metodos.append(('sendfile', lambda n: os.sendfile(destino_fd, origem_fd, None, n)))
+
+    copiado = 0
+    for nome, copiar in metodos:
+        try:
+            while copiado < tamanho:
+                n = copiar(tamanho - copiado)
+                if n == 0:
+                    break
+                copiado += n
+        except OSError:
+            continue
+        if copiado >= tamanho:
+            return nome
+
+    with open(origem_fd, 'rb', closefd=False) as origem, open(destino_fd, 'ab', closefd=False) as destino:
+        shutil.copyfileobj(origem, destino)
+    return 'read/write'
+
+
+def concatenar_partes(partes, destino):
+    """
+    Junta as partes, na ordem, em destino e apaga as partes.
+
+    Returns:
+        set: Metodos de copia usados (ver _copiar_para)
+    """
+    metodos = set()
+    with open(destino, 'wb') as saida:
+        for parte in partes:
+            with open(parte, 'rb') as entrada:
+                tamanho = os.fstat(entrada.fileno()).st_size
+                if tamanho:
+                    metodos.add(_copiar_para(entrada.fileno(), saida.fileno(), tamanho))
+    for parte in partes:
+        Path(parte).unlink(missing_ok=True)
+    return metodos
 
 
 # =============================================================================
@@ -125,15 +447,19 @@ def normalizar_formato_excel(formato):
     return 'xlsx' if formato in ('xls', 'xlsx') else formato
 
 
-def gerar_nome_arquivo(formato, record_count):
+def gerar_nome_arquivo(formato, record_count, filtros=None):
     """
-    Gera nome de arquivo com timestamp e quantidade de registros.
+    Gera nome de arquivo com timestamp, filtros e quantidade de registros.
 
     Exemplo:
       relatorio_20260211_120324_19618.xlsx
+      relatorio_20260211_120324_emp1_venc20260101-20260131_812.xlsx
     """
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     extensao = normalizar_formato_excel(formato)
+    sufixo = sufixo_filtros(filtros)
+    if sufixo:
+        return f'relatorio_{timestamp}_{sufixo}_{record_count}.{extensao}'
     return f'relatorio_{timestamp}_{record_count}.{extensao}'
 
 
@@ -161,39 +487,120 @@ def main():
     4) Imprime JSON final em STDOUT (para o Node consumir).
     """
     parser = argparse.ArgumentParser(description='Gera relatorio consolidado')
-    parser.add_argument('--formato', required=True, choices=['csv', 'xls', 'xlsx', 'txt'])
+    parser.add_argument('--formato', required=True, choices=sorted(GENERATORS))
     parser.add_argument('--output-dir', required=True, help='Diretorio de saida')
+    parser.add_argument(
+        '--profile',
+        choices=profiling.PROFILE_MODES,
+        help='Perfila cada etapa (cpu: cProfile, mem: tracemalloc) em backend/logs/profiles/',
+    )
+    grupo = parser.add_argument_group('filtros (aplicados no WHERE)')
+    grupo.add_argument('--empresa', type=int, action='append', help='Codigoempresa (repetivel)')
+    grupo.add_argument(
+        '--centro-custo', action='append', help='CodigoDoCentroDeCusto (repetivel)'
+    )
+    grupo.add_argument('--vencimento-de', type=_data_iso, help='DataDeVencimento >= AAAA-MM-DD')
+    grupo.add_argument('--vencimento-ate', type=_data_iso, help='DataDeVencimento <= AAAA-MM-DD')
+    grupo.add_argument('--baixa-de', type=_data_iso, help='Datadabaixa >= AAAA-MM-DD')
+    grupo.add_argument('--baixa-ate', type=_data_iso, help='Datadabaixa <= AAAA-MM-DD')
+    grupo.add_argument('--status', action='append', help='StatusParcela (repetivel)')
+    parser.add_argument(
+        '--paralelo',
+        type=int,
+        default=int(os.getenv('REPORT_WORKERS') or 1),
+        help='Processos para CSV/TXT: uma parte por faixa de NumeroDoTitulo (default: 1)',
+    )
+    parser.add_argument(
+        '--manter-partes',
+        action='store_true',
+        help='Com --paralelo, entrega as partes como arquivos separados em vez de concatenar',
+    )
     args = parser.parse_args()
+    filtros = {
+        nome: getattr(args, nome)
+        for nome, *_ in FILTROS
+        if not _vazio(getattr(args, nome))
+    }
+    profiler = profiling.Profiler(args.profile, 'generate_report').activate()
 
     connection = None
     try:
         # Conecta no banco
-        connection = pymysql.connect(**MYSQL_CONFIG)
-        cursor = connection.cursor()
+        with profiler.stage('conexao'):
+            connection = conectar()
+            cursor = abrir_cursor(connection)
 
         # Log em STDERR para não atrapalhar o JSON (STDOUT)
-        print('Buscando dados consolidados...', file=sys.stderr)
-
-        # Busca dados
-        rows = buscar_dados_consolidados(cursor)
-        record_count = len(rows)
-        if record_count == 0:
-            # Falha controlada: nÃ£o gera arquivo vazio
-            raise ValueError('Nenhum dado encontrado em RELATORIO_CONSOLIDADO')
+        print(f'Buscando dados consolidados... filtros: {filtros or "nenhum"}', file=sys.stderr)
 
-        # Prepara caminho de saÃ­da
+        # Prepara caminho de saida. A quantidade de linhas so e conhecida
+        # no fim do streaming: gera num arquivo parcial e renomeia depois.
         formato = normalizar_formato_excel(args.formato)
-        filename = gerar_nome_arquivo(formato, record_count)
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
+        partial_path = output_dir / f'.relatorio_{os.getpid()}.parcial.{formato}'
+
+        paralelo = args.paralelo > 1 and formato in FORMATOS_PARALELOS
+        if args.paralelo > 1 and not paralelo:
+            print(f'--paralelo ignorado para {formato.upper()} (so CSV/TXT)', file=sys.stderr)
+
+        partes = None
+        if paralelo:
+            with profiler.stage('busca'):
+                faixas = calcular_faixas(cursor, filtros, args.paralelo)
+            if not faixas:
+                raise ValueError(_mensagem_sem_dados(filtros))
+
+            print(
+                f'Gerando arquivo {formato.upper()} em {len(faixas)} partes '
+                f'({args.paralelo} processos)...',
+                file=sys.stderr,
+            )
+            with profiler.stage('geracao'):
+                partes, record_count = exportar_paralelo(
+                    formato, filtros, faixas, output_dir, args.paralelo
+                )
+            if not args.manter_partes:
+                with profiler.stage('concatenacao'):
+                    try:
+                        metodos = concatenar_partes(partes, partial_path)
+                    except BaseException:
+                        partial_path.unlink(missing_ok=True)
+                        raise
+                print(f'Partes concatenadas ({", ".join(sorted(metodos))})', file=sys.stderr)
+                partes = None
+        else:
+            # Busca dados
+            with profiler.stage('busca'):
+                rows = buscar_dados_consolidados(cursor, filtros)
+                first = next(rows, None)
+            if first is None:
+                # Falha controlada: nÃ£o gera arquivo vazio
+                raise ValueError(_mensagem_sem_dados(filtros))
+
+            # Instancia gerador correto e gera o arquivo
+            generator_class = GENERATORS[formato]
+            generator = generator_class()
+
+            print(f'Gerando arquivo {formato.upper()}...', file=sys.stderr)
+            with profiler.stage('geracao'):
+                try:
+                    record_count = generator.generate(itertools.chain([first], rows), partial_path)
+                except BaseException:
+                    partial_path.unlink(missing_ok=True)
+                    raise
+
+        filename = gerar_nome_arquivo(formato, record_count, filtros)
+        if partes:
+            # Download em varias partes: relatorio_..._N.parte1de4.csv, ...
+            base, extensao = filename.rsplit('.', 1)
+            nomes = [f'{base}.parte{i + 1}de{len(partes)}.{extensao}' for i in range(len(partes))]
+            for parte, nome in zip(partes, nomes):
+                os.replace(parte, output_dir / nome)
+            filename = nomes[0]
         filepath = output_dir / filename
-
-        # Instancia gerador correto e gera o arquivo
-        generator_class = GENERATORS[formato]
-        generator = generator_class()
-
-        print(f'Gerando arquivo {formato.upper()}...', file=sys.stderr)
-        generator.generate(rows, filepath)
+        if not partes:
+            os.replace(partial_path, filepath)
 
         # Retorno para o Node: JSON puro em STDOUT
         result = {
@@ -202,6 +609,10 @@ def main():
             'recordCount': record_count,
             'formato': formato,
         }
+        if partes:
+            result['partes'] = nomes
+        if filtros:
+            result['filtros'] = filtros
         print(json.dumps(result))
 
         # Log final (apenas informativo)
@@ -217,6 +628,7 @@ def main():
         # Fecha conexÃ£o mesmo em caso de erro
         if connection:
             connection.close()
+        profiler.finish()
 
 
 if __name__ == '__main__':
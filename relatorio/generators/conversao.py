@@ -0,0 +1,88 @@
+"""
+Conversao de tipos das colunas de RELATORIO_CONSOLIDADO
+
+Valores monetarios ficam em VARCHAR no formato pt-BR ("1.234,56") e, no
+SQLite, datas chegam como texto ISO. Os geradores tipados (XLSX, Parquet,
+Feather) usam estas funcoes para gravar numeros e datas de verdade.
+"""
+
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+# Colunas monetarias: VARCHAR no formato pt-BR em RELATORIO_CONSOLIDADO
+MONEY_COLUMNS = frozenset({
+    "ValorOriginalRateado",
+    "SaldoAtual",
+    "ValorDaBaixaRateado",
+    "AcrescimoRateado",
+    "DescontoRateado",
+    "ValorLiquido",
+})
+
+# Colunas DATE (no SQLite chegam como texto ISO "2026-02-05")
+DATE_COLUMNS = frozenset({"DataDeEmissao", "DataDeVencimento", "Datadabaixa"})
+
+# Colunas BIGINT
+INT_COLUMNS = frozenset({
+    "Codigoempresa",
+    "CodigoDoCliente",
+    "NumeroDoTitulo",
+    "NumeroDaParcela",
+})
+
+_VALOR_BR = re.compile(r"^-?\d{1,3}(\.\d{3})*(,\d+)?$|^-?\d+(,\d+)?$")
+
+
+def _valor_br_text(value):
+    """Texto "1234.56" de um valor pt-BR, ou None se nao estiver no formato."""
+    text = value.strip()
+    if not _VALOR_BR.match(text):
+        return None
+    return text.replace(".", "").replace(",", ".")
+
+
+def parse_valor_br(value):
+    """
+    Converte valor monetario pt-BR ("1.234,56") em float.
+
+    Retorna o valor original quando nao e um numero nesse formato.
+    """
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return value
+    text = _valor_br_text(value)
+    return value if text is None else float(text)
+
+
+def parse_decimal_br(value):
+    """
+    Converte valor monetario pt-BR em Decimal com 2 casas.
+
+    Vazio ou fora do formato vira None (coluna DECIMAL nao aceita texto).
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        text = str(value)
+    elif isinstance(value, str):
+        text = _valor_br_text(value)
+        if text is None:
+            return None
+    else:
+        return None
+    try:
+        return Decimal(text).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return None
+
+
+def parse_data(value):
+    """Converte data ISO ("2026-02-05") em date; outros valores passam direto."""
+    if isinstance(value, str) and value:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return value
+    return value
@@ -8,14 +8,34 @@ import csv
 class CSVGenerator:
     """Gera arquivo CSV usando streaming."""
 
-    def generate(self, rows, filepath):
-        if not rows:
+    def generate(self, rows, filepath, header=True):
+        """
+        Escreve as linhas (qualquer iteravel de dicts, ex: cursor) no arquivo.
+
+        Args:
+            rows: Linhas (dicts)
+            filepath: Arquivo de saida
+            header: Escreve BOM e cabecalho (False nas partes seguintes de
+                uma exportacao paralela, que sao concatenadas na primeira)
+
+        Returns:
+            int: Quantidade de linhas escritas
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
             raise ValueError("Nenhum dado para exportar")
 
-        headers = list(rows[0].keys())
+        headers = list(first.keys())
 
-        with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
+        count = 1
+        encoding = "utf-8-sig" if header else "utf-8"
+        with open(filepath, "w", newline="", encoding=encoding) as f:
             writer = csv.DictWriter(f, fieldnames=headers, delimiter=";")
-            writer.writeheader()
+            if header:
+                writer.writeheader()
+            writer.writerow(first)
             for row in rows:
                 writer.writerow(row)
+                count += 1
+        return count
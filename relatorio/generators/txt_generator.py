@@ -2,30 +2,76 @@
 Gerador TXT - Formato tabular com colunas alinhadas
 """
 
+# Largura maxima de uma coluna (conteudo + 2 de espaco)
+MAX_COLUMN_WIDTH = 30
+
 
 class TXTGenerator:
     """Gera arquivo TXT em formato tabular."""
 
-    def generate(self, rows, filepath):
-        if not rows:
-            raise ValueError("Nenhum dado para exportar")
+    def generate(self, rows, filepath, widths=None, header=True):
+        """
+        Escreve as linhas no arquivo.
 
-        headers = list(rows[0].keys())
+        As larguras dependem de todas as linhas: sem widths, um iteravel (ex:
+        cursor) e materializado para calcula-las. Com widths (ex: somadas de
+        varias partes por merge_widths), as linhas sao escritas em streaming.
 
-        col_widths = {}
-        for header in headers:
-            max_len = len(str(header))
-            for row in rows:
-                val_len = len(str(row.get(header, "")))
-                if val_len > max_len:
-                    max_len = val_len
-            col_widths[header] = min(max_len + 2, 30)
+        Args:
+            rows: Linhas (dicts)
+            filepath: Arquivo de saida
+            widths: Maior tamanho de cada coluna (column_widths)
+            header: Escreve cabecalho e linha separadora (False nas partes
+                seguintes de uma exportacao paralela)
+
+        Returns:
+            int: Quantidade de linhas escritas
+        """
+        if widths is None:
+            rows = rows if isinstance(rows, list) else list(rows)
+            if not rows:
+                raise ValueError("Nenhum dado para exportar")
+            widths = self.column_widths(rows)
+
+        headers = list(widths)
+        col_widths = {h: min(widths[h] + 2, MAX_COLUMN_WIDTH) for h in headers}
 
+        count = 0
         with open(filepath, "w", encoding="utf-8") as f:
-            header_line = "".join(h.ljust(col_widths[h]) for h in headers)
-            f.write(header_line + "\n")
-            f.write("=" * len(header_line) + "\n")
+            if header:
+                header_line = "".join(h.ljust(col_widths[h]) for h in headers)
+                f.write(header_line + "\n")
+                f.write("=" * len(header_line) + "\n")
 
             for row in rows:
                 line = "".join(str(row.get(h, "")).ljust(col_widths[h]) for h in headers)
                 f.write(line + "\n")
+                count += 1
+        return count
+
+    @staticmethod
+    def column_widths(rows):
+        """
+        Maior tamanho de cada coluna (cabecalho incluido), em uma passada.
+
+        Returns:
+            dict: {coluna: tamanho}; vazio se nao ha linhas
+        """
+        widths = {}
+        for row in rows:
+            if not widths:
+                widths = {h: len(str(h)) for h in row}
+            for h, size in widths.items():
+                val_len = len(str(row.get(h, "")))
+                if val_len > size:
+                    widths[h] = val_len
+        return widths
+
+    @staticmethod
+    def merge_widths(parts):
+        """Combina as larguras de varias partes (maior valor por coluna)."""
+        merged = {}
+        for widths in parts:
+            for h, size in widths.items():
+                merged[h] = max(merged.get(h, 0), size)
+        return merged
@@ -1,24 +1,156 @@
 """
-Gerador XLS - Usando openpyxl em modo write-only para performance
+Gerador XLS - Excel (.xlsx) em memoria constante
+
+Usa xlsxwriter com constant_memory (cada linha vai direto para o XML da
+planilha) e cai para openpyxl write-only quando xlsxwriter nao esta
+instalado. Valores e datas viram celulas tipadas com formato de numero
+cacheado (em vez de strings compartilhadas), e ao atingir o limite de
+linhas do Excel a escrita continua em Relatorio_2, Relatorio_3, ...
 """
 
-from openpyxl import Workbook
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - depende do ambiente
+    xlsxwriter = None
+
+from .conversao import DATE_COLUMNS, MONEY_COLUMNS, parse_data, parse_valor_br
+
+# Limite do Excel: 1.048.576 linhas, uma delas o cabecalho
+MAX_DATA_ROWS = 1_048_575
+
+SHEET_NAME = "Relatorio"
+
+MONEY_FORMAT = "#,##0.00"
+DATE_FORMAT = "dd/mm/yyyy"
+
+
+def sheet_name(index):
+    """Nome da planilha de indice 0, 1, 2...: Relatorio, Relatorio_2, Relatorio_3..."""
+    return SHEET_NAME if index == 0 else f"{SHEET_NAME}_{index + 1}"
 
 
 class XLSGenerator:
     """Gera arquivo Excel (.xlsx) otimizado."""
 
+    def __init__(self, max_rows=MAX_DATA_ROWS, money_columns=MONEY_COLUMNS,
+                 date_columns=DATE_COLUMNS):
+        self.max_rows = max_rows
+        self.money_columns = money_columns
+        self.date_columns = date_columns
+
     def generate(self, rows, filepath):
-        if not rows:
+        """
+        Escreve as linhas (qualquer iteravel de dicts, ex: cursor) no arquivo.
+
+        Returns:
+            int: Quantidade de linhas escritas
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
             raise ValueError("Nenhum dado para exportar")
 
-        wb = Workbook(write_only=True)
-        ws = wb.create_sheet("Relatorio")
+        headers = list(first.keys())
+        converters = [self._converter(header) for header in headers]
 
-        headers = list(rows[0].keys())
-        ws.append(headers)
+        if xlsxwriter is not None:
+            return self._generate_xlsxwriter(first, rows, headers, converters, filepath)
+        return self._generate_openpyxl(first, rows, headers, converters, filepath)
 
-        for row in rows:
-            ws.append(list(row.values()))
+    def _converter(self, header):
+        if header in self.money_columns:
+            return parse_valor_br
+        if header in self.date_columns:
+            return parse_data
+        return None
+
+    def _typed_rows(self, first, rows, headers, converters):
+        """Linhas como listas de valores ja convertidos, na ordem dos headers."""
+        pairs = list(zip(headers, converters))
+        for row in _chain(first, rows):
+            yield [
+                convert(row.get(header)) if convert else row.get(header)
+                for header, convert in pairs
+            ]
+
+    def _generate_xlsxwriter(self, first, rows, headers, converters, filepath):
+        workbook = xlsxwriter.Workbook(str(filepath), {
+            "constant_memory": True,
+            "default_date_format": DATE_FORMAT,
+        })
+        money = workbook.add_format({"num_format": MONEY_FORMAT})
+        day = workbook.add_format({"num_format": DATE_FORMAT})
+        moment = workbook.add_format({"num_format": DATE_FORMAT + " hh:mm:ss"})
+
+        def write(ws, r, c, value, is_money):
+            if value is None:
+                return
+            if isinstance(value, bool):
+                ws.write_boolean(r, c, value)
+            elif isinstance(value, (int, float, Decimal)):
+                ws.write_number(r, c, value, money if is_money else None)
+            elif isinstance(value, datetime):
+                ws.write_datetime(r, c, value, moment)
+            elif isinstance(value, date):
+                ws.write_datetime(r, c, value, day)
+            else:
+                ws.write_string(r, c, str(value))
+
+        money_flags = [convert is parse_valor_br for convert in converters]
+        count = 0
+        ws, row_num = None, self.max_rows
+        try:
+            for values in self._typed_rows(first, rows, headers, converters):
+                if row_num >= self.max_rows:
+                    ws = workbook.add_worksheet(sheet_name(count // self.max_rows))
+                    ws.write_row(0, 0, headers)
+                    row_num = 0
+                row_num += 1
+                for col, value in enumerate(values):
+                    write(ws, row_num, col, value, money_flags[col])
+                count += 1
+        finally:
+            workbook.close()
+        return count
+
+    def _generate_openpyxl(self, first, rows, headers, converters, filepath):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+
+        wb = Workbook(write_only=True)
+        money_cols = [i for i, convert in enumerate(converters) if convert is parse_valor_br]
+        date_cols = [i for i, convert in enumerate(converters) if convert is parse_data]
+
+        count = 0
+        ws, row_num = None, self.max_rows
+        for values in self._typed_rows(first, rows, headers, converters):
+            if row_num >= self.max_rows:
+                ws = wb.create_sheet(sheet_name(count // self.max_rows))
+                ws.append(headers)
+                row_num = 0
+            # So as celulas com formato viram WriteOnlyCell; o estilo e
+            # cacheado pelo openpyxl (mesmo number_format, mesmo indice)
+            for col in money_cols:
+                if isinstance(values[col], float):
+                    cell = WriteOnlyCell(ws, value=values[col])
+                    cell.number_format = MONEY_FORMAT
+                    values[col] = cell
+            for col in date_cols:
+                if isinstance(values[col], date):
+                    cell = WriteOnlyCell(ws, value=values[col])
+                    cell.number_format = DATE_FORMAT
+                    values[col] = cell
+            ws.append(values)
+            row_num += 1
+            count += 1
 
         wb.save(filepath)
+        return count
+
+
+def _chain(first, rows):
+    yield first
+    yield from rows